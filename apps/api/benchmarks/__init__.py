@@ -0,0 +1,6 @@
+"""
+Benchmarks for the LearnR API hot paths.
+
+Run from apps/api, e.g.:
+    python -m benchmarks.quiz_hot_path --size medium
+"""
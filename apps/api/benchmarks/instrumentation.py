@@ -0,0 +1,126 @@
+"""
+Per-stage latency, query and allocation recording for benchmarks.
+
+Stages may nest (e.g. update_beliefs inside submit_answer); every metric is
+inclusive of nested stages.
+"""
+import functools
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class StageSamples:
+    """Raw samples recorded for one stage."""
+    latencies_ms: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    peak_allocated_bytes: list[int] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        """Summarize samples as percentiles and means."""
+        latencies = np.asarray(self.latencies_ms)
+        summary: dict = {"count": len(self.latencies_ms)}
+        for p in PERCENTILES:
+            summary[f"p{p}_ms"] = round(float(np.percentile(latencies, p)), 3)
+        summary["max_ms"] = round(float(latencies.max()), 3)
+        summary["mean_queries"] = round(float(np.mean(self.queries)), 2)
+        summary["max_queries"] = int(max(self.queries))
+        if self.peak_allocated_bytes:
+            summary["mean_peak_kib"] = round(float(np.mean(self.peak_allocated_bytes)) / 1024, 1)
+            summary["max_peak_kib"] = round(max(self.peak_allocated_bytes) / 1024, 1)
+        return summary
+
+
+@dataclass
+class _ActiveStage:
+    name: str
+    started_at: float
+    queries: int = 0
+    baseline_bytes: int = 0
+    peak_bytes: int = 0
+
+
+class HotPathRecorder:
+    """
+    Records per-stage metrics for code running against an engine.
+
+    Usage:
+        recorder = HotPathRecorder(engine)
+        with recorder:
+            with recorder.stage("select"):
+                await selector.select_next_question(...)
+        recorder.summary()
+    """
+
+    def __init__(self, engine: AsyncEngine, trace_allocations: bool = True):
+        self.engine = engine
+        self.trace_allocations = trace_allocations
+        self.samples: dict[str, StageSamples] = {}
+        self._active: list[_ActiveStage] = []
+        self._started_tracing = False
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        for stage in self._active:
+            stage.queries += 1
+
+    def __enter__(self) -> "HotPathRecorder":
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record latency, queries and peak allocations of the enclosed block."""
+        active = _ActiveStage(name=name, started_at=0.0)
+        if self.trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing stages' peak before resetting it for this stage
+            for outer in self._active:
+                outer.peak_bytes = max(outer.peak_bytes, peak)
+            tracemalloc.reset_peak()
+            active.baseline_bytes = current
+        self._active.append(active)
+        active.started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - active.started_at) * 1000
+            self._active.pop()
+            samples = self.samples.setdefault(name, StageSamples())
+            samples.latencies_ms.append(elapsed_ms)
+            samples.queries.append(active.queries)
+            if self.trace_allocations:
+                peak = max(active.peak_bytes, tracemalloc.get_traced_memory()[1])
+                samples.peak_allocated_bytes.append(max(peak - active.baseline_bytes, 0))
+
+    def instrument(self, obj: object, method_name: str, stage_name: str | None = None) -> None:
+        """Record every call of an async method on obj as a stage."""
+        method = getattr(obj, method_name)
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            with self.stage(stage_name or method_name):
+                return await method(*args, **kwargs)
+
+        setattr(obj, method_name, wrapper)
+
+    def summary(self) -> dict[str, dict]:
+        """Summaries for every recorded stage."""
+        return {name: samples.summary() for name, samples in self.samples.items()}
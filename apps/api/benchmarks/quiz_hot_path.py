@@ -0,0 +1,447 @@
+"""
+Adaptive quiz hot path benchmark.
+
+Seeds a synthetic course into a fresh database, then simulates learners
+taking quiz sessions through the same services the API uses:
+
+    load_beliefs   -> BeliefRepository.get_beliefs_as_dict
+    select         -> QuestionSelector.select_next_question (or _adaptive)
+    submit_answer  -> QuizAnswerService.submit_answer
+    update_beliefs -> BeliefUpdater.update_beliefs (inside submit_answer)
+    commit         -> AsyncSession.commit
+
+and reports latency percentiles, query counts and peak allocations per stage.
+
+Runs against in-memory SQLite by default, or any database URL (e.g. a local
+PostgreSQL with an empty database). No network services are used: cache
+version counters (course content, prerequisite graph and belief snapshot
+versions) are kept in memory instead of Redis, and reading queue population
+(Qdrant/OpenAI) is disabled for the run.
+
+Usage:
+    cd apps/api
+    python -m benchmarks.quiz_hot_path --size small
+    python -m benchmarks.quiz_hot_path --size all --json results.json
+    python -m benchmarks.quiz_hot_path --questions 2000 --concepts 800 \\
+        --prerequisite-density 3 --selector adaptive
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field, replace
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.instrumentation import HotPathRecorder
+from benchmarks.sqlite_support import BENCHMARK_TABLES, is_sqlite, register_sqlite_functions
+from benchmarks.synthetic_course import (
+    COURSE_SIZES,
+    BKTParameters,
+    SimulatedLearner,
+    SyntheticCourseSpec,
+    generate_course,
+    seed_course,
+    seed_learner,
+    start_quiz_session,
+)
+from src.config import settings
+from src.db.session import Base
+from src.repositories import question_repository
+from src.dependencies import get_question_selector, get_quiz_answer_service
+from src.repositories.belief_repository import BeliefRepository
+from src.repositories.concept_repository import ConceptRepository
+from src.repositories.question_repository import QuestionRepository
+from src.repositories.quiz_session_repository import QuizSessionRepository
+from src.repositories.response_repository import ResponseRepository
+from src.repositories.user_repository import UserRepository
+from src.services import belief_snapshot_cache, prerequisite_graph_service, question_pool_cache
+from src.services.mastery_gate import MasteryGateService
+from src.services.prerequisite_graph_service import PrerequisiteGraphService
+from src.services.question_exclusion_cache import QuestionExclusionCache
+from src.services.question_pool_cache import CachedQuestion
+from src.utils.logging_config import configure_logging
+
+SQLITE_MEMORY_URL = "sqlite+aiosqlite://"
+SELECTORS = ("bkt", "adaptive")
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """Benchmark run configuration."""
+    course: SyntheticCourseSpec
+    learners: int = 5
+    sessions_per_learner: int = 2
+    questions_per_session: int = 10  # Sessions auto-complete at 10-15 questions
+    selector: str = "bkt"
+    scoring_engine: str = settings.QUESTION_SCORING_ENGINE
+    exclusion_cache: bool = settings.QUESTION_EXCLUSION_CACHE_ENABLED
+    trace_allocations: bool = True
+    database_url: str = SQLITE_MEMORY_URL
+    bkt: BKTParameters = field(default_factory=BKTParameters)
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of a benchmark run."""
+    config: dict
+    seed_ms: float
+    answers: int
+    correct_rate: float
+    wall_time_s: float
+    stages: dict[str, dict]
+
+    def format_table(self) -> str:
+        """Render stage summaries as a plain text table."""
+        course = self.config["course"]
+        lines = [
+            f"Course: {course['questions']} questions, {course['concepts']} concepts, "
+            f"prerequisite density {course['prerequisite_density']}",
+            f"Selector: {self.config['selector']} ({self.config['scoring_engine']}), "
+            f"answers: {self.answers}, correct rate: {self.correct_rate:.1%}, "
+            f"seed: {self.seed_ms:.0f}ms, wall time: {self.wall_time_s:.2f}s",
+            "",
+            f"{'stage':<20}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'max ms':>10}{'queries':>9}{'peak KiB':>10}",
+        ]
+        for name, s in self.stages.items():
+            peak = f"{s['max_peak_kib']:>10.1f}" if "max_peak_kib" in s else f"{'-':>10}"
+            lines.append(
+                f"{name:<20}{s['count']:>7}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+                f"{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}{s['mean_queries']:>9.1f}{peak}"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def _override_attributes(target, **overrides) -> Iterator[None]:
+    """Temporarily override attributes of an object or module."""
+    previous = {name: getattr(target, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(target, name, value)
+
+
+def _override_settings(**overrides):
+    """Temporarily override settings attributes."""
+    return _override_attributes(settings, **overrides)
+
+
+@contextmanager
+def _local_versions() -> Iterator[None]:
+    """Serve cache version counters from memory instead of Redis for the run."""
+    versions: dict[tuple[str, object], int] = {}
+
+    def getter(kind: str):
+        async def get_version(key) -> int:
+            return versions.get((kind, key), 0)
+        return get_version
+
+    def bumper(kind: str):
+        async def bump_version(key) -> int:
+            versions[(kind, key)] = versions.get((kind, key), 0) + 1
+            return versions[(kind, key)]
+        return bump_version
+
+    with ExitStack() as stack:
+        stack.enter_context(_override_attributes(
+            question_pool_cache, get_course_content_version=getter("content"),
+        ))
+        stack.enter_context(_override_attributes(
+            question_repository, bump_course_content_version=bumper("content"),
+        ))
+        stack.enter_context(_override_attributes(
+            prerequisite_graph_service, get_prerequisite_graph_version=getter("graph"),
+        ))
+        stack.enter_context(_override_attributes(
+            belief_snapshot_cache,
+            get_user_belief_version=getter("belief"),
+            bump_user_belief_version=bumper("belief"),
+        ))
+        yield
+
+
+async def _create_engine(database_url: str) -> AsyncEngine:
+    """Create an engine and the benchmark tables."""
+    if database_url == SQLITE_MEMORY_URL:
+        # One shared connection, so every session sees the same in-memory database
+        engine = create_async_engine(database_url, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(database_url)
+
+    if is_sqlite(engine):
+        register_sqlite_functions(engine)
+
+    tables = [Base.metadata.tables[name] for name in BENCHMARK_TABLES]
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables)
+            )
+    except Exception:
+        # Close the connection, or the aiosqlite worker thread keeps the process alive
+        await engine.dispose()
+        raise
+    return engine
+
+
+async def run_benchmark(config: BenchmarkConfig) -> BenchmarkReport:
+    """
+    Run the quiz hot path benchmark.
+
+    Args:
+        config: Benchmark configuration
+
+    Returns:
+        BenchmarkReport with per-stage summaries
+    """
+    if config.selector not in SELECTORS:
+        raise ValueError(f"Unknown selector: {config.selector}. Expected one of {SELECTORS}")
+
+    with _override_settings(
+        BELIEF_SNAPSHOT_ENABLED=False,
+        READING_QUEUE_ENABLED=False,
+        QUESTION_EXCLUSION_CACHE_ENABLED=config.exclusion_cache,
+        QUESTION_SCORING_ENGINE=config.scoring_engine,
+    ), _local_versions():
+        # Synthetic course ids repeat across runs; start with no cached graphs
+        await PrerequisiteGraphService.reset_instance()
+        engine = await _create_engine(config.database_url)
+        try:
+            return await _run(engine, config)
+        finally:
+            await engine.dispose()
+            await PrerequisiteGraphService.reset_instance()
+
+
+async def _run(engine: AsyncEngine, config: BenchmarkConfig) -> BenchmarkReport:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    course = generate_course(config.course)
+
+    seed_start = time.perf_counter()
+    async with session_factory() as db:
+        await seed_course(db, course)
+        learners = []
+        for index in range(config.learners):
+            user_id, enrollment_id = await seed_learner(db, course, index)
+            learner = SimulatedLearner(course, config.bkt, seed=config.course.seed + index)
+            learners.append((user_id, enrollment_id, learner))
+        await db.commit()
+    seed_ms = (time.perf_counter() - seed_start) * 1000
+
+    # Fresh exclusion cache per run, shared across requests like in the API
+    exclusion_cache = QuestionExclusionCache()
+    answers = 0
+    correct = 0
+    wall_start = time.perf_counter()
+
+    with HotPathRecorder(engine, trace_allocations=config.trace_allocations) as recorder:
+        # The API serves questions from the in-process pool cache
+        async with session_factory() as db:
+            with recorder.stage("load_question_pool"):
+                questions = await QuestionRepository(db).get_questions_with_concepts(
+                    course.course_id
+                )
+                pool = [CachedQuestion.from_model(q) for q in questions]
+
+        for user_id, enrollment_id, learner in learners:
+            for _ in range(config.sessions_per_learner):
+                async with session_factory() as db:
+                    session_id = await start_quiz_session(
+                        db, user_id, enrollment_id, config.questions_per_session
+                    )
+                    await db.commit()
+
+                for _ in range(config.questions_per_session):
+                    question = await _select_question(
+                        session_factory, recorder, config, exclusion_cache,
+                        user_id, session_id, pool,
+                    )
+                    if question is None:
+                        break
+
+                    selected_answer, is_correct = learner.answer(question.id)
+                    await _submit_answer(
+                        session_factory, recorder, user_id, session_id,
+                        question.id, selected_answer,
+                    )
+                    answers += 1
+                    correct += int(is_correct)
+
+    return BenchmarkReport(
+        config=asdict(config),
+        seed_ms=round(seed_ms, 1),
+        answers=answers,
+        correct_rate=correct / answers if answers else 0.0,
+        wall_time_s=round(time.perf_counter() - wall_start, 3),
+        stages=recorder.summary(),
+    )
+
+
+async def _select_question(
+    session_factory,
+    recorder: HotPathRecorder,
+    config: BenchmarkConfig,
+    exclusion_cache: QuestionExclusionCache,
+    user_id,
+    session_id,
+    pool: list[CachedQuestion],
+) -> CachedQuestion | None:
+    """Run one next-question request; returns None when the pool is exhausted."""
+    async with session_factory() as db:
+        belief_repo = BeliefRepository(db)
+        selector = await get_question_selector(db=db, exclusion_cache=exclusion_cache)
+
+        with recorder.stage("load_beliefs"):
+            beliefs = await belief_repo.get_beliefs_as_dict(user_id)
+
+        try:
+            with recorder.stage("select"):
+                if config.selector == "adaptive":
+                    gate = MasteryGateService(db, belief_repo, ConceptRepository(db))
+                    question, *_ = await selector.select_next_question_adaptive(
+                        user_id=user_id,
+                        session_id=session_id,
+                        beliefs=beliefs,
+                        available_questions=pool,
+                        mastery_gate_service=gate,
+                    )
+                else:
+                    question, _, _ = await selector.select_next_question(
+                        user_id=user_id,
+                        session_id=session_id,
+                        beliefs=beliefs,
+                        available_questions=pool,
+                    )
+        except ValueError:
+            return None
+        await db.commit()
+        return question
+
+
+async def _submit_answer(
+    session_factory,
+    recorder: HotPathRecorder,
+    user_id,
+    session_id,
+    question_id,
+    selected_answer: str,
+) -> None:
+    """Run one answer submission request."""
+    async with session_factory() as db:
+        service = get_quiz_answer_service(
+            response_repo=ResponseRepository(db),
+            question_repo=QuestionRepository(db),
+            session_repo=QuizSessionRepository(db),
+            user_repo=UserRepository(db),
+            belief_repo=BeliefRepository(db),
+            concept_repo=ConceptRepository(db),
+        )
+        recorder.instrument(service.belief_updater, "update_beliefs")
+
+        with recorder.stage("submit_answer"):
+            await service.submit_answer(
+                user_id=user_id,
+                session_id=session_id,
+                question_id=question_id,
+                selected_answer=selected_answer,
+            )
+        with recorder.stage("commit"):
+            await db.commit()
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark adaptive quiz selection and answer submission"
+    )
+    parser.add_argument(
+        "--size", choices=[*COURSE_SIZES, "all"], default="small",
+        help="Synthetic course size (default: small)",
+    )
+    parser.add_argument("--questions", type=int, help="Override the number of questions")
+    parser.add_argument("--concepts", type=int, help="Override the number of concepts")
+    parser.add_argument(
+        "--prerequisite-density", type=float,
+        help="Average direct prerequisites per concept (default: 1.5)",
+    )
+    parser.add_argument("--learners", type=int, default=5, help="Simulated learners")
+    parser.add_argument("--sessions", type=int, default=2, help="Quiz sessions per learner")
+    parser.add_argument(
+        "--questions-per-session", type=int, default=10, choices=range(10, 16),
+        metavar="{10..15}", help="Questions per session (default: 10)",
+    )
+    parser.add_argument("--selector", choices=SELECTORS, default="bkt")
+    parser.add_argument(
+        "--scoring-engine", choices=("scalar", "vectorized"),
+        default=settings.QUESTION_SCORING_ENGINE,
+    )
+    parser.add_argument(
+        "--no-exclusion-cache", action="store_true",
+        help="Query exclusions without the per-user cache",
+    )
+    parser.add_argument(
+        "--no-allocations", action="store_true",
+        help="Skip allocation tracing (lower overhead latencies)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database-url", default=SQLITE_MEMORY_URL,
+        help="Async database URL of an empty database (default: in-memory SQLite)",
+    )
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def _build_configs(args: argparse.Namespace) -> list[BenchmarkConfig]:
+    sizes = list(COURSE_SIZES) if args.size == "all" else [args.size]
+    configs = []
+    for size in sizes:
+        spec = replace(COURSE_SIZES[size], seed=args.seed)
+        if args.questions:
+            spec = replace(spec, questions=args.questions)
+        if args.concepts:
+            spec = replace(spec, concepts=args.concepts)
+        if args.prerequisite_density is not None:
+            spec = replace(spec, prerequisite_density=args.prerequisite_density)
+        configs.append(BenchmarkConfig(
+            course=spec,
+            learners=args.learners,
+            sessions_per_learner=args.sessions,
+            questions_per_session=args.questions_per_session,
+            selector=args.selector,
+            scoring_engine=args.scoring_engine,
+            exclusion_cache=not args.no_exclusion_cache,
+            trace_allocations=not args.no_allocations,
+            database_url=args.database_url,
+        ))
+    return configs
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    configure_logging(log_level="WARNING", json_logs=False)
+
+    reports = []
+    for config in _build_configs(args):
+        report = await run_benchmark(config)
+        print(report.format_table())
+        print()
+        reports.append(report)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(r) for r in reports], f, indent=2, default=str)
+        print(f"Results written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
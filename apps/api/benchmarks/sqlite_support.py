@@ -0,0 +1,61 @@
+"""
+SQLite support for benchmark databases.
+
+The models target PostgreSQL. For benchmarks that must run without a database
+server, this module renders the PostgreSQL-only column types for SQLite (JSONB
+and ARRAY as JSON, UUID as CHAR(32), matching SQLAlchemy's hex storage of
+UUIDs on dialects without a native type) and provides the md5() function used
+by the question text index.
+"""
+import hashlib
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.compiler import compiles
+
+# Tables used by quiz selection and answer submission
+BENCHMARK_TABLES = (
+    "users",
+    "courses",
+    "enrollments",
+    "concepts",
+    "concept_prerequisites",
+    "questions",
+    "question_concepts",
+    "belief_states",
+    "quiz_sessions",
+    "quiz_responses",
+)
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw) -> str:
+    return "JSON"
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array_sqlite(type_, compiler, **kw) -> str:
+    return "JSON"
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw) -> str:
+    return "CHAR(32)"
+
+
+def _md5(value: str | None) -> str | None:
+    return hashlib.md5(value.encode("utf-8")).hexdigest() if value is not None else None
+
+
+def is_sqlite(engine: AsyncEngine) -> bool:
+    """Check whether an engine targets SQLite."""
+    return engine.dialect.name == "sqlite"
+
+
+def register_sqlite_functions(engine: AsyncEngine) -> None:
+    """Register the PostgreSQL functions used by the schema on each SQLite connection."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        dbapi_connection.create_function("md5", 1, _md5, deterministic=True)
@@ -0,0 +1,347 @@
+"""
+Synthetic courses and simulated learners for benchmarks.
+
+Courses are generated deterministically from a seed: concepts grouped into
+knowledge areas, a prerequisite DAG of configurable density, and questions
+testing one to three concepts of a knowledge area. Learners answer according
+to a BKT ground truth (initial mastery, learning on practice, slip and guess).
+"""
+import random
+from dataclasses import dataclass, field
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.belief_state import BeliefState
+from src.models.concept import Concept
+from src.models.concept_prerequisite import ConceptPrerequisite
+from src.models.course import Course
+from src.models.enrollment import Enrollment
+from src.models.question import Question
+from src.models.question_concept import QuestionConcept
+from src.models.quiz_session import QuizSession
+from src.models.user import User
+
+ANSWER_OPTIONS = ("A", "B", "C", "D")
+
+# Rows per INSERT statement when seeding
+INSERT_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticCourseSpec:
+    """Shape of a synthetic course."""
+    questions: int
+    concepts: int
+    prerequisite_density: float = 1.5  # Average direct prerequisites per concept
+    knowledge_areas: int = 6
+    max_concepts_per_question: int = 3
+    seed: int = 42
+
+
+# Standard sizes (questions / concepts)
+COURSE_SIZES: dict[str, SyntheticCourseSpec] = {
+    "small": SyntheticCourseSpec(questions=100, concepts=50),
+    "medium": SyntheticCourseSpec(questions=1_000, concepts=500),
+    "large": SyntheticCourseSpec(questions=10_000, concepts=5_000),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticQuestion:
+    """Ground-truth parameters of a generated question."""
+    id: UUID
+    knowledge_area_id: str
+    concept_indices: tuple[int, ...]
+    correct_answer: str
+    difficulty: float
+    slip_rate: float
+    guess_rate: float
+
+
+@dataclass
+class SyntheticCourse:
+    """A generated course, ready to be seeded."""
+    spec: SyntheticCourseSpec
+    course_id: UUID
+    knowledge_area_ids: list[str]
+    concept_ids: list[UUID]
+    concept_knowledge_areas: list[str]
+    prerequisites: list[tuple[int, int]]  # (concept index, prerequisite concept index)
+    questions: list[SyntheticQuestion]
+    questions_by_id: dict[UUID, SyntheticQuestion] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.questions_by_id = {q.id: q for q in self.questions}
+
+
+def _uuid(rnd: random.Random) -> UUID:
+    return UUID(int=rnd.getrandbits(128), version=4)
+
+
+def _difficulty_label(difficulty: float) -> str:
+    if difficulty < -1.0:
+        return "Easy"
+    if difficulty > 1.0:
+        return "Hard"
+    return "Medium"
+
+
+def generate_course(spec: SyntheticCourseSpec) -> SyntheticCourse:
+    """
+    Generate a synthetic course.
+
+    Concepts are split into contiguous knowledge areas. Each concept draws a
+    Poisson(prerequisite_density) number of prerequisites from earlier
+    concepts, so the prerequisite graph is acyclic.
+
+    Args:
+        spec: Course shape and seed
+
+    Returns:
+        SyntheticCourse with deterministic IDs
+    """
+    rnd = random.Random(spec.seed)
+    rng = np.random.default_rng(spec.seed)
+
+    knowledge_area_ids = [f"ka-{i + 1}" for i in range(spec.knowledge_areas)]
+    concept_ids = [_uuid(rnd) for _ in range(spec.concepts)]
+    area_of_concept = (np.arange(spec.concepts) * spec.knowledge_areas) // max(spec.concepts, 1)
+    concept_knowledge_areas = [knowledge_area_ids[a] for a in area_of_concept]
+
+    prerequisites: list[tuple[int, int]] = []
+    prerequisite_counts = rng.poisson(spec.prerequisite_density, size=spec.concepts)
+    for index in range(1, spec.concepts):
+        count = min(int(prerequisite_counts[index]), index)
+        for prereq_index in rng.choice(index, size=count, replace=False):
+            prerequisites.append((index, int(prereq_index)))
+
+    concepts_by_area: dict[str, list[int]] = {ka: [] for ka in knowledge_area_ids}
+    for index, ka in enumerate(concept_knowledge_areas):
+        concepts_by_area[ka].append(index)
+    populated_areas = [ka for ka in knowledge_area_ids if concepts_by_area[ka]]
+
+    questions: list[SyntheticQuestion] = []
+    for _ in range(spec.questions):
+        ka = populated_areas[int(rng.integers(len(populated_areas)))]
+        area_concepts = concepts_by_area[ka]
+        # Most questions test a single concept
+        count = min(
+            int(rng.geometric(0.6)), spec.max_concepts_per_question, len(area_concepts)
+        )
+        chosen = rng.choice(area_concepts, size=count, replace=False)
+        questions.append(
+            SyntheticQuestion(
+                id=_uuid(rnd),
+                knowledge_area_id=ka,
+                concept_indices=tuple(int(c) for c in chosen),
+                correct_answer=ANSWER_OPTIONS[int(rng.integers(len(ANSWER_OPTIONS)))],
+                difficulty=float(np.clip(rng.normal(0.0, 1.0), -3.0, 3.0)),
+                slip_rate=float(rng.uniform(0.05, 0.15)),
+                guess_rate=0.25,
+            )
+        )
+
+    return SyntheticCourse(
+        spec=spec,
+        course_id=_uuid(rnd),
+        knowledge_area_ids=knowledge_area_ids,
+        concept_ids=concept_ids,
+        concept_knowledge_areas=concept_knowledge_areas,
+        prerequisites=prerequisites,
+        questions=questions,
+    )
+
+
+async def _insert_rows(db: AsyncSession, model, rows: list[dict]) -> None:
+    """Insert rows with batched executemany statements."""
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(model.__table__.insert(), rows[start:start + INSERT_BATCH_SIZE])
+
+
+async def seed_course(db: AsyncSession, course: SyntheticCourse) -> None:
+    """
+    Insert a synthetic course with its concepts, prerequisites and questions.
+
+    Args:
+        db: Database session (caller commits)
+        course: Generated course
+    """
+    await _insert_rows(db, Course, [{
+        "id": course.course_id,
+        "slug": f"synthetic-{course.course_id.hex[:8]}",
+        "name": "Synthetic Benchmark Course",
+        "knowledge_areas": [
+            {"id": ka, "name": ka.upper(), "short_name": ka.upper(), "display_order": i + 1}
+            for i, ka in enumerate(course.knowledge_area_ids)
+        ],
+    }])
+
+    await _insert_rows(db, Concept, [
+        {
+            "id": concept_id,
+            "course_id": course.course_id,
+            "name": f"Concept {index}",
+            "knowledge_area_id": course.concept_knowledge_areas[index],
+        }
+        for index, concept_id in enumerate(course.concept_ids)
+    ])
+
+    await _insert_rows(db, ConceptPrerequisite, [
+        {
+            "concept_id": course.concept_ids[concept_index],
+            "prerequisite_concept_id": course.concept_ids[prereq_index],
+            "strength": 1.0,
+            "relationship_type": "required",
+        }
+        for concept_index, prereq_index in course.prerequisites
+    ])
+
+    await _insert_rows(db, Question, [
+        {
+            "id": q.id,
+            "course_id": course.course_id,
+            "question_text": f"Synthetic question {q.id}",
+            "options": {option: f"Option {option}" for option in ANSWER_OPTIONS},
+            "correct_answer": q.correct_answer,
+            "explanation": "Synthetic explanation.",
+            "knowledge_area_id": q.knowledge_area_id,
+            "difficulty": q.difficulty,
+            "difficulty_label": _difficulty_label(q.difficulty),
+            "slip_rate": q.slip_rate,
+            "guess_rate": q.guess_rate,
+            # Array columns are left NULL so SQLite can store the rows
+            "perspectives": None,
+            "competencies": None,
+        }
+        for q in course.questions
+    ])
+
+    await _insert_rows(db, QuestionConcept, [
+        {
+            "question_id": q.id,
+            "concept_id": course.concept_ids[concept_index],
+            "relevance": 1.0,
+        }
+        for q in course.questions
+        for concept_index in q.concept_indices
+    ])
+
+
+async def seed_learner(
+    db: AsyncSession,
+    course: SyntheticCourse,
+    learner_index: int,
+) -> tuple[UUID, UUID]:
+    """
+    Insert a user enrolled in the course with uninformative beliefs for every concept.
+
+    Args:
+        db: Database session (caller commits)
+        course: Seeded course
+        learner_index: Index used for deterministic IDs and the email address
+
+    Returns:
+        Tuple of (user_id, enrollment_id)
+    """
+    rnd = random.Random(f"{course.spec.seed}:{learner_index}")
+    user_id = _uuid(rnd)
+    enrollment_id = _uuid(rnd)
+
+    await _insert_rows(db, User, [{
+        "id": user_id,
+        "email": f"learner-{learner_index}-{user_id.hex[:8]}@benchmark.local",
+        "hashed_password": "not-a-real-hash",
+    }])
+    await _insert_rows(db, Enrollment, [{
+        "id": enrollment_id,
+        "user_id": user_id,
+        "course_id": course.course_id,
+    }])
+    await _insert_rows(db, BeliefState, [
+        {"id": _uuid(rnd), "user_id": user_id, "concept_id": concept_id, "alpha": 1.0, "beta": 1.0}
+        for concept_id in course.concept_ids
+    ])
+    return user_id, enrollment_id
+
+
+async def start_quiz_session(
+    db: AsyncSession,
+    user_id: UUID,
+    enrollment_id: UUID,
+    question_target: int,
+) -> UUID:
+    """
+    Insert an active adaptive quiz session.
+
+    Args:
+        db: Database session (caller commits)
+        user_id: Learner UUID
+        enrollment_id: Learner's enrollment UUID
+        question_target: Questions before the session auto-completes (10-15)
+
+    Returns:
+        Session UUID
+    """
+    session = QuizSession(
+        user_id=user_id,
+        enrollment_id=enrollment_id,
+        session_type="adaptive",
+        question_strategy="max_info_gain",
+        question_target=question_target,
+        target_concept_ids=None,
+    )
+    db.add(session)
+    await db.flush()
+    return session.id
+
+
+@dataclass(frozen=True, slots=True)
+class BKTParameters:
+    """Ground-truth learning parameters for simulated learners."""
+    p_init: float = 0.5  # P(concept mastered before the first attempt)
+    p_learn: float = 0.2  # P(unmastered concept becomes mastered after an attempt)
+
+
+class SimulatedLearner:
+    """
+    Learner whose answers follow a BKT ground truth.
+
+    A question is answered correctly with probability 1 - slip when every
+    tested concept is mastered, and with probability guess otherwise. After
+    each attempt, every tested concept not yet mastered is learned with
+    probability p_learn.
+    """
+
+    def __init__(self, course: SyntheticCourse, params: BKTParameters, seed: int):
+        self.course = course
+        self.params = params
+        self.rng = np.random.default_rng(seed)
+        self.mastered = self.rng.random(len(course.concept_ids)) < params.p_init
+
+    def answer(self, question_id: UUID) -> tuple[str, bool]:
+        """
+        Answer a question.
+
+        Args:
+            question_id: Question UUID
+
+        Returns:
+            Tuple of (selected option, whether it is correct)
+        """
+        question = self.course.questions_by_id[question_id]
+        indices = list(question.concept_indices)
+
+        if self.mastered[indices].all():
+            is_correct = self.rng.random() >= question.slip_rate
+        else:
+            is_correct = self.rng.random() < question.guess_rate
+
+        learned = self.rng.random(len(indices)) < self.params.p_learn
+        self.mastered[indices] |= learned
+
+        if is_correct:
+            return question.correct_answer, True
+        wrong = [o for o in ANSWER_OPTIONS if o != question.correct_answer]
+        return wrong[int(self.rng.integers(len(wrong)))], False
@@ -3,8 +3,14 @@ Configuration management using Pydantic settings
 Loads environment variables from .env file
 """
 
+from typing import Literal
+
+import structlog
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
+logger = structlog.get_logger(__name__)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
@@ -41,6 +47,17 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: str | None = None  # For embeddings and LLM calls
+    OPENAI_API_BASE: str | None = None  # e.g. http://localhost:8001/v1 for the mock OpenAI service
+
+    # Embedding Batch Jobs
+    EMBEDDING_MAX_IN_FLIGHT: int = 4  # Concurrent embedding requests per batch job
+    EMBEDDING_TOKENS_PER_MINUTE: int = 1_000_000  # Provider token quota the limiter paces against
+    EMBEDDING_REQUESTS_PER_MINUTE: int = 3000  # Provider request quota the limiter paces against
+
+    # Embedding Cache
+    EMBEDDING_CACHE_ENABLED: bool = False  # Reuse embeddings for unchanged texts across processes
+    EMBEDDING_CACHE_DIR: str = "~/.cache/learnr/embeddings"  # Shared by the API, workers and scripts
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 20000  # Least recently used vectors are evicted beyond this
 
     # JWT
     SECRET_KEY: str = "your-secret-key-for-jwt-signing-change-this-in-production"
@@ -59,6 +76,10 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MINUTE: int = 60
     PASSWORD_RESET_RATE_LIMIT: int = 5
     REGISTRATION_RATE_LIMIT: str = "5/minute"  # Max 5 registration attempts per minute per IP
+    RATE_LIMIT_LOCAL_SHADOW_ENABLED: bool = True  # Admit authenticated requests from a local share of the Redis headroom
+    RATE_LIMIT_LOCAL_SHARE: float = 0.1  # Share of a key's remaining headroom one process may admit without Redis
+    RATE_LIMIT_LOCAL_MAX_AGE_SECONDS: float = 5.0  # Local allowance lifetime before the next Redis check
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000  # Least recently used keys are dropped beyond this
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -70,7 +91,85 @@ class Settings(BaseSettings):
     READING_PRIORITY_LOW_THRESHOLD: float = 0.8  # Competency threshold for low priority
     READING_PRIORITY_HIGH_THRESHOLD: float = 0.6  # Competency threshold for high priority
     READING_HARD_DIFFICULTY_THRESHOLD: float = 0.7  # IRT difficulty threshold for "hard" questions
-    READING_QUEUE_SYNC_MODE: bool = True  # Run reading queue tasks synchronously (no Celery required)
+    READING_QUEUE_ENABLED: bool = True  # Populate the reading queue after each answer submission
+    READING_QUEUE_MODE: Literal["background", "sync", "celery"] = "background"  # "background" (in-process executor), "sync" (inline) or "celery"
+    READING_QUEUE_EXECUTOR_CONCURRENCY: int = 2  # Background jobs run concurrently per API process
+    READING_QUEUE_EXECUTOR_MAX_PENDING: int = 1000  # Queued jobs beyond this are dropped
+    READING_QUEUE_EXECUTOR_DROP_POLICY: Literal["oldest", "newest"] = "oldest"  # Job dropped when the queue is full: "oldest" or "newest"
+    READING_QUEUE_EXECUTOR_DB_POOL_SIZE: int = 2  # DB connections held by the background executor
+    READING_QUEUE_EXECUTOR_DRAIN_SECONDS: int = 10  # Max wait for queued jobs on shutdown
+    READING_QUEUE_SYNC_MODE: bool | None = None  # Deprecated: true maps to READING_QUEUE_MODE=sync, false to celery
+    READING_SEARCH_USE_QUESTION_VECTORS: bool = True  # Search chunks with stored question vectors before live embedding
+    READING_SEARCH_SERVE_FROM_PAYLOAD: bool = False  # Build semantic search results from Qdrant payloads (requires full text_content)
+
+    # Celery Worker Runtime
+    WORKER_RUNTIME_ENABLED: bool = True  # Reuse one event loop, DB pool and API clients per worker process
+    WORKER_DB_POOL_SIZE: int = 2  # DB connections held by each worker process
+
+    # Question Pool Cache
+    QUESTION_POOL_CACHE_ENABLED: bool = True  # Serve next-question from the in-process pool cache
+    QUESTION_POOL_CACHE_FALLBACK_TTL_SECONDS: int = 60  # Max pool age when Redis versioning is unavailable
+
+    # Next Question Prefetch
+    NEXT_QUESTION_PREFETCH_ENABLED: bool = True  # Select the next question for both outcomes while the learner answers
+    NEXT_QUESTION_PREFETCH_MAX_SESSIONS: int = 5000  # Least recently staged sessions are dropped beyond this
+    NEXT_QUESTION_PREFETCH_TTL_SECONDS: int = 1800  # Staged questions older than this are reselected
+
+    # Diagnostic Set Cache
+    DIAGNOSTIC_SETS_ENABLED: bool = True  # Draw diagnostic sessions from precomputed question sets
+    DIAGNOSTIC_SET_VARIANTS: int = 8  # Precomputed selections per course (distinct tie-breaks)
+
+    # Prerequisite Graph
+    PREREQUISITE_GRAPH_CACHE_ENABLED: bool = True  # Resolve prerequisites from the in-process graph, not SQL
+    PREREQUISITE_GRAPH_FALLBACK_TTL_SECONDS: int = 60  # Max graph age when Redis versioning is unavailable
+    PREREQUISITE_CLOSURE_MAX_CONCEPTS: int = 20000  # Larger courses skip the closure matrix (n^2/8 bytes)
+    UNLOCK_DETECTION_ENABLED: bool = True  # Record concept unlock events after each answer submission
+
+    # Belief Snapshot Cache
+    BELIEF_SNAPSHOT_ENABLED: bool = True  # Serve user beliefs from in-process snapshots with write-through
+    BELIEF_SNAPSHOT_MAX_USERS: int = 5000  # Least recently used snapshots are dropped beyond this
+    BELIEF_SNAPSHOT_TTL_SECONDS: int = 1800  # Max snapshot age (covers writes that bypass versioning)
+    BELIEF_SNAPSHOT_FALLBACK_TTL_SECONDS: int = 60  # Max snapshot age when Redis versioning is unavailable
+
+    # Question Exclusion Cache
+    QUESTION_EXCLUSION_CACHE_ENABLED: bool = True  # Cache recently answered questions per user in-process
+    QUESTION_EXCLUSION_CACHE_MAX_USERS: int = 5000  # Least recently used users are dropped beyond this
+    QUESTION_EXCLUSION_CACHE_TTL_SECONDS: int = 1800  # Full reload interval (covers deleted responses)
+
+    # User Cache
+    USER_CACHE_LOCAL_ENABLED: bool = True  # Resolve authenticated users from an in-process LRU before Redis
+    USER_CACHE_LOCAL_MAX_USERS: int = 10000  # Least recently used users are dropped beyond this
+    USER_CACHE_LOCAL_TTL_SECONDS: int = 300  # Max entry age while the invalidation subscriber is connected
+    USER_CACHE_LOCAL_FALLBACK_TTL_SECONDS: int = 10  # Max entry age while the subscriber is disconnected
+
+    # Password Hashing
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # Pool running bcrypt off the event loop: "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4  # Concurrent hash/verify operations per API process
+    PASSWORD_HASH_QUEUE_WARNING_MS: int = 500  # Warn when an operation waits longer for a worker
+
+    # Question Selection
+    QUESTION_SCORING_ENGINE: Literal["scalar", "vectorized"] = "vectorized"  # Info gain scoring engine: "scalar" or "vectorized"
+
+    @model_validator(mode="after")
+    def apply_deprecated_reading_queue_sync_mode(self) -> "Settings":
+        """Map READING_QUEUE_SYNC_MODE onto READING_QUEUE_MODE when only the old setting is given"""
+        if self.READING_QUEUE_SYNC_MODE is None:
+            return self
+        if "READING_QUEUE_MODE" in self.model_fields_set:
+            logger.warning(
+                "deprecated_setting_ignored",
+                setting="READING_QUEUE_SYNC_MODE",
+                replacement="READING_QUEUE_MODE",
+            )
+            return self
+        self.READING_QUEUE_MODE = "sync" if self.READING_QUEUE_SYNC_MODE else "celery"
+        logger.warning(
+            "deprecated_setting",
+            setting="READING_QUEUE_SYNC_MODE",
+            replacement="READING_QUEUE_MODE",
+            reading_queue_mode=self.READING_QUEUE_MODE,
+        )
+        return self
 
     class Config:
         env_file = ".env"
@@ -9,6 +9,7 @@ from uuid import UUID
 from fastapi import Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.db.redis_client import get_redis
 from src.db.session import get_db
 from src.exceptions import RateLimitError
@@ -20,10 +21,29 @@ from src.repositories.question_repository import QuestionRepository
 from src.repositories.quiz_session_repository import QuizSessionRepository
 from src.repositories.response_repository import ResponseRepository
 from src.repositories.user_repository import UserRepository
+from src.services.belief_snapshot_cache import (
+    BeliefSnapshotCache,
+    get_belief_snapshot_cache,
+)
 from src.services.belief_updater import BeliefUpdater
+from src.services.mastery_gate import MasteryGateService
+from src.services.prerequisite_graph_service import (
+    PrerequisiteGraphService,
+    get_prerequisite_graph_service,
+)
+from src.services.question_exclusion_cache import (
+    QuestionExclusionCache,
+    get_question_exclusion_cache,
+)
 from src.services.question_selector import QuestionSelector
 from src.services.quiz_answer_service import QuizAnswerService
 from src.services.quiz_session_service import QuizSessionService
+from src.services.user_cache import (
+    deserialize_user,
+    get_user_cache,
+    serialize_user,
+    user_cache_key,
+)
 from src.utils.auth import decode_token
 from src.utils.rate_limit import check_rate_limit
 
@@ -46,7 +66,9 @@ async def get_current_user(
     Extracts JWT from Authorization header, validates it, and returns User object.
 
     **Security Features:**
-    - Rate limited to 60 requests per minute per IP address
+    - Rate limited to 60 requests per minute per IP address (sliding window,
+      mostly admitted from the process's local share without Redis)
+    - In-process user cache (pub/sub invalidated) in front of Redis
     - Redis-based token caching (5-minute TTL) to reduce database load
     - Generic error messages to prevent user enumeration
 
@@ -70,7 +92,8 @@ async def get_current_user(
         is_allowed, retry_after = await check_rate_limit(
             rate_limit_key,
             AUTH_RATE_LIMIT,
-            AUTH_RATE_WINDOW
+            AUTH_RATE_WINDOW,
+            local=settings.RATE_LIMIT_LOCAL_SHADOW_ENABLED,
         )
 
         if not is_allowed:
@@ -131,8 +154,15 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
 
-    # Check Redis cache first (PERF-001 fix)
-    cache_key = f"user_cache:{str(user_id)}"
+    # Check the in-process user cache first (no Redis round-trip on a hit)
+    user_cache = await get_user_cache() if settings.USER_CACHE_LOCAL_ENABLED else None
+    if user_cache is not None:
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
+
+    # Check Redis cache next (PERF-001 fix)
+    cache_key = user_cache_key(user_id)
     redis = None
 
     try:
@@ -142,10 +172,9 @@ async def get_current_user(
         if cached_user_data:
             # Cache hit: deserialize and return user
             user_dict = json.loads(cached_user_data)
-            # Convert id back to UUID (was serialized as string for JSON)
-            if "id" in user_dict and isinstance(user_dict["id"], str):
-                user_dict["id"] = UUID(user_dict["id"])
-            user = User(**user_dict)
+            if user_cache is not None:
+                user_cache.put(user_id, user_dict)
+            user = deserialize_user(user_dict)
             logger.debug(f"Cache hit for user {user_id}")
             return user
     except Exception as e:
@@ -164,23 +193,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Serialize user to JSON-compatible dict for caching
+    user_dict = serialize_user(user)
+    if user_cache is not None:
+        user_cache.put(user_id, user_dict)
+
     # Cache the user data in Redis (5-minute TTL)
     if redis:
         try:
-            # Serialize user to JSON for caching
-            user_dict = {
-                "id": str(user.id),
-                "email": user.email,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
-                "exam_date": user.exam_date.isoformat() if user.exam_date else None,
-                "target_score": user.target_score,
-                "daily_study_time": user.daily_study_time,
-                "knowledge_level": user.knowledge_level,
-                "motivation": user.motivation,
-                "referral_source": user.referral_source,
-                "is_admin": user.is_admin,
-                "dark_mode": user.dark_mode
-            }
             await redis.setex(cache_key, USER_CACHE_TTL, json.dumps(user_dict))
             logger.debug(f"Cached user {user_id} for {USER_CACHE_TTL} seconds")
         except Exception as e:
@@ -292,8 +312,9 @@ def get_belief_repository(
     return BeliefRepository(db)
 
 
-def get_question_selector(
+async def get_question_selector(
     db: AsyncSession = Depends(get_db),
+    exclusion_cache: QuestionExclusionCache = Depends(get_question_exclusion_cache),
 ) -> QuestionSelector:
     """
     Dependency for QuestionSelector.
@@ -305,6 +326,8 @@ def get_question_selector(
         recency_window_days=7,
         prerequisite_weight=0.2,
         min_info_gain_threshold=0.01,
+        scoring_engine=settings.QUESTION_SCORING_ENGINE,
+        exclusion_cache=exclusion_cache if settings.QUESTION_EXCLUSION_CACHE_ENABLED else None,
     )
 
 
@@ -336,6 +359,8 @@ def get_quiz_answer_service(
     user_repo: UserRepository = Depends(get_user_repository),
     belief_repo: BeliefRepository = Depends(get_belief_repository),
     concept_repo: ConceptRepository = Depends(get_concept_repository),
+    prerequisite_graph: PrerequisiteGraphService = Depends(get_prerequisite_graph_service),
+    belief_snapshots: BeliefSnapshotCache = Depends(get_belief_snapshot_cache),
 ) -> QuizAnswerService:
     """
     Dependency for QuizAnswerService.
@@ -343,13 +368,25 @@ def get_quiz_answer_service(
     Provides the answer submission service with all required repositories
     and the belief updater for Bayesian knowledge tracing.
     Story 4.7: Added user_repo for quiz completion stats.
+    Story 4.11: Added mastery gate for unlock detection.
     """
+    graph = prerequisite_graph if settings.PREREQUISITE_GRAPH_CACHE_ENABLED else None
+    mastery_gate = None
+    if settings.UNLOCK_DETECTION_ENABLED:
+        mastery_gate = MasteryGateService(
+            session=belief_repo.session,
+            belief_repository=belief_repo,
+            concept_repository=concept_repo,
+            belief_snapshots=belief_snapshots if settings.BELIEF_SNAPSHOT_ENABLED else None,
+            prerequisite_graph=graph,
+        )
     belief_updater = BeliefUpdater(
         belief_repository=belief_repo,
         concept_repository=concept_repo,
         default_slip=0.10,
         default_guess=0.25,
         prerequisite_propagation=0.3,
+        prerequisite_graph=graph,
     )
     return QuizAnswerService(
         response_repo=response_repo,
@@ -357,12 +394,14 @@ def get_quiz_answer_service(
         session_repo=session_repo,
         user_repo=user_repo,
         belief_updater=belief_updater,
+        mastery_gate=mastery_gate,
     )
 
 
 def get_belief_updater(
     belief_repo: BeliefRepository = Depends(get_belief_repository),
     concept_repo: ConceptRepository = Depends(get_concept_repository),
+    prerequisite_graph: PrerequisiteGraphService = Depends(get_prerequisite_graph_service),
 ) -> BeliefUpdater:
     """
     Dependency for BeliefUpdater.
@@ -376,4 +415,7 @@ def get_belief_updater(
         default_slip=0.10,
         default_guess=0.25,
         prerequisite_propagation=0.3,
+        prerequisite_graph=(
+            prerequisite_graph if settings.PREREQUISITE_GRAPH_CACHE_ENABLED else None
+        ),
     )
@@ -55,6 +55,13 @@ from src.routes import (
     review,
     users,
 )
+from src.services.next_question_prefetch import NextQuestionPrefetcher
+from src.services.password_hasher import PasswordHasher
+from src.services.user_cache import UserCache
+from src.tasks.reading_queue_executor import (
+    get_reading_queue_executor,
+    shutdown_reading_queue_executor,
+)
 from src.utils.rate_limiter import limiter
 
 
@@ -97,8 +104,35 @@ async def lifespan(app: FastAPI):
         print(f"✗ Qdrant connection failed: {e}")
         raise
 
+    # Startup: Background executor for reading queue population
+    if settings.READING_QUEUE_ENABLED and settings.READING_QUEUE_MODE == "background":
+        get_reading_queue_executor().start()
+        print("✓ Reading queue executor started")
+
+    # Startup: Password hashing pool and the dummy hash for unknown-user logins
+    await PasswordHasher.get_instance()
+    print("✓ Password hasher ready")
+
+    # Startup: Subscribe to user cache invalidations
+    if settings.USER_CACHE_LOCAL_ENABLED:
+        (await UserCache.get_instance()).start_listener()
+        print("✓ User cache invalidation subscriber started")
+
     yield
 
+    # Shutdown: Drain queued reading queue jobs (before their clients close)
+    await shutdown_reading_queue_executor()
+    print("✓ Reading queue executor drained")
+
+    # Shutdown: Cancel speculative next-question selections
+    await NextQuestionPrefetcher.reset_instance()
+
+    # Shutdown: Stop the password hashing pool
+    await PasswordHasher.reset_instance()
+
+    # Shutdown: Stop the user cache subscriber (before Redis closes)
+    await UserCache.reset_instance()
+
     # Shutdown: Close Redis connection
     await close_redis()
     print("✓ Redis connection closed")
@@ -4,7 +4,7 @@ Implements repository pattern for data access with multi-course support.
 """
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, text, update
+from sqlalchemy import delete, func, select, text, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.concept import Concept
@@ -234,6 +234,28 @@ class ConceptRepository:
         )
         return list(result.scalars().all())
 
+    async def get_prerequisites_for_concepts(
+        self, concept_ids: list[UUID]
+    ) -> list[ConceptPrerequisite]:
+        """
+        Get direct prerequisite relationships for multiple concepts in a single query.
+
+        Args:
+            concept_ids: List of dependent Concept UUIDs
+
+        Returns:
+            List of ConceptPrerequisite models whose concept_id is in concept_ids
+        """
+        if not concept_ids:
+            return []
+
+        result = await self.session.execute(
+            select(ConceptPrerequisite).where(
+                ConceptPrerequisite.concept_id.in_(concept_ids)
+            )
+        )
+        return list(result.scalars().all())
+
     async def get_prerequisites_with_strength(
         self, concept_id: UUID
     ) -> list[tuple[Concept, float, str]]:
@@ -342,6 +364,29 @@ class ConceptRepository:
         )
         return list(result.scalars().all())
 
+    async def get_dependents_for_concepts(
+        self, prerequisite_ids: list[UUID]
+    ) -> list[ConceptPrerequisite]:
+        """
+        Get dependent relationships for multiple prerequisites in a single query.
+
+        Args:
+            prerequisite_ids: List of prerequisite Concept UUIDs
+
+        Returns:
+            List of ConceptPrerequisite models whose prerequisite_concept_id
+            is in prerequisite_ids
+        """
+        if not prerequisite_ids:
+            return []
+
+        result = await self.session.execute(
+            select(ConceptPrerequisite).where(
+                ConceptPrerequisite.prerequisite_concept_id.in_(prerequisite_ids)
+            )
+        )
+        return list(result.scalars().all())
+
     async def add_prerequisite(
         self,
         concept_id: UUID,
@@ -396,6 +441,63 @@ class ConceptRepository:
         await self.session.flush()
         return len(db_prereqs)
 
+    async def update_prerequisites(
+        self, prerequisites: list[PrerequisiteCreate]
+    ) -> int:
+        """
+        Bulk update strength and relationship type of existing prerequisites.
+
+        Args:
+            prerequisites: PrerequisiteCreate schemas identifying existing
+                relationships by (concept_id, prerequisite_concept_id)
+
+        Returns:
+            Number of prerequisites updated
+        """
+        if not prerequisites:
+            return 0
+
+        # ORM bulk UPDATE by primary key (one executemany statement)
+        await self.session.execute(
+            update(ConceptPrerequisite),
+            [
+                {
+                    "concept_id": p.concept_id,
+                    "prerequisite_concept_id": p.prerequisite_concept_id,
+                    "strength": p.strength,
+                    "relationship_type": p.relationship_type.value,
+                }
+                for p in prerequisites
+            ],
+        )
+        await self.session.flush()
+        return len(prerequisites)
+
+    async def delete_prerequisites(
+        self, pairs: list[tuple[UUID, UUID]]
+    ) -> int:
+        """
+        Delete specific prerequisite relationships.
+
+        Args:
+            pairs: List of (concept_id, prerequisite_concept_id) tuples
+
+        Returns:
+            Number of prerequisites deleted
+        """
+        if not pairs:
+            return 0
+
+        result = await self.session.execute(
+            delete(ConceptPrerequisite).where(
+                tuple_(
+                    ConceptPrerequisite.concept_id,
+                    ConceptPrerequisite.prerequisite_concept_id,
+                ).in_(pairs)
+            )
+        )
+        return result.rowcount
+
     async def get_root_concepts(self, course_id: UUID) -> list[Concept]:
         """
         Get concepts with no prerequisites (foundational concepts).
@@ -4,7 +4,7 @@ Follows the repository pattern for question-related database operations.
 Supports multi-course architecture.
 """
 import logging
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
@@ -13,6 +13,7 @@ from sqlalchemy.orm import selectinload
 
 from ..models.question import Question
 from ..models.question_concept import QuestionConcept
+from ..utils.content_version import bump_course_content_version
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +30,52 @@ class QuestionRepository:
         """
         self.db = db
 
-    async def create_question(self, question_data: dict) -> Question:
+    async def _get_course_ids_for_questions(self, question_ids: list[UUID]) -> set[UUID]:
+        """
+        Get the distinct course IDs owning a set of questions.
+
+        Args:
+            question_ids: List of question UUIDs
+
+        Returns:
+            Set of course UUIDs
+        """
+        if not question_ids:
+            return set()
+
+        result = await self.db.execute(
+            select(Question.course_id)
+            .where(Question.id.in_(question_ids))
+            .distinct()
+        )
+        return {row[0] for row in result.all()}
+
+    async def _bump_content_versions(self, course_ids: set[UUID]) -> None:
+        """
+        Bump the content version of each course whose question bank changed.
+
+        Invalidates in-process question pool caches on every API worker.
+
+        Args:
+            course_ids: Set of course UUIDs
+        """
+        for course_id in course_ids:
+            await bump_course_content_version(course_id)
+
+    async def create_question(
+        self,
+        question_data: dict,
+        bump_version: bool = False,
+    ) -> Question:
         """
         Create a single question.
 
+        Row-by-row callers (e.g. importers) should leave bump_version off and
+        call bump_course_content_version once after the last row.
+
         Args:
             question_data: Dictionary with question fields (must include course_id)
+            bump_version: Bump the course content version after the insert
 
         Returns:
             Created Question instance
@@ -48,6 +89,8 @@ class QuestionRepository:
             await self.db.commit()
             await self.db.refresh(question)
             logger.info(f"Created question: {question.id}")
+            if bump_version:
+                await self._bump_content_versions({question.course_id})
             return question
         except SQLAlchemyError as e:
             logger.error(f"Failed to create question: {str(e)}")
@@ -78,7 +121,8 @@ class QuestionRepository:
                 await self.db.flush()
                 count = len(question_objects)
                 logger.info(f"Bulk inserted {count} questions")
-                return count
+            await self._bump_content_versions({q["course_id"] for q in questions})
+            return count
         except IntegrityError:
             # Duplicate detected - fall back to one-by-one insert
             await self.db.rollback()
@@ -103,6 +147,8 @@ class QuestionRepository:
 
             await self.db.commit()
             logger.info(f"Inserted {inserted_count} questions, skipped {skipped_count} duplicates")
+            if inserted_count:
+                await self._bump_content_versions({q["course_id"] for q in questions})
             return inserted_count
         except SQLAlchemyError as e:
             logger.error(f"Bulk insert failed: {str(e)}")
@@ -515,15 +561,22 @@ class QuestionRepository:
         self,
         question_id: UUID,
         concept_id: UUID,
-        relevance: float = 1.0
+        relevance: float = 1.0,
+        bump_version: bool = False,
+        course_id: UUID | None = None,
     ) -> QuestionConcept:
         """
         Add a single question-concept mapping.
 
+        Row-by-row callers (e.g. importers) should leave bump_version off and
+        call bump_course_content_version once after the last row.
+
         Args:
             question_id: Question UUID
             concept_id: Concept UUID
             relevance: Relevance score (0.0-1.0)
+            bump_version: Bump the course content version after the insert
+            course_id: Course owning the question (looked up if not given)
 
         Returns:
             Created QuestionConcept instance
@@ -536,6 +589,13 @@ class QuestionRepository:
         self.db.add(mapping)
         await self.db.commit()
         await self.db.refresh(mapping)
+        if bump_version:
+            course_ids = (
+                {course_id}
+                if course_id is not None
+                else await self._get_course_ids_for_questions([question_id])
+            )
+            await self._bump_content_versions(course_ids)
         return mapping
 
     async def bulk_add_concept_mappings(
@@ -556,12 +616,88 @@ class QuestionRepository:
             self.db.add_all(mapping_objects)
             await self.db.commit()
             logger.info(f"Bulk inserted {len(mapping_objects)} concept mappings")
+            await self._bump_content_versions(
+                await self._get_course_ids_for_questions(
+                    list({m["question_id"] for m in mappings})
+                )
+            )
             return len(mapping_objects)
         except SQLAlchemyError as e:
             logger.error(f"Failed to bulk insert concept mappings: {str(e)}")
             await self.db.rollback()
             raise
 
+    async def create_questions_with_mappings(
+        self,
+        questions: list[dict],
+        concept_mappings: list[list[dict]],
+    ) -> list[tuple[UUID, int]]:
+        """
+        Insert a batch of questions and their concept mappings in one transaction.
+
+        Tries the whole batch first. If a duplicate is detected, falls back to
+        one savepoint per question so duplicates (and their mappings) are
+        skipped while the rest of the batch is still committed.
+
+        Args:
+            questions: List of question dictionaries (must include course_id)
+            concept_mappings: Per question, a list of dicts with concept_id and relevance
+
+        Returns:
+            (question_id, mapping_count) for each inserted question, in input order
+
+        Raises:
+            SQLAlchemyError: If transaction fails (non-duplicate errors)
+        """
+        def build(question_data: dict, mappings: list[dict]) -> tuple[Question, list[QuestionConcept]]:
+            question = Question(id=uuid4(), **question_data)
+            links = [QuestionConcept(question_id=question.id, **m) for m in mappings]
+            return question, links
+
+        try:
+            try:
+                built = [
+                    build(question_data, mappings)
+                    for question_data, mappings in zip(questions, concept_mappings, strict=True)
+                ]
+                for question, links in built:
+                    self.db.add(question)
+                    self.db.add_all(links)
+                await self.db.flush()
+                inserted = [(question.id, len(links)) for question, links in built]
+                await self.db.commit()
+            except IntegrityError:
+                # Duplicate detected - fall back to one savepoint per question
+                await self.db.rollback()
+                logger.warning("Duplicate questions detected, inserting batch individually...")
+
+                inserted = []
+                for question_data, mappings in zip(questions, concept_mappings, strict=True):
+                    try:
+                        async with self.db.begin_nested():
+                            question, links = build(question_data, mappings)
+                            self.db.add(question)
+                            self.db.add_all(links)
+                            await self.db.flush()
+                        inserted.append((question.id, len(links)))
+                    except IntegrityError:
+                        q_text = question_data.get('question_text', '')[:50]
+                        logger.debug(f"Skipped duplicate: {q_text}...")
+
+                await self.db.commit()
+                logger.info(
+                    f"Inserted {len(inserted)} questions, "
+                    f"skipped {len(questions) - len(inserted)} duplicates"
+                )
+        except SQLAlchemyError as e:
+            logger.error(f"Batch insert failed: {str(e)}")
+            await self.db.rollback()
+            raise
+
+        if inserted:
+            await self._bump_content_versions({q["course_id"] for q in questions})
+        return inserted
+
     async def get_concept_mappings_for_question(
         self,
         question_id: UUID
@@ -623,6 +759,10 @@ class QuestionRepository:
             .where(QuestionConcept.question_id == question_id)
         )
         await self.db.commit()
+        if result.rowcount:
+            await self._bump_content_versions(
+                await self._get_course_ids_for_questions([question_id])
+            )
         return result.rowcount
 
     # =====================================
@@ -644,12 +784,14 @@ class QuestionRepository:
         if not question_ids:
             return 0
 
+        course_ids = await self._get_course_ids_for_questions(question_ids)
         result = await self.db.execute(
             delete(Question)
             .where(Question.id.in_(question_ids))
         )
         await self.db.commit()
         logger.info(f"Deleted {result.rowcount} questions")
+        await self._bump_content_versions(course_ids)
         return result.rowcount
 
     async def deactivate_questions_by_ids(self, question_ids: list[UUID]) -> int:
@@ -667,6 +809,7 @@ class QuestionRepository:
         if not question_ids:
             return 0
 
+        course_ids = await self._get_course_ids_for_questions(question_ids)
         result = await self.db.execute(
             update(Question)
             .where(Question.id.in_(question_ids))
@@ -674,6 +817,7 @@ class QuestionRepository:
         )
         await self.db.commit()
         logger.info(f"Deactivated {result.rowcount} questions")
+        await self._bump_content_versions(course_ids)
         return result.rowcount
 
     # =====================================
@@ -84,6 +84,26 @@ class ReadingChunkRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, chunk_ids: list[UUID]) -> list[ReadingChunk]:
+        """
+        Get multiple reading chunks by their UUIDs in a single query.
+
+        Args:
+            chunk_ids: List of ReadingChunk UUIDs (e.g., ranked search results)
+
+        Returns:
+            List of ReadingChunk models in the order of chunk_ids
+            (may be fewer than input if some IDs don't exist)
+        """
+        if not chunk_ids:
+            return []
+
+        result = await self.session.execute(
+            select(ReadingChunk).where(ReadingChunk.id.in_(chunk_ids))
+        )
+        chunks_by_id = {chunk.id: chunk for chunk in result.scalars().all()}
+        return [chunks_by_id[cid] for cid in dict.fromkeys(chunk_ids) if cid in chunks_by_id]
+
     async def get_all_chunks(self, course_id: UUID) -> list[ReadingChunk]:
         """
         Get all reading chunks for a course.
@@ -8,6 +8,7 @@ import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.db.redis_client import get_redis
 from src.db.session import get_db
 from src.dependencies import get_current_user
@@ -20,6 +21,10 @@ from src.schemas.coverage import (
     CoverageReport,
     GapConceptList,
 )
+from src.services.belief_snapshot_cache import (
+    BeliefSnapshotCache,
+    get_belief_snapshot_cache,
+)
 from src.services.coverage_analyzer import CoverageAnalyzer
 
 logger = structlog.get_logger(__name__)
@@ -47,6 +52,7 @@ async def get_coverage_analyzer(
     belief_repo: BeliefRepository = Depends(get_belief_repository),
     concept_repo: ConceptRepository = Depends(get_concept_repository),
     course_repo: CourseRepository = Depends(get_course_repository),
+    belief_snapshots: BeliefSnapshotCache = Depends(get_belief_snapshot_cache),
 ) -> CoverageAnalyzer:
     """Dependency for CoverageAnalyzer with Redis caching."""
     redis = await get_redis()
@@ -55,6 +61,7 @@ async def get_coverage_analyzer(
         concept_repository=concept_repo,
         course_repository=course_repo,
         redis_client=redis,
+        belief_snapshots=belief_snapshots if settings.BELIEF_SNAPSHOT_ENABLED else None,
     )
 
 
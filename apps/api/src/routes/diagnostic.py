@@ -12,6 +12,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.db.redis_client import get_redis
 from src.db.session import get_db
 from src.dependencies import get_current_user
@@ -45,6 +46,8 @@ from src.services.belief_updater import BeliefUpdater
 from src.services.diagnostic_results_service import DiagnosticResultsService
 from src.services.diagnostic_service import DiagnosticService
 from src.services.diagnostic_session_service import DiagnosticSessionService
+from src.services.diagnostic_set_cache import DiagnosticSetCache, get_diagnostic_set_cache
+from src.services.question_pool_cache import QuestionPoolCache, get_question_pool_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -67,9 +70,16 @@ def get_concept_repository(db: AsyncSession = Depends(get_db)) -> ConceptReposit
 def get_diagnostic_service(
     question_repo: QuestionRepository = Depends(get_question_repository),
     concept_repo: ConceptRepository = Depends(get_concept_repository),
+    question_pool: QuestionPoolCache = Depends(get_question_pool_cache),
+    diagnostic_sets: DiagnosticSetCache = Depends(get_diagnostic_set_cache),
 ) -> DiagnosticService:
     """Dependency for DiagnosticService."""
-    return DiagnosticService(question_repo, concept_repo)
+    return DiagnosticService(
+        question_repo,
+        concept_repo,
+        question_pool=question_pool if settings.QUESTION_POOL_CACHE_ENABLED else None,
+        diagnostic_sets=diagnostic_sets if settings.DIAGNOSTIC_SETS_ENABLED else None,
+    )
 
 
 def get_belief_repository(db: AsyncSession = Depends(get_db)) -> BeliefRepository:
@@ -8,6 +8,7 @@ import structlog
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.db.session import get_db
 from src.dependencies import get_current_user
 from src.models.user import User
@@ -19,7 +20,15 @@ from src.schemas.mastery_gate import (
     OverrideAttemptResponse,
     RecentUnlocksResponse,
 )
+from src.services.belief_snapshot_cache import (
+    BeliefSnapshotCache,
+    get_belief_snapshot_cache,
+)
 from src.services.mastery_gate import MasteryGateService
+from src.services.prerequisite_graph_service import (
+    PrerequisiteGraphService,
+    get_prerequisite_graph_service,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -28,6 +37,8 @@ router = APIRouter(prefix="/concepts", tags=["prerequisites"])
 
 def get_mastery_gate_service(
     session: AsyncSession = Depends(get_db),
+    belief_snapshots: BeliefSnapshotCache = Depends(get_belief_snapshot_cache),
+    prerequisite_graph: PrerequisiteGraphService = Depends(get_prerequisite_graph_service),
 ) -> MasteryGateService:
     """Dependency to get MasteryGateService instance."""
     belief_repo = BeliefRepository(session)
@@ -36,6 +47,10 @@ def get_mastery_gate_service(
         session=session,
         belief_repository=belief_repo,
         concept_repository=concept_repo,
+        belief_snapshots=belief_snapshots if settings.BELIEF_SNAPSHOT_ENABLED else None,
+        prerequisite_graph=(
+            prerequisite_graph if settings.PREREQUISITE_GRAPH_CACHE_ENABLED else None
+        ),
     )
 
 
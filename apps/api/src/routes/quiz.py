@@ -14,6 +14,7 @@ from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.db.session import get_db
 from src.dependencies import (
     get_active_enrollment,
@@ -50,6 +51,15 @@ from src.schemas.quiz_session import (
     QuizSessionType,
     TargetProgress,
 )
+from src.services.belief_snapshot_cache import (
+    BeliefSnapshotCache,
+    get_belief_snapshot_cache,
+)
+from src.services.next_question_prefetch import (
+    NextQuestionPrefetcher,
+    get_next_question_prefetcher,
+)
+from src.services.question_pool_cache import QuestionPoolCache, get_question_pool_cache
 from src.services.question_selector import QuestionSelector
 from src.services.quiz_answer_service import QuizAnswerService
 from src.services.quiz_session_service import QuizSessionService
@@ -754,6 +764,9 @@ async def get_next_question(
     question_selector: QuestionSelector = Depends(get_question_selector),
     question_repo: QuestionRepository = Depends(get_question_repository),
     belief_repo: BeliefRepository = Depends(get_belief_repository),
+    question_pool: QuestionPoolCache = Depends(get_question_pool_cache),
+    belief_snapshots: BeliefSnapshotCache = Depends(get_belief_snapshot_cache),
+    prefetcher: NextQuestionPrefetcher = Depends(get_next_question_prefetcher),
 ) -> QuestionSelectionResponse:
     """
     Get the next question for an active quiz session.
@@ -769,6 +782,10 @@ async def get_next_question(
     - max_uncertainty: Select question testing most uncertain concepts
     - prerequisite_first: Prioritize foundational concepts
     - balanced: Balance across all knowledge areas
+
+    While the learner answers, the next question is selected for both answer
+    outcomes in the background; the matching one is served without running
+    selection again if the session is unchanged.
     """
     # Validate session exists and belongs to user
     try:
@@ -812,14 +829,17 @@ async def get_next_question(
             },
         )
 
-    # Load user beliefs
-    beliefs = await belief_repo.get_beliefs_as_dict(current_user.id)
-
-    # Load available questions with concepts eager-loaded
-    # Get course_id from enrollment
-    available_questions = await question_repo.get_questions_with_concepts(
-        enrollment.course_id
-    )
+    # Load available questions with concepts for the enrollment's course.
+    # The pool cache serves immutable records and only reloads when the
+    # course content version changes.
+    pool = None
+    if settings.QUESTION_POOL_CACHE_ENABLED:
+        pool = await question_pool.get_questions(enrollment.course_id, question_repo)
+        available_questions = list(pool)
+    else:
+        available_questions = await question_repo.get_questions_with_concepts(
+            enrollment.course_id
+        )
 
     if not available_questions:
         raise HTTPException(
@@ -854,55 +874,85 @@ async def get_next_question(
         focus_target_type = "concept"
         focus_target_id = ",".join(str(cid) for cid in target_concept_ids)
 
-    # Select next question with focused filters
-    focus_expanded = False
-    try:
-        question, info_gain, metadata = await question_selector.select_next_question(
-            user_id=current_user.id,
-            session_id=session.id,
-            beliefs=beliefs,
-            available_questions=available_questions,
-            strategy=strategy,
-            knowledge_area_filter=knowledge_area_filter,
-            target_concept_ids=target_concept_ids,
-        )
-
-        # Handle focused session exhaustion - fallback to wider selection
-        if question is None and metadata.get("exhausted"):
-            logger.info(
-                "focused_session_expanded",
-                session_id=str(session.id),
-                focus_type=focus_target_type,
-                target_id=focus_target_id,
-                reason="focused_pool_exhausted",
-            )
-            focus_expanded = True
-
-            # Retry without focused filters
+    # Serve the question staged while the learner answered the previous one.
+    # Staged questions come from the cached pool, so prefetch needs it.
+    prefetch_enabled = settings.NEXT_QUESTION_PREFETCH_ENABLED and pool is not None
+    staged = None
+    if prefetch_enabled:
+        staged = prefetcher.take(session.id, session.total_questions, strategy, pool)
+
+    # Load user beliefs. The snapshot cache reads Postgres once per user and
+    # is kept current by write-through from answer submission. A staged hit
+    # still needs them to stage the question after this one.
+    if settings.BELIEF_SNAPSHOT_ENABLED:
+        beliefs = await belief_snapshots.get_beliefs(current_user.id, belief_repo)
+    else:
+        beliefs = await belief_repo.get_beliefs_as_dict(current_user.id)
+
+    if staged is not None:
+        question, info_gain, focus_expanded = staged
+    else:
+        # Select next question with focused filters
+        focus_expanded = False
+        try:
             question, info_gain, metadata = await question_selector.select_next_question(
                 user_id=current_user.id,
                 session_id=session.id,
                 beliefs=beliefs,
                 available_questions=available_questions,
                 strategy=strategy,
-                knowledge_area_filter=None,
-                target_concept_ids=None,
+                knowledge_area_filter=knowledge_area_filter,
+                target_concept_ids=target_concept_ids,
             )
 
-            if question is None:
-                raise ValueError("No questions available after expanding focus")
+            # Handle focused session exhaustion - fallback to wider selection
+            if question is None and metadata.get("exhausted"):
+                logger.info(
+                    "focused_session_expanded",
+                    session_id=str(session.id),
+                    focus_type=focus_target_type,
+                    target_id=focus_target_id,
+                    reason="focused_pool_exhausted",
+                )
+                focus_expanded = True
+
+                # Retry without focused filters
+                question, info_gain, metadata = await question_selector.select_next_question(
+                    user_id=current_user.id,
+                    session_id=session.id,
+                    beliefs=beliefs,
+                    available_questions=available_questions,
+                    strategy=strategy,
+                    knowledge_area_filter=None,
+                    target_concept_ids=None,
+                )
+
+                if question is None:
+                    raise ValueError("No questions available after expanding focus")
+
+        except ValueError as e:
+            error_msg = str(e)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": {
+                        "code": "NO_QUESTIONS_AVAILABLE",
+                        "message": error_msg,
+                    }
+                },
+            ) from e
 
-    except ValueError as e:
-        error_msg = str(e)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": {
-                    "code": "NO_QUESTIONS_AVAILABLE",
-                    "message": error_msg,
-                }
-            },
-        ) from e
+    # Start selecting the question after this one while the learner answers
+    if prefetch_enabled:
+        prefetcher.stage(
+            user_id=current_user.id,
+            session=session,
+            question=question,
+            strategy=strategy,
+            pool=pool,
+            question_selector=question_selector,
+            beliefs=beliefs,
+        )
 
     # Get concept names for the response
     concept_names = []
@@ -943,6 +993,7 @@ async def get_next_question(
         strategy=strategy,
         progress=f"{current_question_number}/{question_target}",
         focus_expanded=focus_expanded,
+        prefetched=staged is not None,
     )
 
     return QuestionSelectionResponse(
@@ -981,6 +1032,7 @@ async def submit_answer(
     current_user: User = Depends(get_current_user),
     answer_service: QuizAnswerService = Depends(get_quiz_answer_service),
     db: AsyncSession = Depends(get_db),
+    prefetcher: NextQuestionPrefetcher = Depends(get_next_question_prefetcher),
 ) -> AnswerResponse:
     """
     Submit an answer to a quiz question.
@@ -1022,6 +1074,9 @@ async def submit_answer(
                 session_id=str(answer_data.session_id),
             )
 
+        # Pick the prefetched next question matching this outcome
+        prefetcher.resolve(answer_data.session_id, answer_data.question_id, response.is_correct)
+
         return response
 
     except InvalidSessionError as e:
@@ -10,6 +10,7 @@ import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.db.session import get_db
 from src.dependencies import get_current_user
 from src.models.user import User
@@ -26,6 +27,10 @@ from src.schemas.review import (
     ReviewSummaryResponse,
 )
 from src.services.belief_updater import BeliefUpdater
+from src.services.prerequisite_graph_service import (
+    PrerequisiteGraphService,
+    get_prerequisite_graph_service,
+)
 from src.services.review_session_service import ReviewSessionService
 
 logger = structlog.get_logger(__name__)
@@ -35,6 +40,7 @@ router = APIRouter(prefix="/quiz", tags=["Review"])
 
 def get_review_session_service(
     db: AsyncSession = Depends(get_db),
+    prerequisite_graph: PrerequisiteGraphService = Depends(get_prerequisite_graph_service),
 ) -> ReviewSessionService:
     """Dependency injection for ReviewSessionService."""
     review_repo = ReviewSessionRepository(db)
@@ -43,6 +49,9 @@ def get_review_session_service(
     belief_updater = BeliefUpdater(
         belief_repository=belief_repo,
         concept_repository=concept_repo,
+        prerequisite_graph=(
+            prerequisite_graph if settings.PREREQUISITE_GRAPH_CACHE_ENABLED else None
+        ),
     )
     return ReviewSessionService(
         review_repo=review_repo,
@@ -9,6 +9,7 @@ from src.db.session import get_db
 from src.dependencies import get_current_user
 from src.models.user import User
 from src.schemas.user import UserResponse, UserUpdate
+from src.services.user_cache import UserCache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -69,14 +70,9 @@ async def update_user_profile(
     await db.commit()
     await db.refresh(current_user)
 
-    # Invalidate user cache so subsequent requests get fresh data
-    try:
-        from src.db.redis_client import get_redis
-        redis = await get_redis()
-        cache_key = f"user_cache:{str(current_user.id)}"
-        await redis.delete(cache_key)
-    except Exception:
-        # Cache invalidation failure is not critical
-        pass
+    # Invalidate user cache (Redis and every API process's local LRU)
+    # so subsequent requests get fresh data
+    user_cache = await UserCache.get_instance()
+    await user_cache.publish_invalidation(current_user.id)
 
     return UserResponse.model_validate(current_user)
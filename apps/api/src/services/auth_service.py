@@ -18,7 +18,8 @@ from src.models.user import User
 from src.repositories.password_reset_repository import PasswordResetRepository
 from src.repositories.user_repository import UserRepository
 from src.services.email_service import EmailService
-from src.utils.auth import create_access_token, hash_password, verify_password
+from src.services.password_hasher import PasswordHasher
+from src.utils.auth import create_access_token
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +27,22 @@ logger = logging.getLogger(__name__)
 class AuthService:
     """Service for authentication operations."""
 
-    def __init__(self, user_repo: UserRepository, reset_token_repo: PasswordResetRepository = None):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        reset_token_repo: PasswordResetRepository = None,
+        password_hasher: PasswordHasher | None = None,
+    ):
         self.user_repo = user_repo
         self.reset_token_repo = reset_token_repo
         self.email_service = EmailService()
+        self.password_hasher = password_hasher
+
+    async def _get_password_hasher(self) -> PasswordHasher:
+        """Get the injected password hasher, or the process-wide one."""
+        if self.password_hasher is None:
+            self.password_hasher = await PasswordHasher.get_instance()
+        return self.password_hasher
 
     async def register_user(self, email: str, password: str) -> tuple[User, str]:
         """
@@ -50,8 +63,9 @@ class AuthService:
         if existing_user:
             raise ConflictError(f"Email {email} already registered")
 
-        # Hash password
-        hashed_password = hash_password(password)
+        # Hash password (off the event loop)
+        hasher = await self._get_password_hasher()
+        hashed_password = await hasher.hash(password)
 
         # Create user
         user = await self.user_repo.create_user(email, hashed_password)
@@ -87,17 +101,14 @@ class AuthService:
 
         # Timing-safe authentication check
         # Always verify password even if user not found to prevent timing attacks
+        hasher = await self._get_password_hasher()
         if user is None:
             # Perform dummy hash verification to maintain constant timing
-            # Using a valid bcrypt hash to ensure timing is similar to real verification
-            verify_password(
-                "dummy_password_for_timing_safety",
-                "$2b$12$nbnaTwK8eZWPYgqkvl4fV.H.x8xuFE6tbqfZ/DWQdsYJX6Jkqa2VW"
-            )
+            await hasher.verify_dummy(password)
             raise AuthenticationError("Invalid email or password")
 
         # Verify password (bcrypt.verify is timing-safe)
-        if not verify_password(password, user.hashed_password):
+        if not await hasher.verify(password, user.hashed_password):
             raise AuthenticationError("Invalid email or password")
 
         # Generate JWT token (same as registration)
@@ -177,8 +188,9 @@ class AuthService:
         if not user:
             raise TokenInvalidError("Invalid password reset token.")
 
-        # Hash new password
-        hashed_password = hash_password(new_password)
+        # Hash new password (off the event loop)
+        hasher = await self._get_password_hasher()
+        hashed_password = await hasher.hash(new_password)
 
         # Update user password
         user.hashed_password = hashed_password
@@ -16,6 +16,7 @@ from src.models.enrollment import Enrollment
 from src.repositories.belief_repository import BeliefRepository
 from src.repositories.concept_repository import ConceptRepository
 from src.schemas.belief_state import BeliefInitializationStatus, InitializationResult
+from src.services.belief_snapshot_cache import record_belief_updates
 from src.utils.bkt_math import calculate_alpha_beta
 
 # Performance threshold in milliseconds
@@ -196,6 +197,7 @@ class BeliefInitializationService:
 
             # Bulk insert for performance
             created_count = await self.belief_repo.bulk_create(beliefs)
+            await record_belief_updates(self.belief_repo, user_id)
 
             duration_ms = (time.perf_counter() - start_time) * 1000
 
@@ -280,6 +282,7 @@ class BeliefInitializationService:
 
             # Use database function for bulk insert
             created_count = await self.belief_repo.initialize_via_db_function(user_id)
+            await record_belief_updates(self.belief_repo, user_id)
 
             duration_ms = (time.perf_counter() - start_time) * 1000
 
@@ -0,0 +1,470 @@
+"""
+Belief Snapshot Cache Service
+
+Provides a process-wide, per-user snapshot of belief states for question
+selection, prerequisite gating and coverage. Each snapshot stores alpha, beta
+and response_count in compact arrays indexed by concept, so a quiz session
+loads the user's beliefs from Postgres once instead of once per question.
+
+Coherence:
+- BeliefUpdater and ReviewSessionService write their updates through to the
+  local snapshot (record_belief_updates)
+- After the transaction commits, the user's Redis belief version is bumped so
+  snapshots held by other API workers reload on their next read
+- A rolled back transaction drops the local snapshot instead
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.utils.belief_version import bump_user_belief_version, get_user_belief_version
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from src.models.belief_state import BeliefState
+    from src.repositories.belief_repository import BeliefRepository
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys used to publish belief versions after commit
+PENDING_USERS_KEY = "belief_snapshot_pending_users"
+HOOKS_REGISTERED_KEY = "belief_snapshot_hooks_registered"
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotBelief:
+    """
+    Immutable belief record read from a snapshot.
+
+    Exposes the same attribute names as the BeliefState model for every field
+    read by QuestionSelector, MasteryGateService and CoverageAnalyzer.
+    """
+    user_id: UUID
+    concept_id: UUID
+    alpha: float
+    beta: float
+    response_count: int
+
+    @property
+    def mean(self) -> float:
+        """Calculate mean mastery probability: alpha / (alpha + beta)."""
+        return self.alpha / (self.alpha + self.beta)
+
+    @property
+    def confidence(self) -> float:
+        """Calculate confidence level: (alpha + beta) / (alpha + beta + 2)."""
+        total = self.alpha + self.beta
+        return total / (total + 2)
+
+    @property
+    def status(self) -> str:
+        """Classify belief state (same rules as BeliefState.status)."""
+        if self.confidence < 0.7:
+            return "uncertain"
+        if self.mean >= 0.8:
+            return "mastered"
+        if self.mean < 0.5:
+            return "gap"
+        return "borderline"
+
+
+class BeliefSnapshot:
+    """
+    Compact belief arrays for one user at a belief version.
+
+    alpha[i], beta[i] and response_count[i] belong to concept_ids[i].
+    """
+
+    __slots__ = (
+        "user_id",
+        "concept_ids",
+        "concept_index",
+        "alpha",
+        "beta",
+        "response_count",
+        "version",
+        "loaded_at",
+        "_records",
+    )
+
+    def __init__(
+        self,
+        user_id: UUID,
+        concept_ids: tuple[UUID, ...],
+        alpha: np.ndarray,
+        beta: np.ndarray,
+        response_count: np.ndarray,
+        version: int | None,
+    ):
+        self.user_id = user_id
+        self.concept_ids = concept_ids
+        self.concept_index = {cid: i for i, cid in enumerate(concept_ids)}
+        self.alpha = alpha
+        self.beta = beta
+        self.response_count = response_count
+        self.version = version
+        self.loaded_at = time.time()
+        self._records: dict[UUID, SnapshotBelief] | None = None
+
+    @classmethod
+    def from_beliefs(
+        cls,
+        user_id: UUID,
+        beliefs: Iterable["BeliefState"],
+        version: int | None,
+    ) -> "BeliefSnapshot":
+        """Build a snapshot from BeliefState rows."""
+        beliefs = list(beliefs)
+        return cls(
+            user_id=user_id,
+            concept_ids=tuple(b.concept_id for b in beliefs),
+            alpha=np.array([b.alpha for b in beliefs], dtype=np.float64),
+            beta=np.array([b.beta for b in beliefs], dtype=np.float64),
+            response_count=np.array([b.response_count for b in beliefs], dtype=np.int32),
+            version=version,
+        )
+
+    def __len__(self) -> int:
+        return len(self.concept_ids)
+
+    def as_dict(self) -> dict[UUID, SnapshotBelief]:
+        """Get beliefs keyed by concept_id (records are reused until the next write)."""
+        if self._records is None:
+            self._records = {
+                cid: SnapshotBelief(
+                    user_id=self.user_id,
+                    concept_id=cid,
+                    alpha=float(a),
+                    beta=float(b),
+                    response_count=int(n),
+                )
+                for cid, a, b, n in zip(
+                    self.concept_ids,
+                    self.alpha.tolist(),
+                    self.beta.tolist(),
+                    self.response_count.tolist(),
+                    strict=True,
+                )
+            }
+        return self._records
+
+    def apply(self, concept_id: UUID, alpha: float, beta: float, response_count: int) -> bool:
+        """
+        Write an updated belief into the arrays.
+
+        Returns:
+            False if the concept is not part of this snapshot
+        """
+        index = self.concept_index.get(concept_id)
+        if index is None:
+            return False
+        self.alpha[index] = alpha
+        self.beta[index] = beta
+        self.response_count[index] = response_count
+        self._records = None
+        return True
+
+
+class BeliefSnapshotCache:
+    """
+    Process-wide belief snapshot cache keyed by user.
+
+    Provides:
+    - One belief query per user until their beliefs change elsewhere
+    - Write-through of belief updates made by this process
+    - Version-based invalidation via the Redis user belief version
+    - Time-based expiry (and a shorter one when Redis is unavailable)
+    - LRU bound on the number of cached users
+    """
+
+    _instance: Optional["BeliefSnapshotCache"] = None
+    _lock = asyncio.Lock()
+
+    def __init__(
+        self,
+        max_users: int | None = None,
+        ttl_seconds: int | None = None,
+        fallback_ttl_seconds: int | None = None,
+    ):
+        self.max_users = max_users or settings.BELIEF_SNAPSHOT_MAX_USERS
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.BELIEF_SNAPSHOT_TTL_SECONDS
+        )
+        self.fallback_ttl_seconds = (
+            fallback_ttl_seconds
+            if fallback_ttl_seconds is not None
+            else settings.BELIEF_SNAPSHOT_FALLBACK_TTL_SECONDS
+        )
+        self.snapshots: OrderedDict[UUID, BeliefSnapshot] = OrderedDict()
+        self._publish_tasks: set[asyncio.Task] = set()
+
+        # Cache statistics
+        self.hits: int = 0
+        self.misses: int = 0
+        self.write_throughs: int = 0
+        self.invalidations: int = 0
+
+    @classmethod
+    async def get_instance(cls) -> "BeliefSnapshotCache":
+        """Get singleton instance."""
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def reset_instance(cls) -> None:
+        """Reset singleton (for testing)."""
+        async with cls._lock:
+            cls._instance = None
+
+    def _is_fresh(self, snapshot: BeliefSnapshot, version: int | None) -> bool:
+        """Check whether a cached snapshot can be served for the current version."""
+        age = time.time() - snapshot.loaded_at
+        if version is not None and snapshot.version is not None:
+            return snapshot.version == version and age < self.ttl_seconds
+        # Redis unavailable now or at load time: fall back to a short expiry
+        return age < self.fallback_ttl_seconds
+
+    async def get_snapshot(
+        self,
+        user_id: UUID,
+        belief_repository: "BeliefRepository",
+    ) -> BeliefSnapshot:
+        """
+        Get the belief snapshot for a user, loading it on a miss.
+
+        Args:
+            user_id: User UUID
+            belief_repository: Repository used to load beliefs on a miss
+
+        Returns:
+            BeliefSnapshot for the user
+        """
+        # Read the version before loading, so a concurrent commit is never
+        # hidden behind a snapshot tagged with its version
+        version = await get_user_belief_version(user_id)
+
+        snapshot = self.snapshots.get(user_id)
+        if snapshot is not None and self._is_fresh(snapshot, version):
+            self.hits += 1
+            self.snapshots.move_to_end(user_id)
+            return snapshot
+
+        self.misses += 1
+        start_time = time.time()
+        beliefs = await belief_repository.get_beliefs_as_dict(user_id)
+        snapshot = BeliefSnapshot.from_beliefs(user_id, beliefs.values(), version)
+
+        self.snapshots[user_id] = snapshot
+        self.snapshots.move_to_end(user_id)
+        while len(self.snapshots) > self.max_users:
+            self.snapshots.popitem(last=False)
+
+        logger.debug(
+            f"Loaded belief snapshot for user {user_id}: {len(snapshot)} concepts "
+            f"(version={version}) in {(time.time() - start_time) * 1000:.2f}ms"
+        )
+        return snapshot
+
+    async def get_beliefs(
+        self,
+        user_id: UUID,
+        belief_repository: "BeliefRepository",
+    ) -> dict[UUID, SnapshotBelief]:
+        """
+        Get a user's beliefs keyed by concept_id.
+
+        Drop-in replacement for BeliefRepository.get_beliefs_as_dict for readers.
+
+        Args:
+            user_id: User UUID
+            belief_repository: Repository used to load beliefs on a miss
+
+        Returns:
+            Dictionary mapping concept_id to SnapshotBelief
+        """
+        snapshot = await self.get_snapshot(user_id, belief_repository)
+        return snapshot.as_dict()
+
+    def apply_updates(self, user_id: UUID, beliefs: Iterable["BeliefState"]) -> None:
+        """
+        Write updated beliefs through to the user's local snapshot.
+
+        The snapshot is dropped instead if an update touches a concept it
+        does not hold (e.g. a newly created belief state).
+
+        Args:
+            user_id: User UUID
+            beliefs: BeliefState models holding the new values
+        """
+        snapshot = self.snapshots.get(user_id)
+        if snapshot is None:
+            return
+
+        for belief in beliefs:
+            if not snapshot.apply(
+                belief.concept_id, belief.alpha, belief.beta, belief.response_count
+            ):
+                self.invalidate(user_id)
+                return
+        self.write_throughs += 1
+
+    def invalidate(self, user_id: UUID | None = None) -> None:
+        """
+        Drop cached snapshots in this process.
+
+        Args:
+            user_id: User to invalidate (all users if None)
+        """
+        if user_id is None:
+            self.snapshots.clear()
+        elif self.snapshots.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    async def publish(self, user_id: UUID, written: BeliefSnapshot | None = None) -> None:
+        """
+        Bump the user's belief version so other workers reload their snapshot.
+
+        If this process wrote the changes through to its own snapshot and no
+        other writer intervened, the local snapshot is re-tagged with the new
+        version and keeps being served without a reload.
+
+        Args:
+            user_id: User UUID
+            written: Local snapshot that received the write-through, if any
+        """
+        version = await bump_user_belief_version(user_id)
+        snapshot = self.snapshots.get(user_id)
+        if (
+            version is not None
+            and snapshot is not None
+            and snapshot is written
+            and snapshot.version is not None
+            and version == snapshot.version + 1
+        ):
+            snapshot.version = version
+
+    async def publish_after_commit(self, user_id: UUID, session: AsyncSession | None) -> None:
+        """
+        Publish the user's belief version once the session's transaction commits.
+
+        If the transaction rolls back, the user's local snapshot (which may hold
+        uncommitted values) is dropped instead. Without a real AsyncSession the
+        version is published immediately.
+
+        Args:
+            user_id: User UUID
+            session: Session holding the uncommitted belief writes
+        """
+        written = self.snapshots.get(user_id)
+        if not isinstance(session, AsyncSession):
+            await self.publish(user_id, written)
+            return
+
+        sync_session = session.sync_session
+        pending: dict[UUID, BeliefSnapshot | None] = sync_session.info.setdefault(
+            PENDING_USERS_KEY, {}
+        )
+        # Only re-tag if every write in this transaction went to the same snapshot
+        if user_id in pending and pending[user_id] is not written:
+            written = None
+        pending[user_id] = written
+
+        if not sync_session.info.get(HOOKS_REGISTERED_KEY):
+            event.listen(sync_session, "after_commit", self._on_commit)
+            event.listen(sync_session, "after_rollback", self._on_rollback)
+            sync_session.info[HOOKS_REGISTERED_KEY] = True
+
+    def _on_commit(self, sync_session: "Session") -> None:
+        """Publish versions for users whose beliefs changed in the committed transaction."""
+        pending = sync_session.info.get(PENDING_USERS_KEY)
+        if not pending:
+            return
+        users = dict(pending)
+        pending.clear()
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to publish from: drop local snapshots instead
+            for user_id in users:
+                self.invalidate(user_id)
+            return
+
+        for user_id, written in users.items():
+            task = loop.create_task(self.publish(user_id, written))
+            self._publish_tasks.add(task)
+            task.add_done_callback(self._publish_tasks.discard)
+
+    def _on_rollback(self, sync_session: "Session") -> None:
+        """Drop local snapshots holding writes from a rolled back transaction."""
+        pending = sync_session.info.get(PENDING_USERS_KEY)
+        if not pending:
+            return
+        for user_id in list(pending):
+            self.invalidate(user_id)
+        pending.clear()
+
+    def get_statistics(self) -> dict:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "user_count": len(self.snapshots),
+            "max_users": self.max_users,
+            "belief_count": sum(len(s) for s in self.snapshots.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "write_throughs": self.write_throughs,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global service instance accessor
+async def get_belief_snapshot_cache() -> BeliefSnapshotCache:
+    """FastAPI dependency for the belief snapshot cache."""
+    return await BeliefSnapshotCache.get_instance()
+
+
+async def record_belief_updates(
+    belief_repository: "BeliefRepository",
+    user_id: UUID,
+    beliefs: Iterable["BeliefState"] | None = None,
+) -> None:
+    """
+    Record belief writes for a user in the snapshot cache.
+
+    Call after flushing belief changes, from every code path that writes
+    belief states. Updated beliefs are written through to the local snapshot;
+    pass beliefs=None for bulk writes (initialization, resets) to drop it.
+    The Redis belief version is bumped after the repository's session commits.
+
+    Args:
+        belief_repository: Repository whose session holds the belief writes
+        user_id: User UUID
+        beliefs: Updated BeliefState models, or None to invalidate
+    """
+    if not settings.BELIEF_SNAPSHOT_ENABLED:
+        return
+
+    cache = await BeliefSnapshotCache.get_instance()
+    if beliefs is None:
+        cache.invalidate(user_id)
+    else:
+        cache.apply_updates(user_id, beliefs)
+    # Repositories without a session (e.g. test doubles) publish immediately
+    session = getattr(belief_repository, "session", None)
+    await cache.publish_after_commit(user_id, session)
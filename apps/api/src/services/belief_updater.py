@@ -9,8 +9,10 @@ from typing import TYPE_CHECKING
 from uuid import UUID
 
 import structlog
+from sqlalchemy import inspect
 
 from src.schemas.belief_state import BeliefUpdateResult, BeliefUpdaterResponse
+from src.services.belief_snapshot_cache import record_belief_updates
 from src.utils.bkt_math import calculate_info_gain, safe_divide
 
 if TYPE_CHECKING:
@@ -18,6 +20,7 @@ if TYPE_CHECKING:
     from src.models.question import Question
     from src.repositories.belief_repository import BeliefRepository
     from src.repositories.concept_repository import ConceptRepository
+    from src.services.prerequisite_graph_service import PrerequisiteGraphService
 
 logger = structlog.get_logger(__name__)
 
@@ -52,6 +55,7 @@ class BeliefUpdater:
         default_slip: float = DEFAULT_SLIP,
         default_guess: float = DEFAULT_GUESS,
         prerequisite_propagation: float = DEFAULT_PREREQUISITE_PROPAGATION,
+        prerequisite_graph: "PrerequisiteGraphService | None" = None,
     ):
         """
         Initialize BeliefUpdater.
@@ -62,12 +66,15 @@ class BeliefUpdater:
             default_slip: Default P(incorrect | mastered), default 0.10
             default_guess: Default P(correct | not mastered), default 0.25
             prerequisite_propagation: Weight for propagating updates to prerequisites, default 0.3
+            prerequisite_graph: Optional in-memory prerequisite graph; prerequisites
+                of concepts it holds are resolved without queries
         """
         self.belief_repository = belief_repository
         self.concept_repository = concept_repository
         self.default_slip = default_slip
         self.default_guess = default_guess
         self.prerequisite_propagation = prerequisite_propagation
+        self.prerequisite_graph = prerequisite_graph
 
     async def update_beliefs(
         self,
@@ -215,6 +222,8 @@ class BeliefUpdater:
         # === Persist all updates atomically ===
         if updated_beliefs:
             await self.belief_repository.flush_updates(updated_beliefs)
+            # Write through to the belief snapshot cache (published on commit)
+            await record_belief_updates(self.belief_repository, user_id, updated_beliefs)
 
         # === Calculate information gain ===
         beliefs_after: dict[UUID, tuple[float, float]] = {
@@ -289,15 +298,29 @@ class BeliefUpdater:
         if self.concept_repository is None:
             return 0
 
+        # Prerequisites of concepts in the cached graph need no queries
+        graphs = {}
+        if self.prerequisite_graph is not None:
+            try:
+                graphs = await self.prerequisite_graph.get_graphs_for_concepts(
+                    self.belief_repository.session, direct_concept_ids
+                )
+            except Exception as e:
+                logger.warning("Failed to get prerequisite graph", error=str(e))
+
         # Collect all prerequisite concept IDs
         all_prereq_ids: set[UUID] = set()
         for concept_id in direct_concept_ids:
             try:
-                prereqs = await self.concept_repository.get_prerequisites(concept_id)
-                for prereq in prereqs:
+                if concept_id in graphs:
+                    prereq_ids = self.prerequisite_graph.get_prerequisite_ids(concept_id)
+                else:
+                    prereqs = await self.concept_repository.get_prerequisites(concept_id)
+                    prereq_ids = [prereq.id for prereq in prereqs]
+                for prereq_id in prereq_ids:
                     # Skip if already updated directly
-                    if prereq.id not in direct_concept_ids:
-                        all_prereq_ids.add(prereq.id)
+                    if prereq_id not in direct_concept_ids:
+                        all_prereq_ids.add(prereq_id)
             except Exception as e:
                 logger.warning(
                     "Failed to get prerequisites for concept",
@@ -429,6 +452,10 @@ class BeliefUpdater:
             Concept name or "Unknown" if not loaded
         """
         try:
+            state = inspect(belief, raiseerr=False)
+            if state is not None and "concept" in state.unloaded:
+                # Lazy loading is not possible on an async session
+                return "Unknown"
             if belief.concept and belief.concept.name:
                 return belief.concept.name
         except Exception:
@@ -35,6 +35,7 @@ from src.schemas.coverage import (
 )
 
 if TYPE_CHECKING:
+    from src.services.belief_snapshot_cache import BeliefSnapshotCache
     from src.services.mastery_gate import MasteryGateService
 
 logger = logging.getLogger(__name__)
@@ -58,6 +59,7 @@ class CoverageAnalyzer:
         concept_repository: ConceptRepository,
         course_repository: CourseRepository,
         redis_client: Redis | None = None,
+        belief_snapshots: "BeliefSnapshotCache | None" = None,
     ):
         """
         Initialize CoverageAnalyzer with dependencies.
@@ -67,11 +69,20 @@ class CoverageAnalyzer:
             concept_repository: Repository for concept access
             course_repository: Repository for course access
             redis_client: Optional Redis client for caching
+            belief_snapshots: Optional in-process belief snapshot cache
         """
         self.belief_repository = belief_repository
         self.concept_repository = concept_repository
         self.course_repository = course_repository
         self.redis = redis_client
+        self.belief_snapshots = belief_snapshots
+
+    async def _get_all_beliefs(self, user_id: UUID) -> list[BeliefState]:
+        """Get all user beliefs, from the snapshot cache if configured."""
+        if self.belief_snapshots is not None:
+            beliefs = await self.belief_snapshots.get_beliefs(user_id, self.belief_repository)
+            return list(beliefs.values())
+        return await self.belief_repository.get_all_beliefs(user_id)
 
     def _get_cache_key(self, user_id: UUID, suffix: str = "summary") -> str:
         """Generate cache key for coverage data."""
@@ -203,33 +214,28 @@ class CoverageAnalyzer:
     async def _get_locked_concept_ids(
         self,
         user_id: UUID,
-        concept_ids: set[UUID],
+        beliefs: list[BeliefState],
         mastery_gate_service: "MasteryGateService",
     ) -> set[UUID]:
         """
         Get set of concept IDs that are locked (prerequisites not mastered).
 
+        Evaluates every concept in one bulk gate check, reusing the beliefs
+        already loaded for the coverage report.
+
         Args:
             user_id: User UUID
-            concept_ids: Set of concept IDs to check
+            beliefs: User's belief states (concepts to check)
             mastery_gate_service: MasteryGate service instance
 
         Returns:
             Set of locked concept UUIDs
         """
-        locked = set()
-        for concept_id in concept_ids:
-            try:
-                gate_result = await mastery_gate_service.check_prerequisites_mastered(
-                    user_id=user_id,
-                    concept_id=concept_id,
-                )
-                if not gate_result.is_unlocked:
-                    locked.add(concept_id)
-            except ValueError:
-                # Concept not found - skip
-                continue
-        return locked
+        return await mastery_gate_service.get_locked_concept_ids(
+            user_id=user_id,
+            concept_ids={b.concept_id for b in beliefs},
+            beliefs={b.concept_id: b for b in beliefs},
+        )
 
     async def analyze_coverage(
         self,
@@ -265,7 +271,7 @@ class CoverageAnalyzer:
                 )
 
         # Fetch all beliefs for the user
-        beliefs = await self.belief_repository.get_all_beliefs(user_id)
+        beliefs = await self._get_all_beliefs(user_id)
 
         # Group by status using BeliefState.status property
         status_groups: dict[str, list[BeliefState]] = {
@@ -288,11 +294,11 @@ class CoverageAnalyzer:
         # Calculate locked/unlocked counts (Story 4.11)
         locked_count = 0
         unlocked_count = total_concepts
+        locked_concept_ids: set[UUID] = set()
         if mastery_gate_service and beliefs:
-            concept_ids = {b.concept_id for b in beliefs}
             locked_concept_ids = await self._get_locked_concept_ids(
                 user_id=user_id,
-                concept_ids=concept_ids,
+                beliefs=beliefs,
                 mastery_gate_service=mastery_gate_service,
             )
             locked_count = len(locked_concept_ids)
@@ -329,9 +335,13 @@ class CoverageAnalyzer:
         if use_cache and not mastery_gate_service:
             await self._set_cached_coverage(user_id, summary)
 
-        # Get KA breakdown
+        # Get KA breakdown (reusing beliefs and lock status computed above)
         ka_breakdown = await self.analyze_coverage_by_ka(
-            user_id, course_id, mastery_gate_service
+            user_id,
+            course_id,
+            mastery_gate_service,
+            beliefs=beliefs,
+            locked_concept_ids=locked_concept_ids,
         )
 
         # Log performance
@@ -351,6 +361,8 @@ class CoverageAnalyzer:
         user_id: UUID,
         course_id: UUID,
         mastery_gate_service: "MasteryGateService | None" = None,
+        beliefs: list[BeliefState] | None = None,
+        locked_concept_ids: set[UUID] | None = None,
     ) -> list[KnowledgeAreaCoverage]:
         """
         Generate coverage breakdown by knowledge area.
@@ -359,6 +371,9 @@ class CoverageAnalyzer:
             user_id: User UUID
             course_id: Course UUID
             mastery_gate_service: Optional MasteryGate service for prerequisite status
+            beliefs: Optional pre-loaded beliefs (fetched if not provided)
+            locked_concept_ids: Optional pre-computed locked concepts
+                (computed via mastery_gate_service if not provided)
 
         Returns:
             List of KnowledgeAreaCoverage for each KA
@@ -376,21 +391,22 @@ class CoverageAnalyzer:
                 ka_names[ka.get("id", "")] = ka.get("name", ka.get("id", "Unknown"))
 
         # Get all beliefs
-        beliefs = await self.belief_repository.get_all_beliefs(user_id)
+        if beliefs is None:
+            beliefs = await self._get_all_beliefs(user_id)
 
         # Get all concepts for mapping belief -> KA
         concepts = await self.concept_repository.get_all_concepts(course_id)
         concept_map: dict[UUID, Concept] = {c.id: c for c in concepts}
 
         # Get locked concept IDs if gate service provided (Story 4.11)
-        locked_concept_ids: set[UUID] = set()
-        if mastery_gate_service and beliefs:
-            all_concept_ids = {b.concept_id for b in beliefs}
-            locked_concept_ids = await self._get_locked_concept_ids(
-                user_id=user_id,
-                concept_ids=all_concept_ids,
-                mastery_gate_service=mastery_gate_service,
-            )
+        if locked_concept_ids is None:
+            locked_concept_ids = set()
+            if mastery_gate_service and beliefs:
+                locked_concept_ids = await self._get_locked_concept_ids(
+                    user_id=user_id,
+                    beliefs=beliefs,
+                    mastery_gate_service=mastery_gate_service,
+                )
 
         # Group beliefs by KA
         ka_beliefs: dict[str, list[BeliefState]] = {}
@@ -477,7 +493,7 @@ class CoverageAnalyzer:
             GapConceptList with gaps sorted by probability ascending
         """
         # Get all beliefs
-        beliefs = await self.belief_repository.get_all_beliefs(user_id)
+        beliefs = await self._get_all_beliefs(user_id)
 
         # Get concepts for names and KA
         concepts = await self.concept_repository.get_all_concepts(course_id)
@@ -534,17 +550,16 @@ class CoverageAnalyzer:
         )
 
         # Get all beliefs and concepts
-        beliefs = await self.belief_repository.get_all_beliefs(user_id)
+        beliefs = await self._get_all_beliefs(user_id)
         concepts = await self.concept_repository.get_all_concepts(course_id)
         concept_map: dict[UUID, Concept] = {c.id: c for c in concepts}
 
         # Get locked concept IDs if gate service provided (Story 4.11)
         locked_concept_ids: set[UUID] = set()
         if mastery_gate_service and beliefs:
-            all_concept_ids = {b.concept_id for b in beliefs}
             locked_concept_ids = await self._get_locked_concept_ids(
                 user_id=user_id,
-                concept_ids=all_concept_ids,
+                beliefs=beliefs,
                 mastery_gate_service=mastery_gate_service,
             )
 
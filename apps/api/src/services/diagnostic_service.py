@@ -1,10 +1,22 @@
 """
 Diagnostic service for optimal question selection.
 Implements greedy coverage optimization algorithm for diagnostic assessment.
+
+Selection runs lazily over a per-course candidate structure (concept
+bitsets and each KA's questions pre-sorted by initial score). Within a KA, a
+question's coverage + discrimination score never increases as concepts get
+covered, so its last computed value is an upper bound: only questions whose
+bound reaches the top of their KA queue are re-scored. The structure is
+cached per question pool snapshot, so diagnostic start cost does not grow
+with the bank size. With a DiagnosticSetCache, sessions draw one of several
+precomputed selections (variants differ in tie-breaking) instead.
 """
+import heapq
 import random
 import time
+from array import array
 from collections import defaultdict
+from collections.abc import Sequence
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -13,6 +25,8 @@ import structlog
 from src.models.question import Question
 from src.repositories.concept_repository import ConceptRepository
 from src.repositories.question_repository import QuestionRepository
+from src.services.diagnostic_set_cache import DiagnosticSetCache
+from src.services.question_pool_cache import CachedQuestion, QuestionPoolCache
 
 logger = structlog.get_logger(__name__)
 
@@ -24,6 +38,77 @@ class QuestionWithConcepts:
     concept_ids: set[UUID]
 
 
+@dataclass(frozen=True, slots=True)
+class DiagnosticCandidates:
+    """
+    Precomputed selection structure for a course's question pool.
+
+    Question i tests the concepts whose bits are set in concept_masks[i]
+    (bit k is concept_ids[k]). area_orders lists each KA's question indices
+    by descending initial coverage + discrimination score, ties by index.
+    """
+    questions: Sequence[Question | CachedQuestion]
+    concept_ids: tuple[UUID, ...]
+    concept_masks: tuple[int, ...]
+    discriminations: tuple[float, ...]
+    initial_partial_scores: tuple[float, ...]
+    area_orders: dict[str, tuple[int, ...]]
+
+    def concepts_in(self, mask: int) -> set[UUID]:
+        """Get the concept IDs of a bitset."""
+        concepts = set()
+        while mask:
+            low_bit = mask & -mask
+            concepts.add(self.concept_ids[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return concepts
+
+
+class _LazyMaxQueue:
+    """
+    Question indices by descending score bound, ties by index.
+
+    Merges a presorted initial order with a heap of re-scored entries, so
+    creating a queue for a selection run does not copy the order.
+    """
+
+    __slots__ = ("_order", "_bounds", "_position", "_rescored")
+
+    def __init__(self, order: tuple[int, ...], bounds: tuple[float, ...]):
+        self._order = order
+        self._bounds = bounds
+        self._position = 0
+        self._rescored: list[tuple[float, int]] = []  # (-bound, index)
+
+    def _next_initial(self) -> tuple[float, int] | None:
+        if self._position < len(self._order):
+            index = self._order[self._position]
+            entry = (-self._bounds[index], index)
+            if not self._rescored or entry < self._rescored[0]:
+                return entry
+        return None
+
+    def peek_bound(self) -> float | None:
+        """Highest remaining bound (None if empty)."""
+        entry = self._next_initial() or (self._rescored[0] if self._rescored else None)
+        return -entry[0] if entry is not None else None
+
+    def pop(self) -> tuple[float, int] | None:
+        """Remove and return (bound, index) of the first entry (None if empty)."""
+        entry = self._next_initial()
+        if entry is not None:
+            self._position += 1
+        elif self._rescored:
+            entry = heapq.heappop(self._rescored)
+        else:
+            return None
+        return -entry[0], entry[1]
+
+    def push(self, bound: float, index: int) -> None:
+        """Re-insert an index with an updated bound."""
+        heapq.heappush(self._rescored, (-bound, index))
+
+
 class DiagnosticService:
     """
     Service for selecting optimal diagnostic questions.
@@ -45,10 +130,16 @@ class DiagnosticService:
     WEIGHT_DISCRIMINATION = 5
     WEIGHT_KA_BALANCE = 2
 
+    # Candidate structures by course, shared across requests and reused while
+    # the question pool snapshot they were built from is current
+    _candidate_cache: dict[UUID, DiagnosticCandidates] = {}
+
     def __init__(
         self,
         question_repo: QuestionRepository,
         concept_repo: ConceptRepository,
+        question_pool: QuestionPoolCache | None = None,
+        diagnostic_sets: DiagnosticSetCache | None = None,
     ):
         """
         Initialize diagnostic service.
@@ -56,15 +147,20 @@ class DiagnosticService:
         Args:
             question_repo: Repository for question operations
             concept_repo: Repository for concept operations
+            question_pool: Optional question pool cache; when set, questions
+                come from the cached pool and candidate structures are cached
+            diagnostic_sets: Optional precomputed set cache (requires question_pool)
         """
         self.question_repo = question_repo
         self.concept_repo = concept_repo
+        self.question_pool = question_pool
+        self.diagnostic_sets = diagnostic_sets if question_pool is not None else None
 
     async def select_diagnostic_questions(
         self,
         course_id: UUID,
         target_count: int = DEFAULT_TARGET_COUNT,
-    ) -> tuple[list[Question], set[UUID], int]:
+    ) -> tuple[list[Question | CachedQuestion], set[UUID], int]:
         """
         Select optimal diagnostic questions for a course.
 
@@ -73,6 +169,10 @@ class DiagnosticService:
         2. Balance across knowledge areas
         3. Prefer high discrimination questions
 
+        With a diagnostic set cache, a precomputed selection for the current
+        question pool is drawn when available; otherwise the selection runs
+        live and the cache is regenerated in the background.
+
         Args:
             course_id: Course UUID to select questions for
             target_count: Target number of questions (12-20, default 15)
@@ -92,7 +192,14 @@ class DiagnosticService:
         target_count = max(self.MIN_QUESTIONS, min(self.MAX_QUESTIONS, target_count))
 
         # Fetch all active questions with concepts
-        questions = await self.question_repo.get_questions_with_concepts(course_id)
+        if self.question_pool is not None:
+            questions = await self.question_pool.get_questions(course_id, self.question_repo)
+            if self.diagnostic_sets is not None:
+                drawn = self.diagnostic_sets.draw(course_id, target_count, questions)
+                if drawn is not None:
+                    return self._use_drawn_set(course_id, drawn, start_time)
+        else:
+            questions = await self.question_repo.get_questions_with_concepts(course_id)
 
         # Fetch total concept count for coverage calculation
         total_concepts = await self.concept_repo.get_concept_count(course_id)
@@ -104,18 +211,30 @@ class DiagnosticService:
             )
             return [], set(), total_concepts
 
-        # Prepare questions with concept sets for efficient scoring
-        questions_with_concepts = self._prepare_questions_with_concepts(questions)
+        # Precomputed concept bitsets and score order for the pool
+        candidates = self._get_candidates(course_id, questions)
 
         # Run selection algorithm
         selected, covered_concepts, ka_counts = self._select_questions_greedy(
-            questions_with_concepts,
+            candidates,
             target_count,
         )
 
         # Randomize question order for presentation
         random.shuffle(selected)
 
+        # Precompute sets for the next sessions on this pool snapshot
+        if self.diagnostic_sets is not None:
+            self.diagnostic_sets.schedule_refresh(
+                course_id,
+                target_count,
+                questions,
+                total_concepts,
+                lambda: self.generate_diagnostic_sets(
+                    questions, target_count, self.diagnostic_sets.variant_count
+                ),
+            )
+
         # Calculate duration
         duration_ms = (time.perf_counter() - start_time) * 1000
 
@@ -137,43 +256,163 @@ class DiagnosticService:
 
         return selected, covered_concepts, total_concepts
 
-    def _prepare_questions_with_concepts(
+    def _use_drawn_set(
         self,
-        questions: list[Question],
-    ) -> list[QuestionWithConcepts]:
+        course_id: UUID,
+        drawn: tuple[list[CachedQuestion], int],
+        start_time: float,
+    ) -> tuple[list[CachedQuestion], set[UUID], int]:
+        """Shuffle and log a drawn precomputed set; returns selection results."""
+        selected, total_concepts = drawn
+        random.shuffle(selected)
+        covered_concepts = {
+            qc.concept_id for question in selected for qc in question.question_concepts
+        }
+
+        logger.info(
+            "Drew precomputed diagnostic questions",
+            course_id=str(course_id),
+            question_count=len(selected),
+            concepts_covered=len(covered_concepts),
+            total_concepts=total_concepts,
+            duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+        )
+
+        return selected, covered_concepts, total_concepts
+
+    def generate_diagnostic_sets(
+        self,
+        questions: Sequence[Question | CachedQuestion],
+        target_count: int,
+        variant_count: int,
+        seed: int | None = None,
+    ) -> list[array]:
         """
-        Prepare questions with concept ID sets for efficient scoring.
+        Generate distinct diagnostic selections for a question pool.
+
+        The first variant is the standard selection. The others run the same
+        greedy selection over a random permutation of the pool, which breaks
+        score ties randomly; duplicate selections are dropped.
 
         Args:
-            questions: List of Question models with question_concepts loaded
+            questions: Question pool
+            target_count: Questions per selection
+            variant_count: Number of selections to generate
+            seed: Optional random seed
 
         Returns:
-            List of QuestionWithConcepts dataclass instances
+            List of selections as arrays of indices into questions
         """
-        result = []
+        rnd = random.Random(seed)
+        index_by_id = {question.id: index for index, question in enumerate(questions)}
+
+        question_sets = []
+        seen: set[frozenset[int]] = set()
+        for variant in range(variant_count):
+            if variant == 0:
+                candidates = self._build_candidates(questions)
+            else:
+                permutation = rnd.sample(range(len(questions)), len(questions))
+                candidates = self._build_candidates([questions[i] for i in permutation])
+            selected, _, _ = self._select_questions_greedy(candidates, target_count)
+
+            indices = [index_by_id[question.id] for question in selected]
+            key = frozenset(indices)
+            if key not in seen:
+                seen.add(key)
+                question_sets.append(array("I", indices))
+        return question_sets
+
+    def _get_candidates(
+        self,
+        course_id: UUID,
+        questions: Sequence[Question | CachedQuestion],
+    ) -> DiagnosticCandidates:
+        """
+        Get the candidate structure for a course's questions.
+
+        Structures built from the question pool cache are reused until the
+        pool is reloaded (a new snapshot object).
+
+        Args:
+            course_id: Course UUID
+            questions: Active questions with question_concepts loaded
+
+        Returns:
+            DiagnosticCandidates for the questions
+        """
+        cached = self._candidate_cache.get(course_id)
+        if cached is not None and cached.questions is questions:
+            return cached
+
+        candidates = self._build_candidates(questions)
+        if self.question_pool is not None:
+            self._candidate_cache[course_id] = candidates
+        return candidates
+
+    def _build_candidates(
+        self,
+        questions: Sequence[Question | CachedQuestion],
+    ) -> DiagnosticCandidates:
+        """
+        Build concept bitsets and per-KA initial score orders for questions.
+
+        Args:
+            questions: Questions with question_concepts loaded
+
+        Returns:
+            DiagnosticCandidates for the questions
+        """
+        concept_bits: dict[UUID, int] = {}
+        concept_masks = []
         for question in questions:
-            concept_ids = {
-                qc.concept_id for qc in question.question_concepts
-            }
-            result.append(QuestionWithConcepts(
-                question=question,
-                concept_ids=concept_ids,
-            ))
-        return result
+            mask = 0
+            for qc in question.question_concepts:
+                bit = concept_bits.setdefault(qc.concept_id, len(concept_bits))
+                mask |= 1 << bit
+            concept_masks.append(mask)
+
+        discriminations = tuple(q.discrimination for q in questions)
+        initial_partial_scores = tuple(
+            self._partial_score(mask.bit_count(), discrimination)
+            for mask, discrimination in zip(concept_masks, discriminations, strict=True)
+        )
+
+        area_indices: dict[str, list[int]] = defaultdict(list)
+        for index, question in enumerate(questions):
+            area_indices[question.knowledge_area_id].append(index)
+        area_orders = {
+            ka_id: tuple(sorted(indices, key=lambda i: (-initial_partial_scores[i], i)))
+            for ka_id, indices in area_indices.items()
+        }
+
+        return DiagnosticCandidates(
+            questions=questions,
+            concept_ids=tuple(concept_bits),
+            concept_masks=tuple(concept_masks),
+            discriminations=discriminations,
+            initial_partial_scores=initial_partial_scores,
+            area_orders=area_orders,
+        )
 
     def _select_questions_greedy(
         self,
-        questions: list[QuestionWithConcepts],
+        candidates: DiagnosticCandidates,
         target_count: int,
-    ) -> tuple[list[Question], set[UUID], dict[str, int]]:
+    ) -> tuple[list[Question | CachedQuestion], set[UUID], dict[str, int]]:
         """
         Greedy algorithm for optimal question selection.
 
         Scoring function:
         score = (uncovered_concepts * 10) + (discrimination * 5) + (ka_balance * 2)
 
+        Each step takes the best question of every KA below its cap from a
+        lazy queue and selects the best of those. Selections (including ties,
+        which go to the earliest question) are identical to scoring every
+        available question at each step.
+
         Args:
-            questions: List of questions with concept IDs
+            candidates: Precomputed candidate structure
             target_count: Target number of questions to select
 
         Returns:
@@ -182,46 +421,102 @@ class DiagnosticService:
             - Set of covered concept UUIDs
             - Dict of KA -> count distribution
         """
-        selected: list[Question] = []
-        covered_concepts: set[UUID] = set()
+        selected: list[Question | CachedQuestion] = []
+        covered_mask = 0
         ka_counts: dict[str, int] = defaultdict(int)
+        queues = {
+            ka_id: _LazyMaxQueue(order, candidates.initial_partial_scores)
+            for ka_id, order in candidates.area_orders.items()
+        }
+
+        while len(selected) < target_count:
+            # Best question of each KA as (score, index, partial score)
+            area_bests = {}
+            for ka_id, queue in queues.items():
+                if ka_counts[ka_id] >= self.MAX_QUESTIONS_PER_KA:
+                    continue
+                best = self._pop_area_best(queue, candidates, covered_mask, ka_counts[ka_id])
+                if best is not None:
+                    area_bests[ka_id] = best
+
+            # No valid question found (all KAs maxed out or pool empty)
+            if not area_bests:
+                break
 
-        # Create available pool (copy to avoid modifying input)
-        available = list(questions)
+            best_ka = min(area_bests, key=lambda ka: (-area_bests[ka][0], area_bests[ka][1]))
+            for ka_id, (_, index, partial) in area_bests.items():
+                if ka_id != best_ka:
+                    queues[ka_id].push(partial, index)
 
-        while len(selected) < target_count and available:
-            # Find best question
-            best_question = None
-            best_score = float('-inf')
-            best_idx = -1
+            # Add best question to selection
+            index = area_bests[best_ka][1]
+            selected.append(candidates.questions[index])
+            covered_mask |= candidates.concept_masks[index]
+            ka_counts[best_ka] += 1
 
-            for idx, qwc in enumerate(available):
-                # Skip if KA already at max
-                ka_id = qwc.question.knowledge_area_id
-                if ka_counts[ka_id] >= self.MAX_QUESTIONS_PER_KA:
-                    continue
+        return selected, candidates.concepts_in(covered_mask), ka_counts
 
-                # Calculate score
-                score = self._calculate_score(qwc, covered_concepts, ka_counts)
+    def _pop_area_best(
+        self,
+        queue: _LazyMaxQueue,
+        candidates: DiagnosticCandidates,
+        covered_mask: int,
+        ka_count: int,
+    ) -> tuple[float, int, float] | None:
+        """
+        Remove the best question from a KA queue.
 
-                if score > best_score:
-                    best_score = score
-                    best_question = qwc
-                    best_idx = idx
+        Args:
+            queue: Lazy queue of the KA's remaining questions
+            candidates: Candidate structure
+            covered_mask: Bitset of covered concepts
+            ka_count: Questions already selected from the KA
 
-            # No valid question found (all KAs maxed out or pool empty)
-            if best_question is None:
+        Returns:
+            Tuple of (score, index, partial score), or None if the KA is exhausted
+        """
+        ka_balance_score = self._ka_balance_score(ka_count)
+        best = None
+        ties = []
+        while (entry := queue.pop()) is not None:
+            bound, index = entry
+            uncovered = (candidates.concept_masks[index] & ~covered_mask).bit_count()
+            partial = self._partial_score(uncovered, candidates.discriminations[index])
+            if partial < bound:
+                # Stale bound: re-queue with the current score
+                queue.push(partial, index)
+                continue
+
+            score = partial + ka_balance_score
+            if best is None:
+                best = (score, index, partial)
+            elif score < best[0]:
+                queue.push(partial, index)
+                break
+            elif index < best[1]:
+                ties.append(best)
+                best = (score, index, partial)
+            else:
+                ties.append((score, index, partial))
+
+            # Continue only while a remaining question could tie the best score
+            next_bound = queue.peek_bound()
+            if next_bound is None or next_bound + ka_balance_score < best[0]:
                 break
 
-            # Add best question to selection
-            selected.append(best_question.question)
-            covered_concepts.update(best_question.concept_ids)
-            ka_counts[best_question.question.knowledge_area_id] += 1
+        for _, index, partial in ties:
+            queue.push(partial, index)
+        return best
 
-            # Remove from available pool
-            available.pop(best_idx)
+    def _partial_score(self, uncovered: int, discrimination: float) -> float:
+        """Coverage + discrimination part of the selection score."""
+        coverage_score = uncovered * self.WEIGHT_COVERAGE
+        discrimination_score = discrimination * self.WEIGHT_DISCRIMINATION
+        return coverage_score + discrimination_score
 
-        return selected, covered_concepts, ka_counts
+    def _ka_balance_score(self, ka_count: int) -> float:
+        """KA balance part of the selection score."""
+        return (self.MAX_QUESTIONS_PER_KA - ka_count) * self.WEIGHT_KA_BALANCE
 
     def _calculate_score(
         self,
@@ -245,17 +540,9 @@ class DiagnosticService:
         Returns:
             Score value (higher is better)
         """
-        # Coverage score: prioritize questions with uncovered concepts
-        uncovered = len(qwc.concept_ids - covered_concepts)
-        coverage_score = uncovered * self.WEIGHT_COVERAGE
-
-        # Discrimination score: prefer more informative questions
-        discrimination_score = qwc.question.discrimination * self.WEIGHT_DISCRIMINATION
-
-        # KA balance score: prefer KAs with fewer questions selected
-        ka_id = qwc.question.knowledge_area_id
-        ka_balance_score = (
-            self.MAX_QUESTIONS_PER_KA - ka_counts[ka_id]
-        ) * self.WEIGHT_KA_BALANCE
-
-        return coverage_score + discrimination_score + ka_balance_score
+        # Coverage: uncovered concepts; discrimination: prefer more informative
+        # questions; KA balance: prefer KAs with fewer questions selected
+        partial_score = self._partial_score(
+            len(qwc.concept_ids - covered_concepts), qwc.question.discrimination
+        )
+        return partial_score + self._ka_balance_score(ka_counts[qwc.question.knowledge_area_id])
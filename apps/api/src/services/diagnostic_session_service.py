@@ -12,6 +12,7 @@ from src.models.question import Question
 from src.repositories.belief_repository import BeliefRepository
 from src.repositories.diagnostic_session_repository import DiagnosticSessionRepository
 from src.repositories.question_repository import QuestionRepository
+from src.services.belief_snapshot_cache import record_belief_updates
 from src.services.diagnostic_service import DiagnosticService
 
 logger = structlog.get_logger(__name__)
@@ -339,6 +340,7 @@ class DiagnosticSessionService:
             alpha=1.0,
             beta=1.0,
         )
+        await record_belief_updates(self.belief_repo, user_id)
 
         logger.info(
             "diagnostic_reset_completed",
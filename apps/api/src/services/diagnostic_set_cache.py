@@ -0,0 +1,205 @@
+"""
+Diagnostic Set Cache Service
+
+Provides a process-wide cache of precomputed diagnostic question sets per
+course and target count. Each entry holds a few distinct variants of the
+greedy coverage selection for a question pool snapshot, stored as arrays of
+indices into the snapshot, so starting a diagnostic session draws a set in
+O(1). Sets are regenerated in the background when the pool is reloaded
+(content version change).
+"""
+import asyncio
+import logging
+import random
+import time
+from array import array
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
+
+from src.config import settings
+
+if TYPE_CHECKING:
+    from src.services.question_pool_cache import CachedQuestion
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DiagnosticSetPool:
+    """Precomputed diagnostic sets for a question pool snapshot."""
+    course_id: UUID
+    target_count: int
+    questions: Sequence["CachedQuestion"]  # Pool snapshot the indices refer to
+    question_sets: tuple[array, ...]  # Distinct variants as question indices
+    total_concepts: int
+    generated_at: float
+    generation_time_ms: float
+
+
+class DiagnosticSetCache:
+    """
+    Process-wide diagnostic set cache keyed by course and target count.
+
+    Provides:
+    - O(1) draws of a precomputed set while the question pool snapshot is current
+    - Background regeneration (off the event loop) when the pool is reloaded
+    - At most one regeneration in flight per course and target count
+    """
+
+    _instance: Optional["DiagnosticSetCache"] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self, variant_count: int | None = None):
+        self.variant_count = (
+            variant_count if variant_count is not None else settings.DIAGNOSTIC_SET_VARIANTS
+        )
+        self.pools: dict[tuple[UUID, int], DiagnosticSetPool] = {}
+        self._refresh_tasks: dict[tuple[UUID, int], asyncio.Task] = {}
+
+        # Cache statistics
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @classmethod
+    async def get_instance(cls) -> "DiagnosticSetCache":
+        """Get singleton instance."""
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def reset_instance(cls) -> None:
+        """Reset singleton (for testing)."""
+        async with cls._lock:
+            cls._instance = None
+
+    def draw(
+        self,
+        course_id: UUID,
+        target_count: int,
+        questions: Sequence["CachedQuestion"],
+    ) -> tuple[list["CachedQuestion"], int] | None:
+        """
+        Draw a random precomputed set for the current pool snapshot.
+
+        Args:
+            course_id: Course UUID
+            target_count: Number of questions in the set
+            questions: Current question pool snapshot
+
+        Returns:
+            Tuple of (selected questions, total concept count), or None if
+            no sets exist for this snapshot
+        """
+        pool = self.pools.get((course_id, target_count))
+        if pool is None or pool.questions is not questions:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        indices = random.choice(pool.question_sets)
+        return [questions[i] for i in indices], pool.total_concepts
+
+    def schedule_refresh(
+        self,
+        course_id: UUID,
+        target_count: int,
+        questions: Sequence["CachedQuestion"],
+        total_concepts: int,
+        generate: Callable[[], list[array]],
+    ) -> None:
+        """
+        Regenerate a course's sets in the background.
+
+        Does nothing if a regeneration for the same course and target count
+        is already running.
+
+        Args:
+            course_id: Course UUID
+            target_count: Number of questions per set
+            questions: Pool snapshot the sets are generated from
+            total_concepts: Course concept count to serve with the sets
+            generate: CPU-bound function returning the sets (run in a thread)
+        """
+        key = (course_id, target_count)
+        task = self._refresh_tasks.get(key)
+        if task is not None and not task.done():
+            return
+
+        task = asyncio.get_running_loop().create_task(
+            self._refresh(key, questions, total_concepts, generate)
+        )
+        self._refresh_tasks[key] = task
+
+    async def _refresh(
+        self,
+        key: tuple[UUID, int],
+        questions: Sequence["CachedQuestion"],
+        total_concepts: int,
+        generate: Callable[[], list[array]],
+    ) -> None:
+        """Generate sets off the event loop and store them."""
+        course_id, target_count = key
+        start_time = time.time()
+        try:
+            question_sets = await asyncio.to_thread(generate)
+        except Exception as e:
+            logger.warning(f"Diagnostic set generation failed for course {course_id}: {e}")
+            return
+
+        if not question_sets:
+            return
+
+        generation_time_ms = (time.time() - start_time) * 1000
+        self.pools[key] = DiagnosticSetPool(
+            course_id=course_id,
+            target_count=target_count,
+            questions=questions,
+            question_sets=tuple(question_sets),
+            total_concepts=total_concepts,
+            generated_at=time.time(),
+            generation_time_ms=generation_time_ms,
+        )
+        logger.info(
+            f"Generated {len(question_sets)} diagnostic sets for course {course_id} "
+            f"(target_count={target_count}) in {generation_time_ms:.2f}ms"
+        )
+
+    async def wait_for_refreshes(self) -> None:
+        """Wait for running regenerations to finish."""
+        tasks = [task for task in self._refresh_tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def invalidate(self, course_id: UUID | None = None) -> None:
+        """
+        Drop precomputed sets in this process.
+
+        Args:
+            course_id: Course to invalidate (all courses if None)
+        """
+        if course_id is None:
+            self.pools.clear()
+        else:
+            for key in [key for key in self.pools if key[0] == course_id]:
+                del self.pools[key]
+
+    def get_statistics(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "pool_count": len(self.pools),
+            "set_count": sum(len(p.question_sets) for p in self.pools.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes_running": sum(not t.done() for t in self._refresh_tasks.values()),
+        }
+
+
+# Global service instance accessor
+async def get_diagnostic_set_cache() -> DiagnosticSetCache:
+    """FastAPI dependency for the diagnostic set cache."""
+    return await DiagnosticSetCache.get_instance()
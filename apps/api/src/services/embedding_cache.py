@@ -0,0 +1,461 @@
+"""
+Persistent content-addressed embedding cache.
+
+Stores embedding vectors on disk keyed by (model, dimensions, sha256(text)),
+so identical texts are embedded once across API processes, Celery workers and
+the offline embedding scripts.
+
+Layout (one directory per model and dimension count):
+- vectors.f32: memory-mapped float32 matrix, one row per cached vector
+- index.sqlite3: key -> row slot, last-used time, and free slots for reuse
+
+Several processes can share one cache directory. Lookups read the index in a
+deferred (shared) transaction and check each row against the CRC32 stored with
+its entry, so a row reused by a concurrent writer reads as a miss. Last-used
+times are kept in memory and written in batches; only inserts, eviction and
+slot reuse take the exclusive write lock. When the cache is full, the least
+recently used entries are evicted and their rows reused.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from ..config import settings
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "index.sqlite3"
+VECTORS_FILENAME = "vectors.f32"
+
+# Rows added to the vectors file each time it grows
+GROWTH_ROWS = 1024
+
+# Max keys per SQLite IN clause
+LOOKUP_CHUNK_SIZE = 500
+
+# Seconds to wait for another process holding the write lock
+LOCK_TIMEOUT_SECONDS = 30
+
+# Pending last-used updates are written once this many keys or seconds accrue
+TOUCH_FLUSH_MAX_KEYS = 1000
+TOUCH_FLUSH_SECONDS = 60.0
+
+
+def embedding_cache_key(text: str) -> str:
+    """Content address for a text (sha256 hex digest of its UTF-8 bytes)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _row_checksum(row: np.ndarray) -> int:
+    """CRC32 of a float32 row, stored with its entry to detect reused rows."""
+    return zlib.crc32(np.ascontiguousarray(row, dtype=np.float32).tobytes())
+
+
+class EmbeddingCache:
+    """
+    Disk-backed embedding cache for a single model and dimension count.
+
+    Provides:
+    - Batched lookups and inserts (get_many / put_many)
+    - Compact float32 storage in a memory-mapped file
+    - Size-bounded LRU eviction with row reuse
+    - Hit/miss/eviction counters for this process
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        model: str,
+        dimensions: int,
+        max_entries: int,
+    ):
+        """
+        Open (or create) the cache for a model.
+
+        Args:
+            cache_dir: Root cache directory (shared by all models)
+            model: Embedding model name
+            dimensions: Embedding vector dimensions
+            max_entries: Maximum number of cached vectors before eviction
+        """
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+
+        self.model = model
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.directory = Path(cache_dir).expanduser() / f"{model}-{dimensions}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._vectors_path = self.directory / VECTORS_FILENAME
+        self._vectors_path.touch(exist_ok=True)
+        self._row_bytes = dimensions * np.dtype(np.float32).itemsize
+        self._vectors: np.memmap | None = None
+        self._mapped_rows = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.directory / INDEX_FILENAME,
+            timeout=LOCK_TIMEOUT_SECONDS,
+            isolation_level=None,  # Explicit transactions only
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if columns and "checksum" not in columns:
+            # Index written before row checksums: start the cache afresh
+            self._conn.executescript(
+                """
+                DROP TABLE IF EXISTS entries;
+                DROP TABLE IF EXISTS free_slots;
+                DROP TABLE IF EXISTS meta;
+                """
+            )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                slot INTEGER NOT NULL UNIQUE,
+                last_used REAL NOT NULL,
+                checksum INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS free_slots (slot INTEGER PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO meta (name, value) VALUES ('next_slot', 0);
+            """
+        )
+
+        # Last-used times not yet written to the index
+        self._pending_touches: dict[str, float] = {}
+        self._touches_since: float = time.time()
+
+        # Statistics for this process
+        self.hits: int = 0
+        self.misses: int = 0
+        self.writes: int = 0
+        self.evictions: int = 0
+
+    # =========================================================================
+    # Storage helpers
+    # =========================================================================
+
+    def _file_rows(self) -> int:
+        return self._vectors_path.stat().st_size // self._row_bytes
+
+    def _rows(self, rows_needed: int) -> np.memmap:
+        """Get the vectors memmap, remapping if the file has grown."""
+        if self._vectors is None or self._mapped_rows < rows_needed:
+            if self._vectors is not None:
+                self._vectors.flush()
+            rows = self._file_rows()
+            if rows < rows_needed:
+                raise RuntimeError(
+                    f"Embedding cache file has {rows} rows, expected at least {rows_needed}"
+                )
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r+", shape=(rows, self.dimensions)
+            )
+            self._mapped_rows = rows
+        return self._vectors
+
+    def _ensure_capacity(self, rows_needed: int) -> None:
+        """Grow the vectors file to hold rows_needed rows (write lock held)."""
+        if self._file_rows() >= rows_needed:
+            return
+        rows = min(
+            max(rows_needed, self._file_rows() + GROWTH_ROWS),
+            max(rows_needed, self.max_entries),
+        )
+        with open(self._vectors_path, "r+b") as f:
+            f.truncate(rows * self._row_bytes)
+
+    def _allocate_slots(self, count: int) -> list[int]:
+        """Allocate row slots, reusing freed rows first (write lock held)."""
+        free = [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT slot FROM free_slots ORDER BY slot LIMIT ?", (count,)
+            )
+        ]
+        if free:
+            self._conn.executemany(
+                "DELETE FROM free_slots WHERE slot = ?", [(slot,) for slot in free]
+            )
+
+        remaining = count - len(free)
+        if remaining:
+            next_slot = self._conn.execute(
+                "SELECT value FROM meta WHERE name = 'next_slot'"
+            ).fetchone()[0]
+            free.extend(range(next_slot, next_slot + remaining))
+            self._conn.execute(
+                "UPDATE meta SET value = ? WHERE name = 'next_slot'",
+                (next_slot + remaining,),
+            )
+        return free
+
+    def _write_touches(self) -> None:
+        """Write pending last-used times to the index (write lock held)."""
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._pending_touches.items()],
+            )
+            self._pending_touches.clear()
+        self._touches_since = time.time()
+
+    def _flush_touches(self) -> None:
+        """Write pending last-used times in their own write transaction."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_touches()
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, count: int) -> None:
+        """Evict the least recently used entries (write lock held)."""
+        victims = self._conn.execute(
+            "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (count,)
+        ).fetchall()
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO free_slots (slot) VALUES (?)", [(s,) for _, s in victims]
+        )
+        self.evictions += len(victims)
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """
+        Look up cached vectors for texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            List aligned with texts: cached vector, or None on a miss
+        """
+        if not texts:
+            return []
+
+        keys = [embedding_cache_key(t) for t in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found: dict[str, list[float]] = {}
+
+        with self._lock:
+            # Shared read: writers are not blocked, reused rows fail the checksum
+            self._conn.execute("BEGIN")
+            try:
+                slots: dict[str, tuple[int, int]] = {}
+                for i in range(0, len(unique_keys), LOOKUP_CHUNK_SIZE):
+                    chunk = unique_keys[i:i + LOOKUP_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    for key, slot, checksum in self._conn.execute(
+                        f"SELECT key, slot, checksum FROM entries WHERE key IN ({placeholders})",
+                        chunk,
+                    ):
+                        slots[key] = (slot, checksum)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            if slots:
+                vectors = self._rows(max(slot for slot, _ in slots.values()) + 1)
+                now = time.time()
+                for key, (slot, checksum) in slots.items():
+                    row = np.array(vectors[slot])
+                    if _row_checksum(row) != checksum:
+                        continue
+                    found[key] = row.tolist()
+                    self._pending_touches[key] = now
+
+            if self._pending_touches and (
+                len(self._pending_touches) >= TOUCH_FLUSH_MAX_KEYS
+                or time.time() - self._touches_since >= TOUCH_FLUSH_SECONDS
+            ):
+                try:
+                    self._flush_touches()
+                except sqlite3.OperationalError as e:
+                    # Recency is best-effort; retried on the next flush
+                    logger.warning("embedding_cache_touch_failed", error=str(e))
+
+        results = [found.get(key) for key in keys]
+        hit_count = sum(1 for r in results if r is not None)
+        self.hits += hit_count
+        self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, texts: list[str], vectors: list[list[float]]) -> int:
+        """
+        Store vectors for texts, evicting old entries if the cache is full.
+
+        Texts that are already cached are left untouched.
+
+        Args:
+            texts: Texts that were embedded
+            vectors: Embedding vectors aligned with texts
+
+        Returns:
+            Number of new entries written
+        """
+        if len(texts) != len(vectors):
+            raise ValueError(f"Got {len(texts)} texts but {len(vectors)} vectors")
+
+        pending: dict[str, list[float]] = {}
+        for text, vector in zip(texts, vectors, strict=True):
+            if len(vector) != self.dimensions:
+                logger.warning(
+                    "embedding_cache_dimension_mismatch",
+                    expected=self.dimensions,
+                    actual=len(vector),
+                )
+                continue
+            pending[embedding_cache_key(text)] = vector
+        if not pending:
+            return 0
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                keys = list(pending)
+                existing: set[str] = set()
+                for i in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                    chunk = keys[i:i + LOOKUP_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    existing.update(
+                        row[0]
+                        for row in self._conn.execute(
+                            f"SELECT key FROM entries WHERE key IN ({placeholders})", chunk
+                        )
+                    )
+                new_keys = [k for k in keys if k not in existing][: self.max_entries]
+
+                # Recent lookups count towards recency before anything is evicted
+                self._write_touches()
+
+                if new_keys:
+                    count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                    overflow = count + len(new_keys) - self.max_entries
+                    if overflow > 0:
+                        self._evict(overflow)
+
+                    slots = self._allocate_slots(len(new_keys))
+                    self._ensure_capacity(max(slots) + 1)
+                    rows = self._rows(max(slots) + 1)
+                    checksums = []
+                    for key, slot in zip(new_keys, slots, strict=True):
+                        row = np.asarray(pending[key], dtype=np.float32)
+                        rows[slot] = row
+                        checksums.append(_row_checksum(row))
+                    rows.flush()
+
+                    now = time.time()
+                    self._conn.executemany(
+                        "INSERT INTO entries (key, slot, last_used, checksum) VALUES (?, ?, ?, ?)",
+                        [
+                            (key, slot, now, checksum)
+                            for key, slot, checksum in zip(new_keys, slots, checksums, strict=True)
+                        ],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self.writes += len(new_keys)
+        return len(new_keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get_statistics(self) -> dict:
+        """Get cache statistics (counters are for this process)."""
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model,
+            "dimensions": self.dimensions,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "size_bytes": self._vectors_path.stat().st_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Flush vectors and last-used times, and close the index."""
+        with self._lock:
+            if self._pending_touches:
+                try:
+                    self._flush_touches()
+                except sqlite3.OperationalError as e:
+                    logger.warning("embedding_cache_touch_failed", error=str(e))
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+                self._mapped_rows = 0
+            self._conn.close()
+
+
+# Process-wide caches keyed by (directory, model, dimensions)
+_caches: dict[tuple[str, str, int], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model: str, dimensions: int) -> EmbeddingCache | None:
+    """
+    Get the shared embedding cache for a model (singleton per process).
+
+    Args:
+        model: Embedding model name
+        dimensions: Embedding vector dimensions
+
+    Returns:
+        EmbeddingCache, or None if caching is disabled or the cache cannot be opened
+    """
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+
+    key = (settings.EMBEDDING_CACHE_DIR, model, dimensions)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                try:
+                    cache = EmbeddingCache(
+                        cache_dir=settings.EMBEDDING_CACHE_DIR,
+                        model=model,
+                        dimensions=dimensions,
+                        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+                    )
+                except Exception as e:
+                    # Fail-safe: embeddings still work without the cache
+                    logger.warning("embedding_cache_unavailable", error=str(e))
+                    return None
+                _caches[key] = cache
+    return cache
+
+
+def close_embedding_caches() -> None:
+    """Close all open embedding caches (for shutdown and tests)."""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.close()
+        _caches.clear()
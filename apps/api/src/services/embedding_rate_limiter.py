@@ -0,0 +1,182 @@
+"""
+Request packing and adaptive rate limiting for embedding batch jobs.
+
+Texts are packed into requests by estimated token count, and requests are
+paced by token buckets sized to the provider's token and request quotas.
+The buckets adapt to rate limit (429) responses: the refill rate is halved
+and refilling pauses for the Retry-After period, then the rate recovers
+additively as requests succeed.
+"""
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable
+
+CHARS_PER_TOKEN = 4  # Rough estimate: 1 token ~= 4 characters
+MIN_RATE_FRACTION = 0.05  # Backoff never drops below 5% of the quota
+RECOVERY_FRACTION = 0.05  # Each success restores 5% of the quota
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        Estimated token count (at least 1)
+    """
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def pack_batches(token_counts: list[int], max_items: int, max_tokens: int) -> list[range]:
+    """
+    Split items into consecutive batches within an item and token budget.
+
+    An item larger than max_tokens gets a batch of its own.
+
+    Args:
+        token_counts: Estimated tokens of each item, in order
+        max_items: Maximum items per batch
+        max_tokens: Maximum estimated tokens per batch
+
+    Returns:
+        Index ranges of the batches, covering every item in order
+    """
+    batches = []
+    start = 0
+    batch_tokens = 0
+    for index, count in enumerate(token_counts):
+        if index > start and (index - start >= max_items or batch_tokens + count > max_tokens):
+            batches.append(range(start, index))
+            start = index
+            batch_tokens = 0
+        batch_tokens += count
+    if start < len(token_counts):
+        batches.append(range(start, len(token_counts)))
+    return batches
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket whose refill rate backs off on rate limit errors.
+
+    The bucket holds up to one minute of quota. Waiters are served in FIFO
+    order. An amount larger than the capacity is granted once the bucket is
+    full (driving the level negative), so oversized requests cannot stall.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        """
+        Initialize the bucket full.
+
+        Args:
+            per_minute: Quota per minute (e.g. tokens or requests)
+            clock: Monotonic clock in seconds
+            sleep: Async sleep function
+        """
+        self.max_rate = per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        start = max(self._updated_at, self._paused_until)
+        if now > start:
+            self.level = min(self.capacity, self.level + (now - start) * self.rate)
+        self._updated_at = max(self._updated_at, now)
+
+    async def acquire(self, amount: float) -> None:
+        """
+        Wait until amount is available, then consume it.
+
+        Args:
+            amount: Quota to consume
+        """
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    needed = min(amount, self.capacity)
+                    if self.level >= needed:
+                        self.level -= amount
+                        return
+                    wait = (needed - self.level) / self.rate
+                await self._sleep(wait)
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or charge (negative) quota after the fact."""
+        self.level = min(self.capacity, self.level + amount)
+
+    def on_success(self) -> None:
+        """Recover the refill rate additively after a successful request."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_FRACTION)
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """
+        Back off after a rate limit error.
+
+        Halves the refill rate, empties the bucket and pauses refilling for
+        retry_after seconds.
+
+        Args:
+            retry_after: Seconds the provider asked us to wait, if known
+        """
+        self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+        now = self._clock()
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+
+class EmbeddingRateLimiter:
+    """Paces embedding requests against token and request quotas."""
+
+    def __init__(
+        self,
+        tokens_per_minute: int,
+        requests_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            tokens_per_minute: Provider token quota
+            requests_per_minute: Provider request quota
+            clock: Monotonic clock in seconds
+            sleep: Async sleep function
+        """
+        self.tokens = AdaptiveTokenBucket(tokens_per_minute, clock=clock, sleep=sleep)
+        self.requests = AdaptiveTokenBucket(requests_per_minute, clock=clock, sleep=sleep)
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait for quota for one request of estimated_tokens."""
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+    def on_success(self, estimated_tokens: int, used_tokens: int) -> None:
+        """Settle the token estimate with actual usage and recover the rates."""
+        self.tokens.adjust(estimated_tokens - used_tokens)
+        self.tokens.on_success()
+        self.requests.on_success()
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """Back off both quotas after a rate limit error."""
+        self.tokens.on_rate_limited(retry_after)
+        self.requests.on_rate_limited(retry_after)
@@ -2,8 +2,13 @@
 Embedding Service for generating OpenAI embeddings.
 
 This service provides async methods for generating embeddings using OpenAI's
-text-embedding-3-large model with batching and retry logic.
+text-embedding-3-large model with batching and retry logic. Vectors are looked
+up in the persistent embedding cache first, so unchanged texts are not re-embedded.
+
+Batch jobs pack texts into requests by token budget and keep a window of
+requests in flight, paced by an adaptive limiter for the provider quotas.
 """
+import asyncio
 from typing import TYPE_CHECKING
 
 from openai import APIConnectionError, APIError, AsyncOpenAI, RateLimitError
@@ -16,6 +21,8 @@ from tenacity import (
 
 from ..config import settings
 from ..utils.logging_config import get_logger
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .embedding_rate_limiter import EmbeddingRateLimiter, estimate_tokens, pack_batches
 
 if TYPE_CHECKING:
     from ..models.concept import Concept
@@ -28,34 +35,120 @@ EMBEDDING_MODEL = "text-embedding-3-large"
 EMBEDDING_DIMENSIONS = 3072
 MAX_BATCH_SIZE = 100  # OpenAI allows up to 2048, but we use 100 for safety
 MAX_EMBEDDING_TOKENS = 8000  # OpenAI limit for text-embedding-3-large
+MAX_BATCH_TOKENS = 8 * MAX_EMBEDDING_TOKENS  # Estimated token budget per batch request
+MAX_RATE_LIMIT_RETRIES = 6  # Rate limited attempts per batch before giving up
+MAX_API_ERROR_ATTEMPTS = 3  # Attempts per batch on connection and server errors
+
+
+def _retry_after_seconds(error: RateLimitError) -> float | None:
+    """Read the Retry-After delay of a rate limit response, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        milliseconds = headers.get("retry-after-ms")
+        if milliseconds is not None:
+            return float(milliseconds) / 1000
+        seconds = headers.get("retry-after")
+        return float(seconds) if seconds is not None else None
+    except (TypeError, ValueError):
+        return None
 
 
 class EmbeddingService:
     """
     Service for generating embeddings using OpenAI API.
 
-    Provides batch processing, retry logic with exponential backoff,
-    and proper error handling for rate limits and API errors.
+    Provides concurrent batch processing paced by an adaptive rate limiter,
+    retry logic with exponential backoff, proper error handling for rate
+    limits and API errors, and a content-addressed cache of previously
+    generated embeddings.
     """
 
-    def __init__(self, api_key: str | None = None):
+    cache: EmbeddingCache | None = None
+    batch_client: AsyncOpenAI | None = None
+    rate_limiter: EmbeddingRateLimiter | None = None
+    max_in_flight: int = settings.EMBEDDING_MAX_IN_FLIGHT
+    max_batch_tokens: int = MAX_BATCH_TOKENS
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: EmbeddingCache | None = None,
+        use_cache: bool = True,
+        model: str = EMBEDDING_MODEL,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        base_url: str | None = None,
+        client: AsyncOpenAI | None = None,
+        max_in_flight: int | None = None,
+        rate_limiter: EmbeddingRateLimiter | None = None,
+    ):
         """
         Initialize the Embedding Service.
 
         Args:
             api_key: OpenAI API key (defaults to settings.OPENAI_API_KEY)
+            cache: Embedding cache to use (defaults to the shared cache when
+                EMBEDDING_CACHE_ENABLED is set)
+            use_cache: Set False to always call the API
+            model: Embedding model name
+            dimensions: Embedding vector dimensions
+            base_url: API base URL (defaults to settings.OPENAI_API_BASE, e.g. the mock OpenAI service)
+            client: OpenAI client to use instead of creating one (for both
+                single and batch requests, with its own SDK retry setting)
+            max_in_flight: Concurrent batch requests (defaults to settings.EMBEDDING_MAX_IN_FLIGHT)
+            rate_limiter: Limiter to pace batch requests (defaults to one sized by
+                EMBEDDING_TOKENS_PER_MINUTE / EMBEDDING_REQUESTS_PER_MINUTE)
         """
         self.api_key = api_key or settings.OPENAI_API_KEY
-        self.client = AsyncOpenAI(api_key=self.api_key)
-        self.model = EMBEDDING_MODEL
-        self.dimensions = EMBEDDING_DIMENSIONS
+        self.client = client or AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=base_url or settings.OPENAI_API_BASE,
+        )
+        # Batch requests retry rate limits themselves so the limiter sees every
+        # 429; single texts keep the SDK's retries. An injected client is used as is.
+        self.batch_client = self.client if client else self.client.with_options(max_retries=0)
+        self.model = model
+        self.dimensions = dimensions
+        if max_in_flight is not None:
+            self.max_in_flight = max_in_flight
+        self.rate_limiter = rate_limiter
+        if not use_cache:
+            self.cache = None
+        elif cache is not None:
+            self.cache = cache
+        else:
+            self.cache = get_embedding_cache(self.model, self.dimensions)
+
+    def _get_rate_limiter(self) -> EmbeddingRateLimiter:
+        """Get the batch rate limiter, creating one for the configured quotas."""
+        if self.rate_limiter is None:
+            self.rate_limiter = EmbeddingRateLimiter(
+                tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+                requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+            )
+        return self.rate_limiter
+
+    async def _cache_get(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up texts in the cache (all misses if disabled or unavailable)."""
+        if self.cache is None or not texts:
+            return [None] * len(texts)
+        try:
+            return await asyncio.to_thread(self.cache.get_many, texts)
+        except Exception as e:
+            # Fail-safe: a broken cache must not break embedding
+            logger.warning("embedding_cache_read_failed", error=str(e))
+            return [None] * len(texts)
+
+    async def _cache_put(self, texts: list[str], embeddings: list[list[float]]) -> None:
+        """Store new embeddings in the cache, ignoring cache errors."""
+        if self.cache is None or not texts:
+            return
+        try:
+            await asyncio.to_thread(self.cache.put_many, texts, embeddings)
+        except Exception as e:
+            logger.warning("embedding_cache_write_failed", error=str(e))
 
-    @retry(
-        retry=retry_if_exception_type((RateLimitError, APIConnectionError, APIError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=60),
-        reraise=True,
-    )
     async def generate_embedding(self, text: str) -> list[float]:
         """
         Generate embedding for a single text.
@@ -70,12 +163,13 @@ class EmbeddingService:
             RateLimitError: If rate limit exceeded after retries
             APIError: If API error occurs after retries
         """
-        response = await self.client.embeddings.create(
-            model=self.model,
-            input=[text],
-            dimensions=self.dimensions
-        )
-        return response.data[0].embedding
+        cached = (await self._cache_get([text]))[0]
+        if cached is not None:
+            return cached
+
+        embedding = await self._embed_text(text)
+        await self._cache_put([text], [embedding])
+        return embedding
 
     @retry(
         retry=retry_if_exception_type((RateLimitError, APIConnectionError, APIError)),
@@ -83,24 +177,38 @@ class EmbeddingService:
         wait=wait_exponential(multiplier=1, min=2, max=60),
         reraise=True,
     )
+    async def _embed_text(self, text: str) -> list[float]:
+        """
+        Internal method to generate embedding for a single text with retry.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector (3072 dimensions)
+        """
+        response = await self.client.embeddings.create(
+            model=self.model,
+            input=[text],
+            dimensions=self.dimensions
+        )
+        return response.data[0].embedding
+
     async def _batch_embed_texts(self, texts: list[str]) -> tuple[list[list[float]], int]:
         """
-        Internal method to generate embeddings for a batch of texts with retry.
+        Internal method to generate embeddings for a batch of texts (single attempt).
 
         Args:
             texts: List of texts to embed (max 100)
 
         Returns:
             Tuple of (embeddings, tokens_used)
-
-        Raises:
-            RateLimitError: If rate limit exceeded after retries
-            APIError: If API error occurs after retries
         """
         if len(texts) > MAX_BATCH_SIZE:
             raise ValueError(f"Batch size {len(texts)} exceeds maximum {MAX_BATCH_SIZE}")
 
-        response = await self.client.embeddings.create(
+        client = self.batch_client or self.client
+        response = await client.embeddings.create(
             model=self.model,
             input=texts,
             dimensions=self.dimensions
@@ -111,6 +219,55 @@ class EmbeddingService:
 
         return embeddings, tokens_used
 
+    async def _embed_batch_with_retry(
+        self,
+        texts: list[str],
+        estimated_tokens: int,
+        limiter: EmbeddingRateLimiter,
+    ) -> tuple[list[list[float]], int]:
+        """
+        Embed a batch whose quota has been acquired, retrying through the limiter.
+
+        Rate limit errors back the limiter off (honoring Retry-After) and wait
+        for quota again; connection and server errors back off exponentially.
+
+        Args:
+            texts: List of texts to embed (max 100)
+            estimated_tokens: Estimated tokens of the batch (already acquired)
+            limiter: Rate limiter pacing the batch job
+
+        Returns:
+            Tuple of (embeddings, tokens_used)
+
+        Raises:
+            RateLimitError: If still rate limited after MAX_RATE_LIMIT_RETRIES
+            APIError: If API error occurs after MAX_API_ERROR_ATTEMPTS
+        """
+        rate_limited = 0
+        failed = 0
+        while True:
+            try:
+                embeddings, tokens = await self._batch_embed_texts(texts)
+            except RateLimitError as e:
+                rate_limited += 1
+                if rate_limited > MAX_RATE_LIMIT_RETRIES:
+                    raise
+                retry_after = _retry_after_seconds(e)
+                limiter.on_rate_limited(retry_after)
+                logger.warning("embedding_rate_limited", attempt=rate_limited, retry_after=retry_after)
+                await limiter.acquire(estimated_tokens)
+                continue
+            except (APIConnectionError, APIError) as e:
+                failed += 1
+                if failed >= MAX_API_ERROR_ATTEMPTS:
+                    raise
+                delay = min(60, 2 ** failed)
+                logger.warning("embedding_batch_retry", attempt=failed, delay=delay, error=str(e))
+                await asyncio.sleep(delay)
+                continue
+            limiter.on_success(estimated_tokens, tokens)
+            return embeddings, tokens
+
     async def batch_generate_embeddings(
         self,
         texts: list[str],
@@ -120,13 +277,20 @@ class EmbeddingService:
         """
         Generate embeddings for multiple texts in batches.
 
+        Cached texts are served from the embedding cache; only the remaining
+        unique texts are sent to the API. They are packed into requests of at
+        most batch_size texts and max_batch_tokens estimated tokens, with up to
+        max_in_flight requests running concurrently, paced by the rate limiter.
+        Results keep the input order.
+
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts per API call (default: 100)
+            batch_size: Maximum number of texts per API call (default: 100)
             progress_callback: Optional callback function(processed, total) for progress tracking
 
         Returns:
             Tuple of (list of embedding vectors, total tokens used)
+            (tokens count only texts sent to the API)
 
         Raises:
             ValueError: If batch_size exceeds MAX_BATCH_SIZE
@@ -134,39 +298,84 @@ class EmbeddingService:
         if batch_size > MAX_BATCH_SIZE:
             raise ValueError(f"Batch size {batch_size} exceeds maximum {MAX_BATCH_SIZE}")
 
-        all_embeddings = []
+        all_embeddings: list[list[float] | None] = await self._cache_get(texts)
         total_tokens = 0
-        processed_count = 0
-
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
 
+        # Unique texts still needing an embedding, with their positions
+        missing: dict[str, list[int]] = {}
+        for index, (text, embedding) in enumerate(zip(texts, all_embeddings, strict=True)):
+            if embedding is None:
+                missing.setdefault(text, []).append(index)
+        missing_texts = list(missing)
+
+        cache_hits = len(texts) - sum(len(positions) for positions in missing.values())
+        processed_count = cache_hits
+        if progress_callback and cache_hits:
+            progress_callback(processed_count, len(texts))
+
+        # Pack batches by token budget
+        token_counts = [estimate_tokens(text) for text in missing_texts]
+        batches = pack_batches(token_counts, batch_size, self.max_batch_tokens)
+        limiter = self._get_rate_limiter()
+        window = asyncio.Semaphore(max(1, self.max_in_flight))
+
+        async def embed_batch(batch_number: int, batch_range: range, estimated_tokens: int) -> None:
+            nonlocal processed_count, total_tokens
+            batch = missing_texts[batch_range.start:batch_range.stop]
             try:
-                embeddings, tokens = await self._batch_embed_texts(batch)
-                all_embeddings.extend(embeddings)
-                total_tokens += tokens
-                processed_count += len(batch)
-
-                # Call progress callback if provided
-                if progress_callback:
-                    progress_callback(processed_count, len(texts))
-
-                logger.debug(
-                    "embedded_batch",
-                    batch_number=i // batch_size + 1,
-                    processed=processed_count,
-                    total=len(texts),
-                    tokens=tokens
-                )
-
+                embeddings, tokens = await self._embed_batch_with_retry(batch, estimated_tokens, limiter)
             except (RateLimitError, APIError) as e:
-                logger.error("batch_embedding_failed", batch_start_index=i, error=str(e))
+                logger.error("batch_embedding_failed", batch_start_index=batch_range.start, error=str(e))
                 raise
+            finally:
+                window.release()
+
+            for text, embedding in zip(batch, embeddings, strict=True):
+                for position in missing[text]:
+                    all_embeddings[position] = embedding
+                processed_count += len(missing[text])
+            total_tokens += tokens
+
+            # Store each batch as it completes, so interrupted runs keep progress
+            await self._cache_put(batch, embeddings)
+
+            # Call progress callback if provided
+            if progress_callback:
+                progress_callback(processed_count, len(texts))
+
+            logger.debug(
+                "embedded_batch",
+                batch_number=batch_number,
+                processed=processed_count,
+                total=len(texts),
+                tokens=tokens
+            )
+
+        # Requests are started in batch order; a full window or an exhausted
+        # quota holds back the next one
+        try:
+            async with asyncio.TaskGroup() as tasks:
+                for batch_number, batch_range in enumerate(batches, start=1):
+                    estimated_tokens = sum(token_counts[batch_range.start:batch_range.stop])
+                    await window.acquire()
+                    try:
+                        await limiter.acquire(estimated_tokens)
+                    except BaseException:
+                        window.release()
+                        raise
+                    tasks.create_task(embed_batch(batch_number, batch_range, estimated_tokens))
+        except* Exception as group:
+            # Raise a lone failure (or the first of several API errors) unwrapped
+            # so callers' except clauses still match
+            errors = group.exceptions
+            if len(errors) == 1 or all(isinstance(e, APIError) for e in errors):
+                raise errors[0] from None
+            raise
 
         logger.info(
             "embedding_generation_complete",
             embeddings_count=len(all_embeddings),
+            cache_hits=cache_hits,
             total_tokens=total_tokens
         )
 
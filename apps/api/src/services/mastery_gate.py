@@ -6,8 +6,10 @@ This service checks if prerequisites are mastered before allowing
 access to advanced concepts.
 """
 import time
+from typing import TYPE_CHECKING
 from uuid import UUID
 
+import numpy as np
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,6 +19,7 @@ from src.models.concept import Concept
 from src.models.concept_unlock_event import ConceptUnlockEvent
 from src.repositories.belief_repository import BeliefRepository
 from src.repositories.concept_repository import ConceptRepository
+from src.schemas.belief_state import BeliefUpdateResult
 from src.schemas.mastery_gate import (
     BlockingPrerequisite,
     BulkUnlockStatusResponse,
@@ -27,6 +30,10 @@ from src.schemas.mastery_gate import (
     RecentUnlocksResponse,
 )
 
+if TYPE_CHECKING:
+    from src.services.belief_snapshot_cache import BeliefSnapshotCache
+    from src.services.prerequisite_graph_service import CourseGraph, PrerequisiteGraphService
+
 logger = structlog.get_logger(__name__)
 
 # Default configuration
@@ -47,11 +54,27 @@ class MasteryGateService:
         belief_repository: BeliefRepository,
         concept_repository: ConceptRepository,
         config: MasteryGateConfig | None = None,
+        belief_snapshots: "BeliefSnapshotCache | None" = None,
+        prerequisite_graph: "PrerequisiteGraphService | None" = None,
     ):
         self.session = session
         self.belief_repository = belief_repository
         self.concept_repository = concept_repository
         self.config = config or DEFAULT_CONFIG
+        self.belief_snapshots = belief_snapshots
+        self.prerequisite_graph = prerequisite_graph
+
+    async def _get_beliefs(self, user_id: UUID) -> dict[UUID, BeliefState]:
+        """Get user beliefs keyed by concept_id, from the snapshot cache if configured."""
+        if self.belief_snapshots is not None:
+            return await self.belief_snapshots.get_beliefs(user_id, self.belief_repository)
+        return await self.belief_repository.get_beliefs_as_dict(user_id)
+
+    async def _get_graphs(self, concept_ids: list[UUID]) -> dict[UUID, "CourseGraph"]:
+        """Get cached course graphs keyed by concept_id (empty without a graph cache)."""
+        if self.prerequisite_graph is None:
+            return {}
+        return await self.prerequisite_graph.get_graphs_for_concepts(self.session, concept_ids)
 
     async def check_prerequisites_mastered(
         self,
@@ -70,15 +93,23 @@ class MasteryGateService:
         """
         start_time = time.perf_counter()
 
-        # Get concept details
-        concept = await self.concept_repository.get_by_id(concept_id)
-        if not concept:
-            raise ValueError(f"Concept {concept_id} not found")
-
-        # Get prerequisites with strength
-        prereqs_with_strength = await self.concept_repository.get_prerequisites_with_strength(
-            concept_id
-        )
+        graph = (await self._get_graphs([concept_id])).get(concept_id)
+        if graph is not None:
+            # Concept and prerequisites from the cached graph (no queries)
+            i = graph.index[concept_id]
+            concept_name = graph.concepts[i].name
+            prereqs_with_strength = sorted(graph.prerequisites_of(i), key=lambda p: -p[1])
+        else:
+            # Get concept details
+            concept = await self.concept_repository.get_by_id(concept_id)
+            if not concept:
+                raise ValueError(f"Concept {concept_id} not found")
+            concept_name = concept.name
+
+            # Get prerequisites with strength
+            prereqs_with_strength = await self.concept_repository.get_prerequisites_with_strength(
+                concept_id
+            )
 
         # If no prerequisites, concept is unlocked
         if not prereqs_with_strength:
@@ -90,7 +121,7 @@ class MasteryGateService:
             )
             return GateCheckResult(
                 concept_id=concept_id,
-                concept_name=concept.name,
+                concept_name=concept_name,
                 is_unlocked=True,
                 blocking_prerequisites=[],
                 closest_to_unlock=None,
@@ -99,7 +130,7 @@ class MasteryGateService:
             )
 
         # Get user beliefs for all prerequisites
-        beliefs = await self.belief_repository.get_beliefs_as_dict(user_id)
+        beliefs = await self._get_beliefs(user_id)
 
         # Check each prerequisite
         blocking = []
@@ -173,7 +204,7 @@ class MasteryGateService:
 
         return GateCheckResult(
             concept_id=concept_id,
-            concept_name=concept.name,
+            concept_name=concept_name,
             is_unlocked=len(blocking) == 0,
             blocking_prerequisites=blocking,
             closest_to_unlock=closest,
@@ -181,16 +212,120 @@ class MasteryGateService:
             estimated_questions_to_unlock=estimated_questions,
         )
 
+    async def get_locked_concept_ids(
+        self,
+        user_id: UUID,
+        concept_ids: set[UUID],
+        beliefs: dict[UUID, BeliefState] | None = None,
+    ) -> set[UUID]:
+        """
+        Get the subset of concepts that are locked, evaluated in one pass.
+
+        Gives the same answer as calling check_prerequisites_mastered for each
+        concept, but evaluates concepts held by the cached prerequisite graph
+        with array operations (other concepts with a single prerequisite
+        query) and loads user beliefs at most once. Only 'required'
+        prerequisites gate a concept.
+
+        Args:
+            user_id: User UUID
+            concept_ids: Set of concept IDs to check
+            beliefs: Optional pre-loaded beliefs keyed by concept_id
+
+        Returns:
+            Set of locked concept UUIDs
+        """
+        if not concept_ids:
+            return set()
+
+        start_time = time.perf_counter()
+
+        locked: set[UUID] = set()
+
+        # Concepts in the cached graph: one vectorized pass per course
+        graphs = await self._get_graphs(list(concept_ids))
+        by_course: dict[UUID, list[UUID]] = {}
+        for concept_id, graph in graphs.items():
+            by_course.setdefault(graph.course_id, []).append(concept_id)
+
+        for course_concept_ids in by_course.values():
+            graph = graphs[course_concept_ids[0]]
+            indices = np.array([graph.index[c] for c in course_concept_ids], dtype=np.int32)
+
+            # Concepts without required prerequisites are never locked
+            if not graph.locked_mask(np.zeros(graph.concept_count, dtype=bool))[indices].any():
+                continue
+            if beliefs is None:
+                beliefs = await self._get_beliefs(user_id)
+
+            # Evaluate the gate only for the prerequisites of the requested concepts
+            mastered = np.zeros(graph.concept_count, dtype=bool)
+            for j in graph.prerequisite_indices_of(indices).tolist():
+                belief = beliefs.get(graph.concept_ids[j])
+                mastered[j] = belief is not None and self._meets_mastery_gate(belief)
+
+            is_locked = graph.locked_mask(mastered)[indices]
+            locked.update(c for c, flag in zip(course_concept_ids, is_locked, strict=True) if flag)
+
+        # Concepts outside the cached graph: one prerequisite query
+        remaining = [c for c in concept_ids if c not in graphs]
+        prereqs = (
+            await self.concept_repository.get_prerequisites_for_concepts(remaining)
+            if remaining
+            else []
+        )
+
+        # Build required prerequisite map: concept_id -> list of prereq_concept_ids
+        required_map: dict[UUID, list[UUID]] = {}
+        for prereq in prereqs:
+            if prereq.relationship_type != "required":
+                continue
+            if prereq.concept_id not in required_map:
+                required_map[prereq.concept_id] = []
+            required_map[prereq.concept_id].append(prereq.prerequisite_concept_id)
+
+        if required_map:
+            if beliefs is None:
+                beliefs = await self._get_beliefs(user_id)
+
+            # Each prerequisite is evaluated once even if shared by many concepts
+            mastered: dict[UUID, bool] = {}
+            for concept_id, prereq_ids in required_map.items():
+                for prereq_id in prereq_ids:
+                    if prereq_id not in mastered:
+                        belief = beliefs.get(prereq_id)
+                        mastered[prereq_id] = (
+                            belief is not None and self._meets_mastery_gate(belief)
+                        )
+                    if not mastered[prereq_id]:
+                        locked.add(concept_id)
+                        break
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug(
+            "bulk_lock_check_complete",
+            user_id=str(user_id),
+            total_concepts=len(concept_ids),
+            locked=len(locked),
+            duration_ms=round(duration_ms, 2),
+        )
+
+        return locked
+
     def _meets_mastery_gate(self, belief: BeliefState) -> bool:
         """Check if a belief state meets the mastery gate threshold."""
+        return self._meets_gate_values(belief.mean, belief.confidence, belief.response_count)
+
+    def _meets_gate_values(self, mean: float, confidence: float, response_count: int) -> bool:
+        """Check if belief statistics meet the mastery gate threshold."""
         # Check minimum responses
-        if belief.response_count < self.config.min_responses_for_gate:
+        if response_count < self.config.min_responses_for_gate:
             return False
 
         # Check mastery and confidence thresholds
         return (
-            belief.mean >= self.config.prerequisite_mastery_threshold
-            and belief.confidence >= self.config.prerequisite_confidence_threshold
+            mean >= self.config.prerequisite_mastery_threshold
+            and confidence >= self.config.prerequisite_confidence_threshold
         )
 
     def _calculate_progress(self, belief: BeliefState) -> float:
@@ -244,29 +379,44 @@ class MasteryGateService:
         """
         start_time = time.perf_counter()
 
-        # Build query for concepts
-        query = select(Concept).where(Concept.course_id == course_id)
-        if knowledge_area_id:
-            query = query.where(Concept.knowledge_area_id == knowledge_area_id)
-        query = query.order_by(Concept.name)
-
-        result = await self.session.execute(query)
-        concepts = list(result.scalars().all())
-
-        # Get all prerequisites for the course
-        all_prereqs = await self.concept_repository.get_all_prerequisites_for_course(
-            course_id
-        )
-
-        # Build prerequisite map: concept_id -> list of prereq_concept_ids
         prereq_map: dict[UUID, list[UUID]] = {}
-        for prereq in all_prereqs:
-            if prereq.concept_id not in prereq_map:
-                prereq_map[prereq.concept_id] = []
-            prereq_map[prereq.concept_id].append(prereq.prerequisite_concept_id)
+        if self.prerequisite_graph is not None:
+            # Concepts and prerequisites from the cached graph
+            graph = await self.prerequisite_graph.get_graph(self.session, course_id)
+            concepts = sorted(
+                (
+                    c for c in graph.concepts
+                    if not knowledge_area_id or c.knowledge_area_id == knowledge_area_id
+                ),
+                key=lambda c: c.name,
+            )
+            for concept in concepts:
+                prereq_ids = self.prerequisite_graph.get_prerequisite_ids(concept.id)
+                if prereq_ids:
+                    prereq_map[concept.id] = prereq_ids
+        else:
+            # Build query for concepts
+            query = select(Concept).where(Concept.course_id == course_id)
+            if knowledge_area_id:
+                query = query.where(Concept.knowledge_area_id == knowledge_area_id)
+            query = query.order_by(Concept.name)
+
+            result = await self.session.execute(query)
+            concepts = list(result.scalars().all())
+
+            # Get all prerequisites for the course
+            all_prereqs = await self.concept_repository.get_all_prerequisites_for_course(
+                course_id
+            )
+
+            # Build prerequisite map: concept_id -> list of prereq_concept_ids
+            for prereq in all_prereqs:
+                if prereq.concept_id not in prereq_map:
+                    prereq_map[prereq.concept_id] = []
+                prereq_map[prereq.concept_id].append(prereq.prerequisite_concept_id)
 
         # Get user beliefs
-        beliefs = await self.belief_repository.get_beliefs_as_dict(user_id)
+        beliefs = await self._get_beliefs(user_id)
 
         # Check each concept
         statuses = []
@@ -446,6 +596,153 @@ class MasteryGateService:
             total_unlocked=total,
         )
 
+    def get_newly_mastered_concept_ids(
+        self,
+        updates: list[BeliefUpdateResult],
+        beliefs: dict[UUID, BeliefState],
+    ) -> set[UUID]:
+        """
+        Get the concepts whose belief crossed the mastery gate in an update.
+
+        Args:
+            updates: Belief update results of one answer submission
+            beliefs: User beliefs after the update, keyed by concept_id
+
+        Returns:
+            Set of concept IDs that meet the gate now but did not before
+        """
+        newly_mastered: set[UUID] = set()
+        for update in updates:
+            belief = beliefs.get(update.concept_id)
+            if belief is None or not self._meets_mastery_gate(belief):
+                continue
+            # Only direct updates count a response
+            old_response_count = belief.response_count - (1 if update.is_direct else 0)
+            old_total = update.old_alpha + update.old_beta
+            if not self._meets_gate_values(
+                update.old_alpha / old_total, old_total / (old_total + 2), old_response_count
+            ):
+                newly_mastered.add(update.concept_id)
+        return newly_mastered
+
+    async def record_unlocks_for_updates(
+        self,
+        user_id: UUID,
+        updates: list[BeliefUpdateResult],
+    ) -> list[ConceptUnlockEvent]:
+        """
+        Record unlock events caused by one answer submission's belief updates.
+
+        Call after the updates are flushed (and written through to the belief
+        snapshot). Beliefs are loaded only if some update reaches the gate's
+        mastery and confidence thresholds.
+
+        Args:
+            user_id: User UUID
+            updates: Belief update results of the submission
+
+        Returns:
+            List of new unlock events created
+        """
+        candidates = [
+            update for update in updates
+            if self._meets_gate_values(
+                update.new_alpha / (update.new_alpha + update.new_beta),
+                (update.new_alpha + update.new_beta) / (update.new_alpha + update.new_beta + 2),
+                self.config.min_responses_for_gate,
+            )
+        ]
+        if not candidates:
+            return []
+
+        beliefs = await self._get_beliefs(user_id)
+        mastered = self.get_newly_mastered_concept_ids(candidates, beliefs)
+        return await self.detect_and_record_unlocks(user_id, mastered, beliefs=beliefs)
+
+    async def detect_and_record_unlocks(
+        self,
+        user_id: UUID,
+        mastered_concept_ids: set[UUID],
+        beliefs: dict[UUID, BeliefState] | None = None,
+    ) -> list[ConceptUnlockEvent]:
+        """
+        Record unlock events for dependents unlocked by newly mastered concepts.
+
+        Dependents are read from the cached prerequisite graph (one query for
+        concepts outside it), gated in one bulk pass over the user's beliefs,
+        checked against existing events with one IN query and recorded with
+        a single flush.
+
+        Args:
+            user_id: User UUID
+            mastered_concept_ids: Concepts whose mastery just crossed the gate
+            beliefs: Optional pre-loaded user beliefs keyed by concept_id
+
+        Returns:
+            List of new unlock events created
+        """
+        if not mastered_concept_ids:
+            return []
+
+        start_time = time.perf_counter()
+
+        # Dependent concept -> prerequisite that triggered its unlock
+        triggers: dict[UUID, UUID] = {}
+        graphs = await self._get_graphs(list(mastered_concept_ids))
+        for concept_id, graph in graphs.items():
+            i = graph.index[concept_id]
+            for j in graph.dependent_indices[graph.dependent_slice(i)].tolist():
+                triggers.setdefault(graph.concept_ids[j], concept_id)
+
+        remaining = [c for c in mastered_concept_ids if c not in graphs]
+        if remaining:
+            links = await self.concept_repository.get_dependents_for_concepts(remaining)
+            for link in links:
+                triggers.setdefault(link.concept_id, link.prerequisite_concept_id)
+
+        if not triggers:
+            return []
+
+        if beliefs is None:
+            beliefs = await self._get_beliefs(user_id)
+        locked = await self.get_locked_concept_ids(user_id, set(triggers), beliefs=beliefs)
+        unlocked = [c for c in triggers if c not in locked]
+        if not unlocked:
+            return []
+
+        # Skip concepts already recorded as unlocked
+        result = await self.session.execute(
+            select(ConceptUnlockEvent.concept_id)
+            .where(ConceptUnlockEvent.user_id == user_id)
+            .where(ConceptUnlockEvent.concept_id.in_(unlocked))
+        )
+        recorded = set(result.scalars().all())
+
+        events = [
+            ConceptUnlockEvent(
+                user_id=user_id,
+                concept_id=concept_id,
+                prerequisite_concept_id=triggers[concept_id],
+            )
+            for concept_id in unlocked
+            if concept_id not in recorded
+        ]
+        if events:
+            self.session.add_all(events)
+            await self.session.flush()
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            "unlock_detection_complete",
+            user_id=str(user_id),
+            mastered_concepts=len(mastered_concept_ids),
+            dependents_checked=len(triggers),
+            new_unlocks=len(events),
+            duration_ms=round(duration_ms, 2),
+        )
+
+        return events
+
     async def check_and_record_unlocks(
         self,
         user_id: UUID,
@@ -463,30 +760,4 @@ class MasteryGateService:
         Returns:
             List of new unlock events created
         """
-        # Get concepts that depend on this concept
-        dependents = await self.concept_repository.get_dependents(updated_concept_id)
-
-        new_unlocks = []
-        for dependent in dependents:
-            # Check if this concept is now unlocked
-            gate_result = await self.check_prerequisites_mastered(
-                user_id, dependent.id
-            )
-
-            if gate_result.is_unlocked:
-                # Check if already recorded
-                existing = await self.session.execute(
-                    select(ConceptUnlockEvent)
-                    .where(ConceptUnlockEvent.user_id == user_id)
-                    .where(ConceptUnlockEvent.concept_id == dependent.id)
-                )
-                if existing.scalar_one_or_none() is None:
-                    # Record new unlock
-                    event = await self.record_unlock_event(
-                        user_id=user_id,
-                        concept_id=dependent.id,
-                        triggering_prereq_id=updated_concept_id,
-                    )
-                    new_unlocks.append(event)
-
-        return new_unlocks
+        return await self.detect_and_record_unlocks(user_id, {updated_concept_id})
@@ -0,0 +1,292 @@
+"""
+Next Question Prefetch Service
+
+Selects the following question while the learner is answering the current
+one. When next-question serves a question, a background task selects the
+best next question for both a correct and an incorrect answer, starting
+from the beliefs the request served the question with (advanced with
+QuestionSelector._simulate_update). Answer submission records
+the outcome, and the following next-question call serves the matching
+staged question instead of running selection.
+
+A staged question is only served if the session has advanced by exactly the
+answered question, the strategy is unchanged and the course question pool has
+not been reloaded; otherwise next-question selects as usual. Entries live in
+the process that served the question, so a request routed to another API
+worker is a miss.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.utils.latency_stats import TaskLatencyStats
+
+if TYPE_CHECKING:
+    from src.models.question import Question
+    from src.models.quiz_session import QuizSession
+    from src.services.question_selector import QuestionSelector
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(slots=True)
+class StagedNextQuestion:
+    """Speculative next questions for a session, one per answer outcome."""
+    served_question_id: UUID
+    expected_total_questions: int
+    strategy: str
+    pool: Sequence[Any]
+    created_at: float = field(default_factory=time.time)
+    task: asyncio.Task | None = None
+    branches: dict[bool, tuple["Question | None", float, bool]] | None = None
+    outcome: bool | None = None
+
+
+class NextQuestionPrefetcher:
+    """
+    Process-wide staging area for speculative next questions.
+
+    Features:
+    - Both outcomes selected in a background task with its own DB session
+    - Outcome recorded on answer submission (resolve)
+    - Validated lookup on next-question (take)
+    - LRU bound on staged sessions, TTL on entries
+    """
+
+    _instance: Optional["NextQuestionPrefetcher"] = None
+    _lock = asyncio.Lock()
+
+    def __init__(
+        self,
+        max_sessions: int | None = None,
+        ttl_seconds: int | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ):
+        self.max_sessions = max_sessions or settings.NEXT_QUESTION_PREFETCH_MAX_SESSIONS
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.NEXT_QUESTION_PREFETCH_TTL_SECONDS
+        )
+        if session_factory is None:
+            from src.db.session import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.staged: OrderedDict[UUID, StagedNextQuestion] = OrderedDict()
+
+        # Statistics
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stats = TaskLatencyStats()
+
+    @classmethod
+    async def get_instance(cls) -> "NextQuestionPrefetcher":
+        """Get singleton instance."""
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def reset_instance(cls) -> None:
+        """Cancel pending selections and reset the singleton."""
+        async with cls._lock:
+            if cls._instance is not None:
+                await cls._instance.clear()
+            cls._instance = None
+
+    def stage(
+        self,
+        user_id: UUID,
+        session: "QuizSession",
+        question: "Question",
+        strategy: str,
+        pool: Sequence["Question"],
+        question_selector: "QuestionSelector",
+        beliefs: dict[UUID, Any],
+    ) -> None:
+        """
+        Start selecting the questions to serve after `question`.
+
+        The beliefs must be the ones `question` was selected with: read later,
+        they could already include the answer's update, which the branches
+        would then apply a second time.
+
+        Args:
+            user_id: User UUID
+            session: Quiz session the question was served in
+            question: Question just served
+            strategy: Selection strategy used for the session
+            pool: Course question pool the question was selected from
+            question_selector: Request selector (its parameters are reused)
+            beliefs: User's beliefs by concept when `question` was served
+        """
+        self._drop(session.id)
+
+        target_concept_ids = (
+            [UUID(cid) for cid in session.target_concept_ids]
+            if session.target_concept_ids
+            else None
+        )
+        entry = StagedNextQuestion(
+            served_question_id=question.id,
+            expected_total_questions=session.total_questions + 1,
+            strategy=strategy,
+            pool=pool,
+        )
+        entry.task = asyncio.create_task(
+            self._select_branches(
+                entry,
+                user_id=user_id,
+                session_id=session.id,
+                question=question,
+                knowledge_area_filter=session.knowledge_area_filter,
+                target_concept_ids=target_concept_ids,
+                question_selector=question_selector,
+                beliefs=beliefs,
+            ),
+            name=f"next-question-prefetch-{session.id}",
+        )
+
+        self.staged[session.id] = entry
+        while len(self.staged) > self.max_sessions:
+            self._drop(next(iter(self.staged)))
+
+    async def _select_branches(
+        self,
+        entry: StagedNextQuestion,
+        user_id: UUID,
+        session_id: UUID,
+        question: "Question",
+        knowledge_area_filter: str | None,
+        target_concept_ids: list[UUID] | None,
+        question_selector: "QuestionSelector",
+        beliefs: dict[UUID, Any],
+    ) -> None:
+        """Select the next question for both outcomes and store them on the entry."""
+        start_time = time.perf_counter()
+        try:
+            async with self.session_factory() as db:
+                selector = question_selector.with_session(db)
+                entry.branches = await selector.select_next_questions_for_outcomes(
+                    user_id=user_id,
+                    session_id=session_id,
+                    question=question,
+                    beliefs=beliefs,
+                    available_questions=list(entry.pool),
+                    strategy=entry.strategy,
+                    knowledge_area_filter=knowledge_area_filter,
+                    target_concept_ids=target_concept_ids,
+                )
+        except Exception as e:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self.stats.record(duration_ms, success=False)
+            logger.warning(
+                "next_question_prefetch_failed",
+                session_id=str(session_id),
+                question_id=str(question.id),
+                error=str(e),
+            )
+            return
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        self.stats.record(duration_ms)
+        logger.debug(
+            "next_question_prefetched",
+            session_id=str(session_id),
+            question_id=str(question.id),
+            duration_ms=round(duration_ms, 2),
+        )
+
+    def resolve(self, session_id: UUID, question_id: UUID, is_correct: bool) -> None:
+        """
+        Record the outcome of the answer to a staged session's served question.
+
+        Args:
+            session_id: Quiz session UUID
+            question_id: Answered question UUID
+            is_correct: Whether the answer was correct
+        """
+        entry = self.staged.get(session_id)
+        if entry is not None and entry.served_question_id == question_id:
+            entry.outcome = is_correct
+
+    def take(
+        self,
+        session_id: UUID,
+        total_questions: int,
+        strategy: str,
+        pool: Sequence["Question"],
+    ) -> tuple["Question", float, bool] | None:
+        """
+        Take the staged next question for a session, if still valid.
+
+        Args:
+            session_id: Quiz session UUID
+            total_questions: Questions answered in the session so far
+            strategy: Selection strategy for this request
+            pool: Current course question pool
+
+        Returns:
+            (question, info_gain, focus_expanded), or None on a miss
+        """
+        entry = self.staged.pop(session_id, None)
+        staged = None
+        if (
+            entry is not None
+            and entry.outcome is not None
+            and entry.branches is not None
+            and entry.expected_total_questions == total_questions
+            and entry.strategy == strategy
+            and entry.pool is pool
+            and time.time() - entry.created_at < self.ttl_seconds
+        ):
+            staged = entry.branches[entry.outcome]
+            if staged[0] is None:
+                staged = None
+
+        if entry is not None and entry.task is not None and not entry.task.done():
+            entry.task.cancel()
+
+        if staged is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return staged
+
+    def _drop(self, session_id: UUID) -> None:
+        """Drop a session's entry, cancelling its selection if still running."""
+        entry = self.staged.pop(session_id, None)
+        if entry is not None and entry.task is not None and not entry.task.done():
+            entry.task.cancel()
+
+    async def clear(self) -> None:
+        """Drop all entries and wait for cancelled selections to finish."""
+        tasks = [entry.task for entry in self.staged.values() if entry.task is not None]
+        for session_id in list(self.staged):
+            self._drop(session_id)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_statistics(self) -> dict:
+        """Get staging counters and selection latency statistics."""
+        total = self.hits + self.misses
+        return {
+            "staged": len(self.staged),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "selections": self.stats.to_dict(),
+        }
+
+
+async def get_next_question_prefetcher() -> NextQuestionPrefetcher:
+    """FastAPI dependency for the next question prefetcher."""
+    return await NextQuestionPrefetcher.get_instance()
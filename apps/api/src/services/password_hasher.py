@@ -0,0 +1,181 @@
+"""
+Password hashing off the event loop.
+
+bcrypt (cost 12) takes ~250 ms of CPU per hash or verify. Run inline in an
+async handler it blocks the event loop, stalling every other request on the
+worker. PasswordHasher runs hash_password/verify_password on a thread or
+process pool, with at most PASSWORD_HASH_WORKERS operations in flight; extra
+callers wait on an asyncio semaphore, and the wait is recorded as queue time.
+"""
+import asyncio
+import logging
+import secrets
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.config import settings
+from src.utils.auth import hash_password, verify_password
+from src.utils.latency_stats import TaskLatencyStats
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+
+class PasswordHasher:
+    """
+    Awaitable bcrypt hashing on a bounded worker pool.
+
+    Features:
+    - Thread pool (bcrypt releases the GIL) or process pool
+    - Concurrency cap: at most `workers` operations run at once
+    - Queue-time and run-time statistics per operation
+    - Dummy verification against a pool-generated hash for unknown users,
+      so failed logins take as long as real ones
+    """
+
+    _instance: Optional["PasswordHasher"] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self, workers: int | None = None, executor_type: str | None = None):
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        self.executor_type = executor_type or settings.PASSWORD_HASH_EXECUTOR
+        if self.executor_type not in (EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"Unknown password hash executor: {self.executor_type}")
+
+        self._executor: Executor | None = None
+        self._semaphore = asyncio.Semaphore(self.workers)
+        self._dummy_hash: str | None = None
+
+        # Statistics
+        self.waiting: int = 0
+        self.queue_stats = TaskLatencyStats()
+        self.run_stats: dict[str, TaskLatencyStats] = {}
+
+    @classmethod
+    async def get_instance(cls) -> "PasswordHasher":
+        """Get singleton instance (its dummy hash is generated before it is returned)."""
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    instance = cls()
+                    await instance.prepare_dummy_hash()
+                    cls._instance = instance
+        return cls._instance
+
+    @classmethod
+    async def reset_instance(cls) -> None:
+        """Shut down and reset the singleton."""
+        async with cls._lock:
+            if cls._instance is not None:
+                cls._instance.shutdown()
+            cls._instance = None
+
+    def _get_executor(self) -> Executor:
+        """Create the worker pool on first use."""
+        if self._executor is None:
+            if self.executor_type == EXECUTOR_PROCESS:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, fn, *args: Any) -> Any:
+        """Run fn on the pool once a worker slot is free, recording timings."""
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            started_at = time.perf_counter()
+            queue_ms = (started_at - queued_at) * 1000
+            self.queue_stats.record(queue_ms)
+            if queue_ms > settings.PASSWORD_HASH_QUEUE_WARNING_MS:
+                logger.warning(
+                    f"Password {operation} waited {queue_ms:.0f}ms for a worker "
+                    f"({self.waiting} still waiting)"
+                )
+
+            loop = asyncio.get_running_loop()
+            success = False
+            try:
+                result = await loop.run_in_executor(self._get_executor(), fn, *args)
+                success = True
+            finally:
+                run_ms = (time.perf_counter() - started_at) * 1000
+                stats = self.run_stats.get(operation)
+                if stats is None:
+                    stats = self.run_stats[operation] = TaskLatencyStats()
+                stats.record(run_ms, success=success)
+            return result
+        finally:
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password on the worker pool.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            Hashed password string
+        """
+        return await self._run("hash", hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against its hash on the worker pool.
+
+        Args:
+            plain_password: Plain text password to verify
+            hashed_password: Hashed password from database
+
+        Returns:
+            True if password matches, False otherwise
+        """
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    async def prepare_dummy_hash(self) -> None:
+        """
+        Generate the hash verify_dummy checks against, if not done yet.
+
+        The dummy hash is generated with the current hashing settings, so its
+        cost matches stored hashes. get_instance calls this before the hasher
+        is used, so no login pays for generating it.
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash(secrets.token_urlsafe(32))
+
+    async def verify_dummy(self, plain_password: str) -> None:
+        """
+        Spend one verification's worth of work for a user that does not exist.
+
+        Args:
+            plain_password: Submitted password
+        """
+        await self.prepare_dummy_hash()
+        await self.verify(plain_password, self._dummy_hash)
+
+    def get_statistics(self) -> dict:
+        """Get pool configuration, queue-time and run-time statistics."""
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "waiting": self.waiting,
+            "queue": self.queue_stats.to_dict(),
+            "operations": {name: stats.to_dict() for name, stats in self.run_stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool (running operations finish in the background)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -2,22 +2,33 @@
 Prerequisite Graph Service
 
 Provides in-memory caching of the prerequisite graph for fast BKT lookups.
-Loaded on application startup and provides O(1) prerequisite lookups.
+Loaded on application startup with a single bulk query. Each course is held
+in compact arrays: concept UUIDs map to integer indices, prerequisites and
+dependents are CSR adjacency arrays, and the transitive closure is
+precomputed as a packed bitset matrix, so ancestor, descendant and mastery
+checks are vectorized bit operations. Course graphs are reloaded only when
+the course's prerequisite graph version changes.
 """
 import asyncio
 import logging
+import sys
 import time
-from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID
 
-import networkx as nx
+import numpy as np
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
+from src.utils.content_version import get_prerequisite_graph_version
+
 logger = logging.getLogger(__name__)
 
+REQUIRED_RELATIONSHIP = "required"
+
 
 @dataclass
 class CachedConcept:
@@ -37,35 +48,363 @@ class CachedPrerequisite:
     relationship_type: str
 
 
+def _csr(rows: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build CSR row pointers for edges grouped by row.
+
+    Returns:
+        Tuple of (indptr, order) where order sorts the edges by row
+    """
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, order
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Concatenate the CSR neighbour lists of several rows."""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return indices[:0]
+    # Position of each gathered edge: its row start plus its offset within the row
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return indices[np.repeat(starts, counts) + offsets]
+
+
+def _bit_masks(indices: np.ndarray) -> np.ndarray:
+    """Byte masks of indices in little-endian packed bit rows."""
+    return np.left_shift(1, indices & 7).astype(np.uint8)
+
+
+@dataclass(frozen=True, slots=True)
+class CourseGraph:
+    """
+    Prerequisite graph of one course in array form.
+
+    Edges are stored twice as CSR arrays: prerequisites (row = concept,
+    columns = its prerequisites) and dependents (row = prerequisite, columns
+    = concepts depending on it). Row i of ancestor_bits is a little-endian
+    packed bitset of every transitive prerequisite of concept i; it is None
+    for courses larger than PREREQUISITE_CLOSURE_MAX_CONCEPTS, in which case
+    ancestor queries traverse the CSR arrays instead.
+    """
+    course_id: UUID
+    concept_ids: tuple[UUID, ...]
+    index: dict[UUID, int]
+    concepts: tuple[CachedConcept, ...]
+    depths: np.ndarray  # int32 (n,)
+    prereq_indptr: np.ndarray  # int32 (n + 1,)
+    prereq_indices: np.ndarray  # int32 (edges,)
+    prereq_strengths: np.ndarray  # float64 (edges,)
+    prereq_type_codes: np.ndarray  # uint8 (edges,), indexes relationship_types
+    relationship_types: tuple[str, ...]
+    dependent_indptr: np.ndarray  # int32 (n + 1,)
+    dependent_indices: np.ndarray  # int32 (edges,)
+    ancestor_bits: np.ndarray | None  # uint8 (n, ceil(n / 8))
+    has_cycles: bool
+    version: int | None = None  # Prerequisite graph version at load time
+    loaded_at: float = 0.0
+
+    @property
+    def concept_count(self) -> int:
+        return len(self.concept_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.prereq_indices)
+
+    @property
+    def array_bytes(self) -> int:
+        """Bytes held by the numpy arrays."""
+        arrays = (
+            self.depths, self.prereq_indptr, self.prereq_indices, self.prereq_strengths,
+            self.prereq_type_codes, self.dependent_indptr, self.dependent_indices,
+        )
+        total = sum(a.nbytes for a in arrays)
+        if self.ancestor_bits is not None:
+            total += self.ancestor_bits.nbytes
+        return total
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate footprint including the index dict and concept records."""
+        total = self.array_bytes
+        total += sys.getsizeof(self.index) + sys.getsizeof(self.concept_ids)
+        total += sys.getsizeof(self.concepts)
+        if self.concepts:
+            sample = self.concepts[0]
+            total += len(self.concepts) * (
+                sys.getsizeof(sample) + sys.getsizeof(sample.__dict__) + sys.getsizeof(sample.name)
+            )
+        return total
+
+    def prerequisite_slice(self, i: int) -> slice:
+        """Edge range of concept i's prerequisites."""
+        return slice(self.prereq_indptr[i], self.prereq_indptr[i + 1])
+
+    def dependent_slice(self, i: int) -> slice:
+        """Edge range of concept i's dependents."""
+        return slice(self.dependent_indptr[i], self.dependent_indptr[i + 1])
+
+    def prerequisites_of(self, i: int) -> list[tuple[CachedConcept, float, str]]:
+        """Direct prerequisites of concept i as (concept, strength, relationship_type)."""
+        edges = self.prerequisite_slice(i)
+        return [
+            (self.concepts[j], strength, self.relationship_types[code])
+            for j, strength, code in zip(
+                self.prereq_indices[edges].tolist(),
+                self.prereq_strengths[edges].tolist(),
+                self.prereq_type_codes[edges].tolist(),
+                strict=True,
+            )
+        ]
+
+    def prerequisite_indices_of(self, indices: np.ndarray) -> np.ndarray:
+        """Distinct direct prerequisites of several concepts."""
+        return np.unique(_gather(self.prereq_indptr, self.prereq_indices, indices))
+
+    def mask_of(self, concept_ids: Iterable[UUID]) -> np.ndarray:
+        """Boolean mask over the course's concepts (unknown IDs are ignored)."""
+        mask = np.zeros(self.concept_count, dtype=bool)
+        indices = [i for i in map(self.index.get, concept_ids) if i is not None]
+        mask[indices] = True
+        return mask
+
+    def ids_of(self, mask: np.ndarray) -> set[UUID]:
+        """Concept IDs selected by a boolean mask."""
+        return {self.concept_ids[i] for i in np.flatnonzero(mask)}
+
+    def _reachable(self, indptr: np.ndarray, indices: np.ndarray, i: int) -> np.ndarray:
+        """Mask of concepts reachable from i (excluding i unless on a cycle)."""
+        visited = np.zeros(self.concept_count, dtype=bool)
+        frontier = np.array([i], dtype=np.int32)
+        while len(frontier):
+            neighbours = np.unique(_gather(indptr, indices, frontier))
+            frontier = neighbours[~visited[neighbours]]
+            visited[frontier] = True
+        return visited
+
+    def ancestor_mask(self, i: int) -> np.ndarray:
+        """Mask of every transitive prerequisite of concept i."""
+        if self.ancestor_bits is None:
+            return self._reachable(self.prereq_indptr, self.prereq_indices, i)
+        return np.unpackbits(
+            self.ancestor_bits[i], count=self.concept_count, bitorder="little"
+        ).astype(bool)
+
+    def descendant_mask(self, i: int) -> np.ndarray:
+        """Mask of every concept that transitively depends on concept i."""
+        if self.ancestor_bits is None:
+            return self._reachable(self.dependent_indptr, self.dependent_indices, i)
+        return (self.ancestor_bits[:, i >> 3] & _bit_masks(np.int32(i))) != 0
+
+    def is_ancestor(self, j: int, i: int) -> bool:
+        """Whether concept j is a transitive prerequisite of concept i."""
+        if self.ancestor_bits is None:
+            return bool(self.ancestor_mask(i)[j])
+        return bool(self.ancestor_bits[i, j >> 3] & _bit_masks(np.int32(j)))
+
+    def ancestors_mastered(self, i: int, mastered: np.ndarray) -> bool:
+        """Whether every transitive prerequisite of concept i is in the mastered mask."""
+        if self.ancestor_bits is None:
+            return bool(np.all(mastered[self.ancestor_mask(i)]))
+        mastered_bits = np.packbits(mastered, bitorder="little")
+        return not np.any(self.ancestor_bits[i] & ~mastered_bits)
+
+    def locked_mask(self, mastered: np.ndarray) -> np.ndarray:
+        """
+        Mask of concepts with a direct required prerequisite not mastered.
+
+        Args:
+            mastered: Boolean mask of mastered concepts
+
+        Returns:
+            Boolean mask of locked concepts
+        """
+        if REQUIRED_RELATIONSHIP not in self.relationship_types:
+            return np.zeros(self.concept_count, dtype=bool)
+        required_code = self.relationship_types.index(REQUIRED_RELATIONSHIP)
+        edge_rows = np.repeat(
+            np.arange(self.concept_count, dtype=np.int32), np.diff(self.prereq_indptr)
+        )
+        blocking = (self.prereq_type_codes == required_code) & ~mastered[self.prereq_indices]
+        return np.bincount(edge_rows[blocking], minlength=self.concept_count) > 0
+
+
+def build_course_graph(
+    course_id: UUID,
+    concepts: list[CachedConcept],
+    edges: list[tuple[UUID, UUID, float, str]],
+    closure_max_concepts: int | None = None,
+    version: int | None = None,
+) -> CourseGraph:
+    """
+    Build the array form of a course's prerequisite graph.
+
+    Args:
+        course_id: Course UUID
+        concepts: Concepts of the course
+        edges: (concept_id, prerequisite_id, strength, relationship_type)
+            tuples; edges to concepts outside the course are dropped
+        closure_max_concepts: Skip the closure matrix above this many concepts
+            (defaults to PREREQUISITE_CLOSURE_MAX_CONCEPTS)
+        version: Prerequisite graph version the edges were read at
+
+    Returns:
+        CourseGraph
+    """
+    if closure_max_concepts is None:
+        closure_max_concepts = settings.PREREQUISITE_CLOSURE_MAX_CONCEPTS
+
+    n = len(concepts)
+    concept_ids = tuple(c.id for c in concepts)
+    index = {concept_id: i for i, concept_id in enumerate(concept_ids)}
+
+    rows: list[int] = []
+    cols: list[int] = []
+    strengths: list[float] = []
+    type_codes: list[int] = []
+    relationship_types: dict[str, int] = {}
+    dropped = 0
+    for concept_id, prerequisite_id, strength, relationship_type in edges:
+        i = index.get(concept_id)
+        j = index.get(prerequisite_id)
+        if i is None or j is None:
+            dropped += 1
+            continue
+        rows.append(i)
+        cols.append(j)
+        strengths.append(strength)
+        type_codes.append(relationship_types.setdefault(relationship_type, len(relationship_types)))
+
+    if dropped:
+        logger.warning(f"Dropped {dropped} prerequisite edges outside course {course_id}")
+
+    row_array = np.asarray(rows, dtype=np.int32)
+    col_array = np.asarray(cols, dtype=np.int32)
+    prereq_indptr, prereq_order = _csr(row_array, n)
+    dependent_indptr, dependent_order = _csr(col_array, n)
+    prereq_indices = col_array[prereq_order]
+    dependent_indices = row_array[dependent_order]
+
+    ancestor_bits, has_cycles = None, False
+    if n <= closure_max_concepts:
+        ancestor_bits, has_cycles = _transitive_closure(
+            prereq_indptr, prereq_indices, dependent_indptr, dependent_indices
+        )
+        if has_cycles:
+            logger.warning(f"Prerequisite graph of course {course_id} contains cycles")
+
+    return CourseGraph(
+        course_id=course_id,
+        concept_ids=concept_ids,
+        index=index,
+        concepts=tuple(concepts),
+        depths=np.asarray([c.prerequisite_depth for c in concepts], dtype=np.int32),
+        prereq_indptr=prereq_indptr,
+        prereq_indices=prereq_indices,
+        prereq_strengths=np.asarray(strengths, dtype=np.float64)[prereq_order],
+        prereq_type_codes=np.asarray(type_codes, dtype=np.uint8)[prereq_order],
+        relationship_types=tuple(relationship_types),
+        dependent_indptr=dependent_indptr,
+        dependent_indices=dependent_indices,
+        ancestor_bits=ancestor_bits,
+        has_cycles=has_cycles,
+        version=version,
+        loaded_at=time.time(),
+    )
+
+
+def _transitive_closure(
+    prereq_indptr: np.ndarray,
+    prereq_indices: np.ndarray,
+    dependent_indptr: np.ndarray,
+    dependent_indices: np.ndarray,
+) -> tuple[np.ndarray, bool]:
+    """
+    Compute the packed ancestor bitset of every concept.
+
+    Concepts are visited in topological order (prerequisites first), so each
+    row is the OR of its prerequisites' rows plus their own bits. Concepts on
+    or behind a cycle are iterated to a fixed point afterwards.
+
+    Returns:
+        Tuple of (ancestor bit matrix, whether the graph has cycles)
+    """
+    n = len(prereq_indptr) - 1
+    bits = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+
+    def update(i: int) -> bool:
+        prereqs = prereq_indices[prereq_indptr[i]:prereq_indptr[i + 1]]
+        if not len(prereqs):
+            return False
+        row = np.bitwise_or.reduce(bits[prereqs], axis=0)
+        np.bitwise_or.at(row, prereqs >> 3, _bit_masks(prereqs))
+        changed = not np.array_equal(row, bits[i])
+        bits[i] = row
+        return changed
+
+    # Kahn's algorithm over prerequisite -> dependent edges
+    remaining = np.diff(prereq_indptr)
+    queue = np.flatnonzero(remaining == 0).tolist()
+    visited = 0
+    for i in queue:
+        visited += 1
+        update(i)
+        for d in dependent_indices[dependent_indptr[i]:dependent_indptr[i + 1]].tolist():
+            remaining[d] -= 1
+            if remaining[d] == 0:
+                queue.append(d)
+
+    if visited == n:
+        return bits, False
+
+    cyclic = np.flatnonzero(remaining > 0).tolist()
+    changed = True
+    while changed:
+        changed = False
+        for i in cyclic:
+            changed |= update(i)
+    return bits, True
+
+
 class PrerequisiteGraphService:
     """
     In-memory prerequisite graph cache for fast BKT lookups.
 
     Provides:
-    - O(1) direct prerequisite lookup
-    - Cached BFS for prerequisite chains
+    - O(1) direct prerequisite lookup from CSR arrays
+    - Ancestor/descendant queries from the precomputed transitive closure
+    - Vectorized mastery checks over a course's concepts
+    - Multiple courses side by side, loaded and refreshed independently
+    - Version-based invalidation via the Redis prerequisite graph version
+      (time-based expiry as a fallback when Redis is unavailable)
     - O(1) prerequisite depth lookup
-    - Graph statistics
+    - Graph statistics including memory footprint
     """
 
     _instance: Optional["PrerequisiteGraphService"] = None
     _lock = asyncio.Lock()
 
-    def __init__(self):
-        # Graph storage
-        self.graph: nx.DiGraph | None = None
-        self.concepts: dict[UUID, CachedConcept] = {}
-        self.prerequisites: dict[UUID, list[CachedPrerequisite]] = defaultdict(list)
-        self.dependents: dict[UUID, list[UUID]] = defaultdict(list)
-        self.depths: dict[UUID, int] = {}
-        self.root_concepts: set[UUID] = set()
+    def __init__(self, fallback_ttl_seconds: int | None = None):
+        self.fallback_ttl_seconds = (
+            fallback_ttl_seconds
+            if fallback_ttl_seconds is not None
+            else settings.PREREQUISITE_GRAPH_FALLBACK_TTL_SECONDS
+        )
+
+        # Graph storage (one graph per course)
+        self.graphs: dict[UUID, CourseGraph] = {}
+        self._concept_courses: dict[UUID, UUID] = {}
+        self._load_locks: dict[UUID, asyncio.Lock] = {}
 
         # Cache metadata
         self.loaded_at: float | None = None
-        self.course_ids: set[UUID] = set()
         self.load_time_ms: float = 0.0
-        self.concept_count: int = 0
-        self.edge_count: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
 
     @classmethod
     async def get_instance(cls) -> "PrerequisiteGraphService":
@@ -82,13 +421,34 @@ class PrerequisiteGraphService:
         async with cls._lock:
             cls._instance = None
 
-    async def load_graph(self, session: AsyncSession, course_id: UUID | None = None) -> None:
+    @property
+    def course_ids(self) -> set[UUID]:
+        return set(self.graphs)
+
+    @property
+    def concept_count(self) -> int:
+        return sum(g.concept_count for g in self.graphs.values())
+
+    @property
+    def edge_count(self) -> int:
+        return sum(g.edge_count for g in self.graphs.values())
+
+    async def load_graph(
+        self,
+        session: AsyncSession,
+        course_id: UUID | None = None,
+        version: int | None = None,
+    ) -> None:
         """
         Load prerequisite graph into memory.
 
+        Concepts and their prerequisite edges are fetched with one joined
+        query. Loading a single course replaces only that course's graph.
+
         Args:
             session: Database session
-            course_id: Optional course ID to filter by (loads all if None)
+            course_id: Optional course ID to load (reloads all courses if None)
+            version: Prerequisite graph version read before loading course_id
         """
         from src.models.concept import Concept
         from src.models.concept_prerequisite import ConceptPrerequisite
@@ -96,98 +456,185 @@ class PrerequisiteGraphService:
         start_time = time.time()
         logger.info("Loading prerequisite graph into memory...")
 
-        # Clear existing data
-        self.graph = nx.DiGraph()
-        self.concepts.clear()
-        self.prerequisites.clear()
-        self.dependents.clear()
-        self.depths.clear()
-        self.root_concepts.clear()
-        self.course_ids.clear()
-
-        # Load concepts
-        concept_query = select(Concept)
+        query = select(
+            Concept.id,
+            Concept.course_id,
+            Concept.name,
+            Concept.knowledge_area_id,
+            Concept.difficulty_estimate,
+            Concept.prerequisite_depth,
+            ConceptPrerequisite.prerequisite_concept_id,
+            ConceptPrerequisite.strength,
+            ConceptPrerequisite.relationship_type,
+        ).outerjoin(ConceptPrerequisite, ConceptPrerequisite.concept_id == Concept.id)
         if course_id:
-            concept_query = concept_query.where(Concept.course_id == course_id)
-
-        result = await session.execute(concept_query)
-        db_concepts = result.scalars().all()
-
-        for c in db_concepts:
-            cached = CachedConcept(
-                id=c.id,
-                name=c.name,
-                knowledge_area_id=c.knowledge_area_id,
-                difficulty_estimate=c.difficulty_estimate,
-                prerequisite_depth=c.prerequisite_depth,
-            )
-            self.concepts[c.id] = cached
-            self.depths[c.id] = c.prerequisite_depth
-            self.course_ids.add(c.course_id)
-
-            # Add node to graph
-            self.graph.add_node(
-                c.id,
-                name=c.name,
-                ka=c.knowledge_area_id,
-                difficulty=c.difficulty_estimate,
-                depth=c.prerequisite_depth,
+            query = query.where(Concept.course_id == course_id)
+
+        result = await session.execute(query)
+
+        # Group rows by course (concept columns repeat once per edge)
+        concepts: dict[UUID, dict[UUID, CachedConcept]] = {}
+        edges: dict[UUID, list[tuple[UUID, UUID, float, str]]] = {}
+        for row in result.all():
+            course_concepts = concepts.setdefault(row.course_id, {})
+            if row.id not in course_concepts:
+                course_concepts[row.id] = CachedConcept(
+                    id=row.id,
+                    name=row.name,
+                    knowledge_area_id=row.knowledge_area_id,
+                    difficulty_estimate=row.difficulty_estimate,
+                    prerequisite_depth=row.prerequisite_depth,
+                )
+            if row.prerequisite_concept_id is not None:
+                edges.setdefault(row.course_id, []).append(
+                    (row.id, row.prerequisite_concept_id, row.strength, row.relationship_type)
+                )
+
+        if course_id:
+            # Keep an (empty) graph for a course without concepts so it is not reloaded
+            concepts.setdefault(course_id, {})
+        graphs = {
+            cid: build_course_graph(
+                cid,
+                list(course_concepts.values()),
+                edges.get(cid, []),
+                version=version if course_id else None,
             )
+            for cid, course_concepts in concepts.items()
+        }
 
-        self.concept_count = len(self.concepts)
-        logger.info(f"Loaded {self.concept_count} concepts")
+        if course_id:
+            self._remove_course(course_id)
+        else:
+            self.graphs.clear()
+            self._concept_courses.clear()
+        for graph in graphs.values():
+            self._add_course(graph)
 
-        # Load prerequisites
-        concept_ids = list(self.concepts.keys())
-        if not concept_ids:
-            self.load_time_ms = (time.time() - start_time) * 1000
-            self.loaded_at = time.time()
-            return
+        self.load_time_ms = (time.time() - start_time) * 1000
+        self.loaded_at = time.time()
 
-        prereq_query = select(ConceptPrerequisite).where(
-            ConceptPrerequisite.concept_id.in_(concept_ids)
+        logger.info(
+            f"Prerequisite graph loaded in {self.load_time_ms:.2f}ms: "
+            f"{sum(g.concept_count for g in graphs.values())} concepts, "
+            f"{sum(g.edge_count for g in graphs.values())} prerequisite relationships, "
+            f"{sum(g.memory_bytes for g in graphs.values()) / 1024:.1f}KB"
         )
-        result = await session.execute(prereq_query)
-        db_prereqs = result.scalars().all()
-
-        for p in db_prereqs:
-            cached = CachedPrerequisite(
-                prerequisite_id=p.prerequisite_concept_id,
-                strength=p.strength,
-                relationship_type=p.relationship_type,
-            )
-            self.prerequisites[p.concept_id].append(cached)
-            self.dependents[p.prerequisite_concept_id].append(p.concept_id)
-
-            # Add edge to graph (prereq -> concept)
-            self.graph.add_edge(
-                p.prerequisite_concept_id,
-                p.concept_id,
-                strength=p.strength,
-                relationship_type=p.relationship_type,
-            )
 
-        self.edge_count = len(db_prereqs)
-        logger.info(f"Loaded {self.edge_count} prerequisite relationships")
+        if self.load_time_ms > 5000:
+            logger.warning(f"Graph load time ({self.load_time_ms:.0f}ms) exceeds 5s threshold")
 
-        # Identify root concepts (no prerequisites)
-        for concept_id in self.concepts:
-            if concept_id not in self.prerequisites or not self.prerequisites[concept_id]:
-                self.root_concepts.add(concept_id)
+    def _is_fresh(self, graph: CourseGraph, version: int | None) -> bool:
+        """Check whether a cached course graph can be served for the current version."""
+        if version is not None and graph.version is not None:
+            return graph.version == version
+        # Redis unavailable now or at load time: fall back to age-based expiry
+        return (time.time() - graph.loaded_at) < self.fallback_ttl_seconds
 
-        logger.info(f"Identified {len(self.root_concepts)} root concepts")
+    async def get_graph(self, session: AsyncSession, course_id: UUID) -> CourseGraph:
+        """
+        Get a course's graph, (re)loading it if the graph version changed.
 
-        self.load_time_ms = (time.time() - start_time) * 1000
-        self.loaded_at = time.time()
+        Args:
+            session: Database session used to load the course on a miss
+            course_id: Course UUID
 
-        logger.info(f"Prerequisite graph loaded in {self.load_time_ms:.2f}ms")
+        Returns:
+            Current CourseGraph of the course
+        """
+        version = await get_prerequisite_graph_version(course_id)
+
+        graph = self.graphs.get(course_id)
+        if graph is not None and self._is_fresh(graph, version):
+            self.hits += 1
+            return graph
+
+        lock = self._load_locks.setdefault(course_id, asyncio.Lock())
+        async with lock:
+            # Another coroutine may have reloaded while we waited
+            graph = self.graphs.get(course_id)
+            if graph is not None and self._is_fresh(graph, version):
+                self.hits += 1
+                return graph
+
+            self.misses += 1
+            await self.load_graph(session, course_id, version=version)
+            return self.graphs[course_id]
+
+    async def get_graphs_for_concepts(
+        self,
+        session: AsyncSession,
+        concept_ids: Iterable[UUID],
+    ) -> dict[UUID, CourseGraph]:
+        """
+        Get the current graphs holding the given concepts.
 
-        if self.load_time_ms > 5000:
-            logger.warning(f"Graph load time ({self.load_time_ms:.0f}ms) exceeds 5s threshold")
+        Courses of concepts not seen before are resolved with one query;
+        afterwards the lookup costs one version check per course.
+
+        Args:
+            session: Database session
+            concept_ids: Concept UUIDs
+
+        Returns:
+            Dict of concept_id -> CourseGraph for every concept found in a graph
+        """
+        from src.models.concept import Concept
+
+        concept_courses = {cid: self._concept_courses.get(cid) for cid in concept_ids}
+        unknown = [cid for cid, course_id in concept_courses.items() if course_id is None]
+        if unknown:
+            result = await session.execute(
+                select(Concept.id, Concept.course_id).where(Concept.id.in_(unknown))
+            )
+            concept_courses.update({row.id: row.course_id for row in result.all()})
+
+        graphs: dict[UUID, CourseGraph] = {}
+        for course_id in {c for c in concept_courses.values() if c is not None}:
+            graphs[course_id] = await self.get_graph(session, course_id)
+
+        return {
+            cid: graphs[course_id]
+            for cid, course_id in concept_courses.items()
+            if course_id is not None and cid in graphs[course_id].index
+        }
+
+    def _add_course(self, graph: CourseGraph) -> None:
+        """Install a course graph (replacing any previous one)."""
+        self._remove_course(graph.course_id)
+        self.graphs[graph.course_id] = graph
+        for concept_id in graph.concept_ids:
+            self._concept_courses[concept_id] = graph.course_id
+
+    def _remove_course(self, course_id: UUID) -> None:
+        graph = self.graphs.pop(course_id, None)
+        if graph is not None:
+            for concept_id in graph.concept_ids:
+                self._concept_courses.pop(concept_id, None)
+
+    def _locate(self, concept_id: UUID) -> tuple[CourseGraph, int] | None:
+        """Find the graph holding a concept and its index in it."""
+        course_id = self._concept_courses.get(concept_id)
+        if course_id is None:
+            return None
+        graph = self.graphs[course_id]
+        return graph, graph.index[concept_id]
 
     def is_loaded(self) -> bool:
         """Check if graph is loaded."""
-        return self.graph is not None and self.loaded_at is not None
+        return self.loaded_at is not None
+
+    def get_course_graph(self, course_id: UUID) -> CourseGraph | None:
+        """
+        Get the array form of a course's graph.
+
+        Args:
+            course_id: Course UUID
+
+        Returns:
+            CourseGraph or None if the course is not loaded
+        """
+        return self.graphs.get(course_id)
 
     def get_prerequisites(self, concept_id: UUID) -> list[CachedPrerequisite]:
         """
@@ -199,7 +646,18 @@ class PrerequisiteGraphService:
         Returns:
             List of cached prerequisites
         """
-        return self.prerequisites.get(concept_id, [])
+        located = self._locate(concept_id)
+        if located is None:
+            return []
+        graph, i = located
+        return [
+            CachedPrerequisite(
+                prerequisite_id=concept.id,
+                strength=strength,
+                relationship_type=relationship_type,
+            )
+            for concept, strength, relationship_type in graph.prerequisites_of(i)
+        ]
 
     def get_prerequisite_ids(self, concept_id: UUID) -> list[UUID]:
         """
@@ -211,52 +669,124 @@ class PrerequisiteGraphService:
         Returns:
             List of prerequisite concept UUIDs
         """
-        return [p.prerequisite_id for p in self.prerequisites.get(concept_id, [])]
+        located = self._locate(concept_id)
+        if located is None:
+            return []
+        graph, i = located
+        return [graph.concept_ids[j] for j in graph.prereq_indices[graph.prerequisite_slice(i)]]
 
     def get_prerequisite_chain(
         self, concept_id: UUID, max_depth: int = 10
     ) -> list[tuple[UUID, int]]:
         """
-        Get full prerequisite chain using cached BFS.
+        Get full prerequisite chain by level-synchronous BFS over the CSR arrays.
 
         Args:
             concept_id: Target concept UUID
             max_depth: Maximum depth to traverse
 
         Returns:
-            List of (concept_id, depth) tuples
+            List of (concept_id, depth) tuples, ordered by depth
         """
-        if not self.graph or concept_id not in self.graph:
+        located = self._locate(concept_id)
+        if located is None:
             return []
+        graph, i = located
+
+        visited = np.zeros(graph.concept_count, dtype=bool)
+        frontier = np.array([i], dtype=np.int32)
+        chain: list[tuple[UUID, int]] = []
+        for depth in range(1, max_depth + 1):
+            neighbours = np.unique(_gather(graph.prereq_indptr, graph.prereq_indices, frontier))
+            frontier = neighbours[~visited[neighbours]]
+            if not len(frontier):
+                break
+            visited[frontier] = True
+            chain.extend((graph.concept_ids[j], depth) for j in frontier.tolist())
+        return chain
+
+    def get_ancestor_ids(self, concept_id: UUID) -> set[UUID]:
+        """
+        Get every transitive prerequisite of a concept.
 
-        # BFS backwards through graph
-        visited: dict[UUID, int] = {}
-        queue: list[tuple[UUID, int]] = []
+        Args:
+            concept_id: Concept UUID
 
-        # Start with direct prerequisites
-        for prereq in self.prerequisites.get(concept_id, []):
-            queue.append((prereq.prerequisite_id, 1))
+        Returns:
+            Set of ancestor concept UUIDs
+        """
+        located = self._locate(concept_id)
+        if located is None:
+            return set()
+        graph, i = located
+        return graph.ids_of(graph.ancestor_mask(i))
 
-        while queue:
-            current_id, depth = queue.pop(0)
+    def get_descendant_ids(self, concept_id: UUID) -> set[UUID]:
+        """
+        Get every concept that transitively depends on a concept.
 
-            if depth > max_depth:
-                continue
+        Args:
+            concept_id: Concept UUID
+
+        Returns:
+            Set of descendant concept UUIDs
+        """
+        located = self._locate(concept_id)
+        if located is None:
+            return set()
+        graph, i = located
+        return graph.ids_of(graph.descendant_mask(i))
+
+    def is_ancestor(self, prerequisite_id: UUID, concept_id: UUID) -> bool:
+        """
+        Check whether one concept is a transitive prerequisite of another.
+
+        Args:
+            prerequisite_id: Candidate ancestor concept UUID
+            concept_id: Concept UUID
+
+        Returns:
+            True if prerequisite_id is reachable through prerequisite edges
+        """
+        located = self._locate(concept_id)
+        if located is None:
+            return False
+        graph, i = located
+        j = graph.index.get(prerequisite_id)
+        return j is not None and graph.is_ancestor(j, i)
+
+    def are_ancestors_mastered(self, concept_id: UUID, mastered_ids: Iterable[UUID]) -> bool:
+        """
+        Check whether every transitive prerequisite of a concept is mastered.
+
+        Args:
+            concept_id: Concept UUID
+            mastered_ids: Mastered concept UUIDs
 
-            if current_id in visited:
-                continue
+        Returns:
+            True if all ancestors are mastered (or the concept is unknown)
+        """
+        located = self._locate(concept_id)
+        if located is None:
+            return True
+        graph, i = located
+        return graph.ancestors_mastered(i, graph.mask_of(mastered_ids))
 
-            visited[current_id] = depth
+    def get_locked_concept_ids(self, course_id: UUID, mastered_ids: Iterable[UUID]) -> set[UUID]:
+        """
+        Get the course's concepts with a direct required prerequisite not mastered.
 
-            # Add prerequisites of current
-            for prereq in self.prerequisites.get(current_id, []):
-                if prereq.prerequisite_id not in visited:
-                    queue.append((prereq.prerequisite_id, depth + 1))
+        Args:
+            course_id: Course UUID
+            mastered_ids: Mastered concept UUIDs
 
-        # Sort by depth
-        result = list(visited.items())
-        result.sort(key=lambda x: x[1])
-        return result
+        Returns:
+            Set of locked concept UUIDs (empty if the course is not loaded)
+        """
+        graph = self.graphs.get(course_id)
+        if graph is None:
+            return set()
+        return graph.ids_of(graph.locked_mask(graph.mask_of(mastered_ids)))
 
     def get_prerequisite_depth(self, concept_id: UUID) -> int:
         """
@@ -268,7 +798,11 @@ class PrerequisiteGraphService:
         Returns:
             Prerequisite depth (0 = foundational)
         """
-        return self.depths.get(concept_id, 0)
+        located = self._locate(concept_id)
+        if located is None:
+            return 0
+        graph, i = located
+        return int(graph.depths[i])
 
     def get_dependents(self, concept_id: UUID) -> list[UUID]:
         """
@@ -280,16 +814,31 @@ class PrerequisiteGraphService:
         Returns:
             List of dependent concept UUIDs
         """
-        return self.dependents.get(concept_id, [])
+        located = self._locate(concept_id)
+        if located is None:
+            return []
+        graph, i = located
+        return [graph.concept_ids[j] for j in graph.dependent_indices[graph.dependent_slice(i)]]
 
-    def get_root_concepts(self) -> list[UUID]:
+    def get_root_concepts(self, course_id: UUID | None = None) -> list[UUID]:
         """
         Get all root concepts (no prerequisites).
 
+        Args:
+            course_id: Optional course to restrict to
+
         Returns:
             List of root concept UUIDs
         """
-        return list(self.root_concepts)
+        if course_id is None:
+            graphs = list(self.graphs.values())
+        else:
+            graphs = [self.graphs[course_id]] if course_id in self.graphs else []
+        return [
+            graph.concept_ids[i]
+            for graph in graphs
+            for i in np.flatnonzero(np.diff(graph.prereq_indptr) == 0).tolist()
+        ]
 
     def get_concept(self, concept_id: UUID) -> CachedConcept | None:
         """
@@ -301,38 +850,41 @@ class PrerequisiteGraphService:
         Returns:
             CachedConcept or None
         """
-        return self.concepts.get(concept_id)
+        located = self._locate(concept_id)
+        if located is None:
+            return None
+        graph, i = located
+        return graph.concepts[i]
 
     def get_statistics(self) -> dict:
-        """Get graph statistics."""
+        """Get graph statistics, including the per-course memory footprint."""
+        memory_bytes = sum(g.memory_bytes for g in self.graphs.values())
         return {
             "loaded": self.is_loaded(),
             "loaded_at": self.loaded_at,
             "load_time_ms": self.load_time_ms,
             "concept_count": self.concept_count,
             "edge_count": self.edge_count,
-            "root_concept_count": len(self.root_concepts),
-            "course_ids": list(self.course_ids),
-            "memory_estimate_kb": self._estimate_memory(),
+            "root_concept_count": len(self.get_root_concepts()),
+            "course_ids": list(self.graphs),
+            "memory_bytes": memory_bytes,
+            "memory_estimate_kb": memory_bytes / 1024,
+            "hits": self.hits,
+            "misses": self.misses,
+            "courses": {
+                str(course_id): {
+                    "concept_count": graph.concept_count,
+                    "edge_count": graph.edge_count,
+                    "closure": graph.ancestor_bits is not None,
+                    "has_cycles": graph.has_cycles,
+                    "version": graph.version,
+                    "array_bytes": graph.array_bytes,
+                    "memory_bytes": graph.memory_bytes,
+                }
+                for course_id, graph in self.graphs.items()
+            },
         }
 
-    def _estimate_memory(self) -> float:
-        """Estimate memory usage in KB."""
-        import sys
-
-        total = 0
-        total += sys.getsizeof(self.concepts)
-        total += sys.getsizeof(self.prerequisites)
-        total += sys.getsizeof(self.dependents)
-        total += sys.getsizeof(self.depths)
-
-        # Rough estimate for graph
-        if self.graph:
-            total += self.concept_count * 200  # ~200 bytes per node
-            total += self.edge_count * 100  # ~100 bytes per edge
-
-        return total / 1024
-
 
 # Global service instance accessor
 async def get_prerequisite_graph_service() -> PrerequisiteGraphService:
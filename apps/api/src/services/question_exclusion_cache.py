@@ -0,0 +1,255 @@
+"""
+Question Exclusion Cache Service
+
+Provides the set of questions to exclude from selection for a user: questions
+answered within the recency window plus questions already answered in the
+current session. Both sets are fetched with a single query, and the recency
+set is cached per user in-process.
+
+Coherence:
+- On a hit, only responses recorded since the newest cached answer are read
+  (an index range scan on user_id, created_at), so answers recorded by any
+  API worker are picked up without rescanning the user's history
+- Answers older than the recency window are pruned on read
+- Entries are fully reloaded after a TTL and when the session changes
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.models.quiz_response import QuizResponse
+
+logger = logging.getLogger(__name__)
+
+# Incremental reads start this far before the newest cached answer, so
+# answers whose transaction committed after a later one are not missed
+# (created_at is the transaction start time)
+DELTA_OVERLAP_SECONDS = 60
+
+
+@dataclass(frozen=True, slots=True)
+class AnsweredQuestion:
+    """Latest answer to a question by a user."""
+    question_id: UUID
+    answered_at: datetime
+    in_session: bool
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Normalize database timestamps (naive on some drivers) to aware UTC."""
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+async def fetch_answered_questions(
+    db: AsyncSession,
+    user_id: UUID,
+    session_id: UUID,
+    since: datetime,
+    include_session: bool = True,
+) -> list[AnsweredQuestion]:
+    """
+    Fetch questions a user answered since a time, in one query.
+
+    Args:
+        db: Database session
+        user_id: User UUID
+        session_id: Quiz session UUID used to flag in-session answers
+        since: Only answers recorded after this time are returned
+        include_session: Also return answers from session_id recorded
+            before since
+
+    Returns:
+        One AnsweredQuestion per distinct question
+    """
+    in_session = func.max(case((QuizResponse.session_id == session_id, 1), else_=0))
+    query = (
+        select(QuizResponse.question_id, func.max(QuizResponse.created_at), in_session)
+        .where(QuizResponse.user_id == user_id)
+        .group_by(QuizResponse.question_id)
+    )
+    if include_session:
+        query = query.where(
+            or_(QuizResponse.created_at > since, QuizResponse.session_id == session_id)
+        )
+    else:
+        query = query.where(QuizResponse.created_at > since)
+
+    result = await db.execute(query)
+    return [
+        AnsweredQuestion(
+            question_id=question_id,
+            answered_at=_as_utc(answered_at),
+            in_session=bool(flag),
+        )
+        for question_id, answered_at, flag in result.all()
+    ]
+
+
+@dataclass(slots=True)
+class UserExclusions:
+    """Cached recently answered questions for one user and session."""
+    user_id: UUID
+    session_id: UUID
+    window_days: int
+    answered_at: dict[UUID, datetime] = field(default_factory=dict)
+    session_question_ids: set[UUID] = field(default_factory=set)
+    newest_answer_at: datetime | None = None
+    loaded_at: float = field(default_factory=time.time)
+
+    def merge(self, answers: list[AnsweredQuestion]) -> None:
+        """Add answers, keeping the latest answer time per question."""
+        for answer in answers:
+            previous = self.answered_at.get(answer.question_id)
+            if previous is None or answer.answered_at > previous:
+                self.answered_at[answer.question_id] = answer.answered_at
+            if answer.in_session:
+                self.session_question_ids.add(answer.question_id)
+            if self.newest_answer_at is None or answer.answered_at > self.newest_answer_at:
+                self.newest_answer_at = answer.answered_at
+
+    def excluded_ids(self, cutoff: datetime) -> set[UUID]:
+        """Prune answers older than cutoff and return the exclusion set."""
+        expired = [qid for qid, answered_at in self.answered_at.items() if answered_at <= cutoff]
+        for qid in expired:
+            del self.answered_at[qid]
+        return set(self.answered_at) | self.session_question_ids
+
+
+class QuestionExclusionCache:
+    """
+    Process-wide per-user cache of question exclusion sets.
+
+    Provides:
+    - One query for both the recency and session sets on a miss
+    - Incremental reads of newly recorded answers on a hit
+    - Time-based full reload as a fallback (e.g. for deleted responses)
+    - LRU bound on the number of cached users
+    """
+
+    _instance: Optional["QuestionExclusionCache"] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self, max_users: int | None = None, ttl_seconds: int | None = None):
+        self.max_users = max_users or settings.QUESTION_EXCLUSION_CACHE_MAX_USERS
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.QUESTION_EXCLUSION_CACHE_TTL_SECONDS
+        )
+        self.entries: OrderedDict[UUID, UserExclusions] = OrderedDict()
+
+        # Cache statistics
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @classmethod
+    async def get_instance(cls) -> "QuestionExclusionCache":
+        """Get singleton instance."""
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def reset_instance(cls) -> None:
+        """Reset singleton (for testing)."""
+        async with cls._lock:
+            cls._instance = None
+
+    def _is_reusable(self, entry: UserExclusions, session_id: UUID, window_days: int) -> bool:
+        """Check whether an entry can be extended instead of reloaded."""
+        return (
+            entry.session_id == session_id
+            and entry.window_days == window_days
+            and (time.time() - entry.loaded_at) < self.ttl_seconds
+        )
+
+    async def get_excluded_question_ids(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        session_id: UUID,
+        window_days: int,
+    ) -> set[UUID]:
+        """
+        Get question IDs to exclude from selection.
+
+        Args:
+            db: Database session for queries
+            user_id: User UUID
+            session_id: Current quiz session UUID
+            window_days: Days within which answered questions are excluded
+
+        Returns:
+            Set of question UUIDs answered recently or in the session
+        """
+        cutoff = datetime.now(UTC) - timedelta(days=window_days)
+
+        entry = self.entries.get(user_id)
+        if entry is not None and self._is_reusable(entry, session_id, window_days):
+            self.hits += 1
+            since = cutoff
+            if entry.newest_answer_at is not None:
+                since = max(cutoff, entry.newest_answer_at - timedelta(seconds=DELTA_OVERLAP_SECONDS))
+            entry.merge(
+                await fetch_answered_questions(
+                    db, user_id, session_id, since, include_session=False
+                )
+            )
+            self.entries.move_to_end(user_id)
+            return entry.excluded_ids(cutoff)
+
+        self.misses += 1
+        entry = UserExclusions(user_id=user_id, session_id=session_id, window_days=window_days)
+        entry.merge(await fetch_answered_questions(db, user_id, session_id, cutoff))
+
+        self.entries[user_id] = entry
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.max_users:
+            self.entries.popitem(last=False)
+
+        logger.debug(
+            f"Loaded exclusion set for user {user_id}: {len(entry.answered_at)} recent, "
+            f"{len(entry.session_question_ids)} in session"
+        )
+        return entry.excluded_ids(cutoff)
+
+    def invalidate(self, user_id: UUID | None = None) -> None:
+        """
+        Drop cached exclusion sets in this process.
+
+        Args:
+            user_id: User to invalidate (all users if None)
+        """
+        if user_id is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(user_id, None)
+
+    def get_statistics(self) -> dict:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "user_count": len(self.entries),
+            "max_users": self.max_users,
+            "question_count": sum(len(e.answered_at) for e in self.entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global service instance accessor
+async def get_question_exclusion_cache() -> QuestionExclusionCache:
+    """FastAPI dependency for the question exclusion cache."""
+    return await QuestionExclusionCache.get_instance()
@@ -0,0 +1,243 @@
+"""
+Question Pool Cache Service
+
+Provides a process-wide, per-course cache of the active question bank for
+question selection. Questions are held as compact immutable records instead
+of ORM objects and are reloaded only when the course content version changes.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
+
+from src.config import settings
+from src.utils.content_version import get_course_content_version
+
+if TYPE_CHECKING:
+    from src.models.question import Question
+    from src.repositories.question_repository import QuestionRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedConceptRef:
+    """Minimal concept data needed when serving a question."""
+    id: UUID
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class CachedQuestionConcept:
+    """Cached question-concept mapping (mirrors QuestionConcept attributes)."""
+    concept_id: UUID
+    relevance: float
+    concept: CachedConceptRef | None
+
+
+@dataclass(frozen=True, slots=True)
+class CachedQuestion:
+    """
+    Immutable question record for selection.
+
+    Exposes the same attribute names as the Question model for every field
+    read by QuestionSelector and the next-question route, so it can be used
+    wherever a Question with loaded concepts is expected for selection.
+    Answer and explanation are intentionally not cached.
+    """
+    id: UUID
+    course_id: UUID
+    question_text: str
+    options: dict[str, str]
+    knowledge_area_id: str
+    difficulty: float
+    discrimination: float
+    slip_rate: float
+    guess_rate: float
+    question_concepts: tuple[CachedQuestionConcept, ...]
+
+    @classmethod
+    def from_model(cls, question: "Question") -> "CachedQuestion":
+        """Build a cached record from a Question with concepts eager-loaded."""
+        return cls(
+            id=question.id,
+            course_id=question.course_id,
+            question_text=question.question_text,
+            options=dict(question.options),
+            knowledge_area_id=question.knowledge_area_id,
+            difficulty=question.difficulty,
+            discrimination=question.discrimination,
+            slip_rate=question.slip_rate,
+            guess_rate=question.guess_rate,
+            question_concepts=tuple(
+                CachedQuestionConcept(
+                    concept_id=qc.concept_id,
+                    relevance=qc.relevance,
+                    concept=(
+                        CachedConceptRef(id=qc.concept.id, name=qc.concept.name)
+                        if qc.concept is not None
+                        else None
+                    ),
+                )
+                for qc in question.question_concepts
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CourseQuestionPool:
+    """Snapshot of a course's active questions at a content version."""
+    course_id: UUID
+    version: int | None
+    questions: tuple[CachedQuestion, ...]
+    loaded_at: float
+    load_time_ms: float
+
+
+class QuestionPoolCache:
+    """
+    Process-wide question pool cache keyed by course.
+
+    Provides:
+    - Zero question-bank queries on a cache hit
+    - Version-based invalidation via the Redis course content version
+    - Time-based expiry as a fallback when Redis is unavailable
+    - Per-course load locks so concurrent misses trigger a single reload
+    """
+
+    _instance: Optional["QuestionPoolCache"] = None
+    _lock = asyncio.Lock()
+
+    def __init__(self, fallback_ttl_seconds: int | None = None):
+        self.fallback_ttl_seconds = (
+            fallback_ttl_seconds
+            if fallback_ttl_seconds is not None
+            else settings.QUESTION_POOL_CACHE_FALLBACK_TTL_SECONDS
+        )
+        self.pools: dict[UUID, CourseQuestionPool] = {}
+        self._load_locks: dict[UUID, asyncio.Lock] = {}
+
+        # Cache statistics
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @classmethod
+    async def get_instance(cls) -> "QuestionPoolCache":
+        """Get singleton instance."""
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def reset_instance(cls) -> None:
+        """Reset singleton (for testing)."""
+        async with cls._lock:
+            cls._instance = None
+
+    def _is_fresh(self, pool: CourseQuestionPool, version: int | None) -> bool:
+        """Check whether a cached pool can be served for the current version."""
+        if version is not None and pool.version is not None:
+            return pool.version == version
+        # Redis unavailable now or at load time: fall back to age-based expiry
+        return (time.time() - pool.loaded_at) < self.fallback_ttl_seconds
+
+    async def get_questions(
+        self,
+        course_id: UUID,
+        question_repository: "QuestionRepository",
+    ) -> tuple[CachedQuestion, ...]:
+        """
+        Get the active question pool for a course.
+
+        Args:
+            course_id: Course UUID
+            question_repository: Repository used to load the pool on a miss
+
+        Returns:
+            Tuple of cached question records
+        """
+        version = await get_course_content_version(course_id)
+
+        pool = self.pools.get(course_id)
+        if pool is not None and self._is_fresh(pool, version):
+            self.hits += 1
+            return pool.questions
+
+        lock = self._load_locks.setdefault(course_id, asyncio.Lock())
+        async with lock:
+            # Another coroutine may have reloaded while we waited
+            pool = self.pools.get(course_id)
+            if pool is not None and self._is_fresh(pool, version):
+                self.hits += 1
+                return pool.questions
+
+            self.misses += 1
+            pool = await self._load_pool(course_id, version, question_repository)
+            self.pools[course_id] = pool
+            return pool.questions
+
+    async def _load_pool(
+        self,
+        course_id: UUID,
+        version: int | None,
+        question_repository: "QuestionRepository",
+    ) -> CourseQuestionPool:
+        """Load and convert a course's questions into a pool snapshot."""
+        start_time = time.time()
+
+        questions = await question_repository.get_questions_with_concepts(course_id)
+        records = tuple(CachedQuestion.from_model(q) for q in questions)
+
+        load_time_ms = (time.time() - start_time) * 1000
+        logger.info(
+            f"Loaded question pool for course {course_id}: {len(records)} questions "
+            f"(version={version}) in {load_time_ms:.2f}ms"
+        )
+
+        return CourseQuestionPool(
+            course_id=course_id,
+            version=version,
+            questions=records,
+            loaded_at=time.time(),
+            load_time_ms=load_time_ms,
+        )
+
+    def invalidate(self, course_id: UUID | None = None) -> None:
+        """
+        Drop cached pools in this process.
+
+        Args:
+            course_id: Course to invalidate (all courses if None)
+        """
+        if course_id is None:
+            self.pools.clear()
+        else:
+            self.pools.pop(course_id, None)
+
+    def get_statistics(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "course_count": len(self.pools),
+            "question_count": sum(len(p.questions) for p in self.pools.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "courses": {
+                str(course_id): {
+                    "version": pool.version,
+                    "question_count": len(pool.questions),
+                    "loaded_at": pool.loaded_at,
+                    "load_time_ms": pool.load_time_ms,
+                }
+                for course_id, pool in self.pools.items()
+            },
+        }
+
+
+# Global service instance accessor
+async def get_question_pool_cache() -> QuestionPoolCache:
+    """FastAPI dependency for the question pool cache."""
+    return await QuestionPoolCache.get_instance()
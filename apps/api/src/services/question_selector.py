@@ -8,6 +8,9 @@ Implements combined BKT-IRT question selection (Algorithm 9):
 Also implements prerequisite-based mastery gates (Story 4.11):
 - Soft enforcement: Deprioritize locked concepts (weight = 0.1)
 - Hard enforcement: Exclude locked concepts entirely
+
+Information gain can be scored per candidate (scalar engine) or for all
+candidates in one batched NumPy pass (vectorized engine).
 """
 import math
 import random
@@ -17,6 +20,7 @@ from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Literal
 from uuid import UUID
 
+import numpy as np
 import structlog
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,6 +29,12 @@ from src.models.belief_state import BeliefState
 from src.models.question import Question
 from src.models.quiz_response import QuizResponse
 from src.schemas.mastery_gate import EnforcementMode
+from src.services.belief_snapshot_cache import SnapshotBelief
+from src.services.question_exclusion_cache import (
+    QuestionExclusionCache,
+    fetch_answered_questions,
+)
+from src.utils.bkt_math import expected_info_gain_batch
 
 if TYPE_CHECKING:
     from src.services.mastery_gate import MasteryGateService
@@ -86,6 +96,19 @@ ABILITY_THRESHOLDS = {
 # Weight multiplier for questions testing locked concepts (soft enforcement)
 LOCKED_CONCEPT_WEIGHT = 0.1
 
+# =============================================================================
+# Scoring Engine Configuration
+# =============================================================================
+
+ScoringEngine = Literal['scalar', 'vectorized']
+
+SCORING_ENGINES: tuple[str, ...] = ('scalar', 'vectorized')
+
+# Vectorized scores within this distance of the best score count as tied, so
+# floating-point differences in the digamma implementations do not change
+# which candidate wins (the first tied one, as in the scalar loop).
+VECTORIZED_TIE_TOLERANCE = 1e-6
+
 
 @dataclass
 class DifficultyPerformance:
@@ -137,6 +160,8 @@ class QuestionSelector:
         recency_window_days: int = 7,
         prerequisite_weight: float = 0.2,
         min_info_gain_threshold: float = 0.01,
+        scoring_engine: ScoringEngine = "vectorized",
+        exclusion_cache: QuestionExclusionCache | None = None,
     ):
         """
         Initialize the question selector.
@@ -146,11 +171,25 @@ class QuestionSelector:
             recency_window_days: Days within which to exclude recently answered questions
             prerequisite_weight: Bonus weight for prerequisite concepts (0.0-1.0)
             min_info_gain_threshold: Minimum info gain before falling back to uncertainty
+            scoring_engine: Info gain scoring engine ("scalar" or "vectorized")
+            exclusion_cache: Optional per-user cache of recently answered questions
+
+        Raises:
+            ValueError: If scoring_engine is not a known engine
         """
+        if scoring_engine not in SCORING_ENGINES:
+            raise ValueError(
+                f"Unknown scoring engine: {scoring_engine}. Expected one of {SCORING_ENGINES}"
+            )
+
         self.db = db
         self.recency_window_days = recency_window_days
         self.prerequisite_weight = prerequisite_weight
         self.min_info_gain_threshold = min_info_gain_threshold
+        self.scoring_engine = scoring_engine
+        self.exclusion_cache = exclusion_cache
+        # Exclusion sets fetched during this request, keyed by (user_id, session_id)
+        self._excluded_ids: dict[tuple[UUID, UUID], set[UUID]] = {}
 
     async def select_next_question(
         self,
@@ -217,6 +256,149 @@ class QuestionSelector:
             raise ValueError("No eligible questions available for selection")
 
         # Select based on strategy
+        question, info_gain = self._select_from_candidates(
+            candidates, beliefs, strategy, session_id
+        )
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        # Get concept IDs for the selected question
+        concept_ids = [qc.concept_id for qc in question.question_concepts]
+
+        logger.info(
+            "question_selected",
+            session_id=str(session_id),
+            question_id=str(question.id),
+            strategy=strategy,
+            scoring_engine=self.scoring_engine,
+            info_gain=round(info_gain, 4),
+            concepts_tested=[str(c) for c in concept_ids],
+            candidates_count=len(candidates),
+            target_concept_filter=bool(target_concept_ids),
+            selection_duration_ms=round(duration_ms, 2),
+        )
+
+        return question, info_gain, metadata
+
+    def with_session(self, db: AsyncSession) -> "QuestionSelector":
+        """
+        Create a selector with the same parameters on another database session.
+
+        Args:
+            db: Database session for queries
+
+        Returns:
+            QuestionSelector with its own per-request exclusion state
+        """
+        return QuestionSelector(
+            db=db,
+            recency_window_days=self.recency_window_days,
+            prerequisite_weight=self.prerequisite_weight,
+            min_info_gain_threshold=self.min_info_gain_threshold,
+            scoring_engine=self.scoring_engine,
+            exclusion_cache=self.exclusion_cache,
+        )
+
+    async def select_next_questions_for_outcomes(
+        self,
+        user_id: UUID,
+        session_id: UUID,
+        question: Question,
+        beliefs: dict[UUID, BeliefState],
+        available_questions: list[Question],
+        strategy: str = "max_info_gain",
+        knowledge_area_filter: str | None = None,
+        target_concept_ids: list[UUID] | None = None,
+    ) -> dict[bool, tuple[Question | None, float, bool]]:
+        """
+        Select the question to serve after `question` for each answer outcome.
+
+        `question` is excluded as if answered, and the beliefs of the concepts
+        it tests are advanced with _simulate_update for a correct and an
+        incorrect answer. A focused session whose pool is exhausted widens to
+        all questions, as next-question does.
+
+        Args:
+            user_id: User UUID
+            session_id: Quiz session UUID
+            question: Question currently being answered
+            beliefs: Dictionary mapping concept_id to BeliefState
+            available_questions: List of questions to consider
+            strategy: Selection strategy
+            knowledge_area_filter: Optional knowledge area ID to filter questions
+            target_concept_ids: Optional list of concept UUIDs to filter questions
+
+        Returns:
+            Dict mapping is_correct to (next_question, info_gain, focus_expanded);
+            next_question is None if no question is left
+        """
+        excluded_ids = await self._get_excluded_question_ids(user_id, session_id)
+        self._excluded_ids[(user_id, session_id)] = excluded_ids | {question.id}
+
+        focus_expanded = False
+        candidates = await self._filter_questions(
+            user_id=user_id,
+            session_id=session_id,
+            questions=available_questions,
+            knowledge_area_filter=knowledge_area_filter,
+            target_concept_ids=target_concept_ids,
+        )
+        if not candidates and (knowledge_area_filter or target_concept_ids):
+            focus_expanded = True
+            candidates = await self._filter_questions(
+                user_id=user_id,
+                session_id=session_id,
+                questions=available_questions,
+            )
+        if not candidates:
+            return {True: (None, 0.0, focus_expanded), False: (None, 0.0, focus_expanded)}
+
+        concept_beliefs = [
+            beliefs[qc.concept_id]
+            for qc in question.question_concepts
+            if qc.concept_id in beliefs
+        ]
+
+        results: dict[bool, tuple[Question | None, float, bool]] = {}
+        for is_correct in (True, False):
+            updated = self._simulate_update(
+                concept_beliefs, is_correct, question.slip_rate, question.guess_rate
+            )
+            outcome_beliefs = dict(beliefs)
+            for belief, (alpha, beta) in zip(concept_beliefs, updated, strict=True):
+                outcome_beliefs[belief.concept_id] = SnapshotBelief(
+                    user_id=belief.user_id,
+                    concept_id=belief.concept_id,
+                    alpha=alpha,
+                    beta=beta,
+                    response_count=belief.response_count + 1,
+                )
+            next_question, info_gain = self._select_from_candidates(
+                candidates, outcome_beliefs, strategy, session_id
+            )
+            results[is_correct] = (next_question, info_gain, focus_expanded)
+
+        return results
+
+    def _select_from_candidates(
+        self,
+        candidates: list[Question],
+        beliefs: dict[UUID, BeliefState],
+        strategy: str,
+        session_id: UUID,
+    ) -> tuple[Question, float]:
+        """
+        Pick a question from filtered candidates with a selection strategy.
+
+        Args:
+            candidates: Eligible questions (non-empty)
+            beliefs: User's belief states by concept
+            strategy: Selection strategy
+            session_id: Quiz session UUID (for logging)
+
+        Returns:
+            Tuple of (selected_question, estimated_info_gain)
+        """
         if strategy == "max_info_gain":
             question, info_gain = self._select_by_info_gain(candidates, beliefs)
 
@@ -243,24 +425,7 @@ class QuestionSelector:
             # Default to info gain
             question, info_gain = self._select_by_info_gain(candidates, beliefs)
 
-        duration_ms = (time.perf_counter() - start_time) * 1000
-
-        # Get concept IDs for the selected question
-        concept_ids = [qc.concept_id for qc in question.question_concepts]
-
-        logger.info(
-            "question_selected",
-            session_id=str(session_id),
-            question_id=str(question.id),
-            strategy=strategy,
-            info_gain=round(info_gain, 4),
-            concepts_tested=[str(c) for c in concept_ids],
-            candidates_count=len(candidates),
-            target_concept_filter=bool(target_concept_ids),
-            selection_duration_ms=round(duration_ms, 2),
-        )
-
-        return question, info_gain, metadata
+        return question, info_gain
 
     async def _filter_questions(
         self,
@@ -303,14 +468,8 @@ class QuestionSelector:
         if not questions:
             return []
 
-        # Get recent question IDs (from database)
-        recent_ids = await self._get_recent_question_ids(user_id, self.recency_window_days)
-
-        # Get session question IDs (from database)
-        session_ids = await self._get_session_question_ids(session_id)
-
-        # Combine exclusions
-        excluded_ids = recent_ids | session_ids
+        # Get recent and session question IDs (one query, or the exclusion cache)
+        excluded_ids = await self._get_excluded_question_ids(user_id, session_id)
 
         # Filter out excluded questions
         return [q for q in questions if q.id not in excluded_ids]
@@ -366,52 +525,40 @@ class QuestionSelector:
             if any(qc.concept_id in target_set for qc in q.question_concepts)
         ]
 
-    async def _get_recent_question_ids(
+    async def _get_excluded_question_ids(
         self,
         user_id: UUID,
-        days: int,
-    ) -> set[UUID]:
-        """
-        Get question IDs answered by user within the recency window.
-
-        Args:
-            user_id: User UUID
-            days: Number of days to look back
-
-        Returns:
-            Set of question UUIDs answered recently
-        """
-        cutoff = datetime.now(UTC) - timedelta(days=days)
-
-        result = await self.db.execute(
-            select(QuizResponse.question_id)
-            .where(QuizResponse.user_id == user_id)
-            .where(QuizResponse.created_at > cutoff)
-            .distinct()
-        )
-
-        return {row[0] for row in result.all()}
-
-    async def _get_session_question_ids(
-        self,
         session_id: UUID,
     ) -> set[UUID]:
         """
-        Get question IDs already answered in this session.
+        Get question IDs answered within the recency window or in this session.
+
+        Both sets are fetched with a single query (or served incrementally by
+        the exclusion cache) and reused for the rest of the request, so a
+        focused session that widens its filters does not query again.
 
         Args:
+            user_id: User UUID
             session_id: Quiz session UUID
 
         Returns:
-            Set of question UUIDs in the session
+            Set of question UUIDs to exclude
         """
-        result = await self.db.execute(
-            select(QuizResponse.question_id)
-            .where(QuizResponse.session_id == session_id)
-            .distinct()
-        )
+        key = (user_id, session_id)
+        if key in self._excluded_ids:
+            return self._excluded_ids[key]
+
+        if self.exclusion_cache is not None:
+            excluded_ids = await self.exclusion_cache.get_excluded_question_ids(
+                self.db, user_id, session_id, self.recency_window_days
+            )
+        else:
+            cutoff = datetime.now(UTC) - timedelta(days=self.recency_window_days)
+            answers = await fetch_answered_questions(self.db, user_id, session_id, cutoff)
+            excluded_ids = {answer.question_id for answer in answers}
 
-        return {row[0] for row in result.all()}
+        self._excluded_ids[key] = excluded_ids
+        return excluded_ids
 
     def _select_by_info_gain(
         self,
@@ -430,6 +577,11 @@ class QuestionSelector:
         Returns:
             Tuple of (best_question, info_gain)
         """
+        if self.scoring_engine == "vectorized":
+            return self._select_by_info_gain_vectorized(
+                candidates, beliefs, apply_prerequisite_bonus=apply_prerequisite_bonus
+            )
+
         best_question = None
         best_gain = -1.0
 
@@ -450,6 +602,112 @@ class QuestionSelector:
 
         return best_question, best_gain
 
+    def _select_by_info_gain_vectorized(
+        self,
+        candidates: list[Question],
+        beliefs: dict[UUID, BeliefState],
+        apply_prerequisite_bonus: bool = False,
+        locked_concept_ids: set[UUID] | None = None,
+    ) -> tuple[Question, float]:
+        """
+        Select the question with maximum expected information gain in one batched pass.
+
+        Scores every candidate with expected_info_gain_batch and picks the first
+        candidate tied for the best score, as the scalar loop does. Only that
+        candidate is re-scored with the scalar path, so the reported gain
+        matches the scalar engine.
+
+        Args:
+            candidates: Eligible questions
+            beliefs: User's belief states by concept
+            apply_prerequisite_bonus: Whether to add bonus for foundational concepts
+            locked_concept_ids: Locked concepts to deprioritize (soft enforcement)
+
+        Returns:
+            Tuple of (best_question, info_gain)
+        """
+        if not candidates:
+            raise ValueError("No question could be selected")
+
+        gains = self._calculate_expected_info_gain_batch(candidates, beliefs)
+
+        if apply_prerequisite_bonus or locked_concept_ids:
+            multipliers = np.ones(len(candidates))
+            for i, question in enumerate(candidates):
+                if apply_prerequisite_bonus:
+                    multipliers[i] = self._apply_prerequisite_bonus(question, beliefs, 1.0)
+                if locked_concept_ids and not locked_concept_ids.isdisjoint(
+                    qc.concept_id for qc in question.question_concepts
+                ):
+                    multipliers[i] *= LOCKED_CONCEPT_WEIGHT
+            gains = gains * multipliers
+
+        # argmax returns the first True, i.e. the first candidate tied for the best
+        tied = gains >= gains.max() - VECTORIZED_TIE_TOLERANCE
+        best_question = candidates[int(np.argmax(tied))]
+
+        best_gain = self._calculate_expected_info_gain(best_question, beliefs)
+        if apply_prerequisite_bonus:
+            best_gain = self._apply_prerequisite_bonus(best_question, beliefs, best_gain)
+        if locked_concept_ids and not locked_concept_ids.isdisjoint(
+            qc.concept_id for qc in best_question.question_concepts
+        ):
+            best_gain *= LOCKED_CONCEPT_WEIGHT
+
+        return best_question, best_gain
+
+    def _calculate_expected_info_gain_batch(
+        self,
+        candidates: list[Question],
+        beliefs: dict[UUID, BeliefState],
+    ) -> np.ndarray:
+        """
+        Calculate expected information gain for all candidates at once.
+
+        Packs beliefs into a padded candidates x concepts matrix of alpha/beta
+        values (padding is Beta(1, 1) and masked out) plus per-question
+        slip/guess vectors. Concepts without a belief are skipped, matching
+        _calculate_expected_info_gain.
+
+        Args:
+            candidates: Questions to evaluate
+            beliefs: User's belief states
+
+        Returns:
+            Array of expected information gain, aligned with candidates
+        """
+        n = len(candidates)
+        row_idx: list[int] = []
+        col_idx: list[int] = []
+        alphas: list[float] = []
+        betas: list[float] = []
+        width = 1
+
+        for i, question in enumerate(candidates):
+            j = 0
+            for qc in question.question_concepts:
+                belief = beliefs.get(qc.concept_id)
+                if belief is None:
+                    continue
+                row_idx.append(i)
+                col_idx.append(j)
+                alphas.append(belief.alpha)
+                betas.append(belief.beta)
+                j += 1
+            width = max(width, j)
+
+        alpha = np.ones((n, width))
+        beta = np.ones((n, width))
+        mask = np.zeros((n, width), dtype=bool)
+        alpha[row_idx, col_idx] = alphas
+        beta[row_idx, col_idx] = betas
+        mask[row_idx, col_idx] = True
+
+        slip = np.fromiter((q.slip_rate for q in candidates), dtype=float, count=n)
+        guess = np.fromiter((q.guess_rate for q in candidates), dtype=float, count=n)
+
+        return expected_info_gain_batch(alpha, beta, mask, slip, guess)
+
     def _select_by_uncertainty(
         self,
         candidates: list[Question],
@@ -787,19 +1045,10 @@ class QuestionSelector:
         Returns:
             Set of locked concept UUIDs
         """
-        locked = set()
-        for concept_id in concept_ids:
-            try:
-                gate_result = await mastery_gate_service.check_prerequisites_mastered(
-                    user_id=user_id,
-                    concept_id=concept_id,
-                )
-                if not gate_result.is_unlocked:
-                    locked.add(concept_id)
-            except ValueError:
-                # Concept not found - skip
-                continue
-        return locked
+        return await mastery_gate_service.get_locked_concept_ids(
+            user_id=user_id,
+            concept_ids=concept_ids,
+        )
 
     def apply_prerequisite_filter(
         self,
@@ -868,6 +1117,14 @@ class QuestionSelector:
         Returns:
             Tuple of (best_question, info_gain)
         """
+        if self.scoring_engine == "vectorized":
+            return self._select_by_info_gain_vectorized(
+                candidates,
+                beliefs,
+                apply_prerequisite_bonus=apply_prerequisite_bonus,
+                locked_concept_ids=locked_concept_ids,
+            )
+
         best_question = None
         best_gain = -1.0
 
@@ -4,7 +4,7 @@ Story 4.3: Answer Submission and Immediate Feedback
 Story 4.7: Fixed-Length Session Auto-Completion
 """
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 import structlog
@@ -26,6 +26,9 @@ from src.schemas.quiz import (
 )
 from src.services.belief_updater import BeliefUpdater
 
+if TYPE_CHECKING:
+    from src.services.mastery_gate import MasteryGateService
+
 logger = structlog.get_logger(__name__)
 
 
@@ -39,6 +42,7 @@ class QuizAnswerService:
     - Session statistics updates
     - Feedback generation (explanation, concepts updated)
     - Session auto-completion (Story 4.7)
+    - Concept unlock events (Story 4.11)
     """
 
     def __init__(
@@ -48,6 +52,7 @@ class QuizAnswerService:
         session_repo: QuizSessionRepository,
         user_repo: UserRepository,
         belief_updater: BeliefUpdater,
+        mastery_gate: "MasteryGateService | None" = None,
     ):
         """
         Initialize quiz answer service.
@@ -58,12 +63,15 @@ class QuizAnswerService:
             session_repo: Repository for session operations
             user_repo: Repository for user operations (Story 4.7)
             belief_updater: Service for updating Bayesian belief states
+            mastery_gate: Optional service recording concepts unlocked by the
+                belief updates
         """
         self.response_repo = response_repo
         self.question_repo = question_repo
         self.session_repo = session_repo
         self.user_repo = user_repo
         self.belief_updater = belief_updater
+        self.mastery_gate = mastery_gate
 
     async def submit_answer(
         self,
@@ -88,6 +96,9 @@ class QuizAnswerService:
         7. Session statistics update
         8. Feedback generation
 
+        Belief updates that newly master a prerequisite also record unlock
+        events for its dependents when a mastery gate service is configured.
+
         Args:
             user_id: User UUID submitting the answer
             session_id: Quiz session UUID
@@ -233,6 +244,27 @@ class QuizAnswerService:
                 question_id=str(question_id),
                 error=str(e),
             )
+        else:
+            # 7b. Record concepts unlocked by prerequisites mastered in this update
+            if self.mastery_gate is not None:
+                try:
+                    unlocks = await self.mastery_gate.record_unlocks_for_updates(
+                        user_id, belief_response.updates
+                    )
+                    if unlocks:
+                        logger.info(
+                            "quiz_concepts_unlocked",
+                            user_id=str(user_id),
+                            question_id=str(question_id),
+                            concept_ids=[str(event.concept_id) for event in unlocks],
+                        )
+                except Exception as e:
+                    logger.warning(
+                        "quiz_unlock_detection_failed",
+                        user_id=str(user_id),
+                        question_id=str(question_id),
+                        error=str(e),
+                    )
 
         # 8. Create response record
         response = await self.response_repo.create(
@@ -327,7 +359,21 @@ class QuizAnswerService:
         try:
             from src.config import settings
 
-            if settings.READING_QUEUE_SYNC_MODE:
+            if not settings.READING_QUEUE_ENABLED:
+                logger.debug("reading_queue_disabled", session_id=str(session_id))
+            elif settings.READING_QUEUE_MODE == "background":
+                # Background mode: in-process executor, runs after the response is sent
+                from src.tasks.reading_queue_executor import get_reading_queue_executor
+
+                get_reading_queue_executor().submit(
+                    user_id=str(user_id),
+                    enrollment_id=str(session.enrollment_id),
+                    question_id=str(question_id),
+                    session_id=str(session_id),
+                    is_correct=is_correct,
+                    difficulty=question.difficulty,
+                )
+            elif settings.READING_QUEUE_MODE == "sync":
                 # Sync mode: Run directly without Celery (for development/testing)
                 from src.services.reading_queue_service import ReadingQueueService
 
@@ -347,7 +393,7 @@ class QuizAnswerService:
                     question_id=str(question_id),
                     chunks_added=chunks_added,
                 )
-            else:
+            elif settings.READING_QUEUE_MODE == "celery":
                 # Async mode: Dispatch to Celery worker
                 from src.tasks.reading_queue_tasks import add_reading_to_queue
 
@@ -4,7 +4,8 @@ Story 5.5: Background Reading Queue Population
 
 This service handles:
 - Building semantic search queries from question concepts
-- Searching Qdrant for relevant reading chunks
+- Searching Qdrant for relevant reading chunks (using the question's stored
+  vector when available, live embedding otherwise)
 - Calculating priority based on competency and correctness
 - Adding reading materials to the user's queue
 """
@@ -12,7 +13,7 @@ from uuid import UUID
 
 import structlog
 from sqlalchemy import select, text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.config import settings
 from src.models.concept import Concept
@@ -22,7 +23,7 @@ from src.models.question_concept import QuestionConcept
 from src.repositories.qdrant_repository import QdrantRepository
 from src.repositories.reading_queue_repository import ReadingQueueRepository
 from src.schemas.reading_queue import ReadingPriority, ReadingQueueCreate
-from src.services.embedding_service import EmbeddingService
+from src.services.embedding_service import EMBEDDING_DIMENSIONS, EmbeddingService
 
 logger = structlog.get_logger(__name__)
 
@@ -35,16 +36,23 @@ class ReadingQueueService:
     with priority based on correctness and competency level.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        embedding_service: EmbeddingService | None = None,
+    ):
         """
         Initialize the service with database session.
 
         Args:
             session: Async SQLAlchemy session
+            embedding_service: Optional shared EmbeddingService (a short-lived
+                one is created per search if not provided)
         """
         self.session = session
         self.reading_queue_repo = ReadingQueueRepository(session)
         self.qdrant_repo = QdrantRepository()
+        self.embedding_service = embedding_service
 
     async def populate_reading_queue(
         self,
@@ -126,6 +134,7 @@ class ReadingQueueService:
                 course_id=enrollment.course_id,
                 knowledge_area_id=question.knowledge_area_id,
                 limit=chunks_to_add,
+                question_id=question.id,
             )
         except Exception as e:
             logger.error(
@@ -357,25 +366,31 @@ class ReadingQueueService:
         course_id: UUID,
         knowledge_area_id: str,
         limit: int,
+        question_id: UUID | None = None,
     ) -> list[dict]:
         """
         Search Qdrant for relevant reading chunks.
 
-        Generates embedding for query text and searches the reading_chunks
-        collection with KA filtering.
+        Searches the reading_chunks collection with KA filtering, using the
+        question's stored vector when available and an embedding of the
+        query text otherwise.
 
         Args:
             query_text: Search query (concept names or question text)
             course_id: Course UUID for filtering
             knowledge_area_id: Knowledge area ID for filtering
             limit: Maximum results to return
+            question_id: Optional question UUID whose stored vector to reuse
 
         Returns:
             List of search results with id, score, payload
         """
-        # Generate embedding for query
-        async with EmbeddingService() as embedding_service:
-            query_vector = await embedding_service.generate_embedding(query_text)
+        query_vector = None
+        if question_id is not None and settings.READING_SEARCH_USE_QUESTION_VECTORS:
+            query_vector = await self._get_stored_question_vector(question_id)
+
+        if query_vector is None:
+            query_vector = await self._embed_query(query_text)
 
         # Search Qdrant
         results = await self.qdrant_repo.search_chunks(
@@ -387,6 +402,52 @@ class ReadingQueueService:
 
         return results
 
+    async def _get_stored_question_vector(self, question_id: UUID) -> list[float] | None:
+        """
+        Fetch the question's precomputed embedding from the questions collection.
+
+        Args:
+            question_id: Question UUID
+
+        Returns:
+            Stored vector, or None if missing, malformed or Qdrant fails
+        """
+        try:
+            point = await self.qdrant_repo.get_question_vector(question_id)
+        except Exception as e:
+            logger.warning(
+                "reading_queue_question_vector_lookup_failed",
+                question_id=str(question_id),
+                error=str(e),
+            )
+            return None
+
+        vector = point.get("vector") if point else None
+        if not isinstance(vector, list) or len(vector) != EMBEDDING_DIMENSIONS:
+            logger.debug(
+                "reading_queue_question_vector_missing",
+                question_id=str(question_id),
+            )
+            return None
+
+        return vector
+
+    async def _embed_query(self, query_text: str) -> list[float]:
+        """
+        Generate an embedding for the query text via OpenAI.
+
+        Args:
+            query_text: Search query text
+
+        Returns:
+            Embedding vector
+        """
+        if self.embedding_service is not None:
+            return await self.embedding_service.generate_embedding(query_text)
+
+        async with EmbeddingService() as embedding_service:
+            return await embedding_service.generate_embedding(query_text)
+
     async def _get_question_with_concepts(
         self, question_id: UUID
     ) -> Question | None:
@@ -436,12 +497,15 @@ async def populate_reading_queue_async(
     session_id: str,
     is_correct: bool,
     difficulty: float,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    embedding_service: EmbeddingService | None = None,
 ) -> dict:
     """
     Async function to populate reading queue, used by Celery task.
 
-    Creates a fresh database engine for each task to avoid event loop issues
-    in Celery fork workers.
+    When no session_factory is given, creates a fresh database engine for this
+    call to avoid event loop issues in Celery fork workers. The long-lived
+    worker runtime passes its pooled session factory and shared clients instead.
 
     Args:
         user_id: User UUID string
@@ -450,32 +514,34 @@ async def populate_reading_queue_async(
         session_id: Quiz session UUID string
         is_correct: Whether the answer was correct
         difficulty: IRT b-parameter difficulty
+        session_factory: Optional session factory bound to a long-lived engine
+        embedding_service: Optional shared EmbeddingService
 
     Returns:
         Dict with chunks_added and priority
     """
-    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-
-    from src.config import settings
-
-    # Create fresh engine for this task (avoids event loop issues in Celery fork workers)
-    task_engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=False,
-        pool_size=1,
-        max_overflow=0,
-        pool_pre_ping=True,
-    )
-    TaskSession = async_sessionmaker(
-        task_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    task_engine = None
+    if session_factory is None:
+        # Create fresh engine for this task (avoids event loop issues in Celery fork workers)
+        task_engine = create_async_engine(
+            settings.DATABASE_URL,
+            echo=False,
+            pool_size=1,
+            max_overflow=0,
+            pool_pre_ping=True,
+        )
+        session_factory = async_sessionmaker(
+            task_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
 
     try:
-        async with TaskSession() as session:
+        async with session_factory() as session:
             try:
-                service = ReadingQueueService(session)
+                service = ReadingQueueService(session, embedding_service=embedding_service)
                 chunks_added = await service.populate_reading_queue(
                     user_id=UUID(user_id),
                     enrollment_id=UUID(enrollment_id),
@@ -500,5 +566,6 @@ async def populate_reading_queue_async(
                 )
                 raise
     finally:
-        # Clean up engine to avoid connection leaks
-        await task_engine.dispose()
+        # Clean up per-call engine to avoid connection leaks
+        if task_engine is not None:
+            await task_engine.dispose()
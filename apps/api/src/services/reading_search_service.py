@@ -4,11 +4,13 @@ Reading Search Service for semantic search fallback.
 This service provides semantic search capabilities for reading chunks
 using OpenAI embeddings and Qdrant vector database.
 """
+from typing import Any
 from uuid import UUID
 
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import FieldCondition, Filter, MatchValue
 
+from src.config import settings
 from src.db.qdrant_client import get_qdrant
 from src.models.reading_chunk import ReadingChunk
 from src.repositories.reading_chunk_repository import ReadingChunkRepository
@@ -20,6 +22,16 @@ logger = get_logger(__name__)
 # Collection name for reading chunks in Qdrant
 READING_CHUNKS_COLLECTION = "reading_chunks"
 
+# Payload fields required to build a ReadingChunk without a database load
+REQUIRED_PAYLOAD_FIELDS = (
+    "chunk_id",
+    "course_id",
+    "title",
+    "text_content",
+    "corpus_section",
+    "knowledge_area_id",
+)
+
 
 class ReadingSearchService:
     """
@@ -33,6 +45,7 @@ class ReadingSearchService:
         self,
         qdrant_client: AsyncQdrantClient | None = None,
         embedding_service: EmbeddingService | None = None,
+        serve_from_payload: bool | None = None,
     ):
         """
         Initialize the Reading Search Service.
@@ -40,9 +53,79 @@ class ReadingSearchService:
         Args:
             qdrant_client: Async Qdrant client (defaults to get_qdrant())
             embedding_service: Embedding service (defaults to new EmbeddingService())
+            serve_from_payload: Build chunks from Qdrant payloads instead of loading
+                them from the database (defaults to settings.READING_SEARCH_SERVE_FROM_PAYLOAD)
         """
         self.qdrant_client = qdrant_client or get_qdrant()
         self.embedding_service = embedding_service or EmbeddingService()
+        if serve_from_payload is None:
+            serve_from_payload = settings.READING_SEARCH_SERVE_FROM_PAYLOAD
+        self.serve_from_payload = serve_from_payload
+
+    @staticmethod
+    def _chunk_from_payload(payload: dict[str, Any] | None) -> ReadingChunk | None:
+        """
+        Build a transient ReadingChunk from a Qdrant chunk payload.
+
+        Args:
+            payload: Qdrant point payload written by QdrantUploadService
+
+        Returns:
+            ReadingChunk (not attached to a session), or None if the payload
+            is missing required fields
+        """
+        if not payload or any(payload.get(field) is None for field in REQUIRED_PAYLOAD_FIELDS):
+            return None
+        try:
+            return ReadingChunk(
+                id=UUID(payload["chunk_id"]),
+                course_id=UUID(payload["course_id"]),
+                title=payload["title"],
+                content=payload["text_content"],
+                corpus_section=payload["corpus_section"],
+                knowledge_area_id=payload["knowledge_area_id"],
+                concept_ids=[UUID(cid) for cid in payload.get("concept_ids") or []],
+                estimated_read_time_minutes=payload.get("estimated_read_time") or 5,
+            )
+        except (TypeError, ValueError):
+            return None
+
+    async def _load_chunks(
+        self,
+        search_results: list,
+        chunk_repository: ReadingChunkRepository,
+    ) -> list[ReadingChunk]:
+        """
+        Resolve search results to chunks in score order with at most one query.
+
+        Args:
+            search_results: Qdrant scored points (highest score first)
+            chunk_repository: Repository used for chunks not served from payload
+
+        Returns:
+            List of ReadingChunk models in search result order
+        """
+        chunk_ids = [UUID(result.payload["chunk_id"]) for result in search_results]
+
+        resolved: dict[UUID, ReadingChunk] = {}
+        if self.serve_from_payload:
+            for chunk_id, result in zip(chunk_ids, search_results, strict=True):
+                chunk = self._chunk_from_payload(result.payload)
+                if chunk is not None:
+                    resolved[chunk_id] = chunk
+
+        missing_ids = [cid for cid in chunk_ids if cid not in resolved]
+        if missing_ids:
+            for chunk in await chunk_repository.get_by_ids(missing_ids):
+                resolved[chunk.id] = chunk
+
+        logger.debug(
+            "semantic_search_chunks_loaded",
+            from_payload=len(chunk_ids) - len(missing_ids),
+            from_database=len(missing_ids),
+        )
+
+        return [resolved[cid] for cid in chunk_ids if cid in resolved]
 
     async def search_chunks_by_concept_names(
         self,
@@ -61,7 +144,8 @@ class ReadingSearchService:
         Args:
             course_id: Course UUID to filter by
             concept_names: List of concept names to search for
-            chunk_repository: Repository to fetch full chunk objects
+            chunk_repository: Repository to fetch full chunk objects (batched,
+                and skipped entirely when chunks are served from payload)
             limit: Maximum number of chunks to return
 
         Returns:
@@ -114,24 +198,15 @@ class ReadingSearchService:
                 )
                 return []
 
-            # Extract chunk_ids from search results
-            chunk_ids = [UUID(result.payload["chunk_id"]) for result in search_results]
-
             logger.info(
                 "semantic_search_results",
                 course_id=str(course_id),
-                results_count=len(chunk_ids),
+                results_count=len(search_results),
                 top_score=search_results[0].score if search_results else 0,
             )
 
-            # Fetch full chunk objects from database
-            chunks = []
-            for chunk_id in chunk_ids:
-                chunk = await chunk_repository.get_by_id(chunk_id)
-                if chunk:
-                    chunks.append(chunk)
-
-            return chunks
+            # Resolve chunks in score order (payload and/or one batched query)
+            return await self._load_chunks(search_results, chunk_repository)
 
         except Exception as e:
             logger.error(
@@ -24,6 +24,7 @@ from src.schemas.review import (
     ReviewSummaryResponse,
     StillIncorrectConcept,
 )
+from src.services.belief_snapshot_cache import record_belief_updates
 from src.services.belief_updater import BeliefUpdater
 
 logger = structlog.get_logger(__name__)
@@ -570,6 +571,8 @@ class ReviewSessionService:
         # Persist updates
         if updated_beliefs:
             await self.belief_repo.flush_updates(updated_beliefs)
+            # Write through to the belief snapshot cache (published on commit)
+            await record_belief_updates(self.belief_repo, user_id, updated_beliefs)
 
         return belief_updates
 
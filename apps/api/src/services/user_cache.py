@@ -0,0 +1,258 @@
+"""
+User Cache Service
+
+Provides a process-wide LRU of authenticated users in front of the Redis
+user_cache:{id} entries, so get_current_user resolves a known user without a
+Redis round-trip or a Postgres query.
+
+Coherence:
+- Profile updates call publish_invalidation, which deletes the Redis entry and
+  publishes the user id on USER_CACHE_INVALIDATION_CHANNEL
+- Every API process runs a subscriber (started by the lifespan) that drops the
+  user from its local LRU on each message
+- While the subscriber is not connected, local entries are served for at most
+  USER_CACHE_LOCAL_FALLBACK_TTL_SECONDS; the LRU is cleared on (re)subscribe,
+  since messages published in between were missed
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from uuid import UUID
+
+from src.config import settings
+from src.db.redis_client import get_redis
+from src.models.user import User
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_KEY_PREFIX = "user_cache"
+USER_CACHE_INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+# Seconds between subscriber reconnect attempts
+RESUBSCRIBE_DELAY_SECONDS = 5
+
+
+def user_cache_key(user_id: UUID) -> str:
+    """Build the Redis key holding a user's cached profile."""
+    return f"{USER_CACHE_KEY_PREFIX}:{user_id}"
+
+
+def serialize_user(user: User) -> dict[str, Any]:
+    """Serialize the user fields needed by routes to a JSON-compatible dict."""
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "exam_date": user.exam_date.isoformat() if user.exam_date else None,
+        "target_score": user.target_score,
+        "daily_study_time": user.daily_study_time,
+        "knowledge_level": user.knowledge_level,
+        "motivation": user.motivation,
+        "referral_source": user.referral_source,
+        "is_admin": user.is_admin,
+        "dark_mode": user.dark_mode,
+    }
+
+
+def deserialize_user(user_dict: dict[str, Any]) -> User:
+    """Build a detached User from a serialized dict."""
+    user_dict = dict(user_dict)
+    # Convert id back to UUID (was serialized as string for JSON)
+    if "id" in user_dict and isinstance(user_dict["id"], str):
+        user_dict["id"] = UUID(user_dict["id"])
+    return User(**user_dict)
+
+
+class UserCache:
+    """
+    In-process LRU of serialized users with pub/sub invalidation.
+
+    Entries hold the serialized dict rather than a User, so each request gets
+    its own detached instance and route-level mutations never leak into the
+    cache.
+    """
+
+    _instance: Optional["UserCache"] = None
+    _lock = asyncio.Lock()
+
+    def __init__(
+        self,
+        max_users: int | None = None,
+        ttl_seconds: int | None = None,
+        fallback_ttl_seconds: int | None = None,
+    ):
+        self.max_users = max_users or settings.USER_CACHE_LOCAL_MAX_USERS
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.USER_CACHE_LOCAL_TTL_SECONDS
+        )
+        self.fallback_ttl_seconds = (
+            fallback_ttl_seconds
+            if fallback_ttl_seconds is not None
+            else settings.USER_CACHE_LOCAL_FALLBACK_TTL_SECONDS
+        )
+        # user_id -> (serialized user, cached_at)
+        self.users: OrderedDict[UUID, tuple[dict[str, Any], float]] = OrderedDict()
+
+        self._listener: asyncio.Task | None = None
+        self.subscribed = False
+
+        # Cache statistics
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    @classmethod
+    async def get_instance(cls) -> "UserCache":
+        """Get singleton instance."""
+        if cls._instance is None:
+            async with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def reset_instance(cls) -> None:
+        """Stop the subscriber and reset the singleton."""
+        async with cls._lock:
+            if cls._instance is not None:
+                await cls._instance.stop_listener()
+            cls._instance = None
+
+    def get(self, user_id: UUID) -> User | None:
+        """
+        Get a cached user.
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            Detached User, or None on a miss or expired entry
+        """
+        entry = self.users.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        user_dict, cached_at = entry
+        ttl = self.ttl_seconds if self.subscribed else self.fallback_ttl_seconds
+        if time.time() - cached_at >= ttl:
+            del self.users[user_id]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.users.move_to_end(user_id)
+        return deserialize_user(user_dict)
+
+    def put(self, user_id: UUID, user_dict: dict[str, Any]) -> None:
+        """
+        Cache a serialized user.
+
+        Args:
+            user_id: User UUID
+            user_dict: Serialized user (see serialize_user)
+        """
+        self.users[user_id] = (user_dict, time.time())
+        self.users.move_to_end(user_id)
+        while len(self.users) > self.max_users:
+            self.users.popitem(last=False)
+
+    def invalidate(self, user_id: UUID | None = None) -> None:
+        """
+        Drop cached users in this process.
+
+        Args:
+            user_id: User to invalidate (all users if None)
+        """
+        if user_id is None:
+            self.users.clear()
+        elif self.users.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    async def publish_invalidation(self, user_id: UUID) -> None:
+        """
+        Invalidate a user in this process, in Redis and in every other process.
+
+        Should be called after any committed write to fields in serialize_user.
+
+        Args:
+            user_id: User UUID
+        """
+        self.invalidate(user_id)
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(user_cache_key(user_id))
+                pipe.publish(USER_CACHE_INVALIDATION_CHANNEL, str(user_id))
+                await pipe.execute()
+        except Exception as e:
+            # Fail-safe: other processes expire the entry after their TTL
+            logger.warning(f"User cache invalidation publish failed for {user_id}: {e}")
+
+    def start_listener(self) -> None:
+        """Start the invalidation subscriber on the running event loop."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(), name="user-cache-invalidation")
+
+    async def stop_listener(self) -> None:
+        """Stop the invalidation subscriber."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        self.subscribed = False
+
+    async def _listen(self) -> None:
+        """Drop users named on the invalidation channel, resubscribing on errors."""
+        while True:
+            pubsub = None
+            try:
+                redis = await get_redis()
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(USER_CACHE_INVALIDATION_CHANNEL)
+                # Invalidations published while unsubscribed were missed
+                self.invalidate()
+                self.subscribed = True
+                logger.info("User cache invalidation subscriber connected")
+
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is None or message.get("type") != "message":
+                        continue
+                    try:
+                        self.invalidate(UUID(message["data"]))
+                    except (TypeError, ValueError):
+                        logger.warning(f"Ignoring malformed user cache invalidation: {message['data']!r}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"User cache invalidation subscriber failed (Redis unavailable?): {e}")
+                self.subscribed = False
+                await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def get_statistics(self) -> dict:
+        """Get cache size, subscriber state and hit statistics."""
+        total = self.hits + self.misses
+        return {
+            "users": len(self.users),
+            "subscribed": self.subscribed,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+async def get_user_cache() -> UserCache:
+    """FastAPI dependency for the user cache."""
+    return await UserCache.get_instance()
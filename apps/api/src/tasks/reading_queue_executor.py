@@ -0,0 +1,317 @@
+"""
+In-process background executor for reading queue population.
+Story 5.5: Background Reading Queue Population
+
+Runs reading queue population on the API process's event loop after the
+answer response is returned, without a Celery broker. The executor keeps a
+bounded set of pending jobs keyed by (enrollment_id, question_id), so a
+repeated submission for the same question replaces the pending job instead of
+queuing a duplicate. When the queue is full the oldest (or the new) job is
+dropped according to READING_QUEUE_EXECUTOR_DROP_POLICY.
+
+Jobs use the executor's own pooled database engine and a shared
+EmbeddingService, so background work never competes with request sessions
+for connections.
+
+Lifecycle:
+- Started by the FastAPI lifespan (or lazily on first submit)
+- Drained on lifespan shutdown: pending jobs get up to
+  READING_QUEUE_EXECUTOR_DRAIN_SECONDS to finish, the rest are abandoned
+"""
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.config import settings
+from src.utils.latency_stats import TaskLatencyStats
+
+if TYPE_CHECKING:
+    from src.services.embedding_service import EmbeddingService
+
+logger = structlog.get_logger(__name__)
+
+DROP_OLDEST = "oldest"
+DROP_NEWEST = "newest"
+
+# Key of a reading queue job: (enrollment_id, question_id)
+JobKey = tuple[str, str]
+
+
+class ReadingQueueExecutor:
+    """
+    Bounded asyncio work queue for reading queue population.
+
+    Provides:
+    - A fixed number of worker coroutines on the running event loop
+    - Coalescing of pending jobs for the same (enrollment, question)
+    - Backpressure: at most max_pending jobs wait, extra jobs are dropped
+    - A pooled async database engine and shared EmbeddingService
+    - Graceful drain with a timeout on shutdown
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        max_pending: int | None = None,
+        drop_policy: str | None = None,
+        pool_size: int | None = None,
+    ):
+        self.concurrency = concurrency or settings.READING_QUEUE_EXECUTOR_CONCURRENCY
+        self.max_pending = max_pending or settings.READING_QUEUE_EXECUTOR_MAX_PENDING
+        self.drop_policy = drop_policy or settings.READING_QUEUE_EXECUTOR_DROP_POLICY
+        if self.drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {self.drop_policy}")
+        self.pool_size = pool_size or settings.READING_QUEUE_EXECUTOR_DB_POOL_SIZE
+
+        # Pending jobs in submission order; the queue carries their keys
+        self._pending: dict[JobKey, dict[str, Any]] = {}
+        self._queue: asyncio.Queue[JobKey] | None = None
+        self._workers: list[asyncio.Task] = []
+
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._embedding_service: "EmbeddingService | None" = None
+
+        self.submitted: int = 0
+        self.coalesced: int = 0
+        self.dropped: int = 0
+        self.stats = TaskLatencyStats()
+        self.closed = False
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> "ReadingQueueExecutor":
+        """Create the engine and start the workers on the running event loop."""
+        if self.started or self.closed:
+            return self
+
+        self.engine = create_async_engine(
+            settings.DATABASE_URL,
+            echo=False,
+            pool_size=self.pool_size,
+            max_overflow=0,
+            pool_pre_ping=True,
+        )
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"reading-queue-executor-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(
+            "reading_queue_executor_started",
+            concurrency=self.concurrency,
+            max_pending=self.max_pending,
+            drop_policy=self.drop_policy,
+            db_pool_size=self.pool_size,
+        )
+        return self
+
+    @property
+    def embedding_service(self) -> "EmbeddingService":
+        """Shared EmbeddingService, created on first use."""
+        if self._embedding_service is None:
+            from src.services.embedding_service import EmbeddingService
+
+            self._embedding_service = EmbeddingService()
+        return self._embedding_service
+
+    def submit(
+        self,
+        user_id: str,
+        enrollment_id: str,
+        question_id: str,
+        session_id: str,
+        is_correct: bool,
+        difficulty: float,
+    ) -> bool:
+        """
+        Queue reading queue population for an answer submission.
+
+        Never blocks: a pending job for the same (enrollment, question) is
+        replaced with the newer answer, and a full queue drops a job.
+
+        Args:
+            user_id: User UUID string
+            enrollment_id: Enrollment UUID string
+            question_id: Question UUID string
+            session_id: Quiz session UUID string
+            is_correct: Whether the answer was correct
+            difficulty: IRT b-parameter difficulty
+
+        Returns:
+            True if the job was queued or coalesced, False if it was rejected
+        """
+        if self.closed:
+            return False
+        self.start()
+
+        key = (enrollment_id, question_id)
+        job = {
+            "user_id": user_id,
+            "enrollment_id": enrollment_id,
+            "question_id": question_id,
+            "session_id": session_id,
+            "is_correct": is_correct,
+            "difficulty": difficulty,
+        }
+        self.submitted += 1
+
+        if key in self._pending:
+            # Keep the queue position, run with the latest answer
+            self._pending[key] = job
+            self.coalesced += 1
+            return True
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            if self.drop_policy == DROP_NEWEST:
+                logger.warning(
+                    "reading_queue_job_dropped",
+                    question_id=question_id,
+                    policy=self.drop_policy,
+                    pending=len(self._pending),
+                )
+                return False
+            # Its key stays in the queue and is skipped by the worker
+            oldest = next(iter(self._pending))
+            del self._pending[oldest]
+            logger.warning(
+                "reading_queue_job_dropped",
+                question_id=oldest[1],
+                policy=self.drop_policy,
+                pending=len(self._pending),
+            )
+
+        self._pending[key] = job
+        self._queue.put_nowait(key)
+        return True
+
+    async def _worker(self) -> None:
+        """Run pending jobs until cancelled."""
+        while True:
+            key = await self._queue.get()
+            try:
+                job = self._pending.pop(key, None)
+                if job is not None:
+                    await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: dict[str, Any]) -> None:
+        """Populate the reading queue for one job, logging any failure."""
+        from src.services.reading_queue_service import populate_reading_queue_async
+
+        start_time = time.perf_counter()
+        try:
+            result = await populate_reading_queue_async(
+                **job,
+                session_factory=self.session_factory,
+                embedding_service=self.embedding_service,
+            )
+        except Exception as e:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self.stats.record(duration_ms, success=False)
+            logger.error(
+                "reading_queue_background_failed",
+                user_id=job["user_id"],
+                question_id=job["question_id"],
+                error=str(e),
+                duration_ms=round(duration_ms, 2),
+            )
+            return
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        self.stats.record(duration_ms)
+        logger.info(
+            "reading_queue_background_completed",
+            user_id=job["user_id"],
+            question_id=job["question_id"],
+            chunks_added=result.get("chunks_added", 0),
+            duration_ms=round(duration_ms, 2),
+        )
+
+    def get_statistics(self) -> dict:
+        """Get queue counters and job latency statistics."""
+        return {
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "jobs": self.stats.to_dict(),
+        }
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """
+        Stop accepting jobs, drain pending ones and release resources.
+
+        Args:
+            timeout: Seconds to wait for pending jobs
+                (defaults to READING_QUEUE_EXECUTOR_DRAIN_SECONDS)
+        """
+        if self.closed:
+            return
+        self.closed = True
+        timeout = timeout if timeout is not None else settings.READING_QUEUE_EXECUTOR_DRAIN_SECONDS
+
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except TimeoutError:
+                logger.warning(
+                    "reading_queue_executor_drain_timeout",
+                    abandoned=len(self._pending),
+                    timeout_s=timeout,
+                )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._pending.clear()
+
+        if self._embedding_service is not None:
+            await self._embedding_service.close()
+            self._embedding_service = None
+        if self.engine is not None:
+            await self.engine.dispose()
+
+        logger.info("reading_queue_executor_stopped", **self.get_statistics())
+
+
+# Process-wide executor instance
+_executor: ReadingQueueExecutor | None = None
+
+
+def get_reading_queue_executor() -> ReadingQueueExecutor:
+    """Get the process executor, creating it if needed (workers start on first use)."""
+    global _executor
+    if _executor is None:
+        _executor = ReadingQueueExecutor()
+    return _executor
+
+
+async def shutdown_reading_queue_executor() -> None:
+    """Drain and shut down the process executor, if one was created."""
+    global _executor
+    if _executor is not None:
+        await _executor.shutdown()
+    _executor = None
@@ -5,6 +5,10 @@ Story 5.5: Background Reading Queue Population
 This task runs asynchronously after each answer submission to add
 relevant reading materials to the user's queue without blocking
 the answer response.
+
+With WORKER_RUNTIME_ENABLED, tasks run on the per-process WorkerRuntime
+(persistent event loop, pooled engine, shared clients) instead of paying
+for a new event loop, engine and API clients on every call.
 """
 import asyncio
 import time
@@ -12,16 +16,20 @@ import time
 import structlog
 
 from src.celery_app import celery_app
+from src.config import settings
+from src.tasks.worker_runtime import get_worker_runtime
 
 logger = structlog.get_logger(__name__)
 
+TASK_NAME = "src.tasks.reading_queue_tasks.add_reading_to_queue"
+
 # Performance threshold for monitoring (AC 10)
 TASK_DURATION_WARNING_MS = 200
 
 
 @celery_app.task(
     bind=True,
-    name="src.tasks.reading_queue_tasks.add_reading_to_queue",
+    name=TASK_NAME,
     max_retries=3,
     default_retry_delay=5,
     autoretry_for=(Exception,),
@@ -60,24 +68,38 @@ def add_reading_to_queue(
         Dict with chunks_added, duration_ms, and status
     """
     start_time = time.perf_counter()
+    runtime = get_worker_runtime() if settings.WORKER_RUNTIME_ENABLED else None
+    runtime_mode = "worker" if runtime is not None else "per_task"
 
     try:
         # Import here to avoid circular imports
         from src.services.reading_queue_service import populate_reading_queue_async
 
-        # Run the async function in a new event loop
-        result = asyncio.run(
-            populate_reading_queue_async(
-                user_id=user_id,
-                enrollment_id=enrollment_id,
-                question_id=question_id,
-                session_id=session_id,
-                is_correct=is_correct,
-                difficulty=difficulty,
+        task_kwargs = {
+            "user_id": user_id,
+            "enrollment_id": enrollment_id,
+            "question_id": question_id,
+            "session_id": session_id,
+            "is_correct": is_correct,
+            "difficulty": difficulty,
+        }
+
+        if runtime is not None:
+            # Reuse the worker's event loop, engine pool and clients
+            result = runtime.run(
+                populate_reading_queue_async(
+                    **task_kwargs,
+                    session_factory=runtime.session_factory,
+                    embedding_service=runtime.embedding_service,
+                )
             )
-        )
+        else:
+            # Run the async function in a new event loop
+            result = asyncio.run(populate_reading_queue_async(**task_kwargs))
 
         duration_ms = int((time.perf_counter() - start_time) * 1000)
+        if runtime is not None:
+            runtime.record_task(TASK_NAME, duration_ms)
 
         logger.info(
             "reading_queue_task_completed",
@@ -86,6 +108,10 @@ def add_reading_to_queue(
             question_id=question_id,
             chunks_added=result.get("chunks_added", 0),
             duration_ms=duration_ms,
+            runtime_mode=runtime_mode,
+            latency_stats=(
+                runtime.task_stats[TASK_NAME].to_dict() if runtime is not None else None
+            ),
         )
 
         # Performance monitoring: warn if task exceeds threshold (AC 10)
@@ -96,6 +122,7 @@ def add_reading_to_queue(
                 user_id=user_id,
                 question_id=question_id,
                 duration_ms=duration_ms,
+                runtime_mode=runtime_mode,
                 threshold_ms=TASK_DURATION_WARNING_MS,
                 message="Task exceeded performance threshold - may indicate Qdrant/OpenAI latency issues",
             )
@@ -109,6 +136,8 @@ def add_reading_to_queue(
 
     except Exception as e:
         duration_ms = int((time.perf_counter() - start_time) * 1000)
+        if runtime is not None:
+            runtime.record_task(TASK_NAME, duration_ms, success=False)
 
         logger.error(
             "reading_queue_task_failed",
@@ -118,6 +147,7 @@ def add_reading_to_queue(
             error=str(e),
             retry_count=self.request.retries,
             duration_ms=duration_ms,
+            runtime_mode=runtime_mode,
         )
         raise
 
@@ -0,0 +1,197 @@
+"""
+Long-lived async runtime for Celery worker processes.
+
+Celery tasks are synchronous, so each async task previously ran under its own
+asyncio.run() with a freshly created database engine and API clients. The
+WorkerRuntime keeps one event loop (on a background thread), one pooled
+database engine and shared Qdrant/OpenAI clients per worker process, so each
+task pays only for its own queries.
+
+Lifecycle:
+- Started on worker_process_init (prefork children) or lazily on first use
+- Drained and closed on worker_process_shutdown / worker_shutdown
+"""
+import asyncio
+import os
+import threading
+from collections.abc import Coroutine
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import structlog
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.config import settings
+from src.utils.latency_stats import TaskLatencyStats
+
+if TYPE_CHECKING:
+    from src.services.embedding_service import EmbeddingService
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Seconds to wait for in-flight work and client cleanup on shutdown
+SHUTDOWN_TIMEOUT_SECONDS = 10
+
+
+class WorkerRuntime:
+    """
+    Per-process async runtime shared by Celery tasks.
+
+    Provides:
+    - A persistent event loop running on a daemon thread
+    - A pooled async database engine and session factory
+    - A shared EmbeddingService (created on first use)
+    - Per-task latency statistics
+    """
+
+    def __init__(self, pool_size: int | None = None):
+        self.pid = os.getpid()
+        self.pool_size = pool_size or settings.WORKER_DB_POOL_SIZE
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="worker-runtime-loop", daemon=True
+        )
+        self.engine: AsyncEngine = create_async_engine(
+            settings.DATABASE_URL,
+            echo=False,
+            pool_size=self.pool_size,
+            max_overflow=0,
+            pool_pre_ping=True,
+        )
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        self._embedding_service: "EmbeddingService | None" = None
+        self.task_stats: dict[str, TaskLatencyStats] = {}
+        self.closed = False
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self) -> "WorkerRuntime":
+        """Start the event loop thread."""
+        self._thread.start()
+        logger.info("worker_runtime_started", pid=self.pid, db_pool_size=self.pool_size)
+        return self
+
+    @property
+    def embedding_service(self) -> "EmbeddingService":
+        """Shared EmbeddingService, created on first use."""
+        if self._embedding_service is None:
+            from src.services.embedding_service import EmbeddingService
+
+            self._embedding_service = EmbeddingService()
+        return self._embedding_service
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        Safe to call from any worker thread (prefork, solo or threads pools).
+
+        Args:
+            coro: Coroutine to execute
+
+        Returns:
+            The coroutine's result
+        """
+        if self.closed:
+            coro.close()
+            raise RuntimeError("Worker runtime is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def record_task(self, task_name: str, duration_ms: float, success: bool = True) -> None:
+        """Record a task execution in the latency statistics."""
+        stats = self.task_stats.get(task_name)
+        if stats is None:
+            stats = self.task_stats[task_name] = TaskLatencyStats()
+        stats.record(duration_ms, success=success)
+
+    def get_statistics(self) -> dict:
+        """Get runtime and per-task latency statistics."""
+        return {
+            "pid": self.pid,
+            "db_pool_size": self.pool_size,
+            "tasks": {name: stats.to_dict() for name, stats in self.task_stats.items()},
+        }
+
+    async def _close_resources(self) -> None:
+        from src.db.qdrant_client import close_qdrant
+
+        if self._embedding_service is not None:
+            await self._embedding_service.close()
+            self._embedding_service = None
+        await close_qdrant()
+        await self.engine.dispose()
+
+    def shutdown(self) -> None:
+        """Close shared clients, dispose the engine and stop the loop."""
+        if self.closed:
+            return
+        self.closed = True
+
+        if self._thread.is_alive():
+            try:
+                asyncio.run_coroutine_threadsafe(self._close_resources(), self.loop).result(
+                    timeout=SHUTDOWN_TIMEOUT_SECONDS
+                )
+            except Exception as e:
+                logger.warning("worker_runtime_cleanup_failed", pid=self.pid, error=str(e))
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=SHUTDOWN_TIMEOUT_SECONDS)
+        self.loop.close()
+
+        logger.info("worker_runtime_stopped", **self.get_statistics())
+
+
+# Process-wide runtime instance
+_runtime: WorkerRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
+def get_worker_runtime() -> WorkerRuntime:
+    """
+    Get the runtime for the current worker process, starting it if needed.
+
+    A runtime inherited across fork is discarded, since its loop thread does
+    not exist in the child process.
+    """
+    global _runtime
+    if _runtime is None or _runtime.closed or _runtime.pid != os.getpid():
+        with _runtime_lock:
+            if _runtime is None or _runtime.closed or _runtime.pid != os.getpid():
+                _runtime = WorkerRuntime().start()
+    return _runtime
+
+
+def shutdown_worker_runtime() -> None:
+    """Shut down the current process runtime, if one was started."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is not None and _runtime.pid == os.getpid():
+            _runtime.shutdown()
+        _runtime = None
+
+
+@worker_process_init.connect
+def _init_worker_runtime(**kwargs) -> None:
+    """Start the runtime when a worker child process boots."""
+    if settings.WORKER_RUNTIME_ENABLED:
+        get_worker_runtime()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _shutdown_worker_runtime(**kwargs) -> None:
+    """Drain the runtime when a worker process exits."""
+    shutdown_worker_runtime()
@@ -1,7 +1,13 @@
 """Utility functions for the LearnR API."""
 
 from .auth import create_access_token, decode_token, hash_password, verify_password
-from .bkt_math import beta_entropy, calculate_info_gain, safe_divide
+from .bkt_math import (
+    beta_entropy,
+    beta_entropy_batch,
+    calculate_info_gain,
+    expected_info_gain_batch,
+    safe_divide,
+)
 from .logging_config import configure_logging, get_logger
 
 __all__ = [
@@ -12,6 +18,8 @@ __all__ = [
     "configure_logging",
     "get_logger",
     "beta_entropy",
+    "beta_entropy_batch",
     "calculate_info_gain",
+    "expected_info_gain_batch",
     "safe_divide",
 ]
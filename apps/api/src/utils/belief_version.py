@@ -0,0 +1,71 @@
+"""
+User belief versioning using Redis
+Provides a per-user version counter that in-process belief snapshots compare
+against to detect belief updates committed by other API workers.
+"""
+import logging
+from uuid import UUID
+
+from src.db.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+BELIEF_VERSION_KEY_PREFIX = "belief_version:user"
+
+# Version keys expire after a week without updates; a missing key reads as 0,
+# which forces a reload for any snapshot taken at a later version
+BELIEF_VERSION_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def _belief_version_key(user_id: UUID) -> str:
+    """Build the Redis key holding a user's belief version."""
+    return f"{BELIEF_VERSION_KEY_PREFIX}:{user_id}"
+
+
+async def get_user_belief_version(user_id: UUID) -> int | None:
+    """
+    Get the current belief version for a user.
+
+    Args:
+        user_id: User UUID
+
+    Returns:
+        Current version (0 if beliefs were never bumped),
+        or None if Redis is unavailable
+    """
+    try:
+        redis = await get_redis()
+        value = await redis.get(_belief_version_key(user_id))
+    except Exception as e:
+        # Fail-safe: callers fall back to time-based expiry
+        logger.warning(f"Belief version lookup failed (Redis unavailable?): {e}")
+        return None
+
+    return int(value) if value is not None else 0
+
+
+async def bump_user_belief_version(user_id: UUID) -> int | None:
+    """
+    Increment the belief version for a user.
+
+    Should be called after a transaction that changes the user's belief
+    states has been committed.
+
+    Args:
+        user_id: User UUID
+
+    Returns:
+        New version, or None if Redis is unavailable
+    """
+    key = _belief_version_key(user_id)
+    try:
+        redis = await get_redis()
+        version = await redis.incr(key)
+        await redis.expire(key, BELIEF_VERSION_TTL_SECONDS)
+    except Exception as e:
+        # Fail-safe: the write itself has already succeeded
+        logger.warning(f"Belief version bump failed for user {user_id}: {e}")
+        return None
+
+    logger.debug(f"Bumped belief version for user {user_id} to {version}")
+    return version
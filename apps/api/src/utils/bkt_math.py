@@ -4,7 +4,8 @@ Provides entropy calculations for Beta distributions and information gain.
 """
 from uuid import UUID
 
-from scipy.special import betaln, digamma
+import numpy as np
+from scipy.special import betaln, digamma, gammaln
 
 # Default pseudo-observations for prior scaling
 # Higher values = more confidence in initial belief
@@ -73,6 +74,93 @@ def beta_entropy(alpha: float, beta: float) -> float:
     )
 
 
+def beta_entropy_batch(alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+    """
+    Vectorized differential entropy of Beta(alpha, beta) distributions.
+
+    Element-wise equivalent of beta_entropy for arrays of any shape.
+    Inputs are not validated; callers must pass positive parameters
+    (use alpha=beta=1 for padding, which has zero entropy).
+
+    Args:
+        alpha: Array of alpha parameters
+        beta: Array of beta parameters (same shape as alpha)
+
+    Returns:
+        Array of differential entropies in nats
+    """
+    total = alpha + beta
+    return (
+        gammaln(alpha) + gammaln(beta) - gammaln(total)
+        - (alpha - 1) * digamma(alpha)
+        - (beta - 1) * digamma(beta)
+        + (total - 2) * digamma(total)
+    )
+
+
+def expected_info_gain_batch(
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    mask: np.ndarray,
+    slip: np.ndarray,
+    guess: np.ndarray,
+) -> np.ndarray:
+    """
+    Expected information gain for a batch of candidate questions.
+
+    Operates on a padded candidates x concepts matrix. For each candidate,
+    computes current entropy minus the expected posterior entropy under the
+    slip/guess response model, simulating both response outcomes in one pass.
+
+    Args:
+        alpha: (n_candidates, max_concepts) alpha parameters, padded with 1.0
+        beta: (n_candidates, max_concepts) beta parameters, padded with 1.0
+        mask: (n_candidates, max_concepts) bool, True where a belief exists
+        slip: (n_candidates,) question slip rates
+        guess: (n_candidates,) question guess rates
+
+    Returns:
+        (n_candidates,) expected information gain (0.0 for rows with no beliefs)
+    """
+    counts = mask.sum(axis=1)
+    has_beliefs = counts > 0
+
+    slip_col = slip[:, None]
+    guess_col = guess[:, None]
+    p_mastered = alpha / (alpha + beta)
+
+    # Current entropy (uncertainty)
+    current_entropy = np.where(mask, beta_entropy_batch(alpha, beta), 0.0).sum(axis=1)
+
+    # Predicted probability of a correct response from average mastery
+    avg_mastery = np.where(mask, p_mastered, 0.0).sum(axis=1) / np.maximum(counts, 1)
+    p_correct = (1 - slip) * avg_mastery + guess * (1 - avg_mastery)
+
+    # Posterior mastery for each simulated outcome
+    p_obs_correct = (1 - slip_col) * p_mastered + guess_col * (1 - p_mastered)
+    p_obs_incorrect = slip_col * p_mastered + (1 - guess_col) * (1 - p_mastered)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        post_correct = np.where(
+            p_obs_correct > 0, (1 - slip_col) * p_mastered / p_obs_correct, p_mastered
+        )
+        post_incorrect = np.where(
+            p_obs_incorrect > 0, slip_col * p_mastered / p_obs_incorrect, p_mastered
+        )
+
+    entropy_if_correct = np.where(
+        mask, beta_entropy_batch(alpha + post_correct, beta + (1 - post_correct)), 0.0
+    ).sum(axis=1)
+    entropy_if_incorrect = np.where(
+        mask, beta_entropy_batch(alpha + post_incorrect, beta + (1 - post_incorrect)), 0.0
+    ).sum(axis=1)
+
+    expected_posterior_entropy = (
+        p_correct * entropy_if_correct + (1 - p_correct) * entropy_if_incorrect
+    )
+
+    return np.where(has_beliefs, current_entropy - expected_posterior_entropy, 0.0)
+
+
 def calculate_info_gain(
     beliefs_before: dict[UUID, tuple[float, float]],
     beliefs_after: dict[UUID, tuple[float, float]],
@@ -0,0 +1,112 @@
+"""
+Course content versioning using Redis
+Provides per-course version counters that in-process caches compare against
+to detect question bank and prerequisite graph changes made by other workers
+or offline scripts.
+"""
+import logging
+from uuid import UUID
+
+from src.db.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CONTENT_VERSION_KEY_PREFIX = "content_version:course"
+PREREQUISITE_GRAPH_VERSION_KEY_PREFIX = "prerequisite_graph_version:course"
+
+
+def _content_version_key(course_id: UUID) -> str:
+    """Build the Redis key holding a course's content version."""
+    return f"{CONTENT_VERSION_KEY_PREFIX}:{course_id}"
+
+
+def _prerequisite_graph_version_key(course_id: UUID) -> str:
+    """Build the Redis key holding a course's prerequisite graph version."""
+    return f"{PREREQUISITE_GRAPH_VERSION_KEY_PREFIX}:{course_id}"
+
+
+async def _get_version(key: str) -> int | None:
+    """Read a version counter (0 if unset, None if Redis is unavailable)."""
+    try:
+        redis = await get_redis()
+        value = await redis.get(key)
+    except Exception as e:
+        # Fail-safe: callers fall back to time-based expiry
+        logger.warning(f"Version lookup failed for {key} (Redis unavailable?): {e}")
+        return None
+
+    return int(value) if value is not None else 0
+
+
+async def _bump_version(key: str) -> int | None:
+    """Increment a version counter (None if Redis is unavailable)."""
+    try:
+        redis = await get_redis()
+        version = await redis.incr(key)
+    except Exception as e:
+        # Fail-safe: the write itself has already succeeded
+        logger.warning(f"Version bump failed for {key}: {e}")
+        return None
+
+    logger.debug(f"Bumped {key} to {version}")
+    return version
+
+
+async def get_course_content_version(course_id: UUID) -> int | None:
+    """
+    Get the current content version for a course.
+
+    Args:
+        course_id: Course UUID
+
+    Returns:
+        Current version (0 if the course has never been bumped),
+        or None if Redis is unavailable
+    """
+    return await _get_version(_content_version_key(course_id))
+
+
+async def bump_course_content_version(course_id: UUID) -> int | None:
+    """
+    Increment the content version for a course.
+
+    Should be called after any write that changes the course question bank
+    (question inserts, deletes, deactivation, concept mapping changes).
+
+    Args:
+        course_id: Course UUID
+
+    Returns:
+        New version, or None if Redis is unavailable
+    """
+    return await _bump_version(_content_version_key(course_id))
+
+
+async def get_prerequisite_graph_version(course_id: UUID) -> int | None:
+    """
+    Get the current prerequisite graph version for a course.
+
+    Args:
+        course_id: Course UUID
+
+    Returns:
+        Current version (0 if the course has never been bumped),
+        or None if Redis is unavailable
+    """
+    return await _get_version(_prerequisite_graph_version_key(course_id))
+
+
+async def bump_prerequisite_graph_version(course_id: UUID) -> int | None:
+    """
+    Increment the prerequisite graph version for a course.
+
+    Should be called after committing writes to the course's prerequisite
+    edges or concept depths (e.g. by build_prerequisite_graph.py).
+
+    Args:
+        course_id: Course UUID
+
+    Returns:
+        New version, or None if Redis is unavailable
+    """
+    return await _bump_version(_prerequisite_graph_version_key(course_id))
@@ -0,0 +1,47 @@
+"""
+Rolling latency statistics
+Shared by the Celery worker runtime and the in-process executors (password
+hashing, reading queue, next question prefetch) to report operation latency.
+"""
+from collections import deque
+
+# Number of recent durations kept for percentile reporting
+LATENCY_SAMPLE_SIZE = 500
+
+
+class TaskLatencyStats:
+    """Rolling latency statistics for a single task name or operation."""
+
+    def __init__(self, sample_size: int = LATENCY_SAMPLE_SIZE):
+        self.count: int = 0
+        self.failures: int = 0
+        self.total_ms: float = 0.0
+        self.max_ms: float = 0.0
+        self.samples: deque[float] = deque(maxlen=sample_size)
+
+    def record(self, duration_ms: float, success: bool = True) -> None:
+        """Record one task execution."""
+        self.count += 1
+        if not success:
+            self.failures += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.samples.append(duration_ms)
+
+    def _percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(int(len(ordered) * pct), len(ordered) - 1)
+        return ordered[index]
+
+    def to_dict(self) -> dict:
+        """Summarize statistics for logging."""
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self._percentile(0.50), 2),
+            "p95_ms": round(self._percentile(0.95), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
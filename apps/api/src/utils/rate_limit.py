@@ -1,15 +1,326 @@
 """
 Rate limiting utility using Redis
 Implements sliding window rate limiting for API endpoints
+
+Each key is a sorted set of request timestamps. A single Lua script prunes
+entries older than the window, counts, and records the request, so a check
+is one atomic round-trip however many keys it covers. Multi-key checks are
+all-or-nothing: a request is recorded against every key only if every key
+allows it.
+
+Hot paths can opt in to a local shadow (local=True). After Redis admits a
+request, this process may admit up to RATE_LIMIT_LOCAL_SHARE of the key's
+remaining headroom without contacting Redis, for at most
+RATE_LIMIT_LOCAL_MAX_AGE_SECONDS. Those requests are recorded in Redis on the
+next sync, so a key overshoots its limit by at most the allowances
+outstanding in each process. Rejections are remembered locally until their
+retry time.
 """
 
+import math
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from src.config import settings
 from src.db.redis_client import get_redis
 
+# KEYS: one sorted set per limit
+# ARGV: now_ms, member prefix, then (limit, window_ms, unsynced) per key
+# Returns: allowed, then (count, retry_after_ms) per key
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local counts = {}
+local allowed = 1
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[3 * i])
+    local window = tonumber(ARGV[3 * i + 1])
+    local unsynced = tonumber(ARGV[3 * i + 2])
+
+    -- Keys left by the previous fixed-window counter are started afresh
+    local key_type = redis.call('TYPE', key)['ok']
+    if key_type ~= 'zset' and key_type ~= 'none' then
+        redis.call('DEL', key)
+    end
+
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    -- Requests already admitted from a local allowance
+    for j = 1, unsynced do
+        redis.call('ZADD', key, now, member .. ':' .. i .. ':' .. j)
+    end
+
+    local count = redis.call('ZCARD', key)
+    counts[i] = count
+    if count >= limit then
+        allowed = 0
+    end
+end
+
+local result = {allowed}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[3 * i])
+    local window = tonumber(ARGV[3 * i + 1])
+    local count = counts[i]
+    local retry_after = 0
+
+    if allowed == 1 then
+        redis.call('ZADD', key, now, member .. ':' .. i)
+        count = count + 1
+    elseif count >= limit then
+        -- Allowed again once the (count - limit + 1) oldest requests expire
+        local entry = redis.call('ZRANGE', key, count - limit, count - limit, 'WITHSCORES')
+        retry_after = tonumber(entry[2]) + window - now
+    end
+
+    if count > 0 then
+        redis.call('PEXPIRE', key, window)
+    end
+    result[2 * i] = count
+    result[2 * i + 1] = retry_after
+end
+
+return result
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """A limit of max_attempts requests per sliding window on a Redis key."""
+    key: str
+    max_attempts: int
+    window_seconds: int
+
+
+@dataclass(slots=True)
+class _ShadowEntry:
+    """Local admission state for one key."""
+    allowance: int = 0
+    unsynced: int = 0
+    expires_at: float = 0.0
+    blocked_until: float = 0.0
+
+
+class LocalRateLimitShadow:
+    """
+    Per-process share of each key's Redis headroom.
+
+    Admits requests locally while an allowance granted by the last Redis
+    check lasts, and counts them so the next check records them in Redis.
+    """
+
+    def __init__(
+        self,
+        share: float | None = None,
+        max_age_seconds: float | None = None,
+        max_keys: int | None = None,
+    ):
+        self.share = share if share is not None else settings.RATE_LIMIT_LOCAL_SHARE
+        self.max_age_seconds = (
+            max_age_seconds
+            if max_age_seconds is not None
+            else settings.RATE_LIMIT_LOCAL_MAX_AGE_SECONDS
+        )
+        self.max_keys = max_keys or settings.RATE_LIMIT_LOCAL_MAX_KEYS
+        self.entries: OrderedDict[str, _ShadowEntry] = OrderedDict()
+
+        # Statistics
+        self.local_admits: int = 0
+        self.local_rejects: int = 0
+
+    def try_admit(self, limits: Sequence[RateLimit], now: float) -> tuple[bool, int] | None:
+        """
+        Decide a check locally.
+
+        Args:
+            limits: Limits the request is checked against
+            now: Current time in seconds
+
+        Returns:
+            (is_allowed, retry_after_seconds), or None if Redis must decide
+        """
+        entries = []
+        for limit in limits:
+            entry = self.entries.get(limit.key)
+            if entry is None:
+                return None
+            if entry.blocked_until > now:
+                self.local_rejects += 1
+                return False, max(1, math.ceil(entry.blocked_until - now))
+            if entry.allowance <= 0 or entry.expires_at <= now:
+                return None
+            entries.append(entry)
+
+        for entry in entries:
+            entry.allowance -= 1
+            entry.unsynced += 1
+        self.local_admits += 1
+        return True, 0
+
+    def take_unsynced(self, key: str) -> int:
+        """Pop the count of locally admitted requests not yet recorded in Redis."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return 0
+        unsynced, entry.unsynced = entry.unsynced, 0
+        return unsynced
+
+    def restore_unsynced(self, key: str, unsynced: int) -> None:
+        """Put back locally admitted requests after a failed Redis check."""
+        if unsynced:
+            self._entry(key).unsynced += unsynced
+
+    def record(
+        self,
+        limit: RateLimit,
+        allowed: bool,
+        count: int,
+        retry_after: int,
+        now: float,
+    ) -> None:
+        """
+        Update a key's local state from a Redis check.
+
+        Args:
+            limit: Limit that was checked
+            allowed: Whether Redis admitted the request
+            count: Requests in the window after the check
+            retry_after: Seconds until the key allows requests again (if blocked)
+            now: Current time in seconds
+        """
+        entry = self._entry(limit.key)
+        if allowed:
+            entry.allowance = int(max(0, limit.max_attempts - count) * self.share)
+            entry.expires_at = now + self.max_age_seconds
+            entry.blocked_until = 0.0
+        else:
+            entry.allowance = 0
+            if retry_after:
+                entry.blocked_until = now + retry_after
+
+    def reset(self, key: str | None = None) -> None:
+        """
+        Drop local state.
+
+        Args:
+            key: Key to reset (all keys if None)
+        """
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
+
+    def _entry(self, key: str) -> _ShadowEntry:
+        """Get or create a key's entry, evicting the least recently used beyond max_keys."""
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = _ShadowEntry()
+            while len(self.entries) > self.max_keys:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return entry
+
+
+# Process-wide local shadow and script handle (bound to the Redis client)
+_local_shadow: LocalRateLimitShadow | None = None
+_script: AsyncScript | None = None
+_script_client: Redis | None = None
+
+
+def get_local_shadow() -> LocalRateLimitShadow:
+    """Get the process local shadow, creating it if needed."""
+    global _local_shadow
+    if _local_shadow is None:
+        _local_shadow = LocalRateLimitShadow()
+    return _local_shadow
+
+
+def reset_local_rate_limits() -> None:
+    """Drop all local shadow state (for testing)."""
+    global _local_shadow
+    _local_shadow = None
+
+
+async def _get_script() -> AsyncScript:
+    """Register the sliding window script on the current Redis client."""
+    global _script, _script_client
+    redis = await get_redis()
+    if _script is None or _script_client is not redis:
+        # EVALSHA, loading the script on NOSCRIPT
+        _script = redis.register_script(SLIDING_WINDOW_SCRIPT)
+        _script_client = redis
+    return _script
+
+
+async def check_rate_limits(
+    limits: Sequence[RateLimit],
+    local: bool = False,
+) -> tuple[bool, int]:
+    """
+    Check several rate limits in one Redis round-trip.
+
+    The request is recorded against every key only if all keys allow it.
+
+    Args:
+        limits: Limits to check
+        local: Allow the local shadow to decide without Redis
+
+    Returns:
+        Tuple of (is_allowed: bool, retry_after_seconds: int)
+        - is_allowed: True if every limit allows the request
+        - retry_after_seconds: Seconds until every blocking limit allows
+          requests again (0 if allowed)
+    """
+    if not limits:
+        return True, 0
+
+    now = time.time()
+    shadow = get_local_shadow() if local else None
+    if shadow is not None:
+        decision = shadow.try_admit(limits, now)
+        if decision is not None:
+            return decision
+
+    unsynced = [shadow.take_unsynced(limit.key) if shadow else 0 for limit in limits]
+    args: list[int | str] = [int(now * 1000), uuid.uuid4().hex]
+    for limit, pending in zip(limits, unsynced, strict=True):
+        args.extend((limit.max_attempts, limit.window_seconds * 1000, pending))
+
+    try:
+        script = await _get_script()
+        result = await script(keys=[limit.key for limit in limits], args=args)
+    except Exception:
+        if shadow is not None:
+            for limit, pending in zip(limits, unsynced, strict=True):
+                shadow.restore_unsynced(limit.key, pending)
+        raise
+
+    allowed = bool(int(result[0]))
+    retry_after = 0
+    for i, limit in enumerate(limits):
+        count = int(result[2 * i + 1])
+        key_retry_after = math.ceil(int(result[2 * i + 2]) / 1000)
+        if not allowed and count >= limit.max_attempts:
+            key_retry_after = max(1, key_retry_after)
+            retry_after = max(retry_after, key_retry_after)
+        if shadow is not None:
+            shadow.record(limit, allowed, count, key_retry_after, now)
+
+    return allowed, retry_after
+
 
 async def check_rate_limit(
     key: str,
     max_attempts: int,
-    window_seconds: int
+    window_seconds: int,
+    local: bool = False,
 ) -> tuple[bool, int]:
     """
     Check if rate limit is exceeded using Redis.
@@ -18,28 +329,15 @@ async def check_rate_limit(
         key: Redis key for rate limiting (e.g., "rate_limit:login:user@example.com")
         max_attempts: Maximum attempts allowed within the window
         window_seconds: Time window in seconds
+        local: Allow the local shadow to decide without Redis
+            (hot paths only; never for login or password reset limits)
 
     Returns:
         Tuple of (is_allowed: bool, retry_after_seconds: int)
         - is_allowed: True if request is allowed, False if rate limit exceeded
         - retry_after_seconds: Seconds until rate limit resets (0 if allowed)
     """
-    redis = await get_redis()
-
-    # Increment counter
-    current = await redis.incr(key)
-
-    # Set expiration on first request
-    if current == 1:
-        await redis.expire(key, window_seconds)
-
-    # Check if over limit
-    if current > max_attempts:
-        # Get TTL for retry_after
-        ttl = await redis.ttl(key)
-        return False, ttl if ttl > 0 else window_seconds
-
-    return True, 0
+    return await check_rate_limits([RateLimit(key, max_attempts, window_seconds)], local=local)
 
 
 async def reset_rate_limit(key: str) -> None:
@@ -51,23 +349,36 @@ async def reset_rate_limit(key: str) -> None:
     """
     redis = await get_redis()
     await redis.delete(key)
+    if _local_shadow is not None:
+        _local_shadow.reset(key)
 
 
-async def get_remaining_attempts(key: str, max_attempts: int) -> int:
+async def get_remaining_attempts(
+    key: str,
+    max_attempts: int,
+    window_seconds: int | None = None,
+) -> int:
     """
     Get remaining attempts before rate limit is hit.
 
     Args:
         key: Redis key for rate limiting
         max_attempts: Maximum attempts allowed
+        window_seconds: Time window in seconds (requests older than the
+            window are not counted; without it, expired requests not yet
+            pruned by a check are counted)
 
     Returns:
         int: Number of remaining attempts (0 if rate limit exceeded)
     """
     redis = await get_redis()
-    current = await redis.get(key)
-
-    if current is None:
+    if await redis.type(key) != "zset":
         return max_attempts
 
-    return max(0, max_attempts - int(current))
+    if window_seconds is None:
+        current = await redis.zcard(key)
+    else:
+        window_start_ms = int(time.time() * 1000) - window_seconds * 1000
+        current = await redis.zcount(key, f"({window_start_ms}", "+inf")
+
+    return max(0, max_attempts - current)
@@ -69,13 +69,92 @@ def reset_rate_limiter(test_app):
     yield
 
 
+@pytest.fixture(autouse=True)
+async def reset_question_pool_cache():
+    """
+    Reset the in-process question pool cache before each test.
+    Tests insert questions directly through the ORM, which does not bump
+    the course content version.
+    """
+    from src.services.question_pool_cache import QuestionPoolCache
+
+    await QuestionPoolCache.reset_instance()
+    yield
+
+
+@pytest.fixture(autouse=True)
+async def reset_belief_snapshot_cache():
+    """
+    Reset the in-process belief snapshot cache before each test.
+    Tests write belief states directly through the ORM, which does not bump
+    the user belief version.
+    """
+    from src.services.belief_snapshot_cache import BeliefSnapshotCache
+
+    await BeliefSnapshotCache.reset_instance()
+    yield
+
+
+@pytest.fixture(autouse=True)
+async def reset_question_exclusion_cache():
+    """
+    Reset the in-process question exclusion cache before each test.
+    Each test database starts without quiz responses.
+    """
+    from src.services.question_exclusion_cache import QuestionExclusionCache
+
+    await QuestionExclusionCache.reset_instance()
+    yield
+
+
+@pytest.fixture(autouse=True)
+async def reset_next_question_prefetcher():
+    """
+    Cancel staged next-question selections after each test.
+    Their tasks are bound to the test's event loop.
+    """
+    yield
+    from src.services.next_question_prefetch import NextQuestionPrefetcher
+
+    await NextQuestionPrefetcher.reset_instance()
+
+
+@pytest.fixture(autouse=True)
+async def reset_user_cache():
+    """
+    Reset the in-process user cache before each test.
+    Tests create and modify users directly through the ORM, which does not
+    publish user cache invalidations.
+    """
+    from src.services.user_cache import UserCache
+
+    await UserCache.reset_instance()
+    yield
+
+
+@pytest.fixture(autouse=True)
+async def reset_reading_queue_executor():
+    """
+    Drain the in-process reading queue executor after each test.
+    Its workers are bound to the test's event loop.
+    """
+    yield
+    from src.tasks.reading_queue_executor import shutdown_reading_queue_executor
+
+    await shutdown_reading_queue_executor()
+
+
 @pytest.fixture(autouse=True)
 async def reset_redis_rate_limits_and_cache():
     """
     Reset Redis-based rate limits and caches before each test.
-    This clears rate_limit:*, user_cache:*, and concepts:* keys from Redis.
+    This clears rate_limit:*, user_cache:*, and concepts:* keys from Redis,
+    and the in-process rate limit shadow.
     """
     from src.db.redis_client import get_redis
+    from src.utils.rate_limit import reset_local_rate_limits
+
+    reset_local_rate_limits()
     try:
         redis = await get_redis()
         # Delete all rate limit keys
@@ -13,6 +13,7 @@ from src.models.concept_prerequisite import ConceptPrerequisite
 from src.models.course import Course
 from src.models.user import User
 from src.repositories.concept_repository import ConceptRepository
+from src.schemas.concept_prerequisite import PrerequisiteCreate, RelationshipType
 
 
 @pytest.fixture
@@ -230,6 +231,40 @@ class TestDatabaseConstraints:
         assert len(prereqs_after) == 0
 
 
+class TestRepositoryEdgeDiff:
+    """Tests for updating and deleting specific prerequisite relationships."""
+
+    @pytest.mark.asyncio
+    async def test_update_and_delete_prerequisites(self, db_session, test_course, test_concepts):
+        """Test updating and deleting specific prerequisite relationships."""
+        repo = ConceptRepository(db_session)
+        a, b, c = (concept.id for concept in test_concepts[:3])
+
+        await repo.bulk_add_prerequisites([
+            PrerequisiteCreate(concept_id=b, prerequisite_concept_id=a, strength=0.5),
+            PrerequisiteCreate(concept_id=c, prerequisite_concept_id=a, strength=0.5),
+            PrerequisiteCreate(concept_id=c, prerequisite_concept_id=b, strength=0.5),
+        ])
+
+        updated = await repo.update_prerequisites([
+            PrerequisiteCreate(
+                concept_id=b,
+                prerequisite_concept_id=a,
+                strength=0.9,
+                relationship_type=RelationshipType.RELATED,
+            )
+        ])
+        deleted = await repo.delete_prerequisites([(c, a), (c, b)])
+        await db_session.commit()
+
+        assert updated == 1
+        assert deleted == 2
+        remaining = await repo.get_all_prerequisites_for_course(test_course.id)
+        assert [(p.concept_id, p.prerequisite_concept_id) for p in remaining] == [(b, a)]
+        assert remaining[0].strength == 0.9
+        assert remaining[0].relationship_type == "related"
+
+
 class TestAPIEndpoints:
     """Tests for concept prerequisites API endpoints."""
 
@@ -674,6 +674,49 @@ class TestQuestionConceptMapping:
 
         assert count == 3
 
+    async def test_create_questions_with_mappings_skips_duplicates(
+        self, db_session, test_course_with_concepts
+    ):
+        """Test batch insert of questions with mappings, skipping duplicates."""
+        course, concept1, concept2 = test_course_with_concepts
+
+        def question_data(i: int) -> dict:
+            return {
+                "course_id": course.id,
+                "question_text": f"Batch import question {i}",
+                "options": {"A": "A", "B": "B", "C": "C", "D": "D"},
+                "correct_answer": "A",
+                "explanation": "Explanation",
+                "knowledge_area_id": "test-ka",
+                "difficulty": 0.5,
+                "source": "test",
+            }
+
+        repo = QuestionRepository(db_session)
+
+        first = await repo.create_questions_with_mappings(
+            [question_data(0)],
+            [[{"concept_id": concept1.id, "relevance": 0.9}]],
+        )
+        assert len(first) == 1
+
+        # Question 0 is a duplicate; questions 1 and 2 are still inserted
+        inserted = await repo.create_questions_with_mappings(
+            [question_data(0), question_data(1), question_data(2)],
+            [
+                [{"concept_id": concept1.id, "relevance": 0.9}],
+                [
+                    {"concept_id": concept1.id, "relevance": 0.8},
+                    {"concept_id": concept2.id, "relevance": 0.6},
+                ],
+                [],
+            ],
+        )
+
+        assert [count for _, count in inserted] == [2, 0]
+        mappings = await repo.get_concept_mappings_for_question(inserted[0][0])
+        assert {m.concept_id for m in mappings} == {concept1.id, concept2.id}
+
     async def test_delete_concept_mappings_for_question(self, db_session, test_course_with_concepts):
         """Test deleting concept mappings for a question."""
         course, concept1, concept2 = test_course_with_concepts
@@ -0,0 +1,272 @@
+"""
+Unit tests for BeliefSnapshotCache.
+Tests per-user belief snapshots, write-through and version-based coherence.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.models.belief_state import BeliefState
+from src.services.belief_snapshot_cache import (
+    BeliefSnapshot,
+    BeliefSnapshotCache,
+    get_belief_snapshot_cache,
+    record_belief_updates,
+)
+
+VERSION_PATH = "src.services.belief_snapshot_cache.get_user_belief_version"
+BUMP_PATH = "src.services.belief_snapshot_cache.bump_user_belief_version"
+
+
+def create_belief(user_id, alpha=1.0, beta=1.0, response_count=0):
+    """Helper to create a BeliefState."""
+    return BeliefState(
+        id=uuid4(),
+        user_id=user_id,
+        concept_id=uuid4(),
+        alpha=alpha,
+        beta=beta,
+        response_count=response_count,
+    )
+
+
+@pytest.fixture
+def user_id():
+    return uuid4()
+
+
+@pytest.fixture
+def beliefs(user_id):
+    return [
+        create_belief(user_id, alpha=8.0, beta=1.0, response_count=6),
+        create_belief(user_id, alpha=1.0, beta=7.0, response_count=5),
+        create_belief(user_id),
+    ]
+
+
+@pytest.fixture
+def mock_repo(beliefs):
+    """Create a mock BeliefRepository returning the beliefs."""
+    repo = MagicMock()
+    repo.get_beliefs_as_dict = AsyncMock(
+        side_effect=lambda user_id: {b.concept_id: b for b in beliefs}
+    )
+    return repo
+
+
+class TestBeliefSnapshot:
+    """Tests for the compact snapshot arrays."""
+
+    def test_records_match_belief_states(self, user_id, beliefs):
+        """Snapshot records expose the same values and derived properties."""
+        snapshot = BeliefSnapshot.from_beliefs(user_id, beliefs, version=1)
+        records = snapshot.as_dict()
+
+        assert len(snapshot) == 3
+        for belief in beliefs:
+            record = records[belief.concept_id]
+            assert record.alpha == belief.alpha
+            assert record.beta == belief.beta
+            assert record.response_count == belief.response_count
+            assert record.mean == belief.mean
+            assert record.confidence == belief.confidence
+            assert record.status == belief.status
+
+    def test_apply_updates_arrays(self, user_id, beliefs):
+        """Applying an update changes the stored values."""
+        snapshot = BeliefSnapshot.from_beliefs(user_id, beliefs, version=1)
+        concept_id = beliefs[2].concept_id
+
+        assert snapshot.apply(concept_id, 3.0, 2.0, 1) is True
+        assert snapshot.as_dict()[concept_id].alpha == 3.0
+        assert snapshot.apply(uuid4(), 3.0, 2.0, 1) is False
+
+
+class TestBeliefSnapshotCache:
+    """Tests for loading, write-through and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_same_version_loads_once(self, user_id, mock_repo):
+        """Repeated reads at the same version query Postgres once."""
+        cache = BeliefSnapshotCache()
+
+        with patch(VERSION_PATH, AsyncMock(return_value=4)):
+            first = await cache.get_beliefs(user_id, mock_repo)
+            second = await cache.get_beliefs(user_id, mock_repo)
+
+        assert first is second
+        assert len(first) == 3
+        assert mock_repo.get_beliefs_as_dict.await_count == 1
+        assert cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_version_bump_reloads(self, user_id, mock_repo):
+        """A version bump from another worker triggers a reload."""
+        cache = BeliefSnapshotCache()
+
+        with patch(VERSION_PATH, AsyncMock(side_effect=[1, 2])):
+            await cache.get_beliefs(user_id, mock_repo)
+            await cache.get_beliefs(user_id, mock_repo)
+
+        assert mock_repo.get_beliefs_as_dict.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_uses_fallback_ttl(self, user_id, mock_repo):
+        """Without a version, snapshots are served until the fallback TTL expires."""
+        cache = BeliefSnapshotCache(fallback_ttl_seconds=60)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=None)):
+            await cache.get_beliefs(user_id, mock_repo)
+            await cache.get_beliefs(user_id, mock_repo)
+            assert mock_repo.get_beliefs_as_dict.await_count == 1
+
+            cache.snapshots[user_id].loaded_at = time.time() - 120
+            await cache.get_beliefs(user_id, mock_repo)
+
+        assert mock_repo.get_beliefs_as_dict.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, mock_repo):
+        """Least recently used snapshots are dropped beyond max_users."""
+        cache = BeliefSnapshotCache(max_users=2)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            for _ in range(3):
+                await cache.get_beliefs(uuid4(), mock_repo)
+
+        assert len(cache.snapshots) == 2
+
+    @pytest.mark.asyncio
+    async def test_write_through_updates_snapshot(self, user_id, beliefs, mock_repo):
+        """Updated beliefs are visible without a reload."""
+        cache = BeliefSnapshotCache()
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            await cache.get_beliefs(user_id, mock_repo)
+
+        beliefs[2].alpha = 2.0
+        beliefs[2].response_count = 1
+        cache.apply_updates(user_id, [beliefs[2]])
+
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            records = await cache.get_beliefs(user_id, mock_repo)
+
+        assert records[beliefs[2].concept_id].alpha == 2.0
+        assert records[beliefs[2].concept_id].response_count == 1
+        assert mock_repo.get_beliefs_as_dict.await_count == 1
+        assert cache.write_throughs == 1
+
+    @pytest.mark.asyncio
+    async def test_write_through_unknown_concept_invalidates(self, user_id, mock_repo):
+        """An update for a concept missing from the snapshot drops it."""
+        cache = BeliefSnapshotCache()
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            await cache.get_beliefs(user_id, mock_repo)
+
+        cache.apply_updates(user_id, [create_belief(user_id)])
+
+        assert user_id not in cache.snapshots
+
+    @pytest.mark.asyncio
+    async def test_publish_retags_own_write(self, user_id, mock_repo):
+        """After this process's write is published, its snapshot stays current."""
+        cache = BeliefSnapshotCache()
+        with patch(VERSION_PATH, AsyncMock(return_value=5)):
+            await cache.get_beliefs(user_id, mock_repo)
+        snapshot = cache.snapshots[user_id]
+
+        with patch(BUMP_PATH, AsyncMock(return_value=6)):
+            await cache.publish(user_id, snapshot)
+
+        assert snapshot.version == 6
+
+    @pytest.mark.asyncio
+    async def test_publish_keeps_version_after_foreign_write(self, user_id, mock_repo):
+        """If another worker also wrote, the snapshot is reloaded on next read."""
+        cache = BeliefSnapshotCache()
+        with patch(VERSION_PATH, AsyncMock(return_value=5)):
+            await cache.get_beliefs(user_id, mock_repo)
+        snapshot = cache.snapshots[user_id]
+
+        with patch(BUMP_PATH, AsyncMock(return_value=7)):
+            await cache.publish(user_id, snapshot)
+
+        assert snapshot.version == 5
+
+
+@pytest.fixture
+async def db_session():
+    """Create an AsyncSession on an in-memory SQLite database."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+class TestPublishAfterCommit:
+    """Tests for publishing versions on transaction boundaries."""
+
+    @pytest.mark.asyncio
+    async def test_version_is_bumped_after_commit(self, user_id, mock_repo, db_session):
+        """The belief version is bumped only once the transaction commits."""
+        cache = BeliefSnapshotCache()
+        bump = AsyncMock(return_value=1)
+
+        with patch(BUMP_PATH, bump):
+            await db_session.execute(text("SELECT 1"))
+            await cache.publish_after_commit(user_id, db_session)
+            bump.assert_not_awaited()
+
+            await db_session.commit()
+            await asyncio.sleep(0)
+
+        bump.assert_awaited_once_with(user_id)
+
+    @pytest.mark.asyncio
+    async def test_rollback_drops_snapshot(self, user_id, beliefs, mock_repo, db_session):
+        """A rolled back write-through is discarded and nothing is published."""
+        cache = BeliefSnapshotCache()
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            await cache.get_beliefs(user_id, mock_repo)
+        bump = AsyncMock(return_value=1)
+
+        with patch(BUMP_PATH, bump):
+            await db_session.execute(text("SELECT 1"))
+            cache.apply_updates(user_id, [beliefs[0]])
+            await cache.publish_after_commit(user_id, db_session)
+            await db_session.rollback()
+            await asyncio.sleep(0)
+
+        assert user_id not in cache.snapshots
+        bump.assert_not_awaited()
+
+
+class TestRecordBeliefUpdates:
+    """Tests for the writer entry point."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_is_noop(self, user_id):
+        """Nothing is recorded when snapshots are disabled."""
+        with patch(
+            "src.services.belief_snapshot_cache.settings.BELIEF_SNAPSHOT_ENABLED", False
+        ), patch(BUMP_PATH, AsyncMock()) as bump:
+            await record_belief_updates(MagicMock(), user_id)
+
+        bump.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_without_beliefs(self, user_id, mock_repo):
+        """Bulk writes drop the snapshot and publish a new version."""
+        cache = await get_belief_snapshot_cache()
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            await cache.get_beliefs(user_id, mock_repo)
+
+        with patch(BUMP_PATH, AsyncMock(return_value=1)) as bump:
+            await record_belief_updates(MagicMock(spec=[]), user_id)
+
+        assert user_id not in cache.snapshots
+        bump.assert_awaited_once_with(user_id)
@@ -625,6 +625,41 @@ class TestPrerequisitePropagation:
         # Prerequisite belief response_count should NOT increment
         assert prereq_belief.response_count == 3
 
+    @pytest.mark.asyncio
+    async def test_propagation_uses_cached_prerequisite_graph(
+        self, mock_belief_repo, mock_concept_repo
+    ):
+        """Prerequisites of concepts in the cached graph are resolved without queries."""
+        direct_concept_id = uuid4()
+        prereq_concept_id = uuid4()
+
+        prerequisite_graph = MagicMock()
+        prerequisite_graph.get_graphs_for_concepts = AsyncMock(
+            return_value={direct_concept_id: MagicMock()}
+        )
+        prerequisite_graph.get_prerequisite_ids.return_value = [prereq_concept_id]
+        updater = BeliefUpdater(
+            mock_belief_repo,
+            concept_repository=mock_concept_repo,
+            prerequisite_graph=prerequisite_graph,
+        )
+
+        mock_belief_repo.get_beliefs_for_concepts.side_effect = [
+            {direct_concept_id: create_mock_belief(direct_concept_id)},
+            {prereq_concept_id: create_mock_belief(prereq_concept_id, alpha=2.0, beta=2.0)},
+        ]
+        mock_belief_repo.flush_updates.return_value = None
+
+        response = await updater.update_beliefs(
+            user_id=uuid4(),
+            question=create_mock_question(concept_ids=[direct_concept_id]),
+            is_correct=True,
+        )
+
+        assert response.propagated_updates_count == 1
+        prerequisite_graph.get_prerequisite_ids.assert_called_once_with(direct_concept_id)
+        mock_concept_repo.get_prerequisites.assert_not_called()
+
 
 # ============================================================================
 # Custom Configuration Tests
@@ -463,6 +463,42 @@ class TestKnowledgeAreaBreakdown:
         assert strategy.readiness_score == 0.0
 
 
+class TestLockStatus:
+    """Test prerequisite lock status in coverage (Story 4.11)."""
+
+    @pytest.mark.asyncio
+    async def test_lock_status_computed_once_per_report(
+        self, coverage_analyzer, mock_belief_repo, mock_concept_repo, mock_course_repo
+    ):
+        """Summary and KA breakdown share one bulk gate evaluation."""
+        concept1 = uuid4()
+        concept2 = uuid4()
+
+        mock_belief_repo.get_all_beliefs.return_value = [
+            create_mock_belief(concept1, alpha=9.0, beta=1.0),
+            create_mock_belief(concept2, alpha=1.0, beta=1.0),
+        ]
+        mock_concept_repo.get_all_concepts.return_value = [
+            create_mock_concept(concept1, "Concept 1", "ba-planning"),
+            create_mock_concept(concept2, "Concept 2", "ba-planning"),
+        ]
+        mock_course_repo.get_by_id.return_value = create_mock_course()
+
+        mastery_gate_service = MagicMock()
+        mastery_gate_service.get_locked_concept_ids = AsyncMock(return_value={concept2})
+
+        report = await coverage_analyzer.analyze_coverage(
+            uuid4(), uuid4(), mastery_gate_service=mastery_gate_service
+        )
+
+        assert report.locked_concepts == 1
+        assert report.unlocked_concepts == 1
+        assert report.by_knowledge_area[0].locked_count == 1
+        assert report.by_knowledge_area[0].unlocked_count == 1
+        mastery_gate_service.get_locked_concept_ids.assert_awaited_once()
+        mock_belief_repo.get_all_beliefs.assert_awaited_once()
+
+
 # ============================================================================
 # Gap Concepts Tests (AC: 3)
 # ============================================================================
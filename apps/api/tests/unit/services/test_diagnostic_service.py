@@ -2,6 +2,7 @@
 Unit tests for DiagnosticService.
 Tests the optimal question selection algorithm.
 """
+import random
 from collections import defaultdict
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
@@ -496,3 +497,88 @@ class TestScoreCalculation:
 
         # ka-empty should score higher due to balance bonus
         assert score_empty > score_full
+
+
+
+# ============================================================================
+# Lazy Greedy Selection Tests
+# ============================================================================
+
+def exhaustive_greedy(service, questions, target_count):
+    """Reference selection: score every available question at each step."""
+    available = [
+        QuestionWithConcepts(question=q, concept_ids={qc.concept_id for qc in q.question_concepts})
+        for q in questions
+    ]
+    selected, covered, ka_counts = [], set(), defaultdict(int)
+    while len(selected) < target_count and available:
+        best_idx, best_score = -1, float("-inf")
+        for idx, qwc in enumerate(available):
+            if ka_counts[qwc.question.knowledge_area_id] >= service.MAX_QUESTIONS_PER_KA:
+                continue
+            score = service._calculate_score(qwc, covered, ka_counts)
+            if score > best_score:
+                best_idx, best_score = idx, score
+        if best_idx < 0:
+            break
+        best = available.pop(best_idx)
+        selected.append(best.question)
+        covered |= best.concept_ids
+        ka_counts[best.question.knowledge_area_id] += 1
+    return selected, covered
+
+
+class TestLazyGreedySelection:
+    """Test that lazy selection matches the exhaustive greedy scan."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_exhaustive_scan(self, diagnostic_service, seed):
+        """Verify identical selections, including score ties."""
+        rnd = random.Random(seed)
+        concepts = [uuid4() for _ in range(rnd.randint(5, 40))]
+        questions = [
+            create_mock_question(
+                knowledge_area_id=f"ka{rnd.randint(0, 5)}",
+                # Few distinct values so that many scores tie
+                discrimination=rnd.choice([0.5, 1.0, 1.5]),
+                concept_ids=rnd.sample(concepts, rnd.randint(0, 3)),
+            )
+            for _ in range(rnd.randint(1, 150))
+        ]
+        target_count = rnd.randint(12, 20)
+
+        candidates = diagnostic_service._build_candidates(questions)
+        selected, covered, _ = diagnostic_service._select_questions_greedy(candidates, target_count)
+        expected_selected, expected_covered = exhaustive_greedy(
+            diagnostic_service, questions, target_count
+        )
+
+        assert [q.id for q in selected] == [q.id for q in expected_selected]
+        assert covered == expected_covered
+
+    @pytest.mark.asyncio
+    async def test_candidates_cached_per_pool_snapshot(
+        self, mock_question_repo, mock_concept_repo
+    ):
+        """Verify candidate structures are reused until the pool is reloaded."""
+        course_id = uuid4()
+        pool = tuple(
+            create_mock_question(knowledge_area_id=f"ka{i % 5}", concept_ids=[uuid4()])
+            for i in range(20)
+        )
+        question_pool = AsyncMock()
+        question_pool.get_questions.return_value = pool
+        mock_concept_repo.get_concept_count.return_value = 20
+        service = DiagnosticService(mock_question_repo, mock_concept_repo, question_pool)
+        service._build_candidates = MagicMock(wraps=service._build_candidates)
+
+        await service.select_diagnostic_questions(course_id=course_id)
+        await service.select_diagnostic_questions(course_id=course_id)
+        assert service._build_candidates.call_count == 1
+        mock_question_repo.get_questions_with_concepts.assert_not_called()
+
+        # Reloaded pool (new snapshot) rebuilds the structure
+        question_pool.get_questions.return_value = tuple(pool)[:15]
+        selected, _, _ = await service.select_diagnostic_questions(course_id=course_id)
+        assert service._build_candidates.call_count == 2
+        assert len(selected) == 15
@@ -0,0 +1,200 @@
+"""
+Unit tests for DiagnosticSetCache.
+Tests precomputed diagnostic question sets and their use by DiagnosticService.
+"""
+from array import array
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.services.diagnostic_service import DiagnosticService
+from src.services.diagnostic_set_cache import DiagnosticSetCache, get_diagnostic_set_cache
+
+
+def create_mock_question(knowledge_area_id, concept_ids, discrimination=1.0):
+    """Helper to create a mock Question with concept mappings."""
+    question = MagicMock()
+    question.id = uuid4()
+    question.knowledge_area_id = knowledge_area_id
+    question.discrimination = discrimination
+    question.question_concepts = []
+    for concept_id in concept_ids:
+        qc = MagicMock()
+        qc.concept_id = concept_id
+        question.question_concepts.append(qc)
+    return question
+
+
+@pytest.fixture
+def course_id():
+    return uuid4()
+
+
+@pytest.fixture
+def pool():
+    """Question pool snapshot where every question scores the same."""
+    return tuple(
+        create_mock_question(f"ka{i % 6}", [uuid4()])
+        for i in range(60)
+    )
+
+
+@pytest.fixture
+def diagnostic_service():
+    return DiagnosticService(AsyncMock(), AsyncMock())
+
+
+class TestGenerateDiagnosticSets:
+    """Tests for DiagnosticService.generate_diagnostic_sets."""
+
+    def test_first_variant_is_standard_selection(self, diagnostic_service, pool):
+        """The first set equals the deterministic greedy selection."""
+        question_sets = diagnostic_service.generate_diagnostic_sets(pool, 15, 4, seed=1)
+
+        candidates = diagnostic_service._build_candidates(pool)
+        selected, _, _ = diagnostic_service._select_questions_greedy(candidates, 15)
+        assert [pool[i] for i in question_sets[0]] == selected
+
+    def test_variants_are_distinct_valid_selections(self, diagnostic_service, pool):
+        """Random tie-breaking yields distinct sets that respect the KA cap."""
+        question_sets = diagnostic_service.generate_diagnostic_sets(pool, 15, 8, seed=1)
+
+        assert len(question_sets) > 1
+        assert len({frozenset(s) for s in question_sets}) == len(question_sets)
+        for question_set in question_sets:
+            assert isinstance(question_set, array)
+            assert len(set(question_set)) == 15
+            ka_ids = [pool[i].knowledge_area_id for i in question_set]
+            assert max(ka_ids.count(ka) for ka in set(ka_ids)) <= 4
+
+    def test_duplicate_variants_dropped(self, diagnostic_service):
+        """Without ties every variant is the same selection."""
+        questions = tuple(
+            create_mock_question(f"ka{i % 6}", [uuid4()], discrimination=1.0 + i / 100)
+            for i in range(40)
+        )
+
+        question_sets = diagnostic_service.generate_diagnostic_sets(questions, 12, 8, seed=1)
+
+        assert len(question_sets) == 1
+
+
+class TestDiagnosticSetCache:
+    """Tests for drawing and regenerating sets."""
+
+    @pytest.mark.asyncio
+    async def test_draw_misses_without_sets(self, course_id, pool):
+        """No sets for the course yet."""
+        cache = DiagnosticSetCache(variant_count=4)
+
+        assert cache.draw(course_id, 15, pool) is None
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_then_draw(self, course_id, pool):
+        """Generated sets are drawn for the same pool snapshot only."""
+        cache = DiagnosticSetCache(variant_count=4)
+        question_sets = [array("I", [0, 1, 2]), array("I", [3, 4, 5])]
+
+        cache.schedule_refresh(course_id, 15, pool, 42, lambda: question_sets)
+        await cache.wait_for_refreshes()
+
+        selected, total_concepts = cache.draw(course_id, 15, pool)
+        assert total_concepts == 42
+        assert [pool.index(q) for q in selected] in ([0, 1, 2], [3, 4, 5])
+        assert cache.hits == 1
+
+        # Reloaded pool (equal contents, new snapshot) and other target counts miss
+        assert cache.draw(course_id, 15, (*pool,)) is None
+        assert cache.draw(course_id, 12, pool) is None
+
+    @pytest.mark.asyncio
+    async def test_single_refresh_in_flight(self, course_id, pool):
+        """Concurrent misses schedule one regeneration per course and target count."""
+        cache = DiagnosticSetCache(variant_count=4)
+        generate = MagicMock(return_value=[array("I", [0])])
+
+        for _ in range(5):
+            cache.schedule_refresh(course_id, 15, pool, 10, generate)
+        await cache.wait_for_refreshes()
+
+        assert generate.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_not_stored(self, course_id, pool):
+        """A generation error leaves the cache empty."""
+        cache = DiagnosticSetCache(variant_count=4)
+
+        cache.schedule_refresh(course_id, 15, pool, 10, MagicMock(side_effect=RuntimeError("boom")))
+        await cache.wait_for_refreshes()
+
+        assert cache.draw(course_id, 15, pool) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_course(self, course_id, pool):
+        """Invalidation drops every target count of a course."""
+        cache = DiagnosticSetCache(variant_count=4)
+        for target_count in (12, 15):
+            cache.schedule_refresh(course_id, target_count, pool, 10, lambda: [array("I", [0])])
+        await cache.wait_for_refreshes()
+
+        cache.invalidate(course_id)
+
+        assert cache.get_statistics()["pool_count"] == 0
+
+
+class TestDiagnosticServiceWithSets:
+    """Tests for select_diagnostic_questions with precomputed sets."""
+
+    @pytest.mark.asyncio
+    async def test_live_selection_then_precomputed_draw(self, course_id, pool):
+        """The first session selects live; later sessions draw without queries."""
+        question_pool = AsyncMock()
+        question_pool.get_questions.return_value = pool
+        concept_repo = AsyncMock()
+        concept_repo.get_concept_count.return_value = 60
+        cache = DiagnosticSetCache(variant_count=4)
+        service = DiagnosticService(AsyncMock(), concept_repo, question_pool, cache)
+
+        first, covered, total = await service.select_diagnostic_questions(course_id)
+        await cache.wait_for_refreshes()
+        assert len(first) == 15
+        assert cache.get_statistics()["set_count"] > 1
+
+        second, covered, total = await service.select_diagnostic_questions(course_id)
+
+        assert cache.hits == 1
+        assert concept_repo.get_concept_count.await_count == 1
+        assert len(second) == 15
+        assert total == 60
+        assert covered == {qc.concept_id for q in second for qc in q.question_concepts}
+
+    @pytest.mark.asyncio
+    async def test_sets_ignored_without_question_pool(self, course_id, pool):
+        """Sets are tied to pool snapshots, so they need the pool cache."""
+        question_repo = AsyncMock()
+        question_repo.get_questions_with_concepts.return_value = list(pool)
+        concept_repo = AsyncMock()
+        concept_repo.get_concept_count.return_value = 60
+        cache = DiagnosticSetCache(variant_count=4)
+        service = DiagnosticService(question_repo, concept_repo, diagnostic_sets=cache)
+
+        await service.select_diagnostic_questions(course_id)
+
+        assert service.diagnostic_sets is None
+        assert cache.get_statistics()["refreshes_running"] == 0
+
+
+class TestDiagnosticSetCacheSingleton:
+    """Tests for the singleton accessor."""
+
+    @pytest.mark.asyncio
+    async def test_get_diagnostic_set_cache_returns_singleton(self):
+        await DiagnosticSetCache.reset_instance()
+
+        first = await get_diagnostic_set_cache()
+        second = await get_diagnostic_set_cache()
+
+        assert first is second
+        await DiagnosticSetCache.reset_instance()
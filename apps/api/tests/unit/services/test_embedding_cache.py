@@ -0,0 +1,274 @@
+"""
+Unit tests for EmbeddingCache.
+Tests the persistent embedding cache and its use by EmbeddingService.
+"""
+import sqlite3
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.services import embedding_cache
+from src.services.embedding_cache import (
+    INDEX_FILENAME,
+    EmbeddingCache,
+    close_embedding_caches,
+    embedding_cache_key,
+    get_embedding_cache,
+)
+from src.services.embedding_service import EmbeddingService
+
+DIMENSIONS = 4
+
+
+def vector(value: float) -> list[float]:
+    """Helper to build a small test vector."""
+    return [value] * DIMENSIONS
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an EmbeddingCache in a temporary directory."""
+    c = EmbeddingCache(tmp_path, model="test-model", dimensions=DIMENSIONS, max_entries=3)
+    yield c
+    c.close()
+
+
+class TestEmbeddingCache:
+    """Tests for lookups, inserts and eviction."""
+
+    def test_key_is_content_addressed(self):
+        """Identical texts share a key; different texts do not."""
+        assert embedding_cache_key("a") == embedding_cache_key("a")
+        assert embedding_cache_key("a") != embedding_cache_key("b")
+
+    def test_miss_then_hit(self, cache):
+        """Stored vectors are returned on later lookups."""
+        assert cache.get_many(["alpha"]) == [None]
+
+        cache.put_many(["alpha"], [vector(0.5)])
+
+        assert cache.get_many(["alpha", "beta"]) == [vector(0.5), None]
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    def test_duplicate_texts_in_lookup(self, cache):
+        """Repeated texts in one lookup all receive the vector."""
+        cache.put_many(["alpha"], [vector(0.25)])
+
+        assert cache.get_many(["alpha", "alpha"]) == [vector(0.25), vector(0.25)]
+
+    def test_existing_entries_are_not_rewritten(self, cache):
+        """Only new texts count as writes."""
+        assert cache.put_many(["alpha"], [vector(0.5)]) == 1
+        assert cache.put_many(["alpha", "beta"], [vector(0.75), vector(1.0)]) == 1
+
+        assert cache.get_many(["alpha"]) == [vector(0.5)]
+        assert len(cache) == 2
+
+    def test_wrong_dimensions_are_skipped(self, cache):
+        """Vectors with unexpected dimensions are not stored."""
+        assert cache.put_many(["alpha"], [[0.5] * (DIMENSIONS + 1)]) == 0
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self, cache):
+        """Beyond max_entries the least recently used entry is evicted and its row reused."""
+        cache.put_many(["a", "b", "c"], [vector(1.0), vector(2.0), vector(3.0)])
+        cache.get_many(["a"])  # "b" is now least recently used
+
+        cache.put_many(["d"], [vector(4.0)])
+
+        assert len(cache) == 3
+        assert cache.evictions == 1
+        assert cache.get_many(["a", "b", "c", "d"]) == [vector(1.0), None, vector(3.0), vector(4.0)]
+
+    def test_persists_across_instances(self, tmp_path):
+        """A new cache on the same directory sees earlier entries."""
+        first = EmbeddingCache(tmp_path, model="m", dimensions=DIMENSIONS, max_entries=10)
+        first.put_many(["alpha"], [vector(0.5)])
+        first.close()
+
+        second = EmbeddingCache(tmp_path, model="m", dimensions=DIMENSIONS, max_entries=10)
+
+        assert second.get_many(["alpha"]) == [vector(0.5)]
+        second.close()
+
+    def test_models_do_not_share_entries(self, tmp_path):
+        """Each model and dimension count has its own cache."""
+        first = EmbeddingCache(tmp_path, model="m1", dimensions=DIMENSIONS, max_entries=10)
+        second = EmbeddingCache(tmp_path, model="m2", dimensions=DIMENSIONS, max_entries=10)
+        first.put_many(["alpha"], [vector(0.5)])
+
+        assert second.get_many(["alpha"]) == [None]
+        first.close()
+        second.close()
+
+    def test_statistics(self, cache):
+        """Statistics report counters and hit rate."""
+        cache.put_many(["alpha"], [vector(0.5)])
+        cache.get_many(["alpha", "beta"])
+
+        stats = cache.get_statistics()
+
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["writes"] == 1
+
+
+class TestEmbeddingCacheConcurrency:
+    """Tests for lookups shared with other processes."""
+
+    def test_lookup_does_not_wait_for_writer(self, cache):
+        """Lookups read while another process holds the write lock."""
+        cache.put_many(["alpha"], [vector(0.5)])
+        writer = sqlite3.connect(cache.directory / INDEX_FILENAME, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        cache._conn.execute("PRAGMA busy_timeout = 100")
+
+        try:
+            assert cache.get_many(["alpha"]) == [vector(0.5)]
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+
+    def test_reused_row_reads_as_miss(self, cache):
+        """A row overwritten by another process after the index read is not returned."""
+        cache.put_many(["alpha"], [vector(0.5)])
+        slot = cache._conn.execute("SELECT slot FROM entries").fetchone()[0]
+        rows = np.memmap(cache._vectors_path, dtype=np.float32, mode="r+")
+        rows[slot * DIMENSIONS:(slot + 1) * DIMENSIONS] = 9.0
+        rows.flush()
+
+        assert cache.get_many(["alpha"]) == [None]
+
+    def test_last_used_written_in_batches(self, cache):
+        """Lookups record recency in memory until the batch is flushed."""
+        cache.put_many(["alpha"], [vector(0.5)])
+        stored = cache._conn.execute("SELECT last_used FROM entries").fetchone()[0]
+
+        with patch.object(embedding_cache, "TOUCH_FLUSH_MAX_KEYS", 2):
+            cache.get_many(["alpha"])
+            assert cache._conn.execute("SELECT last_used FROM entries").fetchone()[0] == stored
+
+            cache.put_many(["beta"], [vector(1.0)])
+            cache.get_many(["alpha", "beta"])
+
+        assert cache._pending_touches == {}
+        assert cache._conn.execute(
+            "SELECT last_used FROM entries WHERE key = ?", (embedding_cache_key("alpha"),)
+        ).fetchone()[0] > stored
+
+    def test_index_without_checksums_is_reset(self, tmp_path):
+        """An index written before row checksums is started afresh."""
+        directory = tmp_path / f"m-{DIMENSIONS}"
+        directory.mkdir()
+        conn = sqlite3.connect(directory / INDEX_FILENAME)
+        conn.execute(
+            "CREATE TABLE entries (key TEXT PRIMARY KEY, slot INTEGER NOT NULL UNIQUE, last_used REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO entries VALUES (?, 0, 0)", (embedding_cache_key("alpha"),))
+        conn.commit()
+        conn.close()
+
+        cache = EmbeddingCache(tmp_path, model="m", dimensions=DIMENSIONS, max_entries=10)
+
+        assert len(cache) == 0
+        assert cache.put_many(["alpha"], [vector(0.5)]) == 1
+        assert cache.get_many(["alpha"]) == [vector(0.5)]
+        cache.close()
+
+
+class TestGetEmbeddingCache:
+    """Tests for the process-wide accessor."""
+
+    def test_disabled_returns_none(self):
+        """No cache is opened when caching is disabled."""
+        with patch("src.services.embedding_cache.settings.EMBEDDING_CACHE_ENABLED", False):
+            assert get_embedding_cache("m", DIMENSIONS) is None
+
+    def test_enabled_returns_shared_instance(self, tmp_path):
+        """The same cache is returned for the same model."""
+        with patch("src.services.embedding_cache.settings.EMBEDDING_CACHE_ENABLED", True), patch(
+            "src.services.embedding_cache.settings.EMBEDDING_CACHE_DIR", str(tmp_path)
+        ):
+            first = get_embedding_cache("m", DIMENSIONS)
+            second = get_embedding_cache("m", DIMENSIONS)
+
+        assert first is not None
+        assert first is second
+        close_embedding_caches()
+
+
+def create_embedding_response(texts: list[str], tokens: int = 10):
+    """Helper to build an OpenAI embeddings response for texts."""
+    response = MagicMock()
+    response.data = [MagicMock(embedding=vector(float(len(t)))) for t in texts]
+    response.usage = MagicMock(total_tokens=tokens)
+    return response
+
+
+@pytest.fixture
+def service(cache):
+    """Create an EmbeddingService with a mocked client and a test cache."""
+    svc = EmbeddingService(api_key="test-key", cache=cache, client=MagicMock())
+    svc.dimensions = DIMENSIONS
+    svc.client.embeddings.create = AsyncMock(
+        side_effect=lambda model, input, dimensions: create_embedding_response(input)
+    )
+    return svc
+
+
+class TestEmbeddingServiceCache:
+    """Tests for EmbeddingService cache integration."""
+
+    @pytest.mark.asyncio
+    async def test_generate_embedding_uses_cache(self, service):
+        """A repeated text is embedded once."""
+        first = await service.generate_embedding("hello")
+        second = await service.generate_embedding("hello")
+
+        assert first == second == vector(5.0)
+        assert service.client.embeddings.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_embeds_only_uncached_unique_texts(self, service):
+        """Cached and duplicate texts are not sent to the API; order is preserved."""
+        await service.generate_embedding("aa")
+        service.client.embeddings.create.reset_mock()
+        progress = MagicMock()
+
+        embeddings, tokens = await service.batch_generate_embeddings(
+            ["aa", "bbb", "bbb", "c"], progress_callback=progress
+        )
+
+        assert embeddings == [vector(2.0), vector(3.0), vector(3.0), vector(1.0)]
+        assert tokens == 10
+        sent = service.client.embeddings.create.await_args.kwargs["input"]
+        assert sent == ["bbb", "c"]
+        progress.assert_called_with(4, 4)
+
+    @pytest.mark.asyncio
+    async def test_fully_cached_batch_skips_api(self, service):
+        """A batch of cached texts makes no API calls."""
+        await service.batch_generate_embeddings(["aa", "bbb"])
+        service.client.embeddings.create.reset_mock()
+
+        embeddings, tokens = await service.batch_generate_embeddings(["bbb", "aa"])
+
+        assert embeddings == [vector(3.0), vector(2.0)]
+        assert tokens == 0
+        service.client.embeddings.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cache_errors_fall_back_to_api(self, service):
+        """A failing cache does not break embedding generation."""
+        service.cache = MagicMock()
+        service.cache.get_many.side_effect = OSError("disk full")
+        service.cache.put_many.side_effect = OSError("disk full")
+
+        result = await service.generate_embedding("hello")
+
+        assert result == vector(5.0)
+        service.client.embeddings.create.assert_awaited_once()
@@ -0,0 +1,235 @@
+"""
+Tests for embedding request packing, the adaptive rate limiter and the
+concurrent batch engine of EmbeddingService (against a local fake
+embeddings server).
+"""
+import asyncio
+import base64
+import json
+
+import httpx
+import numpy as np
+import pytest
+from openai import DEFAULT_MAX_RETRIES, AsyncOpenAI, RateLimitError
+
+from src.services.embedding_rate_limiter import (
+    AdaptiveTokenBucket,
+    EmbeddingRateLimiter,
+    estimate_tokens,
+    pack_batches,
+)
+from src.services.embedding_service import MAX_RATE_LIMIT_RETRIES, EmbeddingService
+
+DIMENSIONS = 8
+
+
+def fake_vector(text: str) -> list[float]:
+    """Deterministic embedding of a text."""
+    rng = np.random.default_rng(sum(text.encode()))
+    return rng.random(DIMENSIONS, dtype=np.float32).tolist()
+
+
+class FakeEmbeddingsServer:
+    """Local stand-in for the OpenAI /v1/embeddings endpoint."""
+
+    def __init__(self, rate_limited_requests: int = 0):
+        self.rate_limited_requests = rate_limited_requests
+        self.rate_limited_responses = 0
+        self.inputs: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if self.rate_limited_responses < self.rate_limited_requests:
+            self.rate_limited_responses += 1
+            return httpx.Response(
+                429,
+                headers={"retry-after-ms": "1"},
+                json={"error": {"message": "Rate limit reached", "type": "tokens"}},
+            )
+
+        texts = body["input"]
+        arrival = len(self.inputs)
+        self.inputs.append(texts)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Alternate slow and fast requests so responses complete out of order
+        await asyncio.sleep(0.02 if arrival % 2 == 0 else 0.001)
+        self.in_flight -= 1
+
+        data = []
+        for index, text in enumerate(texts):
+            vector = fake_vector(text)
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode()
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        tokens = sum(estimate_tokens(t) for t in texts)
+        return httpx.Response(200, json={
+            "object": "list",
+            "data": data,
+            "model": body["model"],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+
+def make_service(server: FakeEmbeddingsServer, **kwargs) -> EmbeddingService:
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url="http://fake-openai.local/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(server.handle)),
+        max_retries=0,
+    )
+    kwargs.setdefault(
+        "rate_limiter",
+        EmbeddingRateLimiter(tokens_per_minute=60_000_000, requests_per_minute=600_000),
+    )
+    return EmbeddingService(use_cache=False, dimensions=DIMENSIONS, client=client, **kwargs)
+
+
+class FakeClock:
+    """Clock advanced by the fake sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestPackBatches:
+    """Tests for token-budget batch packing."""
+
+    def test_respects_item_and_token_budgets(self):
+        batches = pack_batches([10, 10, 10, 10, 30, 5], max_items=3, max_tokens=35)
+
+        assert batches == [range(0, 3), range(3, 4), range(4, 6)]
+
+    def test_oversized_item_gets_its_own_batch(self):
+        batches = pack_batches([5, 100, 5], max_items=10, max_tokens=50)
+
+        assert batches == [range(0, 1), range(1, 2), range(2, 3)]
+
+    def test_empty(self):
+        assert pack_batches([], max_items=10, max_tokens=50) == []
+
+
+class TestAdaptiveTokenBucket:
+    """Tests for the adaptive token bucket."""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill_when_empty(self):
+        clock = FakeClock()
+        bucket = AdaptiveTokenBucket(60, clock=clock, sleep=clock.sleep)  # 1 per second
+
+        await bucket.acquire(60)
+        assert clock.sleeps == []
+
+        await bucket.acquire(3)
+        assert sum(clock.sleeps) == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_oversized_amount_granted_when_full(self):
+        clock = FakeClock()
+        bucket = AdaptiveTokenBucket(60, clock=clock, sleep=clock.sleep)
+
+        await bucket.acquire(100)
+
+        assert clock.sleeps == []
+        assert bucket.level == -40
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_rate_and_pauses(self):
+        clock = FakeClock()
+        bucket = AdaptiveTokenBucket(60, clock=clock, sleep=clock.sleep)
+
+        bucket.on_rate_limited(retry_after=5.0)
+        assert bucket.rate == pytest.approx(0.5)
+
+        await bucket.acquire(1)
+        # 5 s pause, then 1 token at 0.5 tokens per second
+        assert clock.now == pytest.approx(7.0)
+
+        for _ in range(20):
+            bucket.on_success()
+        assert bucket.rate == pytest.approx(bucket.max_rate)
+
+
+class TestConcurrentBatchEmbedding:
+    """Tests for EmbeddingService.batch_generate_embeddings against a fake server."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_keep_input_order(self):
+        server = FakeEmbeddingsServer()
+        service = make_service(server, max_in_flight=3)
+        texts = [f"text number {i}" for i in range(40)]
+
+        embeddings, tokens = await service.batch_generate_embeddings(texts, batch_size=5)
+
+        assert np.allclose(embeddings, [fake_vector(t) for t in texts])
+        assert tokens == sum(estimate_tokens(t) for t in texts)
+        assert len(server.inputs) == 8
+        assert server.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_packs_requests_by_token_budget(self):
+        server = FakeEmbeddingsServer()
+        service = make_service(server)
+        service.max_batch_tokens = 40
+        texts = [f"{'x' * (4 * (i % 7 + 1))} {i}" for i in range(30)]
+
+        embeddings, _ = await service.batch_generate_embeddings(texts)
+
+        assert np.allclose(embeddings, [fake_vector(t) for t in texts])
+        assert [t for batch in server.inputs for t in batch] == texts
+        for batch in server.inputs:
+            assert len(batch) == 1 or sum(estimate_tokens(t) for t in batch) <= 40
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_backs_off_and_retries(self):
+        server = FakeEmbeddingsServer(rate_limited_requests=2)
+        service = make_service(server, max_in_flight=1)
+        texts = [f"text {i}" for i in range(10)]
+
+        embeddings, _ = await service.batch_generate_embeddings(texts, batch_size=5)
+
+        assert np.allclose(embeddings, [fake_vector(t) for t in texts])
+        assert server.rate_limited_responses == 2
+        limiter = service.rate_limiter
+        assert limiter.tokens.rate < limiter.tokens.max_rate
+
+    @pytest.mark.asyncio
+    async def test_gives_up_when_rate_limit_persists(self):
+        server = FakeEmbeddingsServer(rate_limited_requests=1000)
+        service = make_service(server)
+
+        with pytest.raises(RateLimitError):
+            await service.batch_generate_embeddings(["text"])
+
+        assert server.rate_limited_responses == MAX_RATE_LIMIT_RETRIES + 1
+
+    @pytest.mark.asyncio
+    async def test_task_failure_is_not_wrapped_in_group(self):
+        server = FakeEmbeddingsServer()
+        service = make_service(server)
+
+        def progress_callback(processed, total):
+            raise ValueError("progress display closed")
+
+        with pytest.raises(ValueError, match="progress display closed"):
+            await service.batch_generate_embeddings(["text"], progress_callback=progress_callback)
+
+    @pytest.mark.asyncio
+    async def test_default_client_keeps_sdk_retries_for_single_texts(self):
+        service = EmbeddingService(api_key="test-key", use_cache=False)
+
+        assert service.client.max_retries == DEFAULT_MAX_RETRIES
+        assert service.batch_client.max_retries == 0
+        # Both share one connection pool
+        assert service.batch_client._client is service.client._client
+        await service.close()
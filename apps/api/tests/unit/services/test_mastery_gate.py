@@ -6,6 +6,8 @@ Tests prerequisite-based mastery gates:
 - Progress calculation
 - Bulk unlock status
 - Question estimates
+- Gates resolved from the cached prerequisite graph
+- Bulk unlock detection
 """
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -13,12 +15,20 @@ from uuid import UUID, uuid4
 
 import pytest
 
+from src.schemas.belief_state import BeliefUpdateResult
 from src.schemas.mastery_gate import (
     BlockingPrerequisite,
     GateCheckResult,
     MasteryGateConfig,
 )
 from src.services.mastery_gate import MasteryGateService
+from src.services.prerequisite_graph_service import (
+    CachedConcept,
+    PrerequisiteGraphService,
+    build_course_graph,
+)
+
+GRAPH_VERSION_PATH = "src.services.prerequisite_graph_service.get_prerequisite_graph_version"
 
 
 # ============================================================================
@@ -432,6 +442,381 @@ class TestCheckPrerequisitesMastered:
         assert result.is_unlocked is True  # Suggested doesn't block
 
 
+# ============================================================================
+# Test: get_locked_concept_ids
+# ============================================================================
+
+
+def create_prerequisite(concept_id, prereq_id, relationship_type="required"):
+    """Helper to create a mock ConceptPrerequisite row."""
+    prereq = MagicMock()
+    prereq.concept_id = concept_id
+    prereq.prerequisite_concept_id = prereq_id
+    prereq.relationship_type = relationship_type
+    return prereq
+
+
+class TestGetLockedConceptIds:
+    """Tests for bulk get_locked_concept_ids method."""
+
+    @pytest.mark.asyncio
+    async def test_locks_concepts_with_unmastered_required_prereqs(
+        self, mastery_gate_service, mock_concept_repo, mock_belief_repo, mock_belief_state
+    ):
+        """Only concepts with an unmastered or unseen required prereq are locked."""
+        mastered_id, weak_id, unseen_id = uuid4(), uuid4(), uuid4()
+        unlocked, locked_weak, locked_unseen, helpful_only, root = (
+            uuid4(), uuid4(), uuid4(), uuid4(), uuid4()
+        )
+
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock(return_value=[
+            create_prerequisite(unlocked, mastered_id),
+            create_prerequisite(locked_weak, mastered_id),
+            create_prerequisite(locked_weak, weak_id),
+            create_prerequisite(locked_unseen, unseen_id),
+            create_prerequisite(helpful_only, weak_id, relationship_type="helpful"),
+        ])
+        mock_belief_repo.get_beliefs_as_dict.return_value = {
+            mastered_id: mock_belief_state(mastered_id, alpha=8.0, beta=2.0),
+            weak_id: mock_belief_state(weak_id, alpha=2.0, beta=8.0),
+        }
+
+        locked = await mastery_gate_service.get_locked_concept_ids(
+            user_id=uuid4(),
+            concept_ids={unlocked, locked_weak, locked_unseen, helpful_only, root},
+        )
+
+        assert locked == {locked_weak, locked_unseen}
+        mock_concept_repo.get_prerequisites_for_concepts.assert_awaited_once()
+        mock_belief_repo.get_beliefs_as_dict.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_uses_provided_beliefs(
+        self, mastery_gate_service, mock_concept_repo, mock_belief_repo
+    ):
+        """Pre-loaded beliefs are used instead of querying the repository."""
+        concept_id, prereq_id = uuid4(), uuid4()
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock(
+            return_value=[create_prerequisite(concept_id, prereq_id)]
+        )
+
+        locked = await mastery_gate_service.get_locked_concept_ids(
+            user_id=uuid4(), concept_ids={concept_id}, beliefs={}
+        )
+
+        assert locked == {concept_id}
+        mock_belief_repo.get_beliefs_as_dict.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_matches_per_concept_gate_checks(
+        self,
+        mastery_gate_service,
+        mock_concept_repo,
+        mock_belief_repo,
+        mock_concept,
+        mock_belief_state,
+    ):
+        """Bulk result agrees with check_prerequisites_mastered for each concept."""
+        prereq_concepts = [mock_concept(name=f"Prereq {i}") for i in range(4)]
+        mock_belief_repo.get_beliefs_as_dict.return_value = {
+            prereq_concepts[0].id: mock_belief_state(prereq_concepts[0].id, 8.0, 2.0),
+            prereq_concepts[1].id: mock_belief_state(prereq_concepts[1].id, 8.0, 2.0, 1),
+            prereq_concepts[2].id: mock_belief_state(prereq_concepts[2].id, 3.0, 3.0),
+        }
+
+        edges = {
+            uuid4(): [(prereq_concepts[0], "required")],
+            uuid4(): [(prereq_concepts[0], "required"), (prereq_concepts[1], "required")],
+            uuid4(): [(prereq_concepts[2], "related")],
+            uuid4(): [(prereq_concepts[3], "required")],
+            uuid4(): [],
+        }
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock(return_value=[
+            create_prerequisite(cid, prereq.id, rel_type)
+            for cid, prereqs in edges.items()
+            for prereq, rel_type in prereqs
+        ])
+
+        bulk_locked = await mastery_gate_service.get_locked_concept_ids(
+            user_id=uuid4(), concept_ids=set(edges)
+        )
+
+        expected_locked = set()
+        for cid, prereqs in edges.items():
+            mock_concept_repo.get_by_id.return_value = mock_concept(cid)
+            mock_concept_repo.get_prerequisites_with_strength.return_value = [
+                (prereq, 1.0, rel_type) for prereq, rel_type in prereqs
+            ]
+            result = await mastery_gate_service.check_prerequisites_mastered(uuid4(), cid)
+            if not result.is_unlocked:
+                expected_locked.add(cid)
+
+        assert bulk_locked == expected_locked
+
+    @pytest.mark.asyncio
+    async def test_empty_concepts_skips_queries(
+        self, mastery_gate_service, mock_concept_repo, mock_belief_repo
+    ):
+        """No concepts to check means no queries."""
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock()
+
+        locked = await mastery_gate_service.get_locked_concept_ids(uuid4(), set())
+
+        assert locked == set()
+        mock_concept_repo.get_prerequisites_for_concepts.assert_not_called()
+        mock_belief_repo.get_beliefs_as_dict.assert_not_called()
+
+
+# ============================================================================
+# Test: Cached Prerequisite Graph
+# ============================================================================
+
+
+class TestCachedPrerequisiteGraph:
+    """Tests for gate checks resolved through PrerequisiteGraphService."""
+
+    @pytest.fixture
+    def course(self):
+        """A course where 'advanced' requires 'base' and is helped by 'extra'."""
+        course_id = uuid4()
+        base, extra, advanced = (
+            CachedConcept(uuid4(), name, "KA1", 0.5, 0) for name in ("Base", "Extra", "Advanced")
+        )
+        graph = build_course_graph(
+            course_id,
+            [base, extra, advanced],
+            [
+                (advanced.id, base.id, 1.0, "required"),
+                (advanced.id, extra.id, 0.5, "helpful"),
+            ],
+            version=0,
+        )
+        graph_service = PrerequisiteGraphService()
+        graph_service._add_course(graph)
+        return course_id, base, extra, advanced, graph_service
+
+    @pytest.fixture
+    def graph_gate_service(self, course, mock_session, mock_belief_repo, mock_concept_repo):
+        """MasteryGateService backed by the cached graph."""
+        return MasteryGateService(
+            session=mock_session,
+            belief_repository=mock_belief_repo,
+            concept_repository=mock_concept_repo,
+            prerequisite_graph=course[4],
+        )
+
+    @pytest.mark.asyncio
+    async def test_gate_check_issues_no_graph_queries(
+        self, course, graph_gate_service, mock_concept_repo, mock_session
+    ):
+        """Concept and prerequisites come from the graph, not the repository."""
+        _, base, _, advanced, _ = course
+
+        with patch(GRAPH_VERSION_PATH, AsyncMock(return_value=0)):
+            result = await graph_gate_service.check_prerequisites_mastered(uuid4(), advanced.id)
+
+        assert result.concept_name == "Advanced"
+        assert result.is_unlocked is False
+        assert [b.concept_id for b in result.blocking_prerequisites] == [base.id]
+        mock_concept_repo.get_by_id.assert_not_called()
+        mock_concept_repo.get_prerequisites_with_strength.assert_not_called()
+        mock_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_locked_concepts_from_graph(
+        self, course, graph_gate_service, mock_concept_repo, mock_belief_repo, mock_belief_state
+    ):
+        """Bulk lock status over graph concepts needs no prerequisite query."""
+        _, base, extra, advanced, _ = course
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock()
+        user_id = uuid4()
+
+        with patch(GRAPH_VERSION_PATH, AsyncMock(return_value=0)):
+            locked = await graph_gate_service.get_locked_concept_ids(
+                user_id, {base.id, extra.id, advanced.id}
+            )
+            assert locked == {advanced.id}
+
+            mock_belief_repo.get_beliefs_as_dict.return_value = {
+                base.id: mock_belief_state(base.id, alpha=8.0, beta=2.0),
+            }
+            locked = await graph_gate_service.get_locked_concept_ids(
+                user_id, {base.id, extra.id, advanced.id}
+            )
+            assert locked == set()
+
+        mock_concept_repo.get_prerequisites_for_concepts.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unlock_detection_uses_graph_dependents(
+        self, course, graph_gate_service, mock_concept_repo, mock_belief_repo,
+        mock_session, mock_belief_state,
+    ):
+        """Dependents of a newly mastered concept are read from the graph."""
+        _, base, _, advanced, _ = course
+        mock_concept_repo.get_dependents_for_concepts = AsyncMock()
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock()
+        mock_belief_repo.get_beliefs_as_dict.return_value = {
+            base.id: mock_belief_state(base.id, alpha=8.0, beta=2.0),
+        }
+        mock_session.execute.return_value = existing_events_result([])
+        mock_session.add_all = MagicMock()
+
+        with patch(GRAPH_VERSION_PATH, AsyncMock(return_value=0)):
+            unlocks = await graph_gate_service.check_and_record_unlocks(uuid4(), base.id)
+
+        assert [event.concept_id for event in unlocks] == [advanced.id]
+        assert unlocks[0].prerequisite_concept_id == base.id
+        mock_session.add_all.assert_called_once()
+        mock_session.flush.assert_awaited_once()
+        # Only the existing-events query touches the database
+        assert mock_session.execute.await_count == 1
+        mock_concept_repo.get_dependents_for_concepts.assert_not_called()
+        mock_concept_repo.get_prerequisites_for_concepts.assert_not_called()
+
+
+# ============================================================================
+# Test: Bulk Unlock Detection
+# ============================================================================
+
+
+def existing_events_result(concept_ids):
+    """Helper to create the result of the existing unlock events query."""
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = concept_ids
+    return result
+
+
+def create_update(concept_id, old, new, is_direct=True):
+    """Helper to create a BeliefUpdateResult from (alpha, beta) pairs."""
+    return BeliefUpdateResult(
+        concept_id=concept_id,
+        concept_name="Concept",
+        old_alpha=old[0],
+        old_beta=old[1],
+        new_alpha=new[0],
+        new_beta=new[1],
+        is_direct=is_direct,
+    )
+
+
+class TestDetectAndRecordUnlocks:
+    """Tests for set-based unlock detection."""
+
+    @pytest.fixture(autouse=True)
+    def session_add_all(self, mock_session):
+        """Track bulk adds on the mock session."""
+        mock_session.add_all = MagicMock()
+
+    @pytest.mark.asyncio
+    async def test_records_unlocked_dependents_once(
+        self, mastery_gate_service, mock_concept_repo, mock_belief_repo,
+        mock_session, mock_belief_state,
+    ):
+        """Unlocked dependents are recorded in one flush; locked and known ones are skipped."""
+        mastered_a, mastered_b, weak = uuid4(), uuid4(), uuid4()
+        unlocked, still_locked, already_recorded = uuid4(), uuid4(), uuid4()
+
+        mock_concept_repo.get_dependents_for_concepts = AsyncMock(return_value=[
+            create_prerequisite(unlocked, mastered_a),
+            create_prerequisite(unlocked, mastered_b),
+            create_prerequisite(still_locked, mastered_b),
+            create_prerequisite(already_recorded, mastered_a),
+        ])
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock(return_value=[
+            create_prerequisite(unlocked, mastered_a),
+            create_prerequisite(unlocked, mastered_b),
+            create_prerequisite(still_locked, mastered_b),
+            create_prerequisite(still_locked, weak),
+            create_prerequisite(already_recorded, mastered_a),
+        ])
+        mock_belief_repo.get_beliefs_as_dict.return_value = {
+            mastered_a: mock_belief_state(mastered_a, alpha=8.0, beta=2.0),
+            mastered_b: mock_belief_state(mastered_b, alpha=8.0, beta=2.0),
+            weak: mock_belief_state(weak, alpha=2.0, beta=8.0),
+        }
+        mock_session.execute.return_value = existing_events_result([already_recorded])
+
+        unlocks = await mastery_gate_service.detect_and_record_unlocks(
+            uuid4(), {mastered_a, mastered_b}
+        )
+
+        assert [event.concept_id for event in unlocks] == [unlocked]
+        assert unlocks[0].prerequisite_concept_id in {mastered_a, mastered_b}
+        mock_concept_repo.get_dependents_for_concepts.assert_awaited_once()
+        mock_belief_repo.get_beliefs_as_dict.assert_awaited_once()
+        assert mock_session.execute.await_count == 1
+        mock_session.add_all.assert_called_once_with(unlocks)
+        mock_session.flush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_nothing_mastered_skips_queries(
+        self, mastery_gate_service, mock_concept_repo, mock_belief_repo, mock_session
+    ):
+        """No newly mastered concepts means no queries."""
+        mock_concept_repo.get_dependents_for_concepts = AsyncMock()
+
+        assert await mastery_gate_service.detect_and_record_unlocks(uuid4(), set()) == []
+
+        mock_concept_repo.get_dependents_for_concepts.assert_not_called()
+        mock_belief_repo.get_beliefs_as_dict.assert_not_called()
+        mock_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_new_unlocks_skips_insert(
+        self, mastery_gate_service, mock_concept_repo, mock_session
+    ):
+        """Dependents that stay locked are neither queried for events nor inserted."""
+        mastered, other = uuid4(), uuid4()
+        dependent = uuid4()
+        mock_concept_repo.get_dependents_for_concepts = AsyncMock(
+            return_value=[create_prerequisite(dependent, mastered)]
+        )
+        mock_concept_repo.get_prerequisites_for_concepts = AsyncMock(return_value=[
+            create_prerequisite(dependent, mastered),
+            create_prerequisite(dependent, other),
+        ])
+
+        unlocks = await mastery_gate_service.detect_and_record_unlocks(
+            uuid4(), {mastered}, beliefs={}
+        )
+
+        assert unlocks == []
+        mock_session.execute.assert_not_called()
+        mock_session.add_all.assert_not_called()
+
+    def test_newly_mastered_concepts(self, mastery_gate_service, mock_belief_state):
+        """Only concepts crossing the gate in this update count as newly mastered."""
+        crossed, already, below, count_crossed = uuid4(), uuid4(), uuid4(), uuid4()
+        beliefs = {
+            crossed: mock_belief_state(crossed, alpha=8.0, beta=2.0, response_count=5),
+            already: mock_belief_state(already, alpha=9.0, beta=2.0, response_count=6),
+            below: mock_belief_state(below, alpha=3.0, beta=3.0, response_count=5),
+            # Reached the minimum response count with this answer
+            count_crossed: mock_belief_state(count_crossed, alpha=8.0, beta=2.0, response_count=3),
+        }
+        updates = [
+            create_update(crossed, (3.0, 2.0), (8.0, 2.0)),
+            create_update(already, (8.0, 2.0), (9.0, 2.0)),
+            create_update(below, (2.0, 3.0), (3.0, 3.0)),
+            create_update(count_crossed, (8.0, 1.5), (8.0, 2.0)),
+        ]
+
+        newly_mastered = mastery_gate_service.get_newly_mastered_concept_ids(updates, beliefs)
+
+        assert newly_mastered == {crossed, count_crossed}
+
+    @pytest.mark.asyncio
+    async def test_record_unlocks_for_updates_skips_unmastered(
+        self, mastery_gate_service, mock_belief_repo
+    ):
+        """Updates below the mastery thresholds load no beliefs."""
+        updates = [create_update(uuid4(), (1.0, 1.0), (2.0, 1.0))]
+
+        assert await mastery_gate_service.record_unlocks_for_updates(uuid4(), updates) == []
+        mock_belief_repo.get_beliefs_as_dict.assert_not_called()
+
+
 # ============================================================================
 # Test: Custom Configuration
 # ============================================================================
@@ -0,0 +1,220 @@
+"""
+Unit tests for the next question prefetcher.
+Uses a mock session factory and selector, so no database is needed.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.services.next_question_prefetch import NextQuestionPrefetcher
+
+TIME_PATH = "src.services.next_question_prefetch.time.time"
+
+
+@asynccontextmanager
+async def mock_session_factory():
+    """Stand-in for AsyncSessionLocal."""
+    yield AsyncMock()
+
+
+@pytest.fixture
+def prefetcher():
+    """Prefetcher with a mock session factory."""
+    return NextQuestionPrefetcher(
+        max_sessions=2, ttl_seconds=60, session_factory=mock_session_factory
+    )
+
+
+def create_selector(correct=None, incorrect=None, error=None):
+    """Selector whose session copy returns fixed outcome branches."""
+    session_selector = MagicMock()
+    session_selector.select_next_questions_for_outcomes = AsyncMock(
+        return_value={True: (correct, 0.5, False), False: (incorrect, 0.4, False)},
+        side_effect=error,
+    )
+    selector = MagicMock()
+    selector.with_session.return_value = session_selector
+    return selector
+
+
+def create_session(total_questions=0):
+    """Quiz session with no focus filters."""
+    session = MagicMock()
+    session.id = uuid4()
+    session.total_questions = total_questions
+    session.knowledge_area_filter = None
+    session.target_concept_ids = None
+    return session
+
+
+async def stage_and_wait(prefetcher, session, question, pool, selector, strategy="max_info_gain"):
+    """Stage a session and wait for its selection to finish."""
+    prefetcher.stage(uuid4(), session, question, strategy, pool, selector, {})
+    await prefetcher.staged[session.id].task
+
+
+class TestStageAndTake:
+    """Tests for serving staged questions."""
+
+    @pytest.mark.asyncio
+    async def test_serves_branch_for_outcome(self, prefetcher):
+        """The staged question matching the answer outcome is served."""
+        session = create_session(total_questions=2)
+        question, correct, incorrect = MagicMock(), MagicMock(), MagicMock()
+        pool = (question, correct, incorrect)
+        await stage_and_wait(prefetcher, session, question, pool, create_selector(correct, incorrect))
+
+        prefetcher.resolve(session.id, question.id, False)
+
+        assert prefetcher.take(session.id, 3, "max_info_gain", pool) == (incorrect, 0.4, False)
+        assert session.id not in prefetcher.staged
+        assert prefetcher.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_unresolved_is_miss(self, prefetcher):
+        """Without a recorded outcome the request selects as usual."""
+        session = create_session()
+        question = MagicMock()
+        pool = (question,)
+        await stage_and_wait(prefetcher, session, question, pool, create_selector(MagicMock()))
+
+        assert prefetcher.take(session.id, 1, "max_info_gain", pool) is None
+        assert prefetcher.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_resolve_ignores_other_questions(self, prefetcher):
+        """An answer to a question other than the served one records no outcome."""
+        session = create_session()
+        question = MagicMock()
+        await stage_and_wait(prefetcher, session, question, (question,), create_selector())
+
+        prefetcher.resolve(session.id, uuid4(), True)
+
+        assert prefetcher.staged[session.id].outcome is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "total_questions,strategy,same_pool",
+        [
+            (5, "max_info_gain", True),  # Session advanced by another answer
+            (1, "max_uncertainty", True),  # Strategy changed
+            (1, "max_info_gain", False),  # Question pool reloaded
+        ],
+    )
+    async def test_stale_entry_is_miss(self, prefetcher, total_questions, strategy, same_pool):
+        """Entries that no longer match the session are not served."""
+        session = create_session()
+        question, correct = MagicMock(), MagicMock()
+        pool = (question, correct)
+        await stage_and_wait(prefetcher, session, question, pool, create_selector(correct))
+        prefetcher.resolve(session.id, question.id, True)
+
+        current_pool = pool if same_pool else (question, correct)
+
+        assert prefetcher.take(session.id, total_questions, strategy, current_pool) is None
+        assert session.id not in prefetcher.staged
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_miss(self, prefetcher):
+        """Entries older than the TTL are reselected."""
+        session = create_session()
+        question, correct = MagicMock(), MagicMock()
+        pool = (question, correct)
+        await stage_and_wait(prefetcher, session, question, pool, create_selector(correct))
+        prefetcher.resolve(session.id, question.id, True)
+
+        with patch(TIME_PATH, return_value=prefetcher.staged[session.id].created_at + 61):
+            assert prefetcher.take(session.id, 1, "max_info_gain", pool) is None
+
+    @pytest.mark.asyncio
+    async def test_exhausted_branch_is_miss(self, prefetcher):
+        """A branch with no question left falls back to selection (and its metadata)."""
+        session = create_session()
+        question = MagicMock()
+        pool = (question,)
+        await stage_and_wait(prefetcher, session, question, pool, create_selector())
+        prefetcher.resolve(session.id, question.id, True)
+
+        assert prefetcher.take(session.id, 1, "max_info_gain", pool) is None
+
+    @pytest.mark.asyncio
+    async def test_failed_selection_is_miss(self, prefetcher):
+        """A selection error is recorded and the request selects as usual."""
+        session = create_session()
+        question = MagicMock()
+        pool = (question,)
+        await stage_and_wait(
+            prefetcher, session, question, pool, create_selector(error=RuntimeError("db down"))
+        )
+        prefetcher.resolve(session.id, question.id, True)
+
+        assert prefetcher.take(session.id, 1, "max_info_gain", pool) is None
+        assert prefetcher.get_statistics()["selections"]["failures"] == 1
+
+
+class TestLifecycle:
+    """Tests for pending selections and bounds."""
+
+    @pytest.mark.asyncio
+    async def test_take_cancels_pending_selection(self, prefetcher):
+        """A selection still running when next-question arrives is cancelled."""
+        started = asyncio.Event()
+
+        async def slow_select(**kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        selector = create_selector()
+        selector.with_session.return_value.select_next_questions_for_outcomes = slow_select
+        session = create_session()
+        question = MagicMock()
+        prefetcher.stage(uuid4(), session, question, "max_info_gain", (question,), selector, {})
+        task = prefetcher.staged[session.id].task
+        await started.wait()
+
+        assert prefetcher.take(session.id, 1, "max_info_gain", (question,)) is None
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_staged(self, prefetcher):
+        """Only max_sessions entries are kept."""
+        sessions = [create_session() for _ in range(3)]
+        for session in sessions:
+            question = MagicMock()
+            await stage_and_wait(prefetcher, session, question, (question,), create_selector())
+
+        assert list(prefetcher.staged) == [sessions[1].id, sessions[2].id]
+
+    @pytest.mark.asyncio
+    async def test_branches_from_staged_beliefs(self, prefetcher):
+        """Branches start from the beliefs the question was served with, not a later read."""
+        beliefs = {uuid4(): MagicMock()}
+        selector = create_selector()
+        session = create_session()
+        question = MagicMock()
+
+        prefetcher.stage(
+            uuid4(), session, question, "max_info_gain", (question,), selector, beliefs
+        )
+        await prefetcher.staged[session.id].task
+
+        select = selector.with_session.return_value.select_next_questions_for_outcomes
+        assert select.await_args.kwargs["beliefs"] is beliefs
+
+    @pytest.mark.asyncio
+    async def test_reset_instance(self):
+        """Resetting the singleton drops staged sessions."""
+        with patch("src.db.session.AsyncSessionLocal", mock_session_factory):
+            instance = await NextQuestionPrefetcher.get_instance()
+        question = MagicMock()
+        await stage_and_wait(instance, create_session(), question, (question,), create_selector())
+
+        await NextQuestionPrefetcher.reset_instance()
+
+        assert instance.staged == {}
+        assert await NextQuestionPrefetcher.get_instance() is not instance
+        await NextQuestionPrefetcher.reset_instance()
@@ -0,0 +1,161 @@
+"""
+Unit tests for PasswordHasher.
+Tests pool execution, the concurrency cap, statistics and dummy verification.
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.services.password_hasher import PasswordHasher
+from src.utils.auth import hash_password
+
+
+@pytest.fixture
+def hasher():
+    """Create a thread-pool hasher and shut it down after the test."""
+    instance = PasswordHasher(workers=2, executor_type="thread")
+    yield instance
+    instance.shutdown()
+
+
+def slow_verify(delay: float):
+    """Create a verify function that sleeps and tracks peak concurrency."""
+    state = {"running": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def verify(plain_password, hashed_password):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(delay)
+        with lock:
+            state["running"] -= 1
+        return plain_password == hashed_password
+
+    return verify, state
+
+
+class TestPasswordHasher:
+    """Tests for hashing on the worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_round_trip(self, hasher):
+        """Hashes produced on the pool verify on the pool."""
+        hashed = await hasher.hash("SecurePass123")
+
+        assert hashed != "SecurePass123"
+        assert await hasher.verify("SecurePass123", hashed) is True
+        assert await hasher.verify("WrongPass123", hashed) is False
+
+    @pytest.mark.asyncio
+    async def test_verifies_existing_hashes(self, hasher):
+        """Hashes created by utils.auth are accepted."""
+        assert await hasher.verify("SecurePass123", hash_password("SecurePass123")) is True
+
+    @pytest.mark.asyncio
+    async def test_does_not_block_event_loop(self, hasher):
+        """Other coroutines keep running while a verification is in progress."""
+        verify, _ = slow_verify(0.2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        with patch("src.services.password_hasher.verify_password", verify):
+            await hasher.verify("a", "a")
+        task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_and_queue_time(self, hasher):
+        """At most `workers` operations run at once; the rest wait and record queue time."""
+        verify, state = slow_verify(0.05)
+
+        with patch("src.services.password_hasher.verify_password", verify):
+            results = await asyncio.gather(*(hasher.verify("a", "a") for _ in range(6)))
+
+        assert results == [True] * 6
+        assert state["peak"] == 2
+        stats = hasher.get_statistics()
+        assert stats["queue"]["count"] == 6
+        assert stats["queue"]["max_ms"] >= 50
+        assert stats["operations"]["verify"]["count"] == 6
+        assert stats["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded_and_releases_slot(self, hasher):
+        """A failing operation raises, counts as a failure and frees its slot."""
+        def broken(plain_password, hashed_password):
+            raise ValueError("malformed hash")
+
+        with patch("src.services.password_hasher.verify_password", broken):
+            with pytest.raises(ValueError, match="malformed"):
+                await hasher.verify("a", "not-a-hash")
+
+        assert hasher.get_statistics()["operations"]["verify"]["failures"] == 1
+        assert await hasher.verify("a", await hasher.hash("a")) is True
+
+    @pytest.mark.asyncio
+    async def test_verify_dummy_reuses_prepared_hash(self, hasher):
+        """A prepared hasher only verifies on unknown-user logins."""
+        await hasher.prepare_dummy_hash()
+
+        await hasher.verify_dummy("AnyPassword123")
+
+        assert hasher.get_statistics()["operations"]["hash"]["count"] == 1
+        assert hasher.get_statistics()["operations"]["verify"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_verify_dummy_reuses_generated_hash(self, hasher):
+        """The dummy hash is generated once and verified against on every call."""
+        await hasher.verify_dummy("AnyPassword123")
+        dummy_hash = hasher._dummy_hash
+        await hasher.verify_dummy("OtherPassword123")
+
+        assert dummy_hash is not None
+        assert hasher._dummy_hash == dummy_hash
+        assert hasher.get_statistics()["operations"]["hash"]["count"] == 1
+        assert hasher.get_statistics()["operations"]["verify"]["count"] == 2
+
+    def test_unknown_executor_raises(self):
+        """Only thread and process pools are supported."""
+        with pytest.raises(ValueError, match="executor"):
+            PasswordHasher(executor_type="gpu")
+
+
+class TestPasswordHasherSingleton:
+    """Tests for the process-wide instance."""
+
+    @pytest.fixture(autouse=True)
+    async def reset_singleton(self):
+        """Reset singleton before and after each test."""
+        await PasswordHasher.reset_instance()
+        yield
+        await PasswordHasher.reset_instance()
+
+    @pytest.mark.asyncio
+    async def test_get_instance_returns_prepared_singleton(self):
+        """One shared instance is returned, with its dummy hash already generated."""
+        hasher = await PasswordHasher.get_instance()
+
+        assert await PasswordHasher.get_instance() is hasher
+        assert hasher._dummy_hash is not None
+
+    @pytest.mark.asyncio
+    async def test_reset_shuts_down_pool(self):
+        """Resetting shuts down the worker pool."""
+        hasher = await PasswordHasher.get_instance()
+        await hasher.hash("a")
+
+        await PasswordHasher.reset_instance()
+
+        assert hasher._executor is None
+        assert await PasswordHasher.get_instance() is not hasher
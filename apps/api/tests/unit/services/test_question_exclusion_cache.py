@@ -0,0 +1,218 @@
+"""
+Unit tests for QuestionExclusionCache.
+Tests the single-query exclusion set and incremental per-user recency cache.
+"""
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.models.quiz_response import QuizResponse
+from src.services.question_exclusion_cache import (
+    AnsweredQuestion,
+    QuestionExclusionCache,
+    UserExclusions,
+    fetch_answered_questions,
+)
+from src.services.question_selector import QuestionSelector
+
+WINDOW_DAYS = 7
+
+
+@pytest.fixture
+async def db():
+    """Create an AsyncSession on an in-memory SQLite quiz_responses table."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE quiz_responses (id CHAR(32) PRIMARY KEY, user_id CHAR(32), "
+                "session_id CHAR(32), question_id CHAR(32), created_at DATETIME)"
+            )
+        )
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(db):
+    """Record SELECT statements issued against quiz_responses."""
+    seen: list[str] = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append(statement)
+
+    event.listen(db.bind.sync_engine, "before_cursor_execute", before_execute)
+    yield seen
+    event.remove(db.bind.sync_engine, "before_cursor_execute", before_execute)
+
+
+async def add_response(db, user_id, session_id, question_id, days_ago=0.0):
+    """Helper to insert a quiz response answered days_ago days back."""
+    await db.execute(
+        QuizResponse.__table__.insert().values(
+            id=uuid4(),
+            user_id=user_id,
+            session_id=session_id,
+            question_id=question_id,
+            created_at=datetime.now(UTC) - timedelta(days=days_ago),
+        )
+    )
+
+
+@pytest.fixture
+def user_id():
+    return uuid4()
+
+
+@pytest.fixture
+def session_id():
+    return uuid4()
+
+
+class TestFetchAnsweredQuestions:
+    """Tests for the combined recency/session query."""
+
+    @pytest.mark.asyncio
+    async def test_returns_recent_and_session_answers(self, db, user_id, session_id):
+        """Recent answers and old in-session answers are returned; old answers are not."""
+        recent_qid, session_qid, old_qid = uuid4(), uuid4(), uuid4()
+        await add_response(db, user_id, uuid4(), recent_qid, days_ago=1)
+        await add_response(db, user_id, session_id, session_qid, days_ago=10)
+        await add_response(db, user_id, uuid4(), old_qid, days_ago=10)
+        await add_response(db, uuid4(), session_id, uuid4(), days_ago=1)
+
+        cutoff = datetime.now(UTC) - timedelta(days=WINDOW_DAYS)
+        answers = await fetch_answered_questions(db, user_id, session_id, cutoff)
+
+        by_id = {a.question_id: a for a in answers}
+        assert set(by_id) == {recent_qid, session_qid}
+        assert by_id[session_qid].in_session is True
+        assert by_id[recent_qid].in_session is False
+
+    @pytest.mark.asyncio
+    async def test_repeated_answers_are_grouped(self, db, user_id, session_id):
+        """A question answered twice is returned once with the latest time."""
+        qid = uuid4()
+        await add_response(db, user_id, uuid4(), qid, days_ago=3)
+        await add_response(db, user_id, session_id, qid, days_ago=0)
+
+        cutoff = datetime.now(UTC) - timedelta(days=WINDOW_DAYS)
+        answers = await fetch_answered_questions(db, user_id, session_id, cutoff)
+
+        assert len(answers) == 1
+        assert answers[0].in_session is True
+        assert answers[0].answered_at > datetime.now(UTC) - timedelta(hours=1)
+
+
+class TestQuestionExclusionCache:
+    """Tests for caching and incremental extension."""
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_both_sets(self, db, user_id, session_id):
+        """A miss returns recent and session questions."""
+        recent_qid, session_qid = uuid4(), uuid4()
+        await add_response(db, user_id, uuid4(), recent_qid, days_ago=2)
+        await add_response(db, user_id, session_id, session_qid, days_ago=9)
+        cache = QuestionExclusionCache()
+
+        excluded = await cache.get_excluded_question_ids(db, user_id, session_id, WINDOW_DAYS)
+
+        assert excluded == {recent_qid, session_qid}
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_hit_extends_with_new_answers(self, db, user_id, session_id):
+        """Answers recorded after the load are picked up incrementally."""
+        first_qid, second_qid = uuid4(), uuid4()
+        await add_response(db, user_id, session_id, first_qid, days_ago=1)
+        cache = QuestionExclusionCache()
+        await cache.get_excluded_question_ids(db, user_id, session_id, WINDOW_DAYS)
+
+        await add_response(db, user_id, session_id, second_qid)
+        excluded = await cache.get_excluded_question_ids(db, user_id, session_id, WINDOW_DAYS)
+
+        assert excluded == {first_qid, second_qid}
+        assert cache.hits == 1
+        assert cache.entries[user_id].session_question_ids == {first_qid, second_qid}
+
+    @pytest.mark.asyncio
+    async def test_hit_reads_only_new_rows(self, db, user_id, session_id, statements):
+        """Incremental reads are bounded by the newest cached answer."""
+        for days_ago in (6, 5, 4):
+            await add_response(db, user_id, uuid4(), uuid4(), days_ago=days_ago)
+        cache = QuestionExclusionCache()
+        await cache.get_excluded_question_ids(db, user_id, session_id, WINDOW_DAYS)
+        statements.clear()
+
+        await cache.get_excluded_question_ids(db, user_id, session_id, WINDOW_DAYS)
+
+        assert len(statements) == 1
+        assert " OR " not in statements[0]
+
+    def test_answers_leaving_window_are_pruned(self, user_id, session_id):
+        """Cached answers older than the window are no longer excluded."""
+        now = datetime.now(UTC)
+        old_qid, recent_qid = uuid4(), uuid4()
+        entry = UserExclusions(user_id=user_id, session_id=session_id, window_days=WINDOW_DAYS)
+        entry.merge([
+            AnsweredQuestion(old_qid, now - timedelta(days=6, hours=23), in_session=False),
+            AnsweredQuestion(recent_qid, now - timedelta(days=1), in_session=False),
+        ])
+
+        excluded = entry.excluded_ids(now - timedelta(days=WINDOW_DAYS) + timedelta(hours=2))
+
+        assert excluded == {recent_qid}
+        assert old_qid not in entry.answered_at
+
+    @pytest.mark.asyncio
+    async def test_new_session_reloads(self, db, user_id, session_id):
+        """A different session triggers a full reload."""
+        cache = QuestionExclusionCache()
+        await cache.get_excluded_question_ids(db, user_id, session_id, WINDOW_DAYS)
+
+        await cache.get_excluded_question_ids(db, user_id, uuid4(), WINDOW_DAYS)
+
+        assert cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, db, session_id):
+        """Least recently used users are dropped beyond max_users."""
+        cache = QuestionExclusionCache(max_users=2)
+
+        for _ in range(3):
+            await cache.get_excluded_question_ids(db, uuid4(), session_id, WINDOW_DAYS)
+
+        assert len(cache.entries) == 2
+
+
+class TestQuestionSelectorExclusions:
+    """Tests for exclusion lookups in QuestionSelector."""
+
+    @pytest.mark.asyncio
+    async def test_single_query_per_request(self, db, user_id, session_id, statements):
+        """Repeated filtering within a request reuses the exclusion set."""
+        await add_response(db, user_id, session_id, uuid4())
+        selector = QuestionSelector(db=db)
+
+        first = await selector._get_excluded_question_ids(user_id, session_id)
+        second = await selector._get_excluded_question_ids(user_id, session_id)
+
+        assert first == second
+        assert len(first) == 1
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_uses_exclusion_cache(self, db, user_id, session_id):
+        """A configured exclusion cache serves the lookup."""
+        qid = uuid4()
+        await add_response(db, user_id, uuid4(), qid, days_ago=1)
+        cache = QuestionExclusionCache()
+        selector = QuestionSelector(db=db, exclusion_cache=cache)
+
+        assert await selector._get_excluded_question_ids(user_id, session_id) == {qid}
+        assert user_id in cache.entries
@@ -0,0 +1,180 @@
+"""
+Unit tests for QuestionPoolCache.
+Tests the process-wide, versioned question pool cache used by next-question.
+"""
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.services.question_pool_cache import (
+    CachedQuestion,
+    QuestionPoolCache,
+    get_question_pool_cache,
+)
+
+VERSION_PATH = "src.services.question_pool_cache.get_course_content_version"
+
+
+def create_mock_question(course_id, concept_names=("Stakeholder Analysis",)):
+    """Helper to create a mock Question with eager-loaded concepts."""
+    question = MagicMock()
+    question.id = uuid4()
+    question.course_id = course_id
+    question.question_text = "Which technique is best?"
+    question.options = {"A": "One", "B": "Two", "C": "Three", "D": "Four"}
+    question.knowledge_area_id = "elicitation"
+    question.difficulty = 0.3
+    question.discrimination = 1.0
+    question.slip_rate = 0.1
+    question.guess_rate = 0.25
+    question.question_concepts = []
+    for name in concept_names:
+        qc = MagicMock()
+        qc.concept_id = uuid4()
+        qc.relevance = 1.0
+        qc.concept = MagicMock()
+        qc.concept.id = qc.concept_id
+        qc.concept.name = name
+        question.question_concepts.append(qc)
+    return question
+
+
+@pytest.fixture
+def course_id():
+    return uuid4()
+
+
+@pytest.fixture
+def mock_repo(course_id):
+    """Create a mock QuestionRepository returning two questions."""
+    repo = MagicMock()
+    repo.get_questions_with_concepts = AsyncMock(
+        return_value=[create_mock_question(course_id), create_mock_question(course_id)]
+    )
+    return repo
+
+
+class TestCachedQuestion:
+    """Tests for CachedQuestion conversion."""
+
+    def test_from_model_copies_selection_fields(self, course_id):
+        """Cached record exposes the attributes used by selection."""
+        question = create_mock_question(course_id, concept_names=("A", "B"))
+
+        cached = CachedQuestion.from_model(question)
+
+        assert cached.id == question.id
+        assert cached.course_id == course_id
+        assert cached.options == question.options
+        assert cached.slip_rate == 0.1
+        assert cached.guess_rate == 0.25
+        assert len(cached.question_concepts) == 2
+        assert cached.question_concepts[0].concept_id == question.question_concepts[0].concept_id
+        assert cached.question_concepts[0].concept.name == "A"
+
+    def test_cached_question_is_immutable(self, course_id):
+        """Cached records cannot be modified."""
+        cached = CachedQuestion.from_model(create_mock_question(course_id))
+
+        with pytest.raises(AttributeError):
+            cached.difficulty = 2.0
+
+
+class TestQuestionPoolCache:
+    """Tests for pool loading and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_first_access_loads_pool(self, course_id, mock_repo):
+        """A miss loads the pool through the repository."""
+        cache = QuestionPoolCache(fallback_ttl_seconds=60)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            questions = await cache.get_questions(course_id, mock_repo)
+
+        assert len(questions) == 2
+        assert all(isinstance(q, CachedQuestion) for q in questions)
+        assert cache.misses == 1
+        mock_repo.get_questions_with_concepts.assert_awaited_once_with(course_id)
+
+    @pytest.mark.asyncio
+    async def test_same_version_is_served_from_cache(self, course_id, mock_repo):
+        """Repeated access at the same version issues no further queries."""
+        cache = QuestionPoolCache(fallback_ttl_seconds=60)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=3)):
+            first = await cache.get_questions(course_id, mock_repo)
+            second = await cache.get_questions(course_id, mock_repo)
+
+        assert first is second
+        assert cache.hits == 1
+        assert mock_repo.get_questions_with_concepts.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_version_bump_reloads_pool(self, course_id, mock_repo):
+        """A new content version triggers a reload."""
+        cache = QuestionPoolCache(fallback_ttl_seconds=60)
+
+        with patch(VERSION_PATH, AsyncMock(side_effect=[1, 2])):
+            await cache.get_questions(course_id, mock_repo)
+            await cache.get_questions(course_id, mock_repo)
+
+        assert mock_repo.get_questions_with_concepts.await_count == 2
+        assert cache.pools[course_id].version == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_uses_fallback_ttl(self, course_id, mock_repo):
+        """Without a version, pools are served until the fallback TTL expires."""
+        cache = QuestionPoolCache(fallback_ttl_seconds=60)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=None)):
+            await cache.get_questions(course_id, mock_repo)
+            await cache.get_questions(course_id, mock_repo)
+            assert mock_repo.get_questions_with_concepts.await_count == 1
+
+            # Age the pool past the fallback TTL
+            pool = cache.pools[course_id]
+            object.__setattr__(pool, "loaded_at", time.time() - 120)
+            await cache.get_questions(course_id, mock_repo)
+
+        assert mock_repo.get_questions_with_concepts.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_pools_are_per_course(self, mock_repo):
+        """Each course gets its own pool."""
+        cache = QuestionPoolCache(fallback_ttl_seconds=60)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            await cache.get_questions(uuid4(), mock_repo)
+            await cache.get_questions(uuid4(), mock_repo)
+
+        assert len(cache.pools) == 2
+        assert cache.get_statistics()["course_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_course_pool(self, course_id, mock_repo):
+        """Local invalidation forces a reload on next access."""
+        cache = QuestionPoolCache(fallback_ttl_seconds=60)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            await cache.get_questions(course_id, mock_repo)
+            cache.invalidate(course_id)
+            await cache.get_questions(course_id, mock_repo)
+
+        assert mock_repo.get_questions_with_concepts.await_count == 2
+
+
+class TestQuestionPoolCacheSingleton:
+    """Tests for singleton accessor."""
+
+    @pytest.mark.asyncio
+    async def test_get_question_pool_cache_returns_singleton(self):
+        """Dependency returns the same instance across calls."""
+        await QuestionPoolCache.reset_instance()
+
+        first = await get_question_pool_cache()
+        second = await get_question_pool_cache()
+
+        assert first is second
+        await QuestionPoolCache.reset_instance()
@@ -6,12 +6,14 @@ Tests the Bayesian question selection algorithm including:
 - Question filtering
 - Selection strategies
 """
-from unittest.mock import AsyncMock, MagicMock
+import random
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 
-from src.services.question_selector import QuestionSelector
+from src.services.question_selector import VECTORIZED_TIE_TOLERANCE, QuestionSelector
 
 # ============================================================================
 # Fixtures
@@ -32,6 +34,7 @@ def question_selector(mock_db):
         recency_window_days=7,
         prerequisite_weight=0.2,
         min_info_gain_threshold=0.01,
+        scoring_engine="scalar",
     )
 
 
@@ -387,13 +390,13 @@ class TestRecentQuestionFilter:
 
         # Mock database returning recent question ID
         mock_result = MagicMock()
-        mock_result.all.return_value = [(recent_qid,)]
+        mock_result.all.return_value = [(recent_qid, datetime.now(UTC), 0)]
         mock_db.execute.return_value = mock_result
 
-        recent_ids = await question_selector._get_recent_question_ids(user_id, 7)
+        excluded_ids = await question_selector._get_excluded_question_ids(user_id, uuid4())
 
-        assert recent_qid in recent_ids
-        assert old_qid not in recent_ids
+        assert recent_qid in excluded_ids
+        assert old_qid not in excluded_ids
 
 
 class TestSessionQuestionFilter:
@@ -407,12 +410,13 @@ class TestSessionQuestionFilter:
 
         # Mock database returning session question ID
         mock_result = MagicMock()
-        mock_result.all.return_value = [(answered_qid,)]
+        mock_result.all.return_value = [(answered_qid, datetime.now(UTC), 1)]
         mock_db.execute.return_value = mock_result
 
-        session_ids = await question_selector._get_session_question_ids(session_id)
+        excluded_ids = await question_selector._get_excluded_question_ids(uuid4(), session_id)
 
-        assert answered_qid in session_ids
+        assert answered_qid in excluded_ids
+        mock_db.execute.assert_awaited_once()
 
 
 # ============================================================================
@@ -518,6 +522,123 @@ class TestPrerequisiteBonus:
         assert result_gain == base_gain
 
 
+# ============================================================================
+# Vectorized Scoring Engine Tests
+# ============================================================================
+
+def create_random_pool(rng, n_concepts=20, n_questions=60):
+    """Helper to create random beliefs and multi-concept questions."""
+    concept_ids = [uuid4() for _ in range(n_concepts)]
+    beliefs = {}
+    # Leave some concepts without beliefs to exercise the skip path
+    for cid in concept_ids[: n_concepts - 3]:
+        beliefs[cid] = create_mock_belief(
+            cid, alpha=rng.uniform(0.5, 30.0), beta=rng.uniform(0.5, 30.0)
+        )
+
+    questions = [
+        create_mock_question(
+            concept_ids=rng.sample(concept_ids, rng.randint(0, 4)),
+            slip_rate=rng.uniform(0.0, 0.3),
+            guess_rate=rng.uniform(0.0, 0.4),
+        )
+        for _ in range(n_questions)
+    ]
+    return beliefs, questions
+
+
+@pytest.fixture
+def vectorized_selector(mock_db):
+    """Create QuestionSelector using the vectorized scoring engine."""
+    return QuestionSelector(
+        db=mock_db,
+        recency_window_days=7,
+        prerequisite_weight=0.2,
+        min_info_gain_threshold=0.01,
+        scoring_engine="vectorized",
+    )
+
+
+class TestVectorizedScoringEngine:
+    """Test the vectorized engine selects exactly what the scalar engine selects."""
+
+    def test_rejects_unknown_engine(self, mock_db):
+        """Should raise ValueError for an unknown scoring engine."""
+        with pytest.raises(ValueError, match="Unknown scoring engine"):
+            QuestionSelector(db=mock_db, scoring_engine="gpu")
+
+    def test_batch_gains_match_scalar_gains(self, question_selector):
+        """Batched gains should match per-question gains within the tie tolerance."""
+        rng = random.Random(7)
+        beliefs, questions = create_random_pool(rng)
+
+        batch_gains = question_selector._calculate_expected_info_gain_batch(questions, beliefs)
+
+        for question, batch_gain in zip(questions, batch_gains, strict=True):
+            scalar_gain = question_selector._calculate_expected_info_gain(question, beliefs)
+            assert batch_gain == pytest.approx(scalar_gain, abs=VECTORIZED_TIE_TOLERANCE)
+
+    @pytest.mark.parametrize("seed", range(10))
+    @pytest.mark.parametrize("apply_prerequisite_bonus", [False, True])
+    def test_select_by_info_gain_parity(
+        self, question_selector, vectorized_selector, seed, apply_prerequisite_bonus
+    ):
+        """Both engines should select the same question with the same gain."""
+        rng = random.Random(seed)
+        beliefs, questions = create_random_pool(rng)
+
+        expected = question_selector._select_by_info_gain(
+            questions, beliefs, apply_prerequisite_bonus=apply_prerequisite_bonus
+        )
+        actual = vectorized_selector._select_by_info_gain(
+            questions, beliefs, apply_prerequisite_bonus=apply_prerequisite_bonus
+        )
+
+        assert actual[0] is expected[0]
+        assert actual[1] == expected[1]
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_prerequisite_gate_parity(self, question_selector, vectorized_selector, seed):
+        """Both engines should apply the locked concept penalty identically."""
+        rng = random.Random(seed)
+        beliefs, questions = create_random_pool(rng)
+        locked = {qc.concept_id for q in questions[:20] for qc in q.question_concepts}
+
+        expected = question_selector._select_by_info_gain_with_prerequisite_gate(
+            questions, beliefs, locked, apply_prerequisite_bonus=True
+        )
+        actual = vectorized_selector._select_by_info_gain_with_prerequisite_gate(
+            questions, beliefs, locked, apply_prerequisite_bonus=True
+        )
+
+        assert actual[0] is expected[0]
+        assert actual[1] == expected[1]
+
+    def test_ties_select_first_candidate(self, vectorized_selector):
+        """Identical candidates should resolve to the first, like the scalar engine."""
+        cid = uuid4()
+        beliefs = {cid: create_mock_belief(cid, alpha=2.0, beta=3.0)}
+        candidates = [create_mock_question(concept_ids=[cid]) for _ in range(5)]
+
+        selected, _ = vectorized_selector._select_by_info_gain(candidates, beliefs)
+
+        assert selected is candidates[0]
+
+    def test_questions_without_beliefs_score_zero(self, vectorized_selector):
+        """Candidates with no known beliefs should still be selectable."""
+        candidates = [create_mock_question(concept_ids=[uuid4()]), create_mock_question()]
+
+        selected, info_gain = vectorized_selector._select_by_info_gain(candidates, {})
+
+        assert selected is candidates[0]
+        assert info_gain == 0.0
+
+    def test_raises_on_empty_candidates(self, vectorized_selector):
+        """Should raise ValueError with empty candidate list."""
+        with pytest.raises(ValueError, match="No question could be selected"):
+            vectorized_selector._select_by_info_gain([], {})
+
+
 # ============================================================================
 # Full Selection Flow Tests (Task 12)
 # ============================================================================
@@ -836,3 +957,103 @@ class TestSelectNextQuestion:
         # Question was returned, not exhausted
         assert metadata["exhausted"] is False
         assert metadata["filtered_count"] == 1
+
+
+class TestSelectNextQuestionsForOutcomes:
+    """Test speculative selection for both answer outcomes."""
+
+    @pytest.mark.asyncio
+    async def test_excludes_current_question(self, question_selector, mock_db):
+        """The question being answered is never selected for either outcome."""
+        cid = uuid4()
+        current = create_mock_question(concept_ids=[cid])
+        other = create_mock_question(concept_ids=[cid])
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        results = await question_selector.select_next_questions_for_outcomes(
+            user_id=uuid4(),
+            session_id=uuid4(),
+            question=current,
+            beliefs={cid: create_mock_belief(cid)},
+            available_questions=[current, other],
+        )
+
+        assert results[True][0] is other
+        assert results[False][0] is other
+        assert results[True][2] is False
+
+    @pytest.mark.asyncio
+    async def test_advances_beliefs_per_outcome(self, question_selector, mock_db):
+        """Each outcome selects against beliefs updated for that answer."""
+        cid = uuid4()
+        current = create_mock_question(concept_ids=[cid])
+        other = create_mock_question(concept_ids=[cid])
+        beliefs = {cid: create_mock_belief(cid, alpha=2.0, beta=2.0, response_count=3)}
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        with patch.object(
+            question_selector, "_select_from_candidates", return_value=(other, 0.1)
+        ) as select:
+            await question_selector.select_next_questions_for_outcomes(
+                user_id=uuid4(),
+                session_id=uuid4(),
+                question=current,
+                beliefs=beliefs,
+                available_questions=[current, other],
+            )
+
+        correct_beliefs = select.call_args_list[0].args[1]
+        incorrect_beliefs = select.call_args_list[1].args[1]
+        assert correct_beliefs[cid].mean > 0.5
+        assert incorrect_beliefs[cid].mean < 0.5
+        assert correct_beliefs[cid].response_count == 4
+        assert beliefs[cid].alpha == 2.0  # Input beliefs are not modified
+
+    @pytest.mark.asyncio
+    async def test_widens_exhausted_focus(self, question_selector, mock_db):
+        """A focused session with no questions left widens to all questions."""
+        target_cid = uuid4()
+        other_cid = uuid4()
+        current = create_mock_question(concept_ids=[target_cid])
+        other = create_mock_question(concept_ids=[other_cid])
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        results = await question_selector.select_next_questions_for_outcomes(
+            user_id=uuid4(),
+            session_id=uuid4(),
+            question=current,
+            beliefs={},
+            available_questions=[current, other],
+            target_concept_ids=[target_cid],
+        )
+
+        assert results[True][0] is other
+        assert results[True][2] is True
+
+    @pytest.mark.asyncio
+    async def test_no_questions_left(self, question_selector, mock_db):
+        """Both outcomes are None when the pool is used up."""
+        current = create_mock_question(concept_ids=[uuid4()])
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        results = await question_selector.select_next_questions_for_outcomes(
+            user_id=uuid4(),
+            session_id=uuid4(),
+            question=current,
+            beliefs={},
+            available_questions=[current],
+        )
+
+        assert results == {True: (None, 0.0, False), False: (None, 0.0, False)}
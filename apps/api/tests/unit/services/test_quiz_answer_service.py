@@ -404,3 +404,100 @@ class TestConceptsStrengthened:
 
         # Should count 3 unique concepts
         assert count == 3
+
+
+# ============================================================================
+# Unlock Detection Tests (Story 4.11)
+# ============================================================================
+
+
+class TestUnlockDetection:
+    """Test unlock events are recorded from the submission's belief updates."""
+
+    @pytest.fixture
+    def mock_mastery_gate(self):
+        """Create mock MasteryGateService."""
+        return AsyncMock()
+
+    @pytest.fixture
+    def gated_answer_service(
+        self,
+        mock_response_repo,
+        mock_question_repo,
+        mock_session_repo,
+        mock_user_repo,
+        mock_belief_updater,
+        mock_mastery_gate,
+    ):
+        """Create QuizAnswerService with a mastery gate."""
+        return QuizAnswerService(
+            response_repo=mock_response_repo,
+            question_repo=mock_question_repo,
+            session_repo=mock_session_repo,
+            user_repo=mock_user_repo,
+            belief_updater=mock_belief_updater,
+            mastery_gate=mock_mastery_gate,
+        )
+
+    @pytest.fixture
+    def submission(self, mock_response_repo, mock_question_repo, mock_session_repo):
+        """Set up repositories for one answer below the session target."""
+        user_id, session_id, question_id = uuid4(), uuid4(), uuid4()
+        mock_session_repo.get_session_by_id.return_value = create_mock_session(
+            session_id=session_id, user_id=user_id, total_questions=1
+        )
+        mock_session_repo.increment_question_count.return_value = create_mock_session(
+            session_id=session_id, user_id=user_id, total_questions=2
+        )
+        mock_question_repo.get_question_by_id.return_value = create_mock_question(
+            question_id=question_id
+        )
+        mock_response_repo.check_already_answered.return_value = False
+        mock_response_repo.create.return_value = create_mock_response()
+        return {
+            "user_id": user_id,
+            "session_id": session_id,
+            "question_id": question_id,
+            "selected_answer": "B",
+        }
+
+    @pytest.mark.asyncio
+    async def test_records_unlocks_for_belief_updates(
+        self, gated_answer_service, mock_belief_updater, mock_mastery_gate, submission
+    ):
+        """The mastery gate receives the updates of this submission."""
+        belief_response = MagicMock()
+        belief_response.updates = []
+        mock_belief_updater.update_beliefs.return_value = belief_response
+        mock_mastery_gate.record_unlocks_for_updates.return_value = [MagicMock()]
+
+        await gated_answer_service.submit_answer(**submission)
+
+        mock_mastery_gate.record_unlocks_for_updates.assert_awaited_once_with(
+            submission["user_id"], belief_response.updates
+        )
+
+    @pytest.mark.asyncio
+    async def test_unlock_failure_does_not_fail_submission(
+        self, gated_answer_service, mock_belief_updater, mock_mastery_gate,
+        mock_response_repo, submission,
+    ):
+        """Errors in unlock detection are logged, not raised."""
+        mock_belief_updater.update_beliefs.return_value = MagicMock(updates=[])
+        mock_mastery_gate.record_unlocks_for_updates.side_effect = RuntimeError("boom")
+
+        result, was_cached = await gated_answer_service.submit_answer(**submission)
+
+        assert was_cached is False
+        mock_response_repo.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_skipped_when_belief_update_fails(
+        self, gated_answer_service, mock_belief_updater, mock_mastery_gate, submission
+    ):
+        """No unlock detection without belief updates."""
+        mock_belief_updater.update_beliefs.side_effect = RuntimeError("db down")
+
+        await gated_answer_service.submit_answer(**submission)
+
+        mock_mastery_gate.record_unlocks_for_updates.assert_not_called()
@@ -7,6 +7,7 @@ Tests:
 - Chunks to add determination based on answer type
 - Semantic search query composition
 - KA competency calculation
+- Query vector selection (stored question vector vs live embedding)
 """
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -14,6 +15,7 @@ from uuid import uuid4
 import pytest
 
 from src.schemas.reading_queue import ReadingPriority
+from src.services.embedding_service import EMBEDDING_DIMENSIONS
 from src.services.reading_queue_service import ReadingQueueService
 
 
@@ -389,3 +391,98 @@ class TestPopulateReadingQueue:
         )
 
         assert result == 0
+
+
+# ============================================================================
+# Reading Chunk Search Tests
+# ============================================================================
+
+
+class TestSearchReadingChunks:
+    """Tests for query vector selection in _search_reading_chunks."""
+
+    @pytest.mark.asyncio
+    async def test_uses_stored_question_vector(self, reading_queue_service):
+        """Stored question vector is used without calling OpenAI."""
+        stored_vector = [0.1] * EMBEDDING_DIMENSIONS
+        reading_queue_service.qdrant_repo = MagicMock()
+        reading_queue_service.qdrant_repo.get_question_vector = AsyncMock(
+            return_value={"id": "q", "vector": stored_vector, "payload": {}}
+        )
+        reading_queue_service.qdrant_repo.search_chunks = AsyncMock(return_value=[])
+        reading_queue_service.embedding_service = AsyncMock()
+        course_id = uuid4()
+
+        await reading_queue_service._search_reading_chunks(
+            query_text="Stakeholder Analysis",
+            course_id=course_id,
+            knowledge_area_id="BA",
+            limit=3,
+            question_id=uuid4(),
+        )
+
+        reading_queue_service.embedding_service.generate_embedding.assert_not_called()
+        reading_queue_service.qdrant_repo.search_chunks.assert_awaited_once_with(
+            query_vector=stored_vector,
+            course_id=course_id,
+            knowledge_area_id="BA",
+            limit=3,
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "lookup",
+        [
+            AsyncMock(return_value=None),
+            AsyncMock(return_value={"id": "q", "vector": [0.1, 0.2], "payload": {}}),
+            AsyncMock(side_effect=Exception("Qdrant unavailable")),
+        ],
+        ids=["missing", "wrong_dimensions", "qdrant_error"],
+    )
+    async def test_falls_back_to_live_embedding(self, reading_queue_service, lookup):
+        """Missing or unusable stored vectors fall back to embedding the query."""
+        live_vector = [0.2] * EMBEDDING_DIMENSIONS
+        reading_queue_service.qdrant_repo = MagicMock()
+        reading_queue_service.qdrant_repo.get_question_vector = lookup
+        reading_queue_service.qdrant_repo.search_chunks = AsyncMock(return_value=[])
+        reading_queue_service.embedding_service = AsyncMock()
+        reading_queue_service.embedding_service.generate_embedding.return_value = live_vector
+
+        await reading_queue_service._search_reading_chunks(
+            query_text="Stakeholder Analysis",
+            course_id=uuid4(),
+            knowledge_area_id="BA",
+            limit=3,
+            question_id=uuid4(),
+        )
+
+        reading_queue_service.embedding_service.generate_embedding.assert_awaited_once_with(
+            "Stakeholder Analysis"
+        )
+        assert (
+            reading_queue_service.qdrant_repo.search_chunks.await_args.kwargs["query_vector"]
+            is live_vector
+        )
+
+    @pytest.mark.asyncio
+    async def test_stored_vectors_disabled(self, reading_queue_service):
+        """Setting off skips the stored vector lookup."""
+        reading_queue_service.qdrant_repo = MagicMock()
+        reading_queue_service.qdrant_repo.get_question_vector = AsyncMock()
+        reading_queue_service.qdrant_repo.search_chunks = AsyncMock(return_value=[])
+        reading_queue_service.embedding_service = AsyncMock()
+
+        with patch(
+            "src.services.reading_queue_service.settings.READING_SEARCH_USE_QUESTION_VECTORS",
+            False,
+        ):
+            await reading_queue_service._search_reading_chunks(
+                query_text="Stakeholder Analysis",
+                course_id=uuid4(),
+                knowledge_area_id="BA",
+                limit=3,
+                question_id=uuid4(),
+            )
+
+        reading_queue_service.qdrant_repo.get_question_vector.assert_not_called()
+        reading_queue_service.embedding_service.generate_embedding.assert_awaited_once()
@@ -0,0 +1,176 @@
+"""
+Unit tests for ReadingSearchService.
+Tests semantic search result loading (batched database load and payload mode).
+"""
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.models.reading_chunk import ReadingChunk
+from src.services.reading_search_service import ReadingSearchService
+
+
+def create_payload(chunk_id, course_id, **overrides):
+    """Helper to build a Qdrant chunk payload."""
+    payload = {
+        "chunk_id": str(chunk_id),
+        "course_id": str(course_id),
+        "title": "Stakeholder Analysis",
+        "knowledge_area_id": "ba-planning",
+        "corpus_section": "3.2.1",
+        "concept_ids": [str(uuid4())],
+        "concept_names": ["Stakeholder Analysis"],
+        "text_content": "Full chunk text.",
+        "estimated_read_time": 4,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def create_result(payload, score):
+    """Helper to build a Qdrant scored point."""
+    result = MagicMock()
+    result.payload = payload
+    result.score = score
+    return result
+
+
+def create_chunk(chunk_id, course_id):
+    """Helper to build a ReadingChunk as returned by the repository."""
+    return ReadingChunk(
+        id=chunk_id,
+        course_id=course_id,
+        title="From DB",
+        content="Database text.",
+        corpus_section="3.2.1",
+        knowledge_area_id="ba-planning",
+        concept_ids=[],
+        estimated_read_time_minutes=5,
+    )
+
+
+@pytest.fixture
+def course_id():
+    return uuid4()
+
+
+@pytest.fixture
+def chunk_ids():
+    return [uuid4(), uuid4(), uuid4()]
+
+
+@pytest.fixture
+def qdrant_client(course_id, chunk_ids):
+    """Create a mock Qdrant client returning three ranked results."""
+    client = MagicMock()
+    client.search = AsyncMock(
+        return_value=[
+            create_result(create_payload(cid, course_id), score)
+            for cid, score in zip(chunk_ids, (0.9, 0.8, 0.7), strict=True)
+        ]
+    )
+    return client
+
+
+@pytest.fixture
+def embedding_service():
+    service = MagicMock()
+    service.generate_embedding = AsyncMock(return_value=[0.1] * 3072)
+    return service
+
+
+@pytest.fixture
+def chunk_repo():
+    repo = MagicMock()
+    repo.get_by_id = AsyncMock()
+    repo.get_by_ids = AsyncMock(return_value=[])
+    return repo
+
+
+class TestSearchChunksByConceptNames:
+    """Tests for loading chunks after vector search."""
+
+    @pytest.mark.asyncio
+    async def test_loads_chunks_in_one_query_preserving_score_order(
+        self, course_id, chunk_ids, qdrant_client, embedding_service, chunk_repo
+    ):
+        """Chunks are fetched with one batched query and returned in score order."""
+        # Repository returns rows in arbitrary order
+        chunk_repo.get_by_ids.return_value = [
+            create_chunk(cid, course_id) for cid in reversed(chunk_ids)
+        ]
+        service = ReadingSearchService(
+            qdrant_client, embedding_service, serve_from_payload=False
+        )
+
+        chunks = await service.search_chunks_by_concept_names(
+            course_id, ["Stakeholder Analysis"], chunk_repo, limit=3
+        )
+
+        assert [c.id for c in chunks] == chunk_ids
+        chunk_repo.get_by_ids.assert_awaited_once_with(chunk_ids)
+        chunk_repo.get_by_id.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_missing_chunks_are_skipped(
+        self, course_id, chunk_ids, qdrant_client, embedding_service, chunk_repo
+    ):
+        """Results without a database row are dropped."""
+        chunk_repo.get_by_ids.return_value = [create_chunk(chunk_ids[2], course_id)]
+        service = ReadingSearchService(
+            qdrant_client, embedding_service, serve_from_payload=False
+        )
+
+        chunks = await service.search_chunks_by_concept_names(
+            course_id, ["Stakeholder Analysis"], chunk_repo
+        )
+
+        assert [c.id for c in chunks] == [chunk_ids[2]]
+
+    @pytest.mark.asyncio
+    async def test_serve_from_payload_skips_database(
+        self, course_id, chunk_ids, qdrant_client, embedding_service, chunk_repo
+    ):
+        """Payload mode builds chunks from Qdrant payloads without any query."""
+        service = ReadingSearchService(
+            qdrant_client, embedding_service, serve_from_payload=True
+        )
+
+        chunks = await service.search_chunks_by_concept_names(
+            course_id, ["Stakeholder Analysis"], chunk_repo
+        )
+
+        assert [c.id for c in chunks] == chunk_ids
+        assert chunks[0].content == "Full chunk text."
+        assert chunks[0].course_id == course_id
+        assert chunks[0].estimated_read_time_minutes == 4
+        chunk_repo.get_by_ids.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_incomplete_payloads_fall_back_to_database(
+        self, course_id, chunk_ids, qdrant_client, embedding_service, chunk_repo
+    ):
+        """Chunks with incomplete payloads are loaded in one query and merged in order."""
+        results = qdrant_client.search.return_value
+        del results[1].payload["text_content"]
+        chunk_repo.get_by_ids.return_value = [create_chunk(chunk_ids[1], course_id)]
+        service = ReadingSearchService(
+            qdrant_client, embedding_service, serve_from_payload=True
+        )
+
+        chunks = await service.search_chunks_by_concept_names(
+            course_id, ["Stakeholder Analysis"], chunk_repo
+        )
+
+        assert [c.id for c in chunks] == chunk_ids
+        assert chunks[1].title == "From DB"
+        chunk_repo.get_by_ids.assert_awaited_once_with([chunk_ids[1]])
+
+    @pytest.mark.asyncio
+    async def test_empty_concept_names(self, qdrant_client, embedding_service, chunk_repo):
+        """No search is issued without concept names."""
+        service = ReadingSearchService(qdrant_client, embedding_service)
+
+        assert await service.search_chunks_by_concept_names(uuid4(), [], chunk_repo) == []
+        qdrant_client.search.assert_not_awaited()
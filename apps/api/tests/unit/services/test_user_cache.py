@@ -0,0 +1,257 @@
+"""
+Unit tests for the in-process user cache.
+Tests LRU/TTL behavior, invalidation publishing and the pub/sub subscriber.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.models.user import User
+from src.services.user_cache import (
+    USER_CACHE_INVALIDATION_CHANNEL,
+    UserCache,
+    deserialize_user,
+    serialize_user,
+    user_cache_key,
+)
+
+REDIS_PATH = "src.services.user_cache.get_redis"
+
+
+def make_user_dict(user_id=None, **overrides):
+    """Helper to create a serialized user."""
+    user = User(
+        id=user_id or uuid4(),
+        email="learner@example.com",
+        hashed_password="hashed",
+        is_admin=False,
+        dark_mode="auto",
+    )
+    user_dict = serialize_user(user)
+    user_dict.update(overrides)
+    return user_dict
+
+
+# ============================================================================
+# Serialization
+# ============================================================================
+
+class TestSerialization:
+    """Tests for the user dict format shared with the Redis cache."""
+
+    def test_round_trip(self):
+        """A deserialized user has a UUID id and the cached fields."""
+        user_id = uuid4()
+        user = deserialize_user(make_user_dict(user_id, target_score=250))
+
+        assert user.id == user_id
+        assert user.email == "learner@example.com"
+        assert user.target_score == 250
+
+    def test_key_format(self):
+        """Local and Redis caches share the user_cache:{id} key format."""
+        user_id = uuid4()
+        assert user_cache_key(user_id) == f"user_cache:{user_id}"
+
+
+# ============================================================================
+# Local LRU
+# ============================================================================
+
+class TestLocalCache:
+    """Tests for get/put/invalidate."""
+
+    def test_hit_returns_fresh_instance(self):
+        """Each hit gets its own User, so mutations do not leak into the cache."""
+        cache = UserCache(max_users=10, ttl_seconds=300, fallback_ttl_seconds=10)
+        cache.subscribed = True
+        user_id = uuid4()
+        cache.put(user_id, make_user_dict(user_id))
+
+        first = cache.get(user_id)
+        first.target_score = 999
+        second = cache.get(user_id)
+
+        assert first is not second
+        assert second.target_score is None
+        assert cache.hits == 2
+
+    def test_miss(self):
+        """Unknown users are a miss."""
+        cache = UserCache(max_users=10)
+
+        assert cache.get(uuid4()) is None
+        assert cache.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        """Only max_users entries are kept."""
+        cache = UserCache(max_users=2, ttl_seconds=300)
+        cache.subscribed = True
+        first, second, third = uuid4(), uuid4(), uuid4()
+
+        cache.put(first, make_user_dict(first))
+        cache.put(second, make_user_dict(second))
+        cache.get(first)  # Refresh first
+        cache.put(third, make_user_dict(third))
+
+        assert set(cache.users) == {first, third}
+
+    def test_entries_expire_after_ttl(self):
+        """Entries older than the TTL are dropped on read."""
+        cache = UserCache(max_users=10, ttl_seconds=300, fallback_ttl_seconds=10)
+        cache.subscribed = True
+        user_id = uuid4()
+        cache.put(user_id, make_user_dict(user_id))
+
+        with patch("src.services.user_cache.time.time", return_value=time.time() + 301):
+            assert cache.get(user_id) is None
+        assert user_id not in cache.users
+
+    def test_short_ttl_while_unsubscribed(self):
+        """Without the subscriber, entries are served for the fallback TTL only."""
+        cache = UserCache(max_users=10, ttl_seconds=300, fallback_ttl_seconds=10)
+        user_id = uuid4()
+        cache.put(user_id, make_user_dict(user_id))
+
+        with patch("src.services.user_cache.time.time", return_value=time.time() + 11):
+            assert cache.get(user_id) is None
+
+    def test_invalidate(self):
+        """Invalidation drops one user, or all users."""
+        cache = UserCache(max_users=10)
+        first, second = uuid4(), uuid4()
+        cache.put(first, make_user_dict(first))
+        cache.put(second, make_user_dict(second))
+
+        cache.invalidate(first)
+        assert set(cache.users) == {second}
+        assert cache.invalidations == 1
+
+        cache.invalidate()
+        assert not cache.users
+
+
+# ============================================================================
+# Invalidation publishing and subscriber
+# ============================================================================
+
+def make_redis(messages=(), deliver=None):
+    """Mock Redis client with a pipeline and a pubsub yielding messages once deliver is set."""
+    redis = MagicMock()
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, 1])
+    pipe_context = MagicMock()
+    pipe_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipe_context.__aexit__ = AsyncMock(return_value=False)
+    redis.pipeline = MagicMock(return_value=pipe_context)
+
+    pending = list(messages)
+
+    async def get_message(ignore_subscribe_messages=False, timeout=None):
+        if pending and (deliver is None or deliver.is_set()):
+            return pending.pop(0)
+        await asyncio.sleep(0.01)
+        return None
+
+    pubsub = MagicMock()
+    pubsub.subscribe = AsyncMock()
+    pubsub.get_message = get_message
+    pubsub.aclose = AsyncMock()
+    redis.pubsub = MagicMock(return_value=pubsub)
+    return redis, pipe, pubsub
+
+
+class TestInvalidation:
+    """Tests for cross-process invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_publish_invalidation(self):
+        """Deletes the Redis entry and publishes the user id in one pipeline."""
+        cache = UserCache(max_users=10)
+        user_id = uuid4()
+        cache.put(user_id, make_user_dict(user_id))
+        redis, pipe, _ = make_redis()
+
+        with patch(REDIS_PATH, AsyncMock(return_value=redis)):
+            await cache.publish_invalidation(user_id)
+
+        assert user_id not in cache.users
+        pipe.delete.assert_called_once_with(user_cache_key(user_id))
+        pipe.publish.assert_called_once_with(USER_CACHE_INVALIDATION_CHANNEL, str(user_id))
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_publish_invalidation_without_redis(self):
+        """The local entry is still dropped when Redis is unavailable."""
+        cache = UserCache(max_users=10)
+        user_id = uuid4()
+        cache.put(user_id, make_user_dict(user_id))
+
+        with patch(REDIS_PATH, AsyncMock(side_effect=ConnectionError("down"))):
+            await cache.publish_invalidation(user_id)
+
+        assert user_id not in cache.users
+
+    @pytest.mark.asyncio
+    async def test_listener_drops_published_users(self):
+        """The subscriber drops users named on the channel."""
+        cache = UserCache(max_users=10)
+        invalidated, kept = uuid4(), uuid4()
+        deliver = asyncio.Event()
+        redis, _, pubsub = make_redis(
+            [
+                {"type": "message", "data": str(invalidated)},
+                {"type": "message", "data": "not-a-uuid"},
+            ],
+            deliver,
+        )
+
+        with patch(REDIS_PATH, AsyncMock(return_value=redis)):
+            cache.start_listener()
+            await asyncio.sleep(0.02)  # Subscribe (clears entries missed while down)
+            cache.put(invalidated, make_user_dict(invalidated))
+            cache.put(kept, make_user_dict(kept))
+            deliver.set()
+            await asyncio.sleep(0.05)
+
+            assert cache.subscribed is True
+            assert set(cache.users) == {kept}
+
+            await cache.stop_listener()
+
+        pubsub.subscribe.assert_awaited_once_with(USER_CACHE_INVALIDATION_CHANNEL)
+        pubsub.aclose.assert_awaited_once()
+        assert cache.subscribed is False
+
+    @pytest.mark.asyncio
+    async def test_subscribe_clears_local_entries(self):
+        """Entries cached before (re)subscribing may have missed invalidations."""
+        cache = UserCache(max_users=10)
+        user_id = uuid4()
+        cache.put(user_id, make_user_dict(user_id))
+        redis, _, _ = make_redis()
+
+        with patch(REDIS_PATH, AsyncMock(return_value=redis)):
+            cache.start_listener()
+            await asyncio.sleep(0.02)
+            await cache.stop_listener()
+
+        assert not cache.users
+
+    @pytest.mark.asyncio
+    async def test_reset_instance_stops_listener(self):
+        """Resetting the singleton cancels its subscriber."""
+        redis, _, _ = make_redis()
+
+        with patch(REDIS_PATH, AsyncMock(return_value=redis)):
+            cache = await UserCache.get_instance()
+            cache.start_listener()
+            await asyncio.sleep(0)
+            await UserCache.reset_instance()
+
+        assert cache._listener is None
+        assert await UserCache.get_instance() is not cache
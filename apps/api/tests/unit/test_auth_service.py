@@ -317,3 +317,16 @@ class TestAuthServiceLogin:
 
         # Verify repository was called with the email as provided
         mock_user_repo.get_by_email.assert_called_once_with(email)
+
+    @pytest.mark.asyncio
+    async def test_login_nonexistent_email_runs_dummy_verify(self, mock_user_repo):
+        """Unknown users still cost one password verification on the hasher."""
+        password_hasher = AsyncMock()
+        auth_service = AuthService(mock_user_repo, password_hasher=password_hasher)
+        mock_user_repo.get_by_email = AsyncMock(return_value=None)
+
+        with pytest.raises(AuthenticationError):
+            await auth_service.login_user("nonexistent@example.com", "AnyPassword123")
+
+        password_hasher.verify_dummy.assert_awaited_once_with("AnyPassword123")
+        password_hasher.verify.assert_not_called()
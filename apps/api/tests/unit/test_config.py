@@ -0,0 +1,64 @@
+"""
+Unit tests for settings validation.
+"""
+import pytest
+from pydantic import ValidationError
+from structlog.testing import capture_logs
+
+from src.config import Settings
+
+
+@pytest.fixture(autouse=True)
+def clear_reading_queue_env(monkeypatch):
+    """Ignore reading queue settings from the environment."""
+    monkeypatch.delenv("READING_QUEUE_MODE", raising=False)
+    monkeypatch.delenv("READING_QUEUE_SYNC_MODE", raising=False)
+
+
+class TestDeprecatedReadingQueueSyncMode:
+    """Tests for the READING_QUEUE_SYNC_MODE alias of READING_QUEUE_MODE."""
+
+    def test_unset_keeps_default_mode(self):
+        with capture_logs() as logs:
+            settings = Settings(_env_file=None)
+
+        assert settings.READING_QUEUE_MODE == "background"
+        assert logs == []
+
+    @pytest.mark.parametrize("value,mode", [("true", "sync"), ("false", "celery")])
+    def test_maps_to_mode_with_warning(self, monkeypatch, value, mode):
+        monkeypatch.setenv("READING_QUEUE_SYNC_MODE", value)
+
+        with capture_logs() as logs:
+            settings = Settings(_env_file=None)
+
+        assert settings.READING_QUEUE_MODE == mode
+        assert [log["event"] for log in logs] == ["deprecated_setting"]
+
+    def test_explicit_mode_wins(self, monkeypatch):
+        monkeypatch.setenv("READING_QUEUE_SYNC_MODE", "true")
+        monkeypatch.setenv("READING_QUEUE_MODE", "background")
+
+        with capture_logs() as logs:
+            settings = Settings(_env_file=None)
+
+        assert settings.READING_QUEUE_MODE == "background"
+        assert [log["event"] for log in logs] == ["deprecated_setting_ignored"]
+
+
+class TestReadingQueueSettings:
+    """Tests for validation of the reading queue settings."""
+
+    @pytest.mark.parametrize(
+        "name,value",
+        [
+            ("READING_QUEUE_MODE", "Background"),
+            ("READING_QUEUE_MODE", "inline"),
+            ("READING_QUEUE_EXECUTOR_DROP_POLICY", "random"),
+        ],
+    )
+    def test_rejects_unknown_values(self, monkeypatch, name, value):
+        monkeypatch.setenv(name, value)
+
+        with pytest.raises(ValidationError, match=name):
+            Settings(_env_file=None)
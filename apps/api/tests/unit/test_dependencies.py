@@ -254,3 +254,71 @@ async def test_get_current_user_rate_limit_exceeded():
             await get_current_user(mock_request, authorization, mock_db)
 
         assert exc_info.value.retry_after_seconds == 30
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_local_cache_hit_skips_redis_and_database():
+    """Test get_current_user serves a locally cached user without Redis or DB lookups."""
+    from src.services.user_cache import UserCache, serialize_user
+
+    user_id = uuid.uuid4()
+    test_user = User(id=user_id, email="test@example.com", is_admin=False)
+    user_cache = UserCache(max_users=10, ttl_seconds=300)
+    user_cache.subscribed = True
+    user_cache.put(user_id, serialize_user(test_user))
+
+    token = create_access_token(data={"sub": str(user_id)})
+    authorization = f"Bearer {token}"
+    mock_db = AsyncMock()
+    mock_request = MockRequest()
+
+    with patch('src.dependencies.check_rate_limit', new_callable=AsyncMock) as mock_rate_limit, \
+         patch('src.dependencies.get_user_cache', AsyncMock(return_value=user_cache)), \
+         patch('src.dependencies.get_redis', new_callable=AsyncMock) as mock_redis, \
+         patch('src.dependencies.UserRepository') as mock_repo_class:
+
+        mock_rate_limit.return_value = (True, 0)
+
+        user = await get_current_user(mock_request, authorization, mock_db)
+
+        assert user.id == user_id
+        assert user.email == "test@example.com"
+        mock_redis.assert_not_awaited()
+        mock_repo_class.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_database_hit_populates_local_cache():
+    """Test get_current_user caches a user loaded from the database in-process."""
+    from src.services.user_cache import UserCache
+
+    user_id = uuid.uuid4()
+    test_user = User(id=user_id, email="test@example.com", is_admin=False)
+    user_cache = UserCache(max_users=10, ttl_seconds=300)
+    user_cache.subscribed = True
+
+    token = create_access_token(data={"sub": str(user_id)})
+    authorization = f"Bearer {token}"
+    mock_db = AsyncMock()
+    mock_request = MockRequest()
+
+    with patch('src.dependencies.check_rate_limit', new_callable=AsyncMock) as mock_rate_limit, \
+         patch('src.dependencies.get_user_cache', AsyncMock(return_value=user_cache)), \
+         patch('src.dependencies.get_redis', new_callable=AsyncMock) as mock_redis, \
+         patch('src.dependencies.UserRepository') as mock_repo_class:
+
+        mock_rate_limit.return_value = (True, 0)
+        mock_redis_instance = AsyncMock()
+        mock_redis_instance.get = AsyncMock(return_value=None)  # Cache miss
+        mock_redis.return_value = mock_redis_instance
+
+        mock_repo_instance = MagicMock()
+        mock_repo_instance.get_by_id = AsyncMock(return_value=test_user)
+        mock_repo_class.return_value = mock_repo_instance
+
+        await get_current_user(mock_request, authorization, mock_db)
+
+        cached = user_cache.get(user_id)
+        assert cached is not None
+        assert cached.email == "test@example.com"
+        mock_redis_instance.setex.assert_awaited_once()
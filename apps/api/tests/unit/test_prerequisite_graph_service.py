@@ -3,20 +3,69 @@ Unit tests for PrerequisiteGraphService.
 Tests the in-memory prerequisite graph cache for BKT lookups.
 """
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from src.services.prerequisite_graph_service import (
     CachedConcept,
     CachedPrerequisite,
     PrerequisiteGraphService,
+    build_course_graph,
     get_prerequisite_graph_service,
     load_prerequisite_graph,
     refresh_prerequisite_graph,
 )
 
+VERSION_PATH = "src.services.prerequisite_graph_service.get_prerequisite_graph_version"
+
+
+def make_concept(name="Test", knowledge_area_id="KA1", difficulty=0.5, depth=0):
+    """Helper to create a CachedConcept."""
+    return CachedConcept(
+        id=uuid4(),
+        name=name,
+        knowledge_area_id=knowledge_area_id,
+        difficulty_estimate=difficulty,
+        prerequisite_depth=depth,
+    )
+
+
+def make_row(course_id, concept, prerequisite_id=None, strength=None, relationship_type=None):
+    """Helper to create a row of the joined concept/prerequisite query."""
+    row = MagicMock()
+    row.id = concept.id
+    row.course_id = course_id
+    row.name = concept.name
+    row.knowledge_area_id = concept.knowledge_area_id
+    row.difficulty_estimate = concept.difficulty_estimate
+    row.prerequisite_depth = concept.prerequisite_depth
+    row.prerequisite_concept_id = prerequisite_id
+    row.strength = strength
+    row.relationship_type = relationship_type
+    return row
+
+
+def mock_session_with_rows(rows):
+    """Helper to create a session whose query returns the given rows."""
+    result = MagicMock()
+    result.all.return_value = rows
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+def service_with(*graphs):
+    """Helper to create a loaded service holding the given course graphs."""
+    service = PrerequisiteGraphService()
+    for graph in graphs:
+        service._add_course(graph)
+    service.loaded_at = 1.0
+    return service
+
 
 class TestCachedConcept:
     """Tests for CachedConcept dataclass."""
@@ -61,12 +110,9 @@ class TestPrerequisiteGraphServiceInit:
         """Test service initializes with empty state."""
         service = PrerequisiteGraphService()
 
-        assert service.graph is None
-        assert service.concepts == {}
-        assert len(service.prerequisites) == 0
-        assert len(service.dependents) == 0
-        assert service.depths == {}
-        assert service.root_concepts == set()
+        assert service.graphs == {}
+        assert service.course_ids == set()
+        assert service.get_root_concepts() == []
         assert service.loaded_at is None
         assert service.concept_count == 0
         assert service.edge_count == 0
@@ -108,167 +154,122 @@ class TestPrerequisiteGraphServiceSingleton:
 class TestPrerequisiteGraphServiceLoadGraph:
     """Tests for load_graph method."""
 
-    @pytest.fixture(autouse=True)
-    async def reset_singleton(self):
-        """Reset singleton before each test."""
-        await PrerequisiteGraphService.reset_instance()
-        yield
-        await PrerequisiteGraphService.reset_instance()
-
-    @pytest.fixture
-    def mock_session(self):
-        """Create a mock database session."""
-        return AsyncMock()
-
     @pytest.fixture
     def sample_concepts(self):
         """Create sample concept data."""
         course_id = uuid4()
-        concept1_id = uuid4()
-        concept2_id = uuid4()
-        concept3_id = uuid4()
-
-        concept1 = MagicMock()
-        concept1.id = concept1_id
-        concept1.name = "Root Concept"
-        concept1.knowledge_area_id = "KA1"
-        concept1.difficulty_estimate = 0.3
-        concept1.prerequisite_depth = 0
-        concept1.course_id = course_id
-
-        concept2 = MagicMock()
-        concept2.id = concept2_id
-        concept2.name = "Intermediate Concept"
-        concept2.knowledge_area_id = "KA1"
-        concept2.difficulty_estimate = 0.5
-        concept2.prerequisite_depth = 1
-        concept2.course_id = course_id
-
-        concept3 = MagicMock()
-        concept3.id = concept3_id
-        concept3.name = "Advanced Concept"
-        concept3.knowledge_area_id = "KA2"
-        concept3.difficulty_estimate = 0.8
-        concept3.prerequisite_depth = 2
-        concept3.course_id = course_id
-
-        return [concept1, concept2, concept3], course_id
+        concepts = [
+            make_concept("Root Concept", "KA1", 0.3, 0),
+            make_concept("Intermediate Concept", "KA1", 0.5, 1),
+            make_concept("Advanced Concept", "KA2", 0.8, 2),
+        ]
+        return concepts, course_id
 
     @pytest.fixture
-    def sample_prerequisites(self, sample_concepts):
-        """Create sample prerequisite data."""
-        concepts, _ = sample_concepts
-        concept1_id = concepts[0].id
-        concept2_id = concepts[1].id
-        concept3_id = concepts[2].id
-
-        # concept2 requires concept1
-        prereq1 = MagicMock()
-        prereq1.concept_id = concept2_id
-        prereq1.prerequisite_concept_id = concept1_id
-        prereq1.strength = 0.9
-        prereq1.relationship_type = "required"
-
-        # concept3 requires concept2
-        prereq2 = MagicMock()
-        prereq2.concept_id = concept3_id
-        prereq2.prerequisite_concept_id = concept2_id
-        prereq2.strength = 0.8
-        prereq2.relationship_type = "recommended"
-
-        return [prereq1, prereq2]
+    def sample_rows(self, sample_concepts):
+        """Joined rows: concept2 requires concept1, concept3 recommends concept2."""
+        concepts, course_id = sample_concepts
+        return [
+            make_row(course_id, concepts[0]),
+            make_row(course_id, concepts[1], concepts[0].id, 0.9, "required"),
+            make_row(course_id, concepts[2], concepts[1].id, 0.8, "recommended"),
+        ]
 
     @pytest.mark.asyncio
-    async def test_load_graph_with_concepts(self, mock_session, sample_concepts):
+    async def test_load_graph_with_concepts(self, sample_concepts):
         """Test loading graph with concepts."""
         concepts, course_id = sample_concepts
-
-        # Mock database results
-        concept_result = MagicMock()
-        concept_result.scalars.return_value.all.return_value = concepts
-
-        prereq_result = MagicMock()
-        prereq_result.scalars.return_value.all.return_value = []
-
-        mock_session.execute = AsyncMock(side_effect=[concept_result, prereq_result])
+        session = mock_session_with_rows([make_row(course_id, c) for c in concepts])
 
         service = PrerequisiteGraphService()
-        await service.load_graph(mock_session)
+        await service.load_graph(session)
 
         assert service.is_loaded() is True
         assert service.concept_count == 3
-        assert len(service.concepts) == 3
+        assert service.edge_count == 0
         assert course_id in service.course_ids
+        assert session.execute.await_count == 1
 
     @pytest.mark.asyncio
-    async def test_load_graph_with_prerequisites(
-        self, mock_session, sample_concepts, sample_prerequisites
-    ):
+    async def test_load_graph_with_prerequisites(self, sample_concepts, sample_rows):
         """Test loading graph with prerequisites."""
-        concepts, course_id = sample_concepts
-
-        # Mock database results
-        concept_result = MagicMock()
-        concept_result.scalars.return_value.all.return_value = concepts
-
-        prereq_result = MagicMock()
-        prereq_result.scalars.return_value.all.return_value = sample_prerequisites
-
-        mock_session.execute = AsyncMock(side_effect=[concept_result, prereq_result])
+        concepts, _ = sample_concepts
 
         service = PrerequisiteGraphService()
-        await service.load_graph(mock_session)
+        await service.load_graph(mock_session_with_rows(sample_rows))
 
         assert service.edge_count == 2
+        roots = service.get_root_concepts()
         # Root concept should have no prerequisites
-        assert concepts[0].id in service.root_concepts
+        assert concepts[0].id in roots
         # Intermediate and advanced should not be roots
-        assert concepts[1].id not in service.root_concepts
-        assert concepts[2].id not in service.root_concepts
+        assert concepts[1].id not in roots
+        assert concepts[2].id not in roots
+
+        prereqs = service.get_prerequisites(concepts[2].id)
+        assert prereqs == [CachedPrerequisite(concepts[1].id, 0.8, "recommended")]
+        assert service.get_concept(concepts[1].id) == concepts[1]
 
     @pytest.mark.asyncio
-    async def test_load_graph_empty(self, mock_session):
+    async def test_load_graph_empty(self):
         """Test loading graph with no concepts."""
-        concept_result = MagicMock()
-        concept_result.scalars.return_value.all.return_value = []
-
-        mock_session.execute = AsyncMock(return_value=concept_result)
-
         service = PrerequisiteGraphService()
-        await service.load_graph(mock_session)
+        await service.load_graph(mock_session_with_rows([]))
 
         assert service.is_loaded() is True
         assert service.concept_count == 0
         assert service.edge_count == 0
 
     @pytest.mark.asyncio
-    async def test_load_graph_clears_previous_data(self, mock_session, sample_concepts):
-        """Test that load_graph clears previous data."""
-        concepts, _ = sample_concepts
-
-        concept_result = MagicMock()
-        concept_result.scalars.return_value.all.return_value = concepts
+    async def test_load_graph_clears_previous_data(self, sample_concepts):
+        """Test that a full load replaces previous courses."""
+        concepts, course_id = sample_concepts
+        old_concept = make_concept("Old Concept", "OLD")
+        service = service_with(build_course_graph(uuid4(), [old_concept], []))
 
-        prereq_result = MagicMock()
-        prereq_result.scalars.return_value.all.return_value = []
+        await service.load_graph(mock_session_with_rows([make_row(course_id, c) for c in concepts]))
 
-        mock_session.execute = AsyncMock(side_effect=[concept_result, prereq_result])
+        # Old data should be cleared
+        assert service.concept_count == 3
+        assert service.course_ids == {course_id}
+        assert service.get_concept(old_concept.id) is None
 
-        service = PrerequisiteGraphService()
-        # Pre-populate with dummy data
-        service.concepts[uuid4()] = CachedConcept(
-            id=uuid4(),
-            name="Old Concept",
-            knowledge_area_id="OLD",
-            difficulty_estimate=0.1,
-            prerequisite_depth=0,
+    @pytest.mark.asyncio
+    async def test_load_single_course_keeps_other_courses(self, sample_concepts, sample_rows):
+        """Test loading one course replaces only that course's graph."""
+        concepts, course_id = sample_concepts
+        other = make_concept("Other Course Concept")
+        other_course_id = uuid4()
+        service = service_with(
+            build_course_graph(other_course_id, [other], []),
+            build_course_graph(course_id, [make_concept("Stale")], []),
         )
 
-        await service.load_graph(mock_session)
+        await service.load_graph(mock_session_with_rows(sample_rows), course_id)
 
-        # Old data should be cleared
-        assert service.concept_count == 3
-        assert "OLD" not in [c.knowledge_area_id for c in service.concepts.values()]
+        assert service.course_ids == {course_id, other_course_id}
+        assert service.concept_count == 4
+        assert service.get_concept(other.id) == other
+        assert service.get_prerequisite_ids(concepts[1].id) == [concepts[0].id]
+
+    @pytest.mark.asyncio
+    async def test_load_graph_groups_courses(self, sample_concepts, sample_rows):
+        """Test rows of several courses build separate graphs."""
+        concepts, course_id = sample_concepts
+        other_course_id = uuid4()
+        a, b = make_concept("A"), make_concept("B")
+        rows = sample_rows + [
+            make_row(other_course_id, a),
+            make_row(other_course_id, b, a.id, 1.0, "required"),
+        ]
+
+        service = PrerequisiteGraphService()
+        await service.load_graph(mock_session_with_rows(rows))
+
+        assert service.get_course_graph(course_id).concept_count == 3
+        assert service.get_course_graph(other_course_id).edge_count == 1
+        assert set(service.get_root_concepts(other_course_id)) == {a.id}
+        assert service.get_dependents(a.id) == [b.id]
 
 
 class TestPrerequisiteGraphServiceQueries:
@@ -276,71 +277,20 @@ class TestPrerequisiteGraphServiceQueries:
 
     @pytest.fixture
     def populated_service(self):
-        """Create a service with pre-populated data."""
-        service = PrerequisiteGraphService()
-
-        # Create UUIDs
-        concept1_id = uuid4()
-        concept2_id = uuid4()
-        concept3_id = uuid4()
-
-        # Add concepts
-        service.concepts = {
-            concept1_id: CachedConcept(
-                id=concept1_id,
-                name="Root",
-                knowledge_area_id="KA1",
-                difficulty_estimate=0.3,
-                prerequisite_depth=0,
-            ),
-            concept2_id: CachedConcept(
-                id=concept2_id,
-                name="Intermediate",
-                knowledge_area_id="KA1",
-                difficulty_estimate=0.5,
-                prerequisite_depth=1,
-            ),
-            concept3_id: CachedConcept(
-                id=concept3_id,
-                name="Advanced",
-                knowledge_area_id="KA2",
-                difficulty_estimate=0.8,
-                prerequisite_depth=2,
-            ),
-        }
-
-        # Add prerequisites
-        service.prerequisites[concept2_id] = [
-            CachedPrerequisite(
-                prerequisite_id=concept1_id,
-                strength=0.9,
-                relationship_type="required",
-            )
+        """Create a service with a three concept course."""
+        concepts = [
+            make_concept("Root", "KA1", 0.3, 0),
+            make_concept("Intermediate", "KA1", 0.5, 1),
+            make_concept("Advanced", "KA2", 0.8, 2),
         ]
-        service.prerequisites[concept3_id] = [
-            CachedPrerequisite(
-                prerequisite_id=concept2_id,
-                strength=0.8,
-                relationship_type="recommended",
-            )
-        ]
-
-        # Add dependents
-        service.dependents[concept1_id] = [concept2_id]
-        service.dependents[concept2_id] = [concept3_id]
-
-        # Add depths
-        service.depths = {
-            concept1_id: 0,
-            concept2_id: 1,
-            concept3_id: 2,
-        }
-
-        # Add roots
-        service.root_concepts = {concept1_id}
+        ids = tuple(c.id for c in concepts)
+        service = service_with(build_course_graph(uuid4(), concepts, [
+            (ids[1], ids[0], 0.9, "required"),
+            (ids[2], ids[1], 0.8, "recommended"),
+        ]))
 
         # Store IDs for tests
-        service._test_ids = (concept1_id, concept2_id, concept3_id)
+        service._test_ids = ids
 
         return service
 
@@ -351,6 +301,7 @@ class TestPrerequisiteGraphServiceQueries:
 
         assert len(prereqs) == 1
         assert prereqs[0].strength == 0.9
+        assert prereqs[0].relationship_type == "required"
 
     def test_get_prerequisites_empty(self, populated_service):
         """Test get_prerequisites returns empty for root concept."""
@@ -422,6 +373,16 @@ class TestPrerequisiteGraphServiceQueries:
         concept = populated_service.get_concept(uuid4())
         assert concept is None
 
+    def test_get_locked_concept_ids(self, populated_service):
+        """Test only direct required prerequisites lock a concept."""
+        concept1_id, concept2_id, _ = populated_service._test_ids
+        course_id = next(iter(populated_service.course_ids))
+
+        # concept3's prerequisite is only recommended
+        assert populated_service.get_locked_concept_ids(course_id, []) == {concept2_id}
+        assert populated_service.get_locked_concept_ids(course_id, [concept1_id]) == set()
+        assert populated_service.get_locked_concept_ids(uuid4(), []) == set()
+
 
 class TestPrerequisiteGraphServiceChain:
     """Tests for prerequisite chain traversal."""
@@ -429,36 +390,16 @@ class TestPrerequisiteGraphServiceChain:
     @pytest.fixture
     def chain_service(self):
         """Create a service with a chain of prerequisites."""
-        import networkx as nx
-
-        service = PrerequisiteGraphService()
-        service.graph = nx.DiGraph()
-
         # Create a chain: A -> B -> C -> D
-        ids = [uuid4() for _ in range(4)]
-
-        for i, cid in enumerate(ids):
-            service.concepts[cid] = CachedConcept(
-                id=cid,
-                name=f"Concept {chr(65+i)}",
-                knowledge_area_id="KA1",
-                difficulty_estimate=0.2 * (i + 1),
-                prerequisite_depth=i,
-            )
-            service.graph.add_node(cid, name=f"Concept {chr(65+i)}")
+        concepts = [
+            make_concept(f"Concept {chr(65 + i)}", "KA1", 0.2 * (i + 1), i)
+            for i in range(4)
+        ]
+        ids = [c.id for c in concepts]
 
         # Set up prerequisites (reverse order: D needs C needs B needs A)
-        for i in range(1, 4):
-            service.prerequisites[ids[i]] = [
-                CachedPrerequisite(
-                    prerequisite_id=ids[i - 1],
-                    strength=0.9,
-                    relationship_type="required",
-                )
-            ]
-            service.graph.add_edge(ids[i - 1], ids[i])
-
-        service.root_concepts = {ids[0]}
+        edges = [(ids[i], ids[i - 1], 0.9, "required") for i in range(1, 4)]
+        service = service_with(build_course_graph(uuid4(), concepts, edges))
         service._test_ids = ids
 
         return service
@@ -466,15 +407,11 @@ class TestPrerequisiteGraphServiceChain:
     def test_get_prerequisite_chain(self, chain_service):
         """Test get_prerequisite_chain returns full chain."""
         ids = chain_service._test_ids
-        # Get chain for D (should return A, B, C)
+        # Get chain for D (should return C, B, A)
         chain = chain_service.get_prerequisite_chain(ids[3])
 
-        assert len(chain) == 3
         # Should be ordered by depth
-        chain_ids = [c[0] for c in chain]
-        assert ids[2] in chain_ids  # C at depth 1
-        assert ids[1] in chain_ids  # B at depth 2
-        assert ids[0] in chain_ids  # A at depth 3
+        assert chain == [(ids[2], 1), (ids[1], 2), (ids[0], 3)]
 
     def test_get_prerequisite_chain_with_max_depth(self, chain_service):
         """Test get_prerequisite_chain respects max_depth."""
@@ -507,6 +444,198 @@ class TestPrerequisiteGraphServiceChain:
         chain = service.get_prerequisite_chain(uuid4())
         assert len(chain) == 0
 
+    def test_ancestors_and_descendants(self, chain_service):
+        """Test closure queries along the chain."""
+        ids = chain_service._test_ids
+
+        assert chain_service.get_ancestor_ids(ids[3]) == set(ids[:3])
+        assert chain_service.get_descendant_ids(ids[1]) == {ids[2], ids[3]}
+        assert chain_service.is_ancestor(ids[0], ids[3]) is True
+        assert chain_service.is_ancestor(ids[3], ids[0]) is False
+        assert chain_service.get_ancestor_ids(uuid4()) == set()
+
+    def test_are_ancestors_mastered(self, chain_service):
+        """Test the transitive mastery check."""
+        ids = chain_service._test_ids
+
+        assert chain_service.are_ancestors_mastered(ids[3], ids[:3]) is True
+        assert chain_service.are_ancestors_mastered(ids[3], [ids[0], ids[2]]) is False
+        assert chain_service.are_ancestors_mastered(ids[0], []) is True
+
+
+class TestTransitiveClosure:
+    """Tests for the array representation against a reference traversal."""
+
+    @staticmethod
+    def reference_ancestors(edges, n, i):
+        """Ancestors of i by plain DFS over (concept, prerequisite) pairs."""
+        prereqs = {k: [p for c, p in edges if c == k] for k in range(n)}
+        seen, stack = set(), list(prereqs[i])
+        while stack:
+            k = stack.pop()
+            if k not in seen:
+                seen.add(k)
+                stack.extend(prereqs[k])
+        return seen
+
+    @pytest.mark.parametrize("closure_max_concepts", [1000, 0])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference(self, seed, closure_max_concepts):
+        """Closure bitsets (and the traversal fallback) match DFS, including cycles."""
+        rnd = random.Random(seed)
+        n = 40
+        concepts = [make_concept() for _ in range(n)]
+        edges = {(i, j) for i in range(1, n) for j in rnd.sample(range(i), min(i, 2))}
+        if seed % 2:
+            edges |= {(3, 10), (10, 20)}  # Introduce a cycle
+        graph = build_course_graph(
+            uuid4(),
+            concepts,
+            [(concepts[i].id, concepts[j].id, 1.0, "required") for i, j in edges],
+            closure_max_concepts=closure_max_concepts,
+        )
+
+        assert (graph.ancestor_bits is None) == (closure_max_concepts == 0)
+        assert graph.has_cycles == (bool(seed % 2) and closure_max_concepts > 0)
+        for i in range(n):
+            expected = self.reference_ancestors(edges, n, i)
+            assert set(np.flatnonzero(graph.ancestor_mask(i))) == expected
+            descendants = {k for k in range(n) if i in self.reference_ancestors(edges, n, k)}
+            assert set(np.flatnonzero(graph.descendant_mask(i))) == descendants
+
+    def test_edges_outside_course_dropped(self):
+        """Prerequisites in another course are not part of the graph."""
+        concept = make_concept()
+
+        graph = build_course_graph(uuid4(), [concept], [(concept.id, uuid4(), 1.0, "required")])
+
+        assert graph.edge_count == 0
+
+
+class TestVersionedGraphAccess:
+    """Tests for version-checked course graph access."""
+
+    @pytest.fixture
+    def course(self):
+        """A course with one prerequisite edge and its query rows."""
+        course_id = uuid4()
+        base, advanced = make_concept("Base"), make_concept("Advanced")
+        rows = [
+            make_row(course_id, base),
+            make_row(course_id, advanced, base.id, 0.9, "required"),
+        ]
+        return course_id, base, advanced, rows
+
+    @pytest.mark.asyncio
+    async def test_get_graph_loads_on_miss(self, course):
+        """First access loads the course and records its version."""
+        course_id, base, advanced, rows = course
+        service = PrerequisiteGraphService()
+        session = mock_session_with_rows(rows)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=4)):
+            graph = await service.get_graph(session, course_id)
+
+        assert graph.version == 4
+        assert graph.concept_count == 2
+        assert service.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_get_graph_same_version_is_hit(self, course):
+        """An unchanged version serves the cached graph without queries."""
+        course_id, _, _, rows = course
+        service = PrerequisiteGraphService()
+        session = mock_session_with_rows(rows)
+
+        with patch(VERSION_PATH, AsyncMock(return_value=1)):
+            first = await service.get_graph(session, course_id)
+            second = await service.get_graph(session, course_id)
+
+        assert second is first
+        assert session.execute.await_count == 1
+        assert service.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_get_graph_reloads_on_version_bump(self, course):
+        """A bumped version reloads the course graph."""
+        course_id, _, _, rows = course
+        service = PrerequisiteGraphService()
+        session = mock_session_with_rows(rows)
+
+        with patch(VERSION_PATH, AsyncMock(side_effect=[1, 2])):
+            first = await service.get_graph(session, course_id)
+            second = await service.get_graph(session, course_id)
+
+        assert second is not first
+        assert second.version == 2
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_graph_without_redis_uses_ttl(self, course):
+        """Without a version the graph expires after the fallback TTL."""
+        course_id, _, _, rows = course
+        service = PrerequisiteGraphService(fallback_ttl_seconds=60)
+        session = mock_session_with_rows(rows)
+
+        with (
+            patch(VERSION_PATH, AsyncMock(return_value=None)),
+            patch("src.services.prerequisite_graph_service.time.time") as mock_time,
+        ):
+            mock_time.return_value = 1000.0
+            first = await service.get_graph(session, course_id)
+
+            mock_time.return_value = 1059.0
+            assert await service.get_graph(session, course_id) is first
+
+            mock_time.return_value = 1061.0
+            assert await service.get_graph(session, course_id) is not first
+
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_graphs_for_concepts(self, course):
+        """Concepts map to the graph of their course; unknown concepts are omitted."""
+        course_id, base, advanced, _ = course
+        graph = build_course_graph(course_id, [base, advanced], [], version=0)
+        service = service_with(graph)
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            graphs = await service.get_graphs_for_concepts(session, [base.id, uuid4()])
+
+        assert graphs == {base.id: graph}
+        # One course lookup for the concept not held by any graph
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_graphs_for_known_concepts_skips_queries(self, course):
+        """Concepts already held by a current graph need no queries."""
+        course_id, base, advanced, _ = course
+        service = service_with(build_course_graph(course_id, [base, advanced], [], version=0))
+        session = AsyncMock()
+
+        with patch(VERSION_PATH, AsyncMock(return_value=0)):
+            graphs = await service.get_graphs_for_concepts(session, [base.id, advanced.id])
+
+        assert set(graphs) == {base.id, advanced.id}
+        session.execute.assert_not_called()
+
+    def test_prerequisites_of(self, course):
+        """Direct prerequisites come with strength and relationship type."""
+        course_id, base, advanced, _ = course
+        graph = build_course_graph(
+            course_id, [base, advanced], [(advanced.id, base.id, 0.9, "required")]
+        )
+
+        prereqs = graph.prerequisites_of(graph.index[advanced.id])
+
+        assert len(prereqs) == 1
+        concept, strength, relationship_type = prereqs[0]
+        assert concept.id == base.id
+        assert strength == pytest.approx(0.9)
+        assert relationship_type == "required"
+
 
 class TestPrerequisiteGraphServiceStatistics:
     """Tests for statistics and metadata methods."""
@@ -514,35 +643,11 @@ class TestPrerequisiteGraphServiceStatistics:
     @pytest.fixture
     def stats_service(self):
         """Create a service with data for statistics."""
-        import time
+        concepts = [make_concept() for _ in range(5)]
+        ids = [c.id for c in concepts]
+        edges = [(ids[i + 1], ids[i], 1.0, "required") for i in range(3)]
 
-        import networkx as nx
-
-        service = PrerequisiteGraphService()
-        service.graph = nx.DiGraph()
-
-        # Add some nodes and edges
-        ids = [uuid4() for _ in range(5)]
-        for cid in ids:
-            service.graph.add_node(cid)
-            service.concepts[cid] = CachedConcept(
-                id=cid,
-                name="Test",
-                knowledge_area_id="KA1",
-                difficulty_estimate=0.5,
-                prerequisite_depth=0,
-            )
-
-        # Add edges
-        service.graph.add_edge(ids[0], ids[1])
-        service.graph.add_edge(ids[1], ids[2])
-        service.graph.add_edge(ids[2], ids[3])
-
-        service.concept_count = 5
-        service.edge_count = 3
-        service.root_concepts = {ids[0], ids[4]}
-        service.course_ids = {uuid4()}
-        service.loaded_at = time.time()
+        service = service_with(build_course_graph(uuid4(), concepts, edges))
         service.load_time_ms = 150.0
 
         return service
@@ -566,21 +671,19 @@ class TestPrerequisiteGraphServiceStatistics:
         assert stats["loaded"] is False
         assert stats["concept_count"] == 0
         assert stats["edge_count"] == 0
+        assert stats["memory_bytes"] == 0
 
-    def test_estimate_memory(self, stats_service):
-        """Test _estimate_memory returns positive value."""
-        memory_kb = stats_service._estimate_memory()
-
-        assert memory_kb > 0
-        assert isinstance(memory_kb, float)
-
-    def test_estimate_memory_no_graph(self):
-        """Test _estimate_memory with no graph."""
-        service = PrerequisiteGraphService()
-        memory_kb = service._estimate_memory()
+    def test_memory_footprint(self, stats_service):
+        """Test the memory footprint covers the arrays and closure matrix."""
+        stats = stats_service.get_statistics()
+        course = next(iter(stats["courses"].values()))
+        graph = next(iter(stats_service.graphs.values()))
 
-        # Should still return something for the empty dicts
-        assert memory_kb >= 0
+        assert course["closure"] is True
+        assert graph.ancestor_bits.shape == (5, 1)
+        assert 0 < course["array_bytes"] < course["memory_bytes"]
+        assert stats["memory_bytes"] == course["memory_bytes"]
+        assert isinstance(stats["memory_estimate_kb"], float)
 
 
 class TestHelperFunctions:
@@ -603,14 +706,7 @@ class TestHelperFunctions:
     @pytest.mark.asyncio
     async def test_load_prerequisite_graph(self):
         """Test load_prerequisite_graph loads data."""
-        mock_session = AsyncMock()
-
-        concept_result = MagicMock()
-        concept_result.scalars.return_value.all.return_value = []
-
-        mock_session.execute = AsyncMock(return_value=concept_result)
-
-        await load_prerequisite_graph(mock_session)
+        await load_prerequisite_graph(mock_session_with_rows([]))
 
         service = await PrerequisiteGraphService.get_instance()
         assert service.is_loaded() is True
@@ -618,12 +714,7 @@ class TestHelperFunctions:
     @pytest.mark.asyncio
     async def test_refresh_prerequisite_graph(self):
         """Test refresh_prerequisite_graph reloads data."""
-        mock_session = AsyncMock()
-
-        concept_result = MagicMock()
-        concept_result.scalars.return_value.all.return_value = []
-
-        mock_session.execute = AsyncMock(return_value=concept_result)
+        mock_session = mock_session_with_rows([])
 
         # Load initial
         await load_prerequisite_graph(mock_session)
@@ -0,0 +1,149 @@
+"""
+Unit tests for the quiz hot path benchmark suite.
+Runs a tiny synthetic course end to end on in-memory SQLite.
+"""
+from dataclasses import replace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import text
+
+from benchmarks.instrumentation import HotPathRecorder
+from benchmarks.quiz_hot_path import BenchmarkConfig, _create_engine, run_benchmark
+from benchmarks.synthetic_course import (
+    BKTParameters,
+    SimulatedLearner,
+    SyntheticCourseSpec,
+    generate_course,
+)
+from src.config import settings
+
+TINY_COURSE = SyntheticCourseSpec(questions=40, concepts=12, knowledge_areas=3)
+
+
+class TestGenerateCourse:
+    """Tests for synthetic course generation."""
+
+    def test_generation_is_deterministic(self):
+        """Same spec produces the same course."""
+        first = generate_course(TINY_COURSE)
+        second = generate_course(TINY_COURSE)
+
+        assert first.course_id == second.course_id
+        assert first.concept_ids == second.concept_ids
+        assert first.prerequisites == second.prerequisites
+        assert [q.id for q in first.questions] == [q.id for q in second.questions]
+
+    def test_prerequisites_form_a_dag(self):
+        """Prerequisites always point to earlier concepts."""
+        course = generate_course(SyntheticCourseSpec(questions=10, concepts=200, prerequisite_density=3.0))
+
+        assert course.prerequisites
+        assert all(prereq < concept for concept, prereq in course.prerequisites)
+
+    def test_questions_test_concepts_of_their_knowledge_area(self):
+        """Question concepts belong to the question's knowledge area."""
+        course = generate_course(TINY_COURSE)
+
+        for question in course.questions:
+            assert 1 <= len(question.concept_indices) <= TINY_COURSE.max_concepts_per_question
+            for index in question.concept_indices:
+                assert course.concept_knowledge_areas[index] == question.knowledge_area_id
+
+
+class TestSimulatedLearner:
+    """Tests for BKT ground-truth learners."""
+
+    def test_mastered_learner_answers_correctly_unless_slipping(self):
+        """A learner who mastered everything is correct on a zero-slip question."""
+        course = generate_course(TINY_COURSE)
+        learner = SimulatedLearner(course, BKTParameters(p_init=1.0), seed=1)
+        question = replace(course.questions[0], slip_rate=0.0)
+        course.questions_by_id[question.id] = question
+
+        option, is_correct = learner.answer(question.id)
+
+        assert is_correct is True
+        assert option == question.correct_answer
+
+
+class TestHotPathRecorder:
+    """Tests for per-stage recording."""
+
+    async def test_counts_queries_per_nested_stage(self):
+        """Queries count toward every enclosing stage."""
+        engine = await _create_engine("sqlite+aiosqlite://")
+        recorder = HotPathRecorder(engine)
+        try:
+            with recorder:
+                async with engine.connect() as conn:
+                    with recorder.stage("outer"):
+                        await conn.execute(text("SELECT 1"))
+                        with recorder.stage("inner"):
+                            await conn.execute(text("SELECT 2"))
+        finally:
+            await engine.dispose()
+
+        summary = recorder.summary()
+        assert summary["outer"]["max_queries"] == 2
+        assert summary["inner"]["max_queries"] == 1
+        assert "max_peak_kib" in summary["inner"]
+
+
+class TestRunBenchmark:
+    """End-to-end benchmark runs."""
+
+    @pytest.mark.parametrize("selector", ["bkt", "adaptive"])
+    async def test_records_every_hot_path_stage(self, selector):
+        """A run answers every question and reports each stage."""
+        config = BenchmarkConfig(
+            course=TINY_COURSE,
+            learners=1,
+            sessions_per_learner=1,
+            questions_per_session=10,
+            selector=selector,
+            trace_allocations=False,
+        )
+
+        report = await run_benchmark(config)
+
+        assert report.answers == 10
+        for stage in ("load_beliefs", "select", "update_beliefs", "submit_answer", "commit"):
+            assert report.stages[stage]["count"] == 10
+        assert report.stages["load_question_pool"]["count"] == 1
+        assert "submit_answer" in report.format_table()
+
+    async def test_restores_settings(self):
+        """Settings overridden for the run are restored afterwards."""
+        before = (settings.BELIEF_SNAPSHOT_ENABLED, settings.READING_QUEUE_ENABLED)
+
+        await run_benchmark(
+            BenchmarkConfig(course=TINY_COURSE, learners=1, sessions_per_learner=1, trace_allocations=False)
+        )
+
+        assert (settings.BELIEF_SNAPSHOT_ENABLED, settings.READING_QUEUE_ENABLED) == before
+
+    async def test_does_not_use_redis(self):
+        """Cache version counters are served in memory during the run."""
+        content_redis = AsyncMock(side_effect=ConnectionError("no redis"))
+        belief_redis = AsyncMock(side_effect=ConnectionError("no redis"))
+
+        with patch("src.utils.content_version.get_redis", content_redis), \
+                patch("src.utils.belief_version.get_redis", belief_redis):
+            await run_benchmark(
+                BenchmarkConfig(
+                    course=TINY_COURSE,
+                    learners=1,
+                    sessions_per_learner=1,
+                    selector="adaptive",
+                    trace_allocations=False,
+                )
+            )
+
+        content_redis.assert_not_awaited()
+        belief_redis.assert_not_awaited()
+
+    async def test_rejects_unknown_selector(self):
+        """Unknown selectors raise ValueError."""
+        with pytest.raises(ValueError):
+            await run_benchmark(BenchmarkConfig(course=TINY_COURSE, selector="random"))
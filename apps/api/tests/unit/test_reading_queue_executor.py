@@ -0,0 +1,197 @@
+"""
+Unit tests for the in-process reading queue executor.
+Tests job execution, coalescing, backpressure and graceful drain.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.tasks import reading_queue_executor
+from src.tasks.reading_queue_executor import (
+    ReadingQueueExecutor,
+    get_reading_queue_executor,
+    shutdown_reading_queue_executor,
+)
+
+POPULATE_PATH = "src.services.reading_queue_service.populate_reading_queue_async"
+
+
+def make_job(enrollment_id=None, question_id=None, is_correct=False):
+    """Helper to create submit() arguments."""
+    return {
+        "user_id": str(uuid4()),
+        "enrollment_id": enrollment_id or str(uuid4()),
+        "question_id": question_id or str(uuid4()),
+        "session_id": str(uuid4()),
+        "is_correct": is_correct,
+        "difficulty": 0.5,
+    }
+
+
+@pytest.fixture(autouse=True)
+def shared_clients():
+    """Avoid creating a real EmbeddingService."""
+    with patch.object(ReadingQueueExecutor, "embedding_service", new=MagicMock()):
+        yield
+
+
+@pytest.fixture
+def gate():
+    """Populate mock that blocks until the gate is opened."""
+    opened = asyncio.Event()
+    calls = []
+
+    async def populate(**kwargs):
+        calls.append(kwargs)
+        await opened.wait()
+        return {"chunks_added": 1, "status": "success"}
+
+    with patch(POPULATE_PATH, populate):
+        yield opened, calls
+
+
+class TestReadingQueueExecutor:
+    """Tests for job handling."""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_with_executor_resources(self):
+        """Jobs run in the background with the executor's session factory."""
+        populate = AsyncMock(return_value={"chunks_added": 2, "status": "success"})
+        executor = ReadingQueueExecutor(concurrency=1, max_pending=10, pool_size=1)
+
+        with patch(POPULATE_PATH, populate):
+            assert executor.submit(**make_job()) is True
+            populate.assert_not_awaited()
+
+            await executor.shutdown(timeout=5)
+
+        populate.assert_awaited_once()
+        assert populate.await_args.kwargs["session_factory"] is executor.session_factory
+        assert executor.stats.count == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesces_pending_jobs_for_same_question(self, gate):
+        """A pending job for the same enrollment and question runs once, with the latest answer."""
+        opened, calls = gate
+        executor = ReadingQueueExecutor(concurrency=1, max_pending=10, pool_size=1)
+
+        executor.submit(**make_job())  # Occupies the only worker
+        await asyncio.sleep(0)
+        enrollment_id, question_id = str(uuid4()), str(uuid4())
+        executor.submit(**make_job(enrollment_id, question_id, is_correct=False))
+        executor.submit(**make_job(enrollment_id, question_id, is_correct=True))
+
+        assert executor.pending_count == 1
+        assert executor.coalesced == 1
+
+        opened.set()
+        await executor.shutdown(timeout=5)
+
+        assert len(calls) == 2
+        assert calls[1]["question_id"] == question_id
+        assert calls[1]["is_correct"] is True
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self, gate):
+        """With the oldest policy a full queue drops the longest-waiting job."""
+        opened, calls = gate
+        executor = ReadingQueueExecutor(
+            concurrency=1, max_pending=2, drop_policy="oldest", pool_size=1
+        )
+
+        executor.submit(**make_job())  # Occupies the only worker
+        await asyncio.sleep(0)
+        jobs = [make_job() for _ in range(3)]
+        results = [executor.submit(**job) for job in jobs]
+
+        assert results == [True, True, True]
+        assert executor.dropped == 1
+
+        opened.set()
+        await executor.shutdown(timeout=5)
+
+        ran = {call["question_id"] for call in calls[1:]}
+        assert ran == {jobs[1]["question_id"], jobs[2]["question_id"]}
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_newest(self, gate):
+        """With the newest policy a full queue rejects the new job."""
+        opened, calls = gate
+        executor = ReadingQueueExecutor(
+            concurrency=1, max_pending=1, drop_policy="newest", pool_size=1
+        )
+
+        executor.submit(**make_job())
+        await asyncio.sleep(0)
+        kept = make_job()
+
+        assert executor.submit(**kept) is True
+        assert executor.submit(**make_job()) is False
+
+        opened.set()
+        await executor.shutdown(timeout=5)
+
+        assert [call["question_id"] for call in calls[1:]] == [kept["question_id"]]
+
+    @pytest.mark.asyncio
+    async def test_failed_job_does_not_stop_worker(self):
+        """A failing job is recorded and the next job still runs."""
+        populate = AsyncMock(side_effect=[RuntimeError("qdrant down"), {"chunks_added": 0}])
+        executor = ReadingQueueExecutor(concurrency=1, max_pending=10, pool_size=1)
+
+        with patch(POPULATE_PATH, populate):
+            executor.submit(**make_job())
+            executor.submit(**make_job())
+            await executor.shutdown(timeout=5)
+
+        assert populate.await_count == 2
+        assert executor.stats.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_shutdown_abandons_jobs_after_timeout(self, gate):
+        """Jobs still running at the drain timeout are cancelled."""
+        _, calls = gate
+        executor = ReadingQueueExecutor(concurrency=1, max_pending=10, pool_size=1)
+        executor.submit(**make_job())
+        executor.submit(**make_job())
+
+        await executor.shutdown(timeout=0.05)
+
+        assert len(calls) == 1
+        assert executor.closed is True
+        assert executor.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_executor_rejects_jobs(self):
+        """No jobs are accepted after shutdown."""
+        executor = ReadingQueueExecutor(concurrency=1, max_pending=10, pool_size=1)
+        await executor.shutdown()
+
+        assert executor.submit(**make_job()) is False
+        assert executor.started is False
+
+    def test_unknown_drop_policy_raises(self):
+        """Only the oldest and newest policies are supported."""
+        with pytest.raises(ValueError, match="drop policy"):
+            ReadingQueueExecutor(drop_policy="random")
+
+
+class TestProcessExecutor:
+    """Tests for the process-wide accessor."""
+
+    @pytest.mark.asyncio
+    async def test_get_returns_same_instance(self):
+        """The executor is created once per process."""
+        assert get_reading_queue_executor() is get_reading_queue_executor()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_resets_instance(self):
+        """A new executor is created after shutdown."""
+        first = get_reading_queue_executor()
+        await shutdown_reading_queue_executor()
+
+        assert first.closed is True
+        assert reading_queue_executor._executor is None
+        assert get_reading_queue_executor() is not first
@@ -0,0 +1,149 @@
+"""
+Unit tests for the Celery worker async runtime.
+Tests loop reuse, per-task statistics, lifecycle and reading queue task integration.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.tasks import worker_runtime
+from src.tasks.reading_queue_tasks import TASK_NAME, add_reading_to_queue
+from src.tasks.worker_runtime import (
+    WorkerRuntime,
+    get_worker_runtime,
+    shutdown_worker_runtime,
+)
+
+
+@pytest.fixture
+def runtime():
+    """Create a started WorkerRuntime and shut it down after the test."""
+    rt = WorkerRuntime(pool_size=1).start()
+    with patch("src.db.qdrant_client.close_qdrant", AsyncMock()):
+        yield rt
+        rt.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_process_runtime():
+    """Ensure no process runtime leaks between tests."""
+    yield
+    with patch("src.db.qdrant_client.close_qdrant", AsyncMock()):
+        shutdown_worker_runtime()
+
+
+class TestWorkerRuntime:
+    """Tests for the per-process runtime."""
+
+    def test_runs_coroutines_on_one_persistent_loop(self, runtime):
+        """Successive calls share the same event loop."""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+
+        assert first is second is runtime.loop
+
+    def test_propagates_exceptions(self, runtime):
+        """Exceptions raised by the coroutine reach the caller."""
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            runtime.run(fail())
+
+    def test_record_task_groups_by_name(self, runtime):
+        """Latency is tracked per task name."""
+        runtime.record_task("a", 5.0)
+        runtime.record_task("a", 15.0)
+        runtime.record_task("b", 1.0, success=False)
+
+        stats = runtime.get_statistics()["tasks"]
+
+        assert stats["a"]["count"] == 2
+        assert stats["a"]["avg_ms"] == 10.0
+        assert stats["b"]["failures"] == 1
+
+    def test_shutdown_closes_shared_clients(self):
+        """Shutdown closes the embedding client, Qdrant client and engine pool."""
+        rt = WorkerRuntime(pool_size=1).start()
+        embedding_service = AsyncMock()
+        rt._embedding_service = embedding_service
+        close_qdrant = AsyncMock()
+
+        with patch("src.db.qdrant_client.close_qdrant", close_qdrant):
+            rt.shutdown()
+
+        embedding_service.close.assert_awaited_once()
+        close_qdrant.assert_awaited_once()
+        assert rt.closed is True
+        assert rt.loop.is_closed()
+
+    def test_run_after_shutdown_raises(self):
+        """A closed runtime rejects new work."""
+        rt = WorkerRuntime(pool_size=1).start()
+        with patch("src.db.qdrant_client.close_qdrant", AsyncMock()):
+            rt.shutdown()
+
+        async def noop():
+            return None
+
+        with pytest.raises(RuntimeError, match="closed"):
+            rt.run(noop())
+
+
+class TestProcessRuntime:
+    """Tests for the process-wide accessor."""
+
+    def test_get_worker_runtime_returns_same_instance(self):
+        """The runtime is created once per process."""
+        assert get_worker_runtime() is get_worker_runtime()
+
+    def test_shutdown_allows_restart(self):
+        """A new runtime is started after shutdown."""
+        first = get_worker_runtime()
+        with patch("src.db.qdrant_client.close_qdrant", AsyncMock()):
+            shutdown_worker_runtime()
+
+        second = get_worker_runtime()
+
+        assert second is not first
+        assert first.closed is True
+
+    def test_runtime_from_parent_process_is_replaced(self):
+        """A runtime inherited across fork is not reused."""
+        first = get_worker_runtime()
+        first.pid = -1
+
+        second = get_worker_runtime()
+
+        assert second is not first
+        assert worker_runtime._runtime is second
+        first.pid = second.pid
+        with patch("src.db.qdrant_client.close_qdrant", AsyncMock()):
+            first.shutdown()
+
+
+class TestReadingQueueTaskRuntime:
+    """Tests for add_reading_to_queue on the worker runtime."""
+
+    def test_task_uses_runtime_resources(self, runtime):
+        """The task passes the runtime's session factory and records latency."""
+        populate = AsyncMock(return_value={"chunks_added": 2, "status": "success"})
+
+        with patch(
+            "src.tasks.reading_queue_tasks.get_worker_runtime", return_value=runtime
+        ), patch(
+            "src.services.reading_queue_service.populate_reading_queue_async", populate
+        ), patch.object(WorkerRuntime, "embedding_service", new=AsyncMock()):
+            result = add_reading_to_queue.run(
+                str(uuid4()), str(uuid4()), str(uuid4()), str(uuid4()), False, 0.5
+            )
+
+        assert result["status"] == "success"
+        assert result["chunks_added"] == 2
+        assert populate.await_args.kwargs["session_factory"] is runtime.session_factory
+        assert runtime.task_stats[TASK_NAME].count == 1
@@ -1,10 +1,18 @@
 """
 Unit tests for BKT mathematical utilities.
 Story 3.4.1: Tests for calculate_alpha_beta prior calculation function.
+Also covers the vectorized entropy and information gain helpers.
 """
+import numpy as np
 import pytest
 
-from src.utils.bkt_math import calculate_alpha_beta, DEFAULT_PSEUDO_OBSERVATIONS
+from src.utils.bkt_math import (
+    DEFAULT_PSEUDO_OBSERVATIONS,
+    beta_entropy,
+    beta_entropy_batch,
+    calculate_alpha_beta,
+    expected_info_gain_batch,
+)
 
 
 class TestCalculateAlphaBeta:
@@ -93,3 +101,70 @@ class TestCalculateAlphaBeta:
         # beta = max(0.01 * 10, 0.1) = 0.1 (hits minimum)
         assert abs(alpha - 9.9) < 0.001
         assert abs(beta - 0.1) < 0.001  # Float precision tolerance
+
+
+class TestBetaEntropyBatch:
+    """Tests for beta_entropy_batch function."""
+
+    def test_matches_scalar_entropy(self):
+        """Element-wise result should match beta_entropy."""
+        alpha = np.array([[1.0, 2.5], [10.0, 0.5]])
+        beta = np.array([[1.0, 7.0], [3.0, 40.0]])
+
+        result = beta_entropy_batch(alpha, beta)
+
+        assert result.shape == (2, 2)
+        for i in range(2):
+            for j in range(2):
+                assert result[i, j] == pytest.approx(beta_entropy(alpha[i, j], beta[i, j]))
+
+    def test_uniform_padding_has_zero_entropy(self):
+        """Beta(1,1) padding contributes zero entropy."""
+        assert beta_entropy_batch(np.ones(3), np.ones(3)) == pytest.approx(np.zeros(3))
+
+
+class TestExpectedInfoGainBatch:
+    """Tests for expected_info_gain_batch function."""
+
+    def test_rows_without_beliefs_have_zero_gain(self):
+        """Fully masked rows should score 0.0."""
+        alpha = np.array([[2.0], [1.0]])
+        beta = np.array([[2.0], [1.0]])
+        mask = np.array([[True], [False]])
+
+        gains = expected_info_gain_batch(
+            alpha, beta, mask, slip=np.array([0.1, 0.1]), guess=np.array([0.25, 0.25])
+        )
+
+        assert gains[0] > 0
+        assert gains[1] == 0.0
+
+    def test_padding_does_not_change_gain(self):
+        """Extra masked columns should not affect a row's gain."""
+        slip = np.array([0.1])
+        guess = np.array([0.25])
+
+        narrow = expected_info_gain_batch(
+            np.array([[3.0]]), np.array([[5.0]]), np.array([[True]]), slip, guess
+        )
+        padded = expected_info_gain_batch(
+            np.array([[3.0, 1.0, 1.0]]),
+            np.array([[5.0, 1.0, 1.0]]),
+            np.array([[True, False, False]]),
+            slip,
+            guess,
+        )
+
+        assert padded[0] == pytest.approx(narrow[0])
+
+    def test_uncertain_beliefs_have_higher_gain(self):
+        """Less concentrated beliefs should yield more information."""
+        alpha = np.array([[1.0], [50.0]])
+        beta = np.array([[1.0], [50.0]])
+        mask = np.ones((2, 1), dtype=bool)
+
+        gains = expected_info_gain_batch(
+            alpha, beta, mask, slip=np.array([0.1, 0.1]), guess=np.array([0.25, 0.25])
+        )
+
+        assert gains[0] > gains[1]
@@ -0,0 +1,27 @@
+"""
+Unit tests for rolling latency statistics.
+"""
+from src.utils.latency_stats import TaskLatencyStats
+
+
+class TestTaskLatencyStats:
+    """Tests for rolling latency statistics."""
+
+    def test_summarizes_samples(self):
+        """Stats report count, failures, average, percentiles and max."""
+        stats = TaskLatencyStats()
+        for duration in (10.0, 20.0, 30.0, 40.0):
+            stats.record(duration)
+        stats.record(100.0, success=False)
+
+        summary = stats.to_dict()
+
+        assert summary["count"] == 5
+        assert summary["failures"] == 1
+        assert summary["avg_ms"] == 40.0
+        assert summary["p50_ms"] == 30.0
+        assert summary["max_ms"] == 100.0
+
+    def test_empty_stats(self):
+        """Empty stats report zeros."""
+        assert TaskLatencyStats().to_dict()["p95_ms"] == 0.0
@@ -0,0 +1,220 @@
+"""
+Unit tests for the sliding window rate limit script and local shadow.
+Runs the Lua script against fakeredis, so no Redis server is needed.
+"""
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+import pytest
+
+from src.utils import rate_limit
+from src.utils.rate_limit import (
+    LocalRateLimitShadow,
+    RateLimit,
+    check_rate_limit,
+    check_rate_limits,
+    get_remaining_attempts,
+    reset_rate_limit,
+)
+
+REDIS_PATH = "src.utils.rate_limit.get_redis"
+TIME_PATH = "src.utils.rate_limit.time.time"
+START = 1_700_000_000.0
+
+
+@pytest.fixture
+def redis():
+    """Fake Redis with Lua support, used by the rate limit module."""
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    with patch(REDIS_PATH, AsyncMock(return_value=client)):
+        yield client
+
+
+@pytest.fixture
+def clock():
+    """Controllable time for the rate limit module."""
+    now = [START]
+    with patch(TIME_PATH, side_effect=lambda: now[0]):
+        yield now
+
+
+@pytest.fixture
+def shadow():
+    """Local shadow sharing half of the headroom for 5 seconds."""
+    rate_limit.reset_local_rate_limits()
+    rate_limit._local_shadow = LocalRateLimitShadow(share=0.5, max_age_seconds=5, max_keys=100)
+    yield rate_limit._local_shadow
+    rate_limit.reset_local_rate_limits()
+
+
+# ============================================================================
+# Sliding window script
+# ============================================================================
+
+class TestSlidingWindow:
+    """Tests for the Lua sliding window check."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_over_threshold(self, redis, clock):
+        """The request after max_attempts is rejected until the oldest expires."""
+        for _ in range(3):
+            assert await check_rate_limit("rl:a", 3, 60) == (True, 0)
+
+        is_allowed, retry_after = await check_rate_limit("rl:a", 3, 60)
+
+        assert is_allowed is False
+        assert retry_after == 60
+        assert await redis.zcard("rl:a") == 3  # Rejections are not recorded
+
+    @pytest.mark.asyncio
+    async def test_window_slides(self, redis, clock):
+        """Requests leave the window one by one, not all at a boundary."""
+        await check_rate_limit("rl:b", 2, 60)
+        clock[0] += 30
+        await check_rate_limit("rl:b", 2, 60)
+
+        clock[0] += 20  # 50s: both still in the window
+        is_allowed, retry_after = await check_rate_limit("rl:b", 2, 60)
+        assert is_allowed is False
+        assert retry_after == 10
+
+        clock[0] += 11  # 61s: the first request has expired
+        assert await check_rate_limit("rl:b", 2, 60) == (True, 0)
+        assert await check_rate_limit("rl:b", 2, 60) == (False, 29)
+
+    @pytest.mark.asyncio
+    async def test_sets_key_expiry(self, redis, clock):
+        """Keys expire with the window."""
+        await check_rate_limit("rl:c", 5, 60)
+
+        assert 0 < await redis.pttl("rl:c") <= 60_000
+
+    @pytest.mark.asyncio
+    async def test_replaces_fixed_window_counter(self, redis, clock):
+        """A counter left by the previous fixed-window limiter is started afresh."""
+        await redis.set("rl:d", "99")
+
+        assert await check_rate_limit("rl:d", 5, 60) == (True, 0)
+        assert await redis.type("rl:d") == "zset"
+
+    @pytest.mark.asyncio
+    async def test_reset_and_remaining(self, redis, clock):
+        """Remaining attempts count requests in the window; reset clears them."""
+        await check_rate_limit("rl:e", 5, 60)
+        await check_rate_limit("rl:e", 5, 60)
+        assert await get_remaining_attempts("rl:e", 5, 60) == 3
+
+        clock[0] += 61
+        assert await get_remaining_attempts("rl:e", 5, 60) == 5
+
+        await reset_rate_limit("rl:e")
+        assert await get_remaining_attempts("rl:e", 5) == 5
+
+
+class TestBatchedKeys:
+    """Tests for multi-key checks."""
+
+    @pytest.mark.asyncio
+    async def test_all_or_nothing(self, redis, clock):
+        """A request blocked by one key is recorded against none."""
+        await check_rate_limit("rl:ip", 1, 60)
+
+        is_allowed, retry_after = await check_rate_limits(
+            [RateLimit("rl:email", 5, 900), RateLimit("rl:ip", 1, 60)]
+        )
+
+        assert is_allowed is False
+        assert retry_after == 60
+        assert await redis.zcard("rl:email") == 0
+
+    @pytest.mark.asyncio
+    async def test_records_every_key(self, redis, clock):
+        """An allowed request is recorded against every key in one call."""
+        result = await check_rate_limits([RateLimit("rl:x", 5, 60), RateLimit("rl:y", 5, 60)])
+
+        assert result == (True, 0)
+        assert await redis.zcard("rl:x") == 1
+        assert await redis.zcard("rl:y") == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_allowed(self):
+        """No limits means nothing to check."""
+        assert await check_rate_limits([]) == (True, 0)
+
+
+# ============================================================================
+# Local shadow
+# ============================================================================
+
+class TestLocalShadow:
+    """Tests for local admission from the Redis headroom."""
+
+    @pytest.mark.asyncio
+    async def test_admits_locally_and_syncs(self, redis, clock, shadow):
+        """Requests within the allowance skip Redis and are recorded on the next sync."""
+        await check_rate_limit("rl:s", 10, 60, local=True)  # count 1: allowance 4
+        assert shadow.entries["rl:s"].allowance == 4
+
+        with patch.object(rate_limit, "_get_script", AsyncMock()) as get_script:
+            for _ in range(4):
+                assert await check_rate_limit("rl:s", 10, 60, local=True) == (True, 0)
+            get_script.assert_not_awaited()
+
+        assert await redis.zcard("rl:s") == 1
+        assert shadow.local_admits == 4
+
+        # Allowance used up: Redis records the 4 local admissions plus this request
+        assert await check_rate_limit("rl:s", 10, 60, local=True) == (True, 0)
+        assert await redis.zcard("rl:s") == 6
+        assert shadow.entries["rl:s"].unsynced == 0
+
+    @pytest.mark.asyncio
+    async def test_allowance_expires(self, redis, clock, shadow):
+        """An old allowance is not used; Redis decides again."""
+        await check_rate_limit("rl:t", 10, 60, local=True)
+        clock[0] += 6
+
+        await check_rate_limit("rl:t", 10, 60, local=True)
+
+        assert shadow.local_admits == 0
+        assert await redis.zcard("rl:t") == 2
+
+    @pytest.mark.asyncio
+    async def test_remembers_rejections(self, redis, clock, shadow):
+        """A rejected key is rejected locally until its retry time."""
+        await check_rate_limit("rl:u", 1, 60, local=True)
+        assert (await check_rate_limit("rl:u", 1, 60, local=True))[0] is False
+
+        clock[0] += 10
+        with patch.object(rate_limit, "_get_script", AsyncMock()) as get_script:
+            assert await check_rate_limit("rl:u", 1, 60, local=True) == (False, 50)
+            get_script.assert_not_awaited()
+
+        await reset_rate_limit("rl:u")
+        assert await check_rate_limit("rl:u", 1, 60, local=True) == (True, 0)
+
+    @pytest.mark.asyncio
+    async def test_small_limits_always_use_redis(self, redis, clock, shadow):
+        """A headroom share below one request grants no local allowance."""
+        await check_rate_limit("rl:v", 2, 60, local=True)
+
+        assert shadow.entries["rl:v"].allowance == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_keeps_local_admissions(self, clock, shadow):
+        """Local admissions are retried on the next sync if Redis fails."""
+        shadow.entries["rl:w"] = rate_limit._ShadowEntry(unsynced=3)
+
+        with patch(REDIS_PATH, AsyncMock(side_effect=ConnectionError("down"))):
+            with pytest.raises(ConnectionError):
+                await check_rate_limit("rl:w", 10, 60, local=True)
+
+        assert shadow.entries["rl:w"].unsynced == 3
+
+    def test_evicts_least_recently_used_keys(self):
+        """Only max_keys entries are kept."""
+        shadow = LocalRateLimitShadow(share=0.5, max_age_seconds=5, max_keys=2)
+        for key in ("a", "b", "c"):
+            shadow.record(RateLimit(key, 10, 60), True, 1, 0, START)
+
+        assert list(shadow.entries) == ["b", "c"]
@@ -42,6 +42,7 @@ class EmbeddingRequest(BaseModel):
     input: Union[str, List[str]]
     model: str = "text-embedding-3-large"
     encoding_format: str = "float"
+    dimensions: Optional[int] = None
 
 
 class EmbeddingData(BaseModel):
@@ -228,7 +229,7 @@ async def create_embeddings(request: EmbeddingRequest):
     # Generate embeddings
     embeddings_data = []
     for idx, text in enumerate(inputs):
-        embedding = generate_deterministic_embedding(text, dimensions=3072)
+        embedding = generate_deterministic_embedding(text, dimensions=request.dimensions or 3072)
         embeddings_data.append(
             EmbeddingData(
                 embedding=embedding,
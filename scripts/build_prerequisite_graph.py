@@ -9,23 +9,33 @@ Constructs concept prerequisite relationships using:
 
 Validates DAG structure, computes depths, exports graph, and stores in PostgreSQL.
 
+With --incremental, the result of the previous build (concept fingerprints,
+edges by source, depths and embeddings) is loaded from the output directory
+and only concepts whose fingerprint changed are re-inferred. The database is
+updated with an edge diff and depths are recomputed for the affected
+downstream subgraph only.
+
 Usage:
     python scripts/build_prerequisite_graph.py --course-id <UUID>
     python scripts/build_prerequisite_graph.py --course-id <UUID> --skip-gpt4
     python scripts/build_prerequisite_graph.py --course-id <UUID> --dry-run
+    python scripts/build_prerequisite_graph.py --course-id <UUID> --similarity-top-k 20
+    python scripts/build_prerequisite_graph.py --course-id <UUID> --incremental
 """
 import argparse
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
 import networkx as nx
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "apps" / "api"))
@@ -41,6 +51,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Semantic inference thresholds
+SIMILARITY_THRESHOLD = 0.7
+DIFFICULTY_THRESHOLD = 0.1  # Minimum difficulty difference
+
+# Concepts per similarity tile side (a tile holds block_size^2 float64 values)
+SIMILARITY_BLOCK_SIZE = 1024
+
+# Bump when the saved graph state format changes
+GRAPH_STATE_VERSION = 1
+
 
 @dataclass
 class ConceptInfo:
@@ -63,6 +83,345 @@ class PrerequisiteEdge:
     source: str  # 'hierarchy', 'semantic', 'gpt4'
 
 
+def find_similar_pairs(
+    normalized: np.ndarray,
+    threshold: float,
+    block_size: int = SIMILARITY_BLOCK_SIZE,
+    top_k: Optional[int] = None,
+    query_indices: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all pairs of unit vectors with cosine similarity >= threshold.
+
+    Similarities are computed as blocked matrix products, so memory stays
+    bounded by one block_size x block_size tile regardless of the number of
+    vectors. Only pairs above the threshold are kept from each tile.
+
+    Args:
+        normalized: (n, dim) array of L2-normalized vectors
+        threshold: Minimum cosine similarity
+        block_size: Rows/columns per tile
+        top_k: If set, only keep pairs where one vector is among the other's
+            top_k most similar vectors
+        query_indices: If set, only return pairs involving at least one of
+            these vectors (not combinable with top_k)
+
+    Returns:
+        Tuple of (rows, cols, similarities) with rows < cols, sorted by (row, col)
+    """
+    if top_k is not None:
+        if query_indices is not None:
+            raise ValueError("query_indices cannot be combined with top_k")
+        return _find_top_k_pairs(normalized, threshold, block_size, top_k)
+    if query_indices is not None:
+        return _find_query_pairs(normalized, threshold, block_size, query_indices)
+
+    n = normalized.shape[0]
+    row_parts, col_parts, sim_parts = [], [], []
+    for r0 in range(0, n, block_size):
+        r1 = min(r0 + block_size, n)
+        # Upper triangle only: column tiles start at the diagonal tile
+        for c0 in range(r0, n, block_size):
+            c1 = min(c0 + block_size, n)
+            tile = normalized[r0:r1] @ normalized[c0:c1].T
+            mask = tile >= threshold
+            if c0 == r0:
+                mask = np.triu(mask, k=1)
+            local_rows, local_cols = np.nonzero(mask)
+            row_parts.append(local_rows + r0)
+            col_parts.append(local_cols + c0)
+            sim_parts.append(tile[local_rows, local_cols])
+
+    return _sorted_pairs(row_parts, col_parts, sim_parts)
+
+
+def _find_top_k_pairs(
+    normalized: np.ndarray,
+    threshold: float,
+    block_size: int,
+    top_k: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find pairs above threshold among each vector's top_k neighbours."""
+    n = normalized.shape[0]
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return _sorted_pairs([], [], [])
+
+    row_parts, col_parts, sim_parts = [], [], []
+    for r0 in range(0, n, block_size):
+        r1 = min(r0 + block_size, n)
+        best_sims = np.full((r1 - r0, k), -np.inf)
+        best_cols = np.full((r1 - r0, k), -1, dtype=np.int64)
+
+        # Running top-k over column tiles
+        for c0 in range(0, n, block_size):
+            c1 = min(c0 + block_size, n)
+            tile = normalized[r0:r1] @ normalized[c0:c1].T
+            if c0 < r1 and r0 < c1:
+                global_rows = np.arange(r0, r1)[:, None]
+                tile[global_rows == np.arange(c0, c1)[None, :]] = -np.inf
+
+            candidate_sims = np.hstack([best_sims, tile])
+            candidate_cols = np.hstack([
+                best_cols, np.broadcast_to(np.arange(c0, c1), tile.shape)
+            ])
+            top = np.argpartition(-candidate_sims, k - 1, axis=1)[:, :k]
+            best_sims = np.take_along_axis(candidate_sims, top, axis=1)
+            best_cols = np.take_along_axis(candidate_cols, top, axis=1)
+
+        local_rows, slots = np.nonzero(best_sims >= threshold)
+        rows = local_rows + r0
+        cols = best_cols[local_rows, slots]
+        row_parts.append(np.minimum(rows, cols))
+        col_parts.append(np.maximum(rows, cols))
+        sim_parts.append(best_sims[local_rows, slots])
+
+    # A pair appears twice when both vectors are in each other's top-k
+    return _deduplicate_pairs(*_sorted_pairs(row_parts, col_parts, sim_parts))
+
+
+def _find_query_pairs(
+    normalized: np.ndarray,
+    threshold: float,
+    block_size: int,
+    query_indices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find pairs above threshold that involve at least one query vector."""
+    n = normalized.shape[0]
+    query_indices = np.unique(np.asarray(query_indices, dtype=np.int64))
+
+    row_parts, col_parts, sim_parts = [], [], []
+    for q0 in range(0, len(query_indices), block_size):
+        queries = query_indices[q0:q0 + block_size]
+        for c0 in range(0, n, block_size):
+            c1 = min(c0 + block_size, n)
+            tile = normalized[queries] @ normalized[c0:c1].T
+            local_rows, local_cols = np.nonzero(tile >= threshold)
+            rows = queries[local_rows]
+            cols = local_cols + c0
+            not_self = rows != cols
+            rows, cols = rows[not_self], cols[not_self]
+            row_parts.append(np.minimum(rows, cols))
+            col_parts.append(np.maximum(rows, cols))
+            sim_parts.append(tile[local_rows[not_self], local_cols[not_self]])
+
+    return _deduplicate_pairs(*_sorted_pairs(row_parts, col_parts, sim_parts))
+
+
+def _deduplicate_pairs(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    sims: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Drop repeated (row, col) pairs from sorted pairs."""
+    if len(rows):
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        rows, cols, sims = rows[keep], cols[keep], sims[keep]
+    return rows, cols, sims
+
+
+def _sorted_pairs(
+    row_parts: List[np.ndarray],
+    col_parts: List[np.ndarray],
+    sim_parts: List[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate tile results and sort them by (row, col)."""
+    if not row_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    rows = np.concatenate(row_parts).astype(np.int64)
+    cols = np.concatenate(col_parts).astype(np.int64)
+    sims = np.concatenate(sim_parts)
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], sims[order]
+
+
+def concept_text(concept: ConceptInfo) -> str:
+    """Text embedded for semantic inference."""
+    text = f"{concept.name}"
+    if concept.description:
+        text += f": {concept.description}"
+    return text
+
+
+def _sha256(value: object) -> str:
+    return hashlib.sha256(json.dumps(value).encode("utf-8")).hexdigest()
+
+
+def concept_fingerprint(concept: ConceptInfo) -> str:
+    """
+    Fingerprint of every concept field that feeds edge inference.
+
+    Name, description and section drive the hierarchy, embeddings and GPT-4
+    prompts; knowledge area and difficulty decide cross-KA candidates and
+    semantic edge direction.
+    """
+    return _sha256([
+        concept.name,
+        concept.description,
+        concept.corpus_section_ref,
+        concept.knowledge_area_id,
+        concept.difficulty_estimate,
+    ])
+
+
+def text_fingerprint(concept: ConceptInfo) -> str:
+    """Fingerprint of the embedded concept text (embedding cache key)."""
+    return _sha256(concept_text(concept))
+
+
+@dataclass
+class ConceptDelta:
+    """Concepts added, modified and removed since the previous build."""
+    added: Set[UUID] = field(default_factory=set)
+    modified: Set[UUID] = field(default_factory=set)
+    removed: Set[UUID] = field(default_factory=set)
+    unchanged: Set[UUID] = field(default_factory=set)
+
+    @property
+    def changed(self) -> Set[UUID]:
+        """Concepts whose edges must be re-inferred."""
+        return self.added | self.modified
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed)
+
+
+@dataclass
+class EdgeDiff:
+    """Changes needed to turn the stored edges into the new edges."""
+    inserted: List[PrerequisiteEdge] = field(default_factory=list)
+    updated: List[PrerequisiteEdge] = field(default_factory=list)
+    deleted: List[Tuple[UUID, UUID]] = field(default_factory=list)
+
+    @property
+    def affected_concept_ids(self) -> Set[UUID]:
+        """Dependent concepts whose set of prerequisites changed."""
+        return (
+            {edge.concept_id for edge in self.inserted}
+            | {concept_id for concept_id, _ in self.deleted}
+        )
+
+
+def diff_edges(
+    existing: Dict[Tuple[UUID, UUID], Tuple[float, str]],
+    edges: List[PrerequisiteEdge]
+) -> EdgeDiff:
+    """
+    Diff new edges against stored ones.
+
+    Args:
+        existing: (concept_id, prerequisite_concept_id) -> (strength, relationship_type)
+        edges: New deduplicated edges
+
+    Returns:
+        EdgeDiff with edges to insert, update and delete
+    """
+    diff = EdgeDiff()
+    new_keys = set()
+    for edge in edges:
+        key = (edge.concept_id, edge.prerequisite_concept_id)
+        new_keys.add(key)
+        if key not in existing:
+            diff.inserted.append(edge)
+        # Strengths are stored rounded to 2 decimals
+        elif existing[key] != (round(edge.strength, 2), edge.relationship_type):
+            diff.updated.append(edge)
+    diff.deleted = [key for key in existing if key not in new_keys]
+    return diff
+
+
+@dataclass
+class GraphState:
+    """
+    Saved result of a build, the baseline for incremental builds.
+
+    Fingerprints, edges (with their inference source), depths and the
+    concepts already sent to GPT-4 are stored as JSON; concept embeddings are
+    stored next to it as float32 arrays keyed by text fingerprint.
+    """
+    course_id: UUID
+    fingerprints: Dict[UUID, str]
+    edges: List[PrerequisiteEdge]
+    depths: Dict[UUID, int]
+    cross_ka_queried: Set[UUID]
+    embeddings: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @staticmethod
+    def embeddings_path(path: Path) -> Path:
+        return path.with_suffix(".npz")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["GraphState"]:
+        """Load a saved state, or None if missing or in an older format."""
+        if not path.exists():
+            return None
+
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != GRAPH_STATE_VERSION:
+            logger.warning(f"Ignoring graph state {path} (format version {data.get('version')})")
+            return None
+
+        embeddings: Dict[str, np.ndarray] = {}
+        embeddings_path = cls.embeddings_path(path)
+        if embeddings_path.exists():
+            with np.load(embeddings_path) as npz:
+                embeddings = dict(zip(npz["fingerprints"].tolist(), npz["vectors"], strict=True))
+
+        return cls(
+            course_id=UUID(data["course_id"]),
+            fingerprints={UUID(k): v for k, v in data["fingerprints"].items()},
+            edges=[
+                PrerequisiteEdge(
+                    concept_id=UUID(e["concept_id"]),
+                    prerequisite_concept_id=UUID(e["prerequisite_concept_id"]),
+                    strength=e["strength"],
+                    relationship_type=e["relationship_type"],
+                    source=e["source"]
+                )
+                for e in data["edges"]
+            ],
+            depths={UUID(k): v for k, v in data["depths"].items()},
+            cross_ka_queried={UUID(c) for c in data["cross_ka_queried"]},
+            embeddings=embeddings
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the state JSON and its embeddings file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": GRAPH_STATE_VERSION,
+            "course_id": str(self.course_id),
+            "fingerprints": {str(k): v for k, v in self.fingerprints.items()},
+            "edges": [
+                {
+                    "concept_id": str(e.concept_id),
+                    "prerequisite_concept_id": str(e.prerequisite_concept_id),
+                    "strength": e.strength,
+                    "relationship_type": e.relationship_type,
+                    "source": e.source
+                }
+                for e in self.edges
+            ],
+            "depths": {str(k): v for k, v in self.depths.items()},
+            "cross_ka_queried": sorted(str(c) for c in self.cross_ka_queried),
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+        embeddings_path = self.embeddings_path(path)
+        if self.embeddings:
+            np.savez(
+                embeddings_path,
+                fingerprints=np.array(list(self.embeddings.keys())),
+                vectors=np.stack(list(self.embeddings.values())).astype(np.float32)
+            )
+        elif embeddings_path.exists():
+            embeddings_path.unlink()
+
+
 class PrerequisiteGraphBuilder:
     """Builds and validates concept prerequisite graph."""
 
@@ -72,13 +431,18 @@ class PrerequisiteGraphBuilder:
         skip_embeddings: bool = False,
         skip_gpt4: bool = False,
         dry_run: bool = False,
-        output_dir: Optional[str] = None
+        output_dir: Optional[str] = None,
+        similarity_top_k: Optional[int] = None,
+        similarity_block_size: int = SIMILARITY_BLOCK_SIZE
     ):
         self.course_id = course_id
         self.skip_embeddings = skip_embeddings
         self.skip_gpt4 = skip_gpt4
         self.dry_run = dry_run
         self.output_dir = Path(output_dir) if output_dir else Path("scripts/output")
+        self.similarity_top_k = similarity_top_k
+        self.similarity_block_size = similarity_block_size
+        self.state_path = self.output_dir / f"graph_state_{course_id}.json"
 
         self.concepts: List[ConceptInfo] = []
         self.concept_map: Dict[UUID, ConceptInfo] = {}
@@ -86,6 +450,14 @@ class PrerequisiteGraphBuilder:
         self.edges: List[PrerequisiteEdge] = []
         self.graph: Optional[nx.DiGraph] = None
 
+        # Incremental mode (set by start_incremental)
+        self.previous_state: Optional[GraphState] = None
+        self.delta: Optional[ConceptDelta] = None
+
+        # Build outputs recorded in the saved state
+        self.text_embeddings: Dict[str, np.ndarray] = {}
+        self.cross_ka_queried: Set[UUID] = set()
+
     async def load_concepts(self, session: AsyncSession) -> None:
         """Load all concepts for the course from database."""
         from src.models.concept import Concept
@@ -121,6 +493,63 @@ class PrerequisiteGraphBuilder:
         logger.info(f"Loaded {len(self.concepts)} concepts")
         logger.info(f"Sections with concepts: {len(self.section_map)}")
 
+    def load_state(self) -> Optional[GraphState]:
+        """Load the saved state of the previous build of this course, if any."""
+        state = GraphState.load(self.state_path)
+        if state is not None and state.course_id != self.course_id:
+            logger.warning(f"Ignoring graph state {self.state_path} for course {state.course_id}")
+            return None
+        return state
+
+    def start_incremental(self, state: GraphState) -> ConceptDelta:
+        """
+        Compare loaded concepts against a previous build and enable incremental mode.
+
+        In incremental mode, inference reuses the previous build's results for
+        unchanged concepts:
+        - Semantic: embeddings are reused by text fingerprint and only pairs
+          involving a changed concept are recomputed
+        - Cross-KA: only candidates that changed (or whose previous GPT-4
+          prerequisites changed) are sent to GPT-4
+        - Section hierarchy: recomputed in memory (no API calls)
+
+        Returns:
+            ConceptDelta between the previous build and the loaded concepts
+        """
+        current = {c.id: concept_fingerprint(c) for c in self.concepts}
+        previous = state.fingerprints
+
+        delta = ConceptDelta(
+            added={cid for cid in current if cid not in previous},
+            modified={cid for cid, fp in current.items() if cid in previous and previous[cid] != fp},
+            removed={cid for cid in previous if cid not in current},
+        )
+        delta.unchanged = set(current) - delta.changed
+
+        self.previous_state = state
+        self.delta = delta
+        logger.info(
+            f"Incremental build: {len(delta.added)} added, {len(delta.modified)} modified, "
+            f"{len(delta.removed)} removed, {len(delta.unchanged)} unchanged concepts"
+        )
+        return delta
+
+    @property
+    def is_incremental(self) -> bool:
+        return self.delta is not None
+
+    def _carried_edges(self, source: str) -> List[PrerequisiteEdge]:
+        """Previous-build edges of a source between two unchanged concepts."""
+        if not self.is_incremental:
+            return []
+        unchanged = self.delta.unchanged
+        return [
+            e for e in self.previous_state.edges
+            if e.source == source
+            and e.concept_id in unchanged
+            and e.prerequisite_concept_id in unchanged
+        ]
+
     def infer_from_section_hierarchy(self) -> List[PrerequisiteEdge]:
         """
         Infer prerequisites from BABOK section hierarchy.
@@ -173,106 +602,147 @@ class PrerequisiteGraphBuilder:
         Rule: If concept A is similar to B and A has lower difficulty,
         A is a prerequisite of B.
         """
+        # Incremental builds keep previous semantic edges between unchanged
+        # concepts when no new embeddings can be generated
+        fallback = self._carried_edges("semantic")
+
         if self.skip_embeddings:
             logger.info("Skipping embedding-based inference (--skip-embeddings)")
-            return []
+            return fallback
 
         logger.info("Inferring prerequisites from embeddings...")
         edges = []
 
-        try:
-            from openai import OpenAI
-            client = OpenAI()
-        except Exception as e:
-            logger.warning(f"Could not initialize OpenAI client: {e}")
-            logger.warning("Skipping embedding-based inference")
-            return []
-
-        # Generate embeddings for all concepts
-        concept_texts = []
-        for c in self.concepts:
-            text = f"{c.name}"
-            if c.description:
-                text += f": {c.description}"
-            concept_texts.append(text)
-
+        concept_texts = [concept_text(c) for c in self.concepts]
         if not concept_texts:
             return edges
 
-        logger.info(f"Generating embeddings for {len(concept_texts)} concepts...")
-
-        # Batch embeddings (max 100 at a time)
-        embeddings = []
-        batch_size = 100
+        # Reuse embeddings of unchanged texts from the previous build
+        fingerprints = [text_fingerprint(c) for c in self.concepts]
+        cached = self.previous_state.embeddings if self.previous_state else {}
+        embeddings_by_fingerprint = {fp: cached[fp] for fp in fingerprints if fp in cached}
+        missing = [i for i, fp in enumerate(fingerprints) if fp not in embeddings_by_fingerprint]
 
-        for i in range(0, len(concept_texts), batch_size):
-            batch = concept_texts[i:i + batch_size]
+        if missing:
             try:
-                response = client.embeddings.create(
+                from src.services.embedding_service import EmbeddingService
+                service = EmbeddingService(
+                    api_key=os.getenv("OPENAI_API_KEY"),
                     model="text-embedding-3-large",
-                    input=batch
+                    dimensions=3072
                 )
-                for item in response.data:
-                    embeddings.append(item.embedding)
-                logger.info(f"Generated embeddings for batch {i // batch_size + 1}")
             except Exception as e:
-                logger.error(f"Error generating embeddings: {e}")
-                return edges
+                logger.warning(f"Could not initialize OpenAI client: {e}")
+                logger.warning("Skipping embedding-based inference")
+                return fallback
 
-        # Calculate pairwise similarity and infer prerequisites
-        import numpy as np
+            logger.info(f"Generating embeddings for {len(missing)} of {len(concept_texts)} concepts...")
+            try:
+                embeddings = await self._generate_embeddings(service, [concept_texts[i] for i in missing])
+            finally:
+                await service.close()
+            if embeddings is None:
+                return fallback
+            for i, embedding in zip(missing, embeddings, strict=True):
+                embeddings_by_fingerprint[fingerprints[i]] = np.asarray(embedding)
 
-        embeddings_array = np.array(embeddings)
+        self.text_embeddings = embeddings_by_fingerprint
+
+        # Calculate pairwise similarity and infer prerequisites
+        embeddings_array = np.array([embeddings_by_fingerprint[fp] for fp in fingerprints], dtype=float)
         norms = np.linalg.norm(embeddings_array, axis=1, keepdims=True)
         normalized = embeddings_array / norms
 
-        # Find similar pairs
-        similarity_threshold = 0.7
-        difficulty_threshold = 0.1  # Minimum difficulty difference
+        if self.is_incremental and self.similarity_top_k is None:
+            # Pairs of unchanged concepts keep their previous edges
+            changed = np.array(
+                [i for i, c in enumerate(self.concepts) if c.id in self.delta.changed],
+                dtype=np.int64
+            )
+            rows, cols, similarities = find_similar_pairs(
+                normalized,
+                SIMILARITY_THRESHOLD,
+                block_size=self.similarity_block_size,
+                query_indices=changed
+            )
+            edges = fallback
+        else:
+            rows, cols, similarities = find_similar_pairs(
+                normalized,
+                SIMILARITY_THRESHOLD,
+                block_size=self.similarity_block_size,
+                top_k=self.similarity_top_k
+            )
+        logger.info(f"Found {len(rows)} concept pairs with similarity >= {SIMILARITY_THRESHOLD}")
 
-        for i, concept_a in enumerate(self.concepts):
-            for j, concept_b in enumerate(self.concepts):
-                if i >= j:  # Skip self and already-checked pairs
-                    continue
+        edges = edges + self.edges_from_similar_pairs(rows, cols, similarities)
 
-                similarity = float(np.dot(normalized[i], normalized[j]))
+        logger.info(f"Inferred {len(edges)} prerequisites from embeddings")
+        return edges
 
-                if similarity < similarity_threshold:
-                    continue
+    async def _generate_embeddings(self, service, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed texts with the concurrent, rate-limited EmbeddingService engine.
+        Returns None if any batch fails.
+        """
+        def log_progress(completed: int, total: int) -> None:
+            logger.info(f"Generated embeddings for {completed}/{total} concepts")
 
-                # Lower difficulty concept is prerequisite of higher
-                diff_a = concept_a.difficulty_estimate
-                diff_b = concept_b.difficulty_estimate
+        try:
+            embeddings, _ = await service.batch_generate_embeddings(
+                texts, progress_callback=log_progress
+            )
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            return None
 
-                if abs(diff_a - diff_b) < difficulty_threshold:
-                    continue  # Too similar in difficulty
+        return embeddings
 
-                if diff_a < diff_b:
-                    prereq_id = concept_a.id
-                    target_id = concept_b.id
-                else:
-                    prereq_id = concept_b.id
-                    target_id = concept_a.id
-
-                # Determine strength based on similarity
-                if similarity >= 0.9:
-                    strength = 0.9
-                elif similarity >= 0.8:
-                    strength = 0.7
-                else:
-                    strength = 0.5
+    def edges_from_similar_pairs(
+        self,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        similarities: np.ndarray
+    ) -> List[PrerequisiteEdge]:
+        """
+        Turn similar concept pairs into semantic prerequisite edges.
 
-                edge = PrerequisiteEdge(
-                    concept_id=target_id,
-                    prerequisite_concept_id=prereq_id,
-                    strength=strength,
-                    relationship_type="related",
-                    source="semantic"
-                )
-                edges.append(edge)
+        Rule: The lower difficulty concept of a pair is a prerequisite of the
+        higher one; pairs closer than DIFFICULTY_THRESHOLD are skipped. Strength
+        is 0.9 / 0.7 / 0.5 for similarity >= 0.9 / >= 0.8 / otherwise.
 
-        logger.info(f"Inferred {len(edges)} prerequisites from embeddings")
-        return edges
+        Args:
+            rows: Concept indices (into self.concepts) of the first concept
+            cols: Concept indices of the second concept
+            similarities: Cosine similarity of each pair
+        """
+        difficulties = np.array([c.difficulty_estimate for c in self.concepts], dtype=float)
+        diff_a = difficulties[rows]
+        diff_b = difficulties[cols]
+
+        keep = np.abs(diff_a - diff_b) >= DIFFICULTY_THRESHOLD
+        rows, cols, similarities = rows[keep], cols[keep], similarities[keep]
+        a_is_prereq = diff_a[keep] < diff_b[keep]
+
+        prereq_indices = np.where(a_is_prereq, rows, cols)
+        target_indices = np.where(a_is_prereq, cols, rows)
+        strengths = np.select(
+            [similarities >= 0.9, similarities >= 0.8], [0.9, 0.7], default=0.5
+        )
+
+        return [
+            PrerequisiteEdge(
+                concept_id=self.concepts[target].id,
+                prerequisite_concept_id=self.concepts[prereq].id,
+                strength=strength,
+                relationship_type="related",
+                source="semantic"
+            )
+            for target, prereq, strength in zip(
+                target_indices.tolist(), prereq_indices.tolist(), strengths.tolist(),
+                strict=True
+            )
+        ]
 
     async def infer_cross_ka_prerequisites(self) -> List[PrerequisiteEdge]:
         """
@@ -283,7 +753,7 @@ class PrerequisiteGraphBuilder:
         """
         if self.skip_gpt4:
             logger.info("Skipping GPT-4 inference (--skip-gpt4)")
-            return []
+            return self._cross_ka_fallback()
 
         logger.info("Inferring cross-KA prerequisites with GPT-4...")
         edges = []
@@ -293,7 +763,9 @@ class PrerequisiteGraphBuilder:
             client = OpenAI()
         except Exception as e:
             logger.warning(f"Could not initialize OpenAI client: {e}")
-            return edges
+            return self._cross_ka_fallback()
+
+        reusable = self._reusable_cross_ka_results()
 
         # Group concepts by KA
         ka_concepts: Dict[str, List[ConceptInfo]] = {}
@@ -335,6 +807,12 @@ class PrerequisiteGraphBuilder:
 
             # Batch process advanced concepts
             for concept in advanced_concepts[:10]:  # Limit to 10 per KA for efficiency
+                if concept.id in reusable:
+                    # Unchanged since the previous build
+                    edges.extend(reusable[concept.id])
+                    self.cross_ka_queried.add(concept.id)
+                    continue
+
                 prompt = self._build_cross_ka_prompt(concept, other_ka_concepts)
 
                 try:
@@ -373,6 +851,8 @@ class PrerequisiteGraphBuilder:
                         )
                         edges.append(edge)
 
+                    self.cross_ka_queried.add(concept.id)
+
                 except Exception as e:
                     logger.warning(f"GPT-4 error for concept {concept.name}: {e}")
                     continue
@@ -380,6 +860,35 @@ class PrerequisiteGraphBuilder:
         logger.info(f"Inferred {len(edges)} cross-KA prerequisites from GPT-4")
         return edges
 
+    def _reusable_cross_ka_results(self) -> Dict[UUID, List[PrerequisiteEdge]]:
+        """
+        GPT-4 results of the previous build that are still valid.
+
+        A concept's result is reused when it was queried before, is unchanged,
+        and all prerequisites GPT-4 returned for it are unchanged.
+        """
+        if not self.is_incremental:
+            return {}
+
+        unchanged = self.delta.unchanged
+        edges_by_target: Dict[UUID, List[PrerequisiteEdge]] = {}
+        for edge in self.previous_state.edges:
+            if edge.source == "gpt4":
+                edges_by_target.setdefault(edge.concept_id, []).append(edge)
+
+        return {
+            target: edges_by_target.get(target, [])
+            for target in self.previous_state.cross_ka_queried & unchanged
+            if all(e.prerequisite_concept_id in unchanged for e in edges_by_target.get(target, []))
+        }
+
+    def _cross_ka_fallback(self) -> List[PrerequisiteEdge]:
+        """Previous GPT-4 edges to keep when GPT-4 is not called in an incremental build."""
+        if not self.is_incremental:
+            return []
+        self.cross_ka_queried = self.previous_state.cross_ka_queried & self.delta.unchanged
+        return self._carried_edges("gpt4")
+
     def _build_cross_ka_prompt(
         self,
         concept: ConceptInfo,
@@ -578,6 +1087,52 @@ Rules:
 
         return depths
 
+    def compute_incremental_depths(self, edge_diff: EdgeDiff) -> Dict[UUID, int]:
+        """
+        Recompute prerequisite depths downstream of changed edges only.
+
+        A concept's depth is 0 without prerequisites and otherwise one more
+        than its shallowest prerequisite, which matches the BFS from roots in
+        compute_prerequisite_depths. New concepts and dependents of inserted
+        or deleted edges are recomputed together with their descendants, in
+        topological order; all other depths come from the previous build.
+
+        Args:
+            edge_diff: Diff applied to the stored edges
+
+        Returns:
+            Depth of every concept
+        """
+        if self.graph is None:
+            raise ValueError("Graph not built. Call validate_dag() first.")
+
+        previous_keys = {(e.concept_id, e.prerequisite_concept_id) for e in self.previous_state.edges}
+        new_keys = {(e.concept_id, e.prerequisite_concept_id) for e in self.edges}
+        seeds = (
+            self.delta.added
+            | edge_diff.affected_concept_ids
+            | {concept_id for concept_id, _ in previous_keys ^ new_keys}
+        )
+
+        affected: Set[UUID] = set()
+        for seed in seeds:
+            if seed in self.graph and seed not in affected:
+                affected.add(seed)
+                affected |= nx.descendants(self.graph, seed)
+
+        logger.info(f"Recomputing depths for {len(affected)} of {self.graph.number_of_nodes()} concepts...")
+
+        depths: Dict[UUID, int] = {
+            node: self.previous_state.depths.get(node, 0)
+            for node in self.graph.nodes()
+            if node not in affected
+        }
+        for node in nx.topological_sort(self.graph.subgraph(affected)):
+            prereq_depths = [depths[p] for p in self.graph.predecessors(node)]
+            depths[node] = 1 + min(prereq_depths) if prereq_depths else 0
+
+        return depths
+
     def compute_graph_statistics(self) -> Dict:
         """Compute comprehensive graph statistics."""
         logger.info("Computing graph statistics...")
@@ -723,6 +1278,47 @@ Rules:
 
         return created
 
+    async def store_edge_diff(self, session: AsyncSession) -> EdgeDiff:
+        """
+        Update stored prerequisites to match the new edges with minimal writes.
+
+        Returns:
+            EdgeDiff between the stored and new edges (computed in dry runs too)
+        """
+        from src.repositories.concept_repository import ConceptRepository
+        from src.schemas.concept_prerequisite import PrerequisiteCreate, RelationshipType
+
+        repo = ConceptRepository(session)
+
+        stored = await repo.get_all_prerequisites_for_course(self.course_id)
+        existing = {
+            (p.concept_id, p.prerequisite_concept_id): (p.strength, p.relationship_type)
+            for p in stored
+        }
+        diff = diff_edges(existing, self.edges)
+        logger.info(
+            f"Edge diff: {len(diff.inserted)} to insert, {len(diff.updated)} to update, "
+            f"{len(diff.deleted)} to delete ({len(existing)} stored)"
+        )
+
+        if self.dry_run:
+            logger.info("Dry run - skipping database writes")
+            return diff
+
+        def to_schema(edge: PrerequisiteEdge) -> PrerequisiteCreate:
+            return PrerequisiteCreate(
+                concept_id=edge.concept_id,
+                prerequisite_concept_id=edge.prerequisite_concept_id,
+                strength=edge.strength,
+                relationship_type=RelationshipType(edge.relationship_type)
+            )
+
+        await repo.delete_prerequisites(diff.deleted)
+        await repo.update_prerequisites([to_schema(e) for e in diff.updated])
+        await repo.bulk_add_prerequisites([to_schema(e) for e in diff.inserted])
+
+        return diff
+
     async def update_concept_depths(
         self,
         session: AsyncSession,
@@ -741,6 +1337,28 @@ Rules:
 
         return updated
 
+    def save_state(self, depths: Dict[UUID, int]) -> Path:
+        """Save this build as the baseline for the next incremental build."""
+        fingerprints = {text_fingerprint(c) for c in self.concepts}
+        embeddings = self.previous_state.embeddings if self.previous_state else {}
+        embeddings = {
+            fp: vector
+            for fp, vector in {**embeddings, **self.text_embeddings}.items()
+            if fp in fingerprints
+        }
+
+        GraphState(
+            course_id=self.course_id,
+            fingerprints={c.id: concept_fingerprint(c) for c in self.concepts},
+            edges=self.edges,
+            depths=depths,
+            cross_ka_queried=self.cross_ka_queried,
+            embeddings=embeddings
+        ).save(self.state_path)
+
+        logger.info(f"Saved graph state to {self.state_path}")
+        return self.state_path
+
 
 async def main():
     """Main orchestrator for prerequisite graph construction."""
@@ -779,6 +1397,17 @@ async def main():
         action="store_true",
         help="Automatically remove cycles instead of failing"
     )
+    parser.add_argument(
+        "--similarity-top-k",
+        type=int,
+        default=None,
+        help="Only consider each concept's K most similar concepts for semantic inference"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-infer concepts changed since the last build (full build if no saved state)"
+    )
 
     args = parser.parse_args()
 
@@ -802,7 +1431,8 @@ async def main():
         skip_embeddings=args.skip_embeddings,
         skip_gpt4=args.skip_gpt4,
         dry_run=args.dry_run,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        similarity_top_k=args.similarity_top_k
     )
 
     async with async_session() as session:
@@ -814,6 +1444,13 @@ async def main():
                 logger.error("No concepts found for this course")
                 sys.exit(1)
 
+            if args.incremental:
+                previous_state = builder.load_state()
+                if previous_state is None:
+                    logger.info("No saved graph state for this course - running a full build")
+                else:
+                    builder.start_incremental(previous_state)
+
             # 2-4. Infer prerequisites from multiple sources
             hierarchy_edges = builder.infer_from_section_hierarchy()
             semantic_edges = await builder.infer_from_embeddings()
@@ -833,14 +1470,27 @@ async def main():
                     logger.error("Graph contains cycles. Use --remove-cycles to auto-fix.")
                     sys.exit(1)
 
-            # 7. Compute depths
-            depths = builder.compute_prerequisite_depths()
+            if builder.is_incremental:
+                # 7-8. Apply the edge diff and recompute affected depths
+                edge_diff = await builder.store_edge_diff(session)
+                depths = builder.compute_incremental_depths(edge_diff)
+
+                # 9. Update changed concept depths
+                previous_depths = builder.previous_state.depths
+                await builder.update_concept_depths(session, {
+                    concept_id: depth
+                    for concept_id, depth in depths.items()
+                    if previous_depths.get(concept_id) != depth
+                })
+            else:
+                # 7. Compute depths
+                depths = builder.compute_prerequisite_depths()
 
-            # 8. Store in database
-            await builder.store_in_database(session)
+                # 8. Store in database
+                await builder.store_in_database(session)
 
-            # 9. Update concept depths
-            await builder.update_concept_depths(session, depths)
+                # 9. Update concept depths
+                await builder.update_concept_depths(session, depths)
 
             # 10. Export graphs
             builder.export_to_graphml()
@@ -882,6 +1532,13 @@ async def main():
                 await session.commit()
                 logger.info("Changes committed to database")
 
+                # Running API workers reload the course graph on next use
+                from src.utils.content_version import bump_prerequisite_graph_version
+                await bump_prerequisite_graph_version(course_id)
+
+                # Baseline for the next --incremental run
+                builder.save_state(depths)
+
             logger.info("Prerequisite graph construction complete!")
 
         except Exception as e:
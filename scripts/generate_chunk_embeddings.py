@@ -440,6 +440,12 @@ async def generate_and_upload_embeddings(
         progress.update_embeddings(len(embeddings))
         progress.update_processed(len(chunks_to_process))
         logger.info(f"Generated {len(embeddings)} embeddings using {total_tokens} tokens")
+        if embedding_service.cache is not None:
+            stats = embedding_service.cache.get_statistics()
+            logger.info(
+                f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['entries']} entries ({stats['size_bytes'] / 1_048_576:.1f} MB)"
+            )
 
         # Step 6: Upload to Qdrant in batches (unless --dry-run)
         if not dry_run:
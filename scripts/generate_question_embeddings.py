@@ -451,6 +451,12 @@ async def main(
         logger.info(f"Vectors uploaded: {uploaded_count}")
         logger.info(f"Vectors skipped (already existed): {skipped_count}")
         logger.info(f"Total OpenAI tokens used: {total_tokens:,}")
+        if embedding_service and embedding_service.cache is not None:
+            stats = embedding_service.cache.get_statistics()
+            logger.info(
+                f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['entries']} entries ({stats['size_bytes'] / 1_048_576:.1f} MB)"
+            )
         logger.info(f"Estimated OpenAI cost: ${cost:.4f}")
         logger.info(f"Total time elapsed: {elapsed_time:.2f}s")
         logger.info(f"Verification: {'PASSED ✓' if verification_report['verified'] else 'FAILED ✗'}")
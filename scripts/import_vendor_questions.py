@@ -50,23 +50,44 @@ CLI OPTIONS:
 --create-missing-concepts Create new concepts for unmatched tags
 --unmatched-report       Export unmatched tags to CSV for review
 --created-concepts-report Export created concepts to CSV for review
+--stream                 Import in bounded batches with checkpoint/resume
+--batch-size             Questions per streamed batch (default: 50)
+--max-pending-batches    Batches buffered between streaming stages (default: 2)
+--checkpoint-file        Resume file for --stream (default: scripts/output/)
+--restart                Ignore an existing checkpoint and start from the first row
+
+STREAMING:
+----------
+With --stream, rows flow parse -> embed -> concept map -> insert in batches
+instead of loading the whole file first. Each batch is committed in one
+transaction and then recorded in the checkpoint file; rerunning the same
+command after a crash resumes after the last committed row. The checkpoint
+is removed once the import completes.
+
+python scripts/import_vendor_questions.py \\
+    --course-slug cbap \\
+    --input-file data/vendor_drop.csv \\
+    --use-csv-tags \\
+    --stream
 """
 import argparse
 import asyncio
 import csv
+import hashlib
 import json
 import logging
 import os
 import sys
 from collections import Counter
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
 from openai import AsyncOpenAI, APIError, RateLimitError, APIConnectionError
-from thefuzz import fuzz
+from rapidfuzz import fuzz, process
 from qdrant_client import AsyncQdrantClient
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from qdrant_client.models import Distance, Filter, FieldCondition, MatchValue, VectorParams
@@ -81,6 +102,8 @@ from src.models.course import Course
 from src.repositories.concept_repository import ConceptRepository
 from src.repositories.question_repository import QuestionRepository
 from src.schemas.concept import ConceptCreate
+from src.utils.content_version import bump_course_content_version
+from src.services.embedding_service import EmbeddingService
 
 logging.basicConfig(
     level=logging.INFO,
@@ -231,6 +254,182 @@ class ImportResult:
             self.warnings = []
 
 
+# Reported when an import has no questions (Story 10.2 AC 6 defaults)
+IRT_PARAMETER_DEFAULTS = {
+    "difficulty": 0.0,
+    "discrimination": 1.0,
+    "guess_rate": 0.25,
+    "slip_rate": 0.10,
+}
+
+
+@dataclass
+class ImportStatistics:
+    """
+    Running coverage and IRT statistics of an import.
+
+    Accumulated batch by batch so that streaming imports can produce the
+    validation report without keeping every question in memory.
+    """
+    total_questions: int = 0
+    unmapped_questions: int = 0
+    mapped_rows: int = 0
+    mapping_total: int = 0
+    concept_question_count: Counter = field(default_factory=Counter)
+    ka_counts: Counter = field(default_factory=Counter)
+    difficulty_labels: Counter = field(default_factory=Counter)
+    irt_totals: Dict[str, List[float]] = field(default_factory=dict)  # parameter -> [min, max, sum]
+
+    def add(
+        self,
+        questions: List[QuestionData],
+        mappings: Dict[int, List[ConceptMapping]],
+    ) -> None:
+        """Add a batch of questions and their concept mappings."""
+        self.total_questions += len(questions)
+        self.unmapped_questions += sum(1 for q in questions if not mappings.get(q.row_number))
+
+        self.mapped_rows += len(mappings)
+        for row_mappings in mappings.values():
+            self.mapping_total += len(row_mappings)
+            for m in row_mappings:
+                self.concept_question_count[str(m.concept_id)] += 1
+
+        self.ka_counts.update(q.knowledge_area_id for q in questions)
+        self.difficulty_labels.update(q.difficulty_label for q in questions if q.difficulty_label)
+
+        for parameter in IRT_PARAMETER_DEFAULTS:
+            for q in questions:
+                value = getattr(q, parameter)
+                totals = self.irt_totals.get(parameter)
+                if totals is None:
+                    self.irt_totals[parameter] = [value, value, value]
+                else:
+                    totals[0] = min(totals[0], value)
+                    totals[1] = max(totals[1], value)
+                    totals[2] += value
+
+    def concepts_needing_content(self, concepts: List[Concept]) -> List[str]:
+        """Names of concepts with fewer than 3 questions."""
+        return [
+            c.name for c in concepts
+            if self.concept_question_count.get(str(c.id), 0) < 3
+        ]
+
+    def report(self, concepts: List[Concept]) -> Dict[str, Any]:
+        """Build the coverage report for the course concepts."""
+        irt_stats: Dict[str, Any] = {}
+        for parameter, default in IRT_PARAMETER_DEFAULTS.items():
+            if parameter in self.irt_totals:
+                low, high, total = self.irt_totals[parameter]
+                irt_stats[parameter] = {
+                    "min": low,
+                    "max": high,
+                    "avg": total / self.total_questions,
+                }
+            else:
+                irt_stats[parameter] = {"min": default, "max": default, "avg": default}
+        irt_stats["by_tier"] = dict(self.difficulty_labels)
+
+        return {
+            "total_questions": self.total_questions,
+            "mapped_questions": self.total_questions - self.unmapped_questions,
+            "unmapped_questions": self.unmapped_questions,
+            "distribution_by_ka": dict(self.ka_counts),
+            "total_concepts": len(concepts),
+            "concepts_with_questions": len([c for c in concepts if self.concept_question_count.get(str(c.id), 0) > 0]),
+            "concepts_needing_content": len(self.concepts_needing_content(concepts)),
+            "avg_mappings_per_question": self.mapping_total / max(1, self.mapped_rows),
+            "irt_parameters": irt_stats,
+        }
+
+
+CHECKPOINT_VERSION = 1
+
+MAPPING_EXPORT_HEADER = [
+    "row_number",
+    "question_text",
+    "correct_answer",
+    "knowledge_area",
+    "concept_id",
+    "concept_name",
+    "relevance",
+    "reasoning",
+]
+
+
+def file_sha256(file_path: str) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ImportCheckpoint:
+    """
+    Progress of a streaming import, saved after every committed batch.
+
+    A resumed import skips rows up to last_row. A checkpoint only resumes an
+    import of the same course, input file contents and mapping mode.
+    """
+    course_slug: str
+    input_sha256: str
+    mapping_mode: str
+    last_row: int = 0
+    batches_committed: int = 0
+    questions_inserted: int = 0
+    mappings_created: int = 0
+    version: int = CHECKPOINT_VERSION
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ImportCheckpoint"]:
+        """Load a checkpoint, or None if it is missing or unreadable."""
+        if not path.exists():
+            return None
+        try:
+            checkpoint = cls(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+        if checkpoint.version != CHECKPOINT_VERSION:
+            logger.warning(f"Ignoring checkpoint {path} with version {checkpoint.version}")
+            return None
+        return checkpoint
+
+    def resumes(self, other: "ImportCheckpoint") -> bool:
+        """Whether this checkpoint belongs to the same import as other."""
+        return (
+            self.course_slug == other.course_slug
+            and self.input_sha256 == other.input_sha256
+            and self.mapping_mode == other.mapping_mode
+        )
+
+    def advance(self, last_row: int, questions_inserted: int, mappings_created: int) -> None:
+        """Record a committed batch."""
+        self.last_row = last_row
+        self.batches_committed += 1
+        self.questions_inserted += questions_inserted
+        self.mappings_created += mappings_created
+
+    def save(self, path: Path) -> None:
+        """Write the checkpoint atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class StreamBatch:
+    """A batch of questions flowing through the streaming import pipeline."""
+    questions: List[QuestionData]
+    embeddings: Dict[int, List[float]] = field(default_factory=dict)
+    mappings: Dict[int, List[ConceptMapping]] = field(default_factory=dict)
+
+
 class ConceptTagMatcher:
     """
     Matches CSV concept tags to existing concepts using fuzzy string matching.
@@ -239,6 +438,11 @@ class ConceptTagMatcher:
     - Exact match (100%): relevance = 1.0
     - High match (95-99%): relevance = 0.9
     - Good match (85-94%): relevance = 0.8
+
+    Fuzzy scores are the rounded fuzz.ratio (as in thefuzz). Distinct tags are
+    scored in batches with rapidfuzz's cdist against the concept names whose
+    length can reach the threshold (ratio <= 200 * min(len) / (len + len)).
+    Ties go to the first concept, and results are memoized per matcher.
     """
 
     def __init__(self, concepts: List[Concept], threshold: int = 85):
@@ -256,6 +460,14 @@ class ConceptTagMatcher:
             c.name.lower(): c for c in concepts
         }
 
+        # Fuzzy candidates in lookup order, with name lengths for pruning
+        self._names: List[str] = list(self.concept_by_name.keys())
+        self._concepts: List[Concept] = list(self.concept_by_name.values())
+        self._name_lengths = np.array([len(name) for name in self._names], dtype=np.int64)
+
+        # Memo of normalized tag -> match result
+        self._matches: Dict[str, Optional[Tuple[Concept, float, float]]] = {}
+
     def match_tag(self, tag: str) -> Optional[Tuple[Concept, float, float]]:
         """
         Match a tag to the best concept.
@@ -269,35 +481,16 @@ class ConceptTagMatcher:
             - relevance: 0.0-1.0 relevance score for question-concept mapping
         """
         normalized = tag.lower().strip()
-
-        # Try exact match first (O(1) lookup)
-        if normalized in self.concept_by_name:
-            return (self.concept_by_name[normalized], 100.0, 1.0)
-
-        # Fuzzy match against all concepts
-        best_match: Optional[Concept] = None
-        best_score: float = 0.0
-
-        for name, concept in self.concept_by_name.items():
-            score = fuzz.ratio(normalized, name)
-            if score > best_score and score >= self.threshold:
-                best_match = concept
-                best_score = score
-
-        if best_match:
-            # Calculate relevance based on match score
-            if best_score >= 95:
-                relevance = 0.9
-            else:  # 85-94
-                relevance = 0.8
-            return (best_match, best_score, relevance)
-
-        return None
+        if normalized not in self._matches:
+            self._match_normalized([normalized])
+        return self._matches[normalized]
 
     def match_tags(self, tags: List[str]) -> List[Tuple[str, Optional[Tuple[Concept, float, float]]]]:
         """
         Match multiple tags and return results for each.
 
+        All distinct unmatched tags are fuzzy-scored in one batch.
+
         Args:
             tags: List of tag strings to match
 
@@ -305,7 +498,53 @@ class ConceptTagMatcher:
             List of tuples (tag, match_result) where match_result is
             (concept, score, relevance) or None
         """
-        return [(tag, self.match_tag(tag)) for tag in tags]
+        normalized = [tag.lower().strip() for tag in tags]
+        self._match_normalized([t for t in dict.fromkeys(normalized) if t not in self._matches])
+        return [(tag, self._matches[n]) for tag, n in zip(tags, normalized, strict=True)]
+
+    def _match_normalized(self, normalized_tags: List[str]) -> None:
+        """Match distinct normalized tags and memoize the results."""
+        fuzzy_by_length: Dict[int, List[str]] = {}
+        for normalized in normalized_tags:
+            # Try exact match first (O(1) lookup)
+            if normalized in self.concept_by_name:
+                self._matches[normalized] = (self.concept_by_name[normalized], 100.0, 1.0)
+            else:
+                fuzzy_by_length.setdefault(len(normalized), []).append(normalized)
+
+        for length, group in fuzzy_by_length.items():
+            candidates = self._candidate_indices(length)
+            if len(candidates) == 0:
+                self._matches.update(dict.fromkeys(group))
+                continue
+
+            scores = process.cdist(
+                group,
+                [self._names[i] for i in candidates],
+                scorer=fuzz.ratio,
+                dtype=np.float64,
+            )
+            # Same rounding as thefuzz; argmax keeps the first of tied concepts
+            rounded = np.rint(scores)
+            best = np.argmax(rounded, axis=1)
+
+            for row, normalized in enumerate(group):
+                best_score = int(rounded[row, best[row]])
+                if best_score > 0 and best_score >= self.threshold:
+                    # Calculate relevance based on match score
+                    relevance = 0.9 if best_score >= 95 else 0.8
+                    self._matches[normalized] = (
+                        self._concepts[candidates[best[row]]], best_score, relevance
+                    )
+                else:
+                    self._matches[normalized] = None
+
+    def _candidate_indices(self, length: int) -> np.ndarray:
+        """Indices of names whose length allows a rounded ratio >= threshold."""
+        lengths = self._name_lengths
+        upper_bound = 200.0 * np.minimum(length, lengths) / np.maximum(length + lengths, 1)
+        # Raw scores just above threshold - 0.5 round up to the threshold
+        return np.nonzero(upper_bound >= self.threshold - 0.5 - 1e-9)[0]
 
 
 class TagClassifier:
@@ -581,11 +820,13 @@ class VendorQuestionImporter:
         use_csv_tags: bool = False,
         tag_match_threshold: int = 85,
         create_missing_concepts: bool = False,
+        max_pending_batches: int = 2,
     ):
         self.course_slug = course_slug
         self.dry_run = dry_run
         self.skip_concept_mapping = skip_concept_mapping
         self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
         self.use_csv_tags = use_csv_tags
         self.tag_match_threshold = tag_match_threshold
         self.create_missing_concepts = create_missing_concepts
@@ -597,12 +838,20 @@ class VendorQuestionImporter:
         self.concept_embeddings: Dict[UUID, List[float]] = {}
 
         self.openai_client: Optional[AsyncOpenAI] = None
+        self.embedding_service: Optional[EmbeddingService] = None
         self.qdrant_client: Optional[AsyncQdrantClient] = None
 
         # Track created concepts and unmatched tags for reporting
         self.created_concepts: List[Tuple[Concept, str]] = []  # (concept, source_tag)
         self.unmatched_tags: List[Tuple[int, str, str]] = []  # (row_number, tag, question_preview)
 
+        # Tag matcher shared by every batch of an import (memoizes tag matches)
+        self._tag_matcher: Optional[ConceptTagMatcher] = None
+        self._tag_matcher_concept_count = 0
+
+        # Tag usage across KAs for consistency validation (AC 9): tag -> {ka_id: [row_numbers]}
+        self._tag_ka_usage: Dict[str, Dict[str, List[int]]] = {}
+
         # Story 2.15: Tag classifier for secondary tags
         self.tag_classifier: Optional[TagClassifier] = None
 
@@ -620,6 +869,10 @@ class VendorQuestionImporter:
                 logger.error("OPENAI_API_KEY environment variable not set")
                 return False
             self.openai_client = AsyncOpenAI(api_key=api_key)
+            # Embeddings go through the shared concurrent, rate-limited engine
+            self.embedding_service = EmbeddingService(
+                api_key=api_key, model="text-embedding-3-small", dimensions=1536
+            )
 
             # Initialize Qdrant client
             qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
@@ -692,18 +945,8 @@ class VendorQuestionImporter:
 
     def parse_csv(self, file_path: str) -> List[QuestionData]:
         """Parse questions from CSV file."""
-        questions = []
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
-                    try:
-                        question = self._parse_csv_row(row, row_num)
-                        if question:
-                            questions.append(question)
-                    except Exception as e:
-                        self.result.errors.append(f"Row {row_num}: {str(e)}")
-
+            questions = list(self.iter_csv(file_path))
             logger.info(f"Parsed {len(questions)} questions from CSV")
         except Exception as e:
             logger.error(f"Failed to parse CSV: {e}")
@@ -711,6 +954,21 @@ class VendorQuestionImporter:
 
         return questions
 
+    def iter_csv(self, file_path: str, start_after_row: int = 0) -> Iterator[QuestionData]:
+        """Yield questions from a CSV file one row at a time, skipping rows up to start_after_row."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
+                if row_num <= start_after_row:
+                    continue
+                try:
+                    question = self._parse_csv_row(row, row_num)
+                except Exception as e:
+                    self.result.errors.append(f"Row {row_num}: {str(e)}")
+                    continue
+                if question:
+                    yield question
+
     def _parse_csv_row(self, row: Dict[str, str], row_num: int) -> Optional[QuestionData]:
         """Parse a single CSV row into QuestionData."""
         # Required fields
@@ -958,22 +1216,8 @@ class VendorQuestionImporter:
 
     def parse_json(self, file_path: str) -> List[QuestionData]:
         """Parse questions from JSON file."""
-        questions = []
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            if not isinstance(data, list):
-                data = [data]
-
-            for idx, item in enumerate(data, start=1):
-                try:
-                    question = self._parse_json_item(item, idx)
-                    if question:
-                        questions.append(question)
-                except Exception as e:
-                    self.result.errors.append(f"Item {idx}: {str(e)}")
-
+            questions = list(self.iter_json(file_path))
             logger.info(f"Parsed {len(questions)} questions from JSON")
         except Exception as e:
             logger.error(f"Failed to parse JSON: {e}")
@@ -981,6 +1225,30 @@ class VendorQuestionImporter:
 
         return questions
 
+    def iter_json(self, file_path: str, start_after_row: int = 0) -> Iterator[QuestionData]:
+        """
+        Yield questions from a JSON file, skipping items up to start_after_row.
+
+        The JSON document itself is loaded whole; only the parsed questions
+        are produced lazily.
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if not isinstance(data, list):
+            data = [data]
+
+        for idx, item in enumerate(data, start=1):
+            if idx <= start_after_row:
+                continue
+            try:
+                question = self._parse_json_item(item, idx)
+            except Exception as e:
+                self.result.errors.append(f"Item {idx}: {str(e)}")
+                continue
+            if question:
+                yield question
+
     def _parse_json_item(self, item: Dict[str, Any], idx: int) -> Optional[QuestionData]:
         """Parse a single JSON item into QuestionData."""
         question_text = item.get("question_text", "").strip()
@@ -1090,77 +1358,77 @@ class VendorQuestionImporter:
             return self.parse_json(file_path)
         return self.parse_csv(file_path)
 
+    def iter_batches(
+        self,
+        file_path: str,
+        file_format: Optional[str] = None,
+        start_after_row: int = 0,
+    ) -> Iterator[List[QuestionData]]:
+        """Yield parsed questions in batches of batch_size, skipping rows up to start_after_row."""
+        if not file_format:
+            ext = Path(file_path).suffix.lower()
+            file_format = "json" if ext == ".json" else "csv"
+
+        if file_format == "json":
+            questions = self.iter_json(file_path, start_after_row)
+        else:
+            questions = self.iter_csv(file_path, start_after_row)
+
+        batch: List[QuestionData] = []
+        for question in questions:
+            batch.append(question)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     # =====================================
     # Embedding Generation
     # =====================================
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=60),
-        retry=retry_if_exception_type((APIError, RateLimitError, APIConnectionError)),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Embedding API call failed, retrying in {retry_state.next_action.sleep} seconds..."
-        )
-    )
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using OpenAI with retry logic."""
-        response = await self.openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text
-        )
-        return response.data[0].embedding
+        return await self.embedding_service.generate_embedding(text)
 
-    async def generate_question_embedding(self, question: QuestionData) -> List[float]:
-        """Generate embedding for a question (combines text + options)."""
+    @staticmethod
+    def _question_embedding_text(question: QuestionData) -> str:
+        """Text embedded for a question (combines text + options)."""
         text = f"{question.question_text}\n"
         for key, value in question.options.items():
             text += f"{key}: {value}\n"
-        return await self.generate_embedding(text)
+        return text
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=60),
-        retry=retry_if_exception_type((APIError, RateLimitError, APIConnectionError)),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Batch embedding API call failed, retrying in {retry_state.next_action.sleep} seconds..."
-        )
-    )
-    async def _batch_embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Internal method to embed a batch of texts with retry logic."""
-        response = await self.openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=texts
-        )
-        return [emb_data.embedding for emb_data in response.data]
+    async def generate_question_embedding(self, question: QuestionData) -> List[float]:
+        """Generate embedding for a question (combines text + options)."""
+        return await self.generate_embedding(self._question_embedding_text(question))
 
     async def batch_generate_embeddings(
         self,
         questions: List[QuestionData]
     ) -> Dict[int, List[float]]:
-        """Generate embeddings for all questions in batches."""
-        embeddings = {}
-        batch_size = 100  # OpenAI batch limit
-
-        for i in range(0, len(questions), batch_size):
-            batch = questions[i:i + batch_size]
-            texts = []
-            for q in batch:
-                text = f"{q.question_text}\n"
-                for key, value in q.options.items():
-                    text += f"{key}: {value}\n"
-                texts.append(text)
+        """
+        Generate embeddings for all questions.
 
-            try:
-                batch_embeddings = await self._batch_embed_texts(texts)
-                for j, embedding in enumerate(batch_embeddings):
-                    embeddings[batch[j].row_number] = embedding
+        Requests are packed, sent concurrently and paced by the
+        EmbeddingService batch engine, which retries rate limit errors.
+        """
+        if not questions:
+            return {}
+        texts = [self._question_embedding_text(q) for q in questions]
 
-                logger.info(f"Generated embeddings for batch {i // batch_size + 1}")
-            except Exception as e:
-                logger.error(f"Batch embedding failed after retries: {e}")
-                # Continue with remaining batches
+        def log_progress(completed: int, total: int) -> None:
+            logger.info(f"Generated embeddings for {completed}/{total} questions")
+
+        try:
+            embeddings, _ = await self.embedding_service.batch_generate_embeddings(
+                texts, progress_callback=log_progress
+            )
+        except Exception as e:
+            logger.error(f"Batch embedding failed after retries: {e}")
+            return {}
 
-        return embeddings
+        return {q.row_number: embedding for q, embedding in zip(questions, embeddings, strict=True)}
 
     # =====================================
     # Concept Matching
@@ -1206,35 +1474,30 @@ class VendorQuestionImporter:
 
         # Generate and store concept embeddings
         logger.info("Generating concept embeddings...")
-        points = []
-        for i, concept in enumerate(self.concepts):
-            text = f"{concept.name}: {concept.description or ''}"
-            try:
-                embedding = await self.generate_embedding(text)
-                points.append({
-                    "id": i,
-                    "vector": embedding,
-                    "payload": {
-                        "concept_id": str(concept.id),
-                        "course_id": str(self.course_id),
-                        "name": concept.name,
-                        "knowledge_area_id": concept.knowledge_area_id,
-                    }
-                })
-            except Exception as e:
-                logger.warning(f"Failed to embed concept {concept.name}: {e}")
-
-            if len(points) >= 100:
-                await self.qdrant_client.upsert(
-                    collection_name=collection_name,
-                    points=points
-                )
-                points = []
+        texts = [f"{concept.name}: {concept.description or ''}" for concept in self.concepts]
+        try:
+            embeddings, _ = await self.embedding_service.batch_generate_embeddings(texts)
+        except Exception as e:
+            logger.warning(f"Failed to embed concepts: {e}")
+            return
 
-        if points:
+        points = [
+            {
+                "id": i,
+                "vector": embedding,
+                "payload": {
+                    "concept_id": str(concept.id),
+                    "course_id": str(self.course_id),
+                    "name": concept.name,
+                    "knowledge_area_id": concept.knowledge_area_id,
+                }
+            }
+            for i, (concept, embedding) in enumerate(zip(self.concepts, embeddings, strict=True))
+        ]
+        for start in range(0, len(points), 100):
             await self.qdrant_client.upsert(
                 collection_name=collection_name,
-                points=points
+                points=points[start:start + 100]
             )
 
         logger.info(f"Stored {len(self.concepts)} concept embeddings in Qdrant")
@@ -1388,9 +1651,46 @@ class VendorQuestionImporter:
 
         return mappings
 
+    async def map_questions_with_embeddings(
+        self,
+        questions: List[QuestionData],
+        question_embeddings: Dict[int, List[float]],
+    ) -> Dict[int, List[ConceptMapping]]:
+        """Map questions to concepts using their embeddings (semantic search + GPT-4)."""
+        mappings: Dict[int, List[ConceptMapping]] = {}
+        for question in questions:
+            if question.row_number in question_embeddings:
+                mappings[question.row_number] = await self.map_question_to_concepts(
+                    question,
+                    question_embeddings[question.row_number]
+                )
+            else:
+                self.result.warnings.append(
+                    f"Row {question.row_number}: No embedding generated"
+                )
+        return mappings
+
+    def _get_tag_matcher(self) -> ConceptTagMatcher:
+        """Get the tag matcher, rebuilding it when concepts were added."""
+        if self._tag_matcher is None or self._tag_matcher_concept_count != len(self.concepts):
+            self._tag_matcher = ConceptTagMatcher(self.concepts, self.tag_match_threshold)
+            self._tag_matcher_concept_count = len(self.concepts)
+        return self._tag_matcher
+
+    def _warn_cross_ka_tag_usage(self):
+        """Warn about tags used across different KAs (AC 9) and reset the tracking."""
+        for tag, ka_rows in self._tag_ka_usage.items():
+            if len(ka_rows) > 1:
+                ka_list = ", ".join([f"{ka} (rows: {rows})" for ka, rows in ka_rows.items()])
+                self.result.warnings.append(
+                    f"Tag '{tag}' used across multiple KAs: {ka_list}"
+                )
+        self._tag_ka_usage = {}
+
     async def map_questions_from_tags(
         self,
         questions: List[QuestionData],
+        warn_cross_ka_usage: bool = True,
     ) -> Dict[int, List[ConceptMapping]]:
         """
         Map questions to concepts using pre-tagged concept names from CSV.
@@ -1400,15 +1700,20 @@ class VendorQuestionImporter:
 
         Args:
             questions: List of QuestionData with concept_tags populated
+            warn_cross_ka_usage: Warn about tags used across KAs now. Streaming
+                imports pass False and warn once after the last batch.
 
         Returns:
             Dict mapping row_number to list of ConceptMapping objects
         """
-        matcher = ConceptTagMatcher(self.concepts, self.tag_match_threshold)
+        matcher = self._get_tag_matcher()
         mappings: Dict[int, List[ConceptMapping]] = {}
 
+        # Score every distinct tag of the batch at once
+        matcher.match_tags([tag for question in questions for tag in question.concept_tags])
+
         # Track tag usage across KAs for consistency validation (AC 9)
-        tag_ka_usage: Dict[str, Dict[str, List[int]]] = {}  # tag -> {ka_id: [row_numbers]}
+        tag_ka_usage = self._tag_ka_usage
 
         matched_count = 0
         unmatched_count = 0
@@ -1478,12 +1783,8 @@ class VendorQuestionImporter:
             mappings[question.row_number] = question_mappings
 
         # AC 9: Warn about tags used across different KAs
-        for tag, ka_rows in tag_ka_usage.items():
-            if len(ka_rows) > 1:
-                ka_list = ", ".join([f"{ka} (rows: {rows})" for ka, rows in ka_rows.items()])
-                self.result.warnings.append(
-                    f"Tag '{tag}' used across multiple KAs: {ka_list}"
-                )
+        if warn_cross_ka_usage:
+            self._warn_cross_ka_tag_usage()
 
         logger.info(
             f"Tag-based mapping complete: {matched_count} matched, "
@@ -1619,69 +1920,16 @@ class VendorQuestionImporter:
         mappings: Dict[int, List[ConceptMapping]]
     ) -> Dict[str, Any]:
         """Validate import results and generate coverage report."""
-        # Questions without mappings
-        unmapped = [q for q in questions if q.row_number not in mappings or not mappings[q.row_number]]
+        stats = ImportStatistics()
+        stats.add(questions, mappings)
+        return self._coverage_report(stats)
 
-        # Count questions per concept
-        concept_question_count = Counter()
-        for row_mappings in mappings.values():
-            for m in row_mappings:
-                concept_question_count[str(m.concept_id)] += 1
-
-        # Concepts with < 3 questions
-        concepts_needing_content = [
-            c.name for c in self.concepts
-            if concept_question_count.get(str(c.id), 0) < 3
-        ]
-
-        # Distribution by KA
-        ka_counts = Counter(q.knowledge_area_id for q in questions)
-
-        # IRT parameter statistics (Story 10.2 AC 6)
-        difficulties = [q.difficulty for q in questions]
-        discriminations = [q.discrimination for q in questions]
-        guess_rates = [q.guess_rate for q in questions]
-        slip_rates = [q.slip_rate for q in questions]
-        difficulty_labels = Counter(q.difficulty_label for q in questions if q.difficulty_label)
-
-        irt_stats = {
-            "difficulty": {
-                "min": min(difficulties) if difficulties else 0.0,
-                "max": max(difficulties) if difficulties else 0.0,
-                "avg": sum(difficulties) / len(difficulties) if difficulties else 0.0,
-            },
-            "discrimination": {
-                "min": min(discriminations) if discriminations else 1.0,
-                "max": max(discriminations) if discriminations else 1.0,
-                "avg": sum(discriminations) / len(discriminations) if discriminations else 1.0,
-            },
-            "guess_rate": {
-                "min": min(guess_rates) if guess_rates else 0.25,
-                "max": max(guess_rates) if guess_rates else 0.25,
-                "avg": sum(guess_rates) / len(guess_rates) if guess_rates else 0.25,
-            },
-            "slip_rate": {
-                "min": min(slip_rates) if slip_rates else 0.10,
-                "max": max(slip_rates) if slip_rates else 0.10,
-                "avg": sum(slip_rates) / len(slip_rates) if slip_rates else 0.10,
-            },
-            "by_tier": dict(difficulty_labels),
-        }
-
-        report = {
-            "total_questions": len(questions),
-            "mapped_questions": len(questions) - len(unmapped),
-            "unmapped_questions": len(unmapped),
-            "distribution_by_ka": dict(ka_counts),
-            "total_concepts": len(self.concepts),
-            "concepts_with_questions": len([c for c in self.concepts if concept_question_count.get(str(c.id), 0) > 0]),
-            "concepts_needing_content": len(concepts_needing_content),
-            "avg_mappings_per_question": sum(len(m) for m in mappings.values()) / max(1, len(mappings)),
-            "irt_parameters": irt_stats,
-        }
+    def _coverage_report(self, stats: ImportStatistics) -> Dict[str, Any]:
+        """Build the coverage report and warn about concepts with few questions."""
+        report = stats.report(self.concepts)
 
         # Log warnings for concepts with few questions
-        for name in concepts_needing_content[:10]:
+        for name in stats.concepts_needing_content(self.concepts)[:10]:
             self.result.warnings.append(f"Concept '{name}' has fewer than 3 questions")
 
         return report
@@ -1690,6 +1938,28 @@ class VendorQuestionImporter:
     # Database Operations
     # =====================================
 
+    def _question_to_dict(self, question: QuestionData) -> Dict[str, Any]:
+        """Build the question row for the repository."""
+        return {
+            "course_id": self.course_id,
+            "question_text": question.question_text,
+            "options": question.options,
+            "correct_answer": question.correct_answer,
+            "explanation": question.explanation,
+            "knowledge_area_id": question.knowledge_area_id,
+            # IRT parameters
+            "difficulty": question.difficulty,
+            "difficulty_label": question.difficulty_label,
+            "discrimination": question.discrimination,
+            "guess_rate": question.guess_rate,
+            "slip_rate": question.slip_rate,
+            "source": question.source,
+            "corpus_reference": question.corpus_reference,
+            # Story 2.15: Secondary tags
+            "perspectives": question.perspectives,
+            "competencies": question.competencies,
+        }
+
     async def insert_questions_and_mappings(
         self,
         questions: List[QuestionData],
@@ -1708,29 +1978,8 @@ class VendorQuestionImporter:
 
             for question in questions:
                 try:
-                    # Build question dict
-                    question_dict = {
-                        "course_id": self.course_id,
-                        "question_text": question.question_text,
-                        "options": question.options,
-                        "correct_answer": question.correct_answer,
-                        "explanation": question.explanation,
-                        "knowledge_area_id": question.knowledge_area_id,
-                        # IRT parameters
-                        "difficulty": question.difficulty,
-                        "difficulty_label": question.difficulty_label,
-                        "discrimination": question.discrimination,
-                        "guess_rate": question.guess_rate,
-                        "slip_rate": question.slip_rate,
-                        "source": question.source,
-                        "corpus_reference": question.corpus_reference,
-                        # Story 2.15: Secondary tags
-                        "perspectives": question.perspectives,
-                        "competencies": question.competencies,
-                    }
-
                     # Insert question
-                    q = await repo.create_question(question_dict)
+                    q = await repo.create_question(self._question_to_dict(question))
                     inserted_question_ids.append(q.id)
 
                     # Insert concept mappings
@@ -1747,8 +1996,57 @@ class VendorQuestionImporter:
                     logger.error(f"Failed to insert question {question.row_number}: {e}")
                     self.result.errors.append(f"Row {question.row_number}: Insert failed - {e}")
 
+        # Invalidate cached question pools once for the whole import
+        if inserted_question_ids:
+            await bump_course_content_version(self.course_id)
+
         return len(inserted_question_ids), mapping_count, inserted_question_ids
 
+    async def insert_batch(
+        self,
+        questions: List[QuestionData],
+        mappings: Dict[int, List[ConceptMapping]]
+    ) -> Tuple[int, int]:
+        """
+        Insert a batch of questions and their concept mappings in one transaction.
+
+        Duplicate questions are skipped. Other database errors propagate so a
+        streaming import stops at the last committed batch.
+
+        Returns:
+            Tuple of (questions inserted, mappings created)
+        """
+        if self.dry_run:
+            return len(questions), sum(len(m) for m in mappings.values())
+
+        concept_mappings = []
+        for question in questions:
+            # One mapping per concept (the first one wins)
+            relevance_by_concept: Dict[UUID, float] = {}
+            for m in mappings.get(question.row_number, []):
+                relevance_by_concept.setdefault(m.concept_id, m.relevance)
+            concept_mappings.append([
+                {"concept_id": concept_id, "relevance": relevance}
+                for concept_id, relevance in relevance_by_concept.items()
+            ])
+
+        async with AsyncSessionLocal() as db:
+            repo = QuestionRepository(db)
+            inserted = await repo.create_questions_with_mappings(
+                [self._question_to_dict(q) for q in questions],
+                concept_mappings,
+            )
+
+        skipped = len(questions) - len(inserted)
+        if skipped:
+            self.result.questions_skipped += skipped
+            self.result.warnings.append(
+                f"Rows {questions[0].row_number}-{questions[-1].row_number}: "
+                f"Skipped {skipped} duplicate questions"
+            )
+
+        return len(inserted), sum(count for _, count in inserted)
+
     async def rollback_import(self, question_ids: List[UUID]):
         """Rollback imported questions."""
         if not question_ids:
@@ -1775,44 +2073,43 @@ class VendorQuestionImporter:
 
         with open(output_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow([
-                "row_number",
-                "question_text",
-                "correct_answer",
-                "knowledge_area",
-                "concept_id",
-                "concept_name",
-                "relevance",
-                "reasoning"
-            ])
+            writer.writerow(MAPPING_EXPORT_HEADER)
+            self._write_mapping_rows(writer, questions, mappings)
 
-            for question in questions:
-                question_mappings = mappings.get(question.row_number, [])
-                if not question_mappings:
+        logger.info(f"Exported mappings to {output_path}")
+
+    def _write_mapping_rows(
+        self,
+        writer,
+        questions: List[QuestionData],
+        mappings: Dict[int, List[ConceptMapping]],
+    ):
+        """Write the mapping export rows of a set of questions."""
+        for question in questions:
+            question_mappings = mappings.get(question.row_number, [])
+            if not question_mappings:
+                writer.writerow([
+                    question.row_number,
+                    question.question_text[:100] + "...",
+                    question.correct_answer,
+                    question.knowledge_area_name,
+                    "",
+                    "NO MAPPING",
+                    "",
+                    ""
+                ])
+            else:
+                for m in question_mappings:
                     writer.writerow([
                         question.row_number,
                         question.question_text[:100] + "...",
                         question.correct_answer,
                         question.knowledge_area_name,
-                        "",
-                        "NO MAPPING",
-                        "",
-                        ""
+                        str(m.concept_id),
+                        m.concept_name,
+                        m.relevance,
+                        m.reasoning
                     ])
-                else:
-                    for m in question_mappings:
-                        writer.writerow([
-                            question.row_number,
-                            question.question_text[:100] + "...",
-                            question.correct_answer,
-                            question.knowledge_area_name,
-                            str(m.concept_id),
-                            m.concept_name,
-                            m.relevance,
-                            m.reasoning
-                        ])
-
-        logger.info(f"Exported mappings to {output_path}")
 
     def export_unmatched_tags_report(self, output_path: str):
         """
@@ -1922,17 +2219,7 @@ class VendorQuestionImporter:
 
                 # Map questions to concepts
                 logger.info("Mapping questions to concepts...")
-                for question in questions:
-                    if question.row_number in question_embeddings:
-                        question_mappings = await self.map_question_to_concepts(
-                            question,
-                            question_embeddings[question.row_number]
-                        )
-                        mappings[question.row_number] = question_mappings
-                    else:
-                        self.result.warnings.append(
-                            f"Row {question.row_number}: No embedding generated"
-                        )
+                mappings = await self.map_questions_with_embeddings(questions, question_embeddings)
 
         # Validate
         report = self.validate_import_results(questions, mappings)
@@ -1962,6 +2249,217 @@ class VendorQuestionImporter:
 
         return self.result
 
+    def _mapping_mode(self) -> str:
+        """Name of the concept mapping mode, recorded in checkpoints."""
+        if self.skip_concept_mapping:
+            return "none"
+        return "csv_tags" if self.use_csv_tags else "gpt4"
+
+    def _load_checkpoint(
+        self,
+        input_file: str,
+        checkpoint_path: Optional[Path],
+        restart: bool,
+    ) -> ImportCheckpoint:
+        """Resume from a matching checkpoint, or start a new one."""
+        checkpoint = ImportCheckpoint(
+            course_slug=self.course_slug,
+            input_sha256=file_sha256(input_file),
+            mapping_mode=self._mapping_mode(),
+        )
+        if checkpoint_path is None or restart or self.dry_run:
+            return checkpoint
+
+        saved = ImportCheckpoint.load(checkpoint_path)
+        if saved is None:
+            return checkpoint
+        if not saved.resumes(checkpoint):
+            logger.warning(
+                f"Checkpoint {checkpoint_path} belongs to a different import "
+                f"(course, input file contents or mapping mode changed); starting from the first row"
+            )
+            return checkpoint
+        return saved
+
+    async def _embed_batch(self, batch: StreamBatch):
+        """Streaming stage: generate question embeddings for GPT-4 mapping."""
+        if self.skip_concept_mapping or self.use_csv_tags:
+            return
+        batch.embeddings = await self.batch_generate_embeddings(batch.questions)
+
+    async def _map_batch(self, batch: StreamBatch):
+        """Streaming stage: map a batch of questions to concepts."""
+        if self.skip_concept_mapping:
+            return
+        if self.use_csv_tags:
+            batch.mappings = await self.map_questions_from_tags(
+                batch.questions, warn_cross_ka_usage=False
+            )
+            if self.create_missing_concepts and self.unmatched_tags:
+                batch.mappings = await self.create_missing_concepts_from_tags(
+                    batch.questions, batch.mappings
+                )
+        else:
+            batch.mappings = await self.map_questions_with_embeddings(
+                batch.questions, batch.embeddings
+            )
+        # Embeddings are not needed past this stage
+        batch.embeddings = {}
+
+    async def _stream_batches(
+        self,
+        batches: Iterator[List[QuestionData]],
+        commit: Callable[[StreamBatch], Awaitable[None]],
+    ):
+        """
+        Push batches through the embed, map and commit stages.
+
+        Each stage runs as its own task and hands batches on through a queue
+        of at most max_pending_batches, so the embedding API and the database
+        work concurrently while a slow stage holds back the ones before it.
+        """
+        to_embed: asyncio.Queue = asyncio.Queue(self.max_pending_batches)
+        to_map: asyncio.Queue = asyncio.Queue(self.max_pending_batches)
+        to_commit: asyncio.Queue = asyncio.Queue(self.max_pending_batches)
+
+        async def produce():
+            for questions in batches:
+                await to_embed.put(StreamBatch(questions))
+            await to_embed.put(None)
+
+        async def stage(source: asyncio.Queue, sink: Optional[asyncio.Queue], handler):
+            while (batch := await source.get()) is not None:
+                await handler(batch)
+                if sink is not None:
+                    await sink.put(batch)
+            if sink is not None:
+                await sink.put(None)
+
+        async with asyncio.TaskGroup() as tasks:
+            tasks.create_task(produce())
+            tasks.create_task(stage(to_embed, to_map, self._embed_batch))
+            tasks.create_task(stage(to_map, to_commit, self._map_batch))
+            tasks.create_task(stage(to_commit, None, commit))
+
+    async def run_streaming(
+        self,
+        input_file: str,
+        file_format: Optional[str] = None,
+        output_csv: Optional[str] = None,
+        unmatched_report: Optional[str] = None,
+        created_concepts_report: Optional[str] = None,
+        checkpoint_file: Optional[str] = None,
+        restart: bool = False,
+    ) -> ImportResult:
+        """
+        Run the import pipeline in bounded batches with checkpoint/resume.
+
+        Rows flow parse -> embed -> concept map -> insert in batches of
+        batch_size, so memory is bounded by the batch size rather than the
+        file size. Each batch is committed in one transaction and then
+        recorded in the checkpoint file; a rerun of the same import resumes
+        after the last committed row. The checkpoint is removed on success.
+        Result counts cover the rows processed by this run.
+        """
+        logger.info(f"Starting streaming import for course: {self.course_slug}")
+
+        # Initialize
+        if not await self.initialize():
+            self.result.errors.append("Initialization failed")
+            return self.result
+
+        checkpoint_path = Path(checkpoint_file) if checkpoint_file else None
+        try:
+            checkpoint = self._load_checkpoint(input_file, checkpoint_path, restart)
+        except OSError as e:
+            self.result.errors.append(f"Parse error: {e}")
+            return self.result
+
+        resuming = checkpoint.last_row > 0
+        if resuming:
+            logger.info(
+                f"Resuming after row {checkpoint.last_row} "
+                f"({checkpoint.questions_inserted} questions imported previously)"
+            )
+
+        if not self.skip_concept_mapping:
+            if self.use_csv_tags:
+                logger.info("Using pre-tagged concepts from CSV (--use-csv-tags)")
+            else:
+                await self.ensure_concept_embeddings()
+
+        stats = ImportStatistics()
+        export_file = None
+        export_writer = None
+        if output_csv:
+            Path(output_csv).parent.mkdir(parents=True, exist_ok=True)
+            append = resuming and Path(output_csv).exists()
+            export_file = open(output_csv, "a" if append else "w", newline="", encoding="utf-8")
+            export_writer = csv.writer(export_file)
+            if not append:
+                export_writer.writerow(MAPPING_EXPORT_HEADER)
+
+        async def commit(batch: StreamBatch):
+            inserted, mapping_count = await self.insert_batch(batch.questions, batch.mappings)
+            self.result.questions_inserted += inserted
+            self.result.mappings_created += mapping_count
+            stats.add(batch.questions, batch.mappings)
+
+            if export_writer is not None:
+                self._write_mapping_rows(export_writer, batch.questions, batch.mappings)
+                export_file.flush()
+
+            checkpoint.advance(batch.questions[-1].row_number, inserted, mapping_count)
+            if checkpoint_path is not None and not self.dry_run:
+                checkpoint.save(checkpoint_path)
+            logger.info(
+                f"Committed batch {checkpoint.batches_committed} "
+                f"(through row {checkpoint.last_row}, {inserted} questions)"
+            )
+
+        try:
+            await self._stream_batches(
+                self.iter_batches(input_file, file_format, checkpoint.last_row),
+                commit,
+            )
+        except Exception as e:
+            errors = e.exceptions if isinstance(e, ExceptionGroup) else (e,)
+            for error in errors:
+                self.result.errors.append(f"Streaming import failed: {error}")
+            if checkpoint.batches_committed and checkpoint_path is not None and not self.dry_run:
+                logger.error(
+                    f"Import stopped after row {checkpoint.last_row}; "
+                    f"rerun the same command to resume from {checkpoint_path}"
+                )
+            return self.result
+        finally:
+            if export_file is not None:
+                export_file.close()
+
+        self.result.questions_parsed = stats.total_questions
+        self.result.questions_valid = stats.total_questions
+        if not stats.total_questions and not resuming:
+            self.result.errors.append("No valid questions parsed")
+            return self.result
+
+        # AC 9: Warn about tags used across different KAs of the whole import
+        self._warn_cross_ka_tag_usage()
+
+        report = self._coverage_report(stats)
+        logger.info(f"Validation report: {json.dumps(report, indent=2)}")
+
+        if unmatched_report and self.unmatched_tags:
+            self.export_unmatched_tags_report(unmatched_report)
+        if created_concepts_report and self.created_concepts:
+            self.export_created_concepts_report(created_concepts_report)
+
+        if checkpoint_path is not None and checkpoint_path.exists() and not self.dry_run:
+            checkpoint_path.unlink()
+
+        self._log_summary(report)
+
+        return self.result
+
     def _log_summary(self, report: Dict[str, Any]):
         """Log import summary."""
         logger.info("=" * 60)
@@ -2088,6 +2586,32 @@ async def main():
         "--created-concepts-report",
         help="Path for created concepts report CSV"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Import in bounded batches with checkpoint/resume (for large files)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Questions per batch with --stream (default: 50)"
+    )
+    parser.add_argument(
+        "--max-pending-batches",
+        type=int,
+        default=2,
+        help="Batches buffered between streaming stages (default: 2)"
+    )
+    parser.add_argument(
+        "--checkpoint-file",
+        help="Resume file for --stream (default: scripts/output/import_checkpoint_<course>_<input>.json)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="With --stream, ignore an existing checkpoint and start from the first row"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -2108,18 +2632,35 @@ async def main():
         course_slug=args.course_slug,
         dry_run=args.dry_run,
         skip_concept_mapping=args.skip_concept_mapping,
+        batch_size=args.batch_size,
         use_csv_tags=args.use_csv_tags,
         tag_match_threshold=args.tag_match_threshold,
         create_missing_concepts=args.create_missing_concepts,
+        max_pending_batches=args.max_pending_batches,
     )
 
-    result = await importer.run(
-        input_file=args.input_file,
-        file_format=args.format,
-        output_csv=output_csv,
-        unmatched_report=args.unmatched_report,
-        created_concepts_report=args.created_concepts_report,
-    )
+    if args.stream:
+        checkpoint_file = args.checkpoint_file
+        if not checkpoint_file:
+            checkpoint_file = f"scripts/output/import_checkpoint_{args.course_slug}_{Path(args.input_file).stem}.json"
+
+        result = await importer.run_streaming(
+            input_file=args.input_file,
+            file_format=args.format,
+            output_csv=output_csv,
+            unmatched_report=args.unmatched_report,
+            created_concepts_report=args.created_concepts_report,
+            checkpoint_file=checkpoint_file,
+            restart=args.restart,
+        )
+    else:
+        result = await importer.run(
+            input_file=args.input_file,
+            file_format=args.format,
+            output_csv=output_csv,
+            unmatched_report=args.unmatched_report,
+            created_concepts_report=args.created_concepts_report,
+        )
 
     # Exit with error code if errors occurred
     if result.errors:
@@ -0,0 +1,430 @@
+"""
+Unit tests for build_prerequisite_graph.
+
+Tests the blocked similarity search and vectorized edge rules against the
+original pairwise loop, and incremental builds against full builds.
+"""
+import hashlib
+import sys
+from dataclasses import replace
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "scripts"))
+
+from build_prerequisite_graph import (
+    DIFFICULTY_THRESHOLD,
+    SIMILARITY_THRESHOLD,
+    ConceptInfo,
+    EdgeDiff,
+    GraphState,
+    PrerequisiteEdge,
+    PrerequisiteGraphBuilder,
+    diff_edges,
+    find_similar_pairs,
+)
+
+
+def make_normalized(n: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors, so many pairs pass the similarity threshold."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(n // 8, 1), dim))
+    vectors = centers[rng.integers(len(centers), size=n)] + 0.4 * rng.normal(size=(n, dim))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_builder(n: int, seed: int = 0) -> PrerequisiteGraphBuilder:
+    rng = np.random.default_rng(seed)
+    builder = PrerequisiteGraphBuilder(course_id=uuid4())
+    builder.concepts = [
+        ConceptInfo(
+            id=uuid4(),
+            name=f"Concept {i}",
+            corpus_section_ref=None,
+            knowledge_area_id="ka",
+            difficulty_estimate=float(rng.choice([0.2, 0.25, 0.5, 0.8])),
+        )
+        for i in range(n)
+    ]
+    return builder
+
+
+def reference_edges(concepts, normalized):
+    """The original O(n^2) pairwise loop."""
+    edges = []
+    for i, concept_a in enumerate(concepts):
+        for j, concept_b in enumerate(concepts):
+            if i >= j:
+                continue
+            similarity = float(np.dot(normalized[i], normalized[j]))
+            if similarity < SIMILARITY_THRESHOLD:
+                continue
+            diff_a = concept_a.difficulty_estimate
+            diff_b = concept_b.difficulty_estimate
+            if abs(diff_a - diff_b) < DIFFICULTY_THRESHOLD:
+                continue
+            if diff_a < diff_b:
+                prereq_id, target_id = concept_a.id, concept_b.id
+            else:
+                prereq_id, target_id = concept_b.id, concept_a.id
+            if similarity >= 0.9:
+                strength = 0.9
+            elif similarity >= 0.8:
+                strength = 0.7
+            else:
+                strength = 0.5
+            edges.append((target_id, prereq_id, strength))
+    return edges
+
+
+class TestFindSimilarPairs:
+    """Tests for the blocked similarity search."""
+
+    @pytest.mark.parametrize("block_size", [1, 7, 32, 1024])
+    def test_matches_dense_upper_triangle(self, block_size):
+        """Every tiling returns exactly the dense pairs above threshold, sorted."""
+        normalized = make_normalized(100)
+        dense = normalized @ normalized.T
+        expected_rows, expected_cols = np.nonzero(np.triu(dense >= SIMILARITY_THRESHOLD, k=1))
+
+        rows, cols, sims = find_similar_pairs(normalized, SIMILARITY_THRESHOLD, block_size=block_size)
+
+        assert len(expected_rows) > 0
+        np.testing.assert_array_equal(rows, expected_rows)
+        np.testing.assert_array_equal(cols, expected_cols)
+        np.testing.assert_allclose(sims, dense[expected_rows, expected_cols])
+
+    def test_empty_input(self):
+        """No vectors produce no pairs."""
+        rows, cols, sims = find_similar_pairs(np.empty((0, 4)), SIMILARITY_THRESHOLD)
+
+        assert len(rows) == len(cols) == len(sims) == 0
+
+    @pytest.mark.parametrize("block_size", [5, 1024])
+    def test_top_k_keeps_nearest_neighbours(self, block_size):
+        """Top-k mode keeps pairs where one concept is in the other's top k."""
+        normalized = make_normalized(60, seed=1)
+        k = 3
+        dense = normalized @ normalized.T
+        np.fill_diagonal(dense, -np.inf)
+        neighbours = np.argsort(-dense, axis=1)[:, :k]
+        expected = {
+            (min(i, int(j)), max(i, int(j)))
+            for i in range(len(normalized))
+            for j in neighbours[i]
+            if dense[i, j] >= SIMILARITY_THRESHOLD
+        }
+
+        rows, cols, _ = find_similar_pairs(
+            normalized, SIMILARITY_THRESHOLD, block_size=block_size, top_k=k
+        )
+
+        pairs = list(zip(rows.tolist(), cols.tolist(), strict=True))
+        assert len(pairs) == len(set(pairs))
+        assert set(pairs) == expected
+        assert pairs == sorted(pairs)
+
+    @pytest.mark.parametrize("block_size", [3, 1024])
+    def test_query_indices_return_pairs_involving_queries(self, block_size):
+        """Query mode returns exactly the full pairs that touch a query vector."""
+        normalized = make_normalized(80, seed=4)
+        query = np.array([3, 17, 18, 60])
+
+        rows, cols, sims = find_similar_pairs(
+            normalized, SIMILARITY_THRESHOLD, block_size=block_size, query_indices=query
+        )
+
+        all_rows, all_cols, all_sims = find_similar_pairs(normalized, SIMILARITY_THRESHOLD)
+        touches = np.isin(all_rows, query) | np.isin(all_cols, query)
+        assert touches.any()
+        np.testing.assert_array_equal(rows, all_rows[touches])
+        np.testing.assert_array_equal(cols, all_cols[touches])
+        np.testing.assert_allclose(sims, all_sims[touches])
+
+    def test_query_indices_cannot_combine_with_top_k(self):
+        with pytest.raises(ValueError):
+            find_similar_pairs(make_normalized(5), 0.7, top_k=2, query_indices=np.array([0]))
+
+    def test_top_k_larger_than_pool_matches_all_pairs(self):
+        """A top_k covering every concept returns all pairs."""
+        normalized = make_normalized(20, seed=2)
+
+        all_pairs = find_similar_pairs(normalized, SIMILARITY_THRESHOLD)
+        top_k_pairs = find_similar_pairs(normalized, SIMILARITY_THRESHOLD, top_k=100)
+
+        for expected, actual in zip(all_pairs, top_k_pairs, strict=True):
+            np.testing.assert_array_equal(expected, actual)
+
+
+class TestEdgesFromSimilarPairs:
+    """Tests for the vectorized difficulty-direction and strength rules."""
+
+    def test_matches_pairwise_loop(self):
+        """Blocked search plus vectorized rules reproduce the original edges in order."""
+        builder = make_builder(150)
+        normalized = make_normalized(150, seed=3)
+
+        rows, cols, sims = find_similar_pairs(normalized, SIMILARITY_THRESHOLD, block_size=16)
+        edges = builder.edges_from_similar_pairs(rows, cols, sims)
+
+        expected = reference_edges(builder.concepts, normalized)
+        assert len(expected) > 0
+        assert [(e.concept_id, e.prerequisite_concept_id, e.strength) for e in edges] == expected
+        assert all(e.relationship_type == "related" and e.source == "semantic" for e in edges)
+
+    def test_strength_buckets(self):
+        """Similarity maps to 0.9 / 0.7 / 0.5 strengths."""
+        builder = make_builder(2)
+        builder.concepts[0].difficulty_estimate = 0.2
+        builder.concepts[1].difficulty_estimate = 0.8
+        rows = np.array([0, 0, 0])
+        cols = np.array([1, 1, 1])
+
+        edges = builder.edges_from_similar_pairs(rows, cols, np.array([0.95, 0.85, 0.75]))
+
+        assert [e.strength for e in edges] == [0.9, 0.7, 0.5]
+        assert all(e.prerequisite_concept_id == builder.concepts[0].id for e in edges)
+
+
+def fake_embedding(text: str, dim: int = 16) -> np.ndarray:
+    """Deterministic embedding; texts sharing a topic word are similar."""
+    topic = text.split()[0]
+    center = np.random.default_rng(int(hashlib.sha256(topic.encode()).hexdigest()[:8], 16))
+    noise = np.random.default_rng(int(hashlib.sha256(text.encode()).hexdigest()[:8], 16))
+    return center.normal(size=dim) + 0.3 * noise.normal(size=dim)
+
+
+def make_concepts(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    topics = ["elicitation", "modelling", "planning", "strategy", "evaluation"]
+    return [
+        ConceptInfo(
+            id=uuid4(),
+            name=f"{topics[i % len(topics)]} concept {i}",
+            corpus_section_ref=None,
+            knowledge_area_id="ka",
+            difficulty_estimate=float(rng.choice([0.2, 0.4, 0.6, 0.8])),
+        )
+        for i in range(n)
+    ]
+
+
+def make_incremental_builder(concepts, monkeypatch, tmp_path, embedded: list):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    builder = PrerequisiteGraphBuilder(course_id=COURSE_ID, skip_gpt4=True, output_dir=str(tmp_path))
+    builder.concepts = concepts
+    builder.concept_map = {c.id: c for c in concepts}
+
+    async def generate(service, texts):
+        embedded.extend(texts)
+        return [fake_embedding(t).tolist() for t in texts]
+
+    builder._generate_embeddings = generate
+    return builder
+
+
+async def build(builder) -> dict:
+    """Run inference + DAG validation; returns depths (incremental or full)."""
+    edges = [builder.infer_from_section_hierarchy(), await builder.infer_from_embeddings()]
+    builder.merge_and_deduplicate(edges)
+    assert builder.validate_dag()
+    if builder.is_incremental:
+        previous = {
+            (e.concept_id, e.prerequisite_concept_id): (round(e.strength, 2), e.relationship_type)
+            for e in builder.previous_state.edges
+        }
+        return builder.compute_incremental_depths(diff_edges(previous, builder.edges))
+    return builder.compute_prerequisite_depths()
+
+
+def edge_set(edges) -> set:
+    return {(e.concept_id, e.prerequisite_concept_id, e.strength, e.source) for e in edges}
+
+
+COURSE_ID = uuid4()
+
+
+class TestDiffEdges:
+    """Tests for the stored-vs-new edge diff."""
+
+    def test_inserts_updates_and_deletes(self):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        existing = {
+            (b, a): (0.5, "related"),
+            (c, a): (0.8, "required"),
+            (c, b): (0.7, "related"),
+        }
+        edges = [
+            PrerequisiteEdge(b, a, 0.5, "related", "semantic"),  # unchanged
+            PrerequisiteEdge(c, a, 0.9, "related", "semantic"),  # updated
+            PrerequisiteEdge(a, c, 0.6, "helpful", "gpt4"),  # inserted
+        ]
+
+        diff = diff_edges(existing, edges)
+
+        assert [(e.concept_id, e.prerequisite_concept_id) for e in diff.inserted] == [(a, c)]
+        assert [(e.concept_id, e.prerequisite_concept_id) for e in diff.updated] == [(c, a)]
+        assert diff.deleted == [(c, b)]
+        assert diff.affected_concept_ids == {a, c}
+
+    def test_compares_strength_at_stored_precision(self):
+        """Strengths are stored rounded to 2 decimals, so 0.654 matches 0.65."""
+        a, b = uuid4(), uuid4()
+
+        diff = diff_edges({(b, a): (0.65, "helpful")}, [PrerequisiteEdge(b, a, 0.654, "helpful", "gpt4")])
+
+        assert diff == EdgeDiff()
+
+
+class TestGraphState:
+    """Tests for saved build state."""
+
+    def test_round_trip(self, tmp_path):
+        a, b = uuid4(), uuid4()
+        state = GraphState(
+            course_id=COURSE_ID,
+            fingerprints={a: "fa", b: "fb"},
+            edges=[PrerequisiteEdge(b, a, 0.7, "related", "semantic")],
+            depths={a: 0, b: 1},
+            cross_ka_queried={b},
+            embeddings={"ta": np.arange(4, dtype=np.float32), "tb": np.ones(4, dtype=np.float32)},
+        )
+        path = tmp_path / "state.json"
+
+        state.save(path)
+        loaded = GraphState.load(path)
+
+        assert loaded.course_id == COURSE_ID
+        assert loaded.fingerprints == state.fingerprints
+        assert loaded.edges == state.edges
+        assert loaded.depths == state.depths
+        assert loaded.cross_ka_queried == {b}
+        np.testing.assert_array_equal(loaded.embeddings["ta"], np.arange(4))
+
+    def test_missing_state(self, tmp_path):
+        assert GraphState.load(tmp_path / "missing.json") is None
+
+
+class TestIncrementalBuild:
+    """Incremental builds must produce the same graph as full builds."""
+
+    @pytest.mark.asyncio
+    async def test_matches_full_rebuild(self, monkeypatch, tmp_path):
+        """Adding, modifying and removing concepts gives the full-build edges and depths."""
+        concepts = make_concepts(60)
+        embedded: list = []
+        first = make_incremental_builder(concepts, monkeypatch, tmp_path, embedded)
+        depths = await build(first)
+        first.save_state(depths)
+
+        # Ten new concepts, two modified, one removed
+        new_concepts = make_concepts(70, seed=1)[60:]
+        changed = list(concepts[1:])
+        changed[5] = replace(changed[5], description="Now with a description")
+        changed[9] = replace(changed[9], difficulty_estimate=0.9)
+        changed += new_concepts
+
+        embedded.clear()
+        incremental = make_incremental_builder(changed, monkeypatch, tmp_path, embedded)
+        delta = incremental.start_incremental(incremental.load_state())
+        incremental_depths = await build(incremental)
+
+        assert len(delta.added) == 10
+        assert len(delta.modified) == 2
+        assert delta.removed == {concepts[0].id}
+        # Only the new text and the changed description are embedded
+        assert len(embedded) == 11
+
+        full = make_incremental_builder(changed, monkeypatch, tmp_path, [])
+        full_depths = await build(full)
+
+        assert edge_set(incremental.edges) == edge_set(full.edges)
+        assert incremental_depths == full_depths
+
+    @pytest.mark.asyncio
+    async def test_unchanged_course_embeds_nothing(self, monkeypatch, tmp_path):
+        concepts = make_concepts(30)
+        embedded: list = []
+        first = make_incremental_builder(concepts, monkeypatch, tmp_path, embedded)
+        first.save_state(await build(first))
+
+        embedded.clear()
+        second = make_incremental_builder(concepts, monkeypatch, tmp_path, embedded)
+        delta = second.start_incremental(second.load_state())
+        await build(second)
+
+        assert delta.is_empty
+        assert embedded == []
+        assert edge_set(second.edges) == edge_set(first.edges)
+
+
+class TestIncrementalDepths:
+    """Tests for downstream-only depth recomputation."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_full_depth_computation(self, seed):
+        rng = np.random.default_rng(seed)
+        builder = make_builder(80, seed=seed)
+        ids = [c.id for c in builder.concepts]
+
+        def random_edges(count):
+            edges = {}
+            for _ in range(count):
+                i, j = sorted(rng.choice(len(ids), size=2, replace=False))
+                edges[(ids[j], ids[i])] = PrerequisiteEdge(ids[j], ids[i], 0.8, "required", "hierarchy")
+            return edges
+
+        old_edges = random_edges(120)
+        builder.edges = list(old_edges.values())
+        builder.validate_dag()
+        old_depths = builder.compute_prerequisite_depths()
+        builder.start_incremental(GraphState(
+            course_id=builder.course_id,
+            fingerprints={c.id: "fp" for c in builder.concepts},
+            edges=builder.edges,
+            depths=old_depths,
+            cross_ka_queried=set(),
+        ))
+
+        # Drop some edges and add others
+        kept = list(old_edges.values())[20:]
+        new_edges = {**{(e.concept_id, e.prerequisite_concept_id): e for e in kept}, **random_edges(15)}
+        builder.edges = list(new_edges.values())
+        builder.validate_dag()
+        existing = {key: (0.8, "required") for key in old_edges}
+
+        incremental = builder.compute_incremental_depths(diff_edges(existing, builder.edges))
+
+        assert incremental == builder.compute_prerequisite_depths()
+
+
+class TestCrossKaReuse:
+    """Tests for reuse of previous GPT-4 results."""
+
+    def test_reuses_unchanged_targets_with_unchanged_prerequisites(self):
+        builder = make_builder(4)
+        a, b, c, d = (concept.id for concept in builder.concepts)
+        previous = [
+            PrerequisiteEdge(a, b, 0.6, "helpful", "gpt4"),
+            PrerequisiteEdge(c, d, 0.6, "helpful", "gpt4"),
+        ]
+        state = GraphState(
+            course_id=builder.course_id,
+            fingerprints={cid: "fp" for cid in (a, b, c, d)},
+            edges=previous,
+            depths={},
+            cross_ka_queried={a, c},
+        )
+        builder.start_incremental(state)
+        # d's fingerprint changes, so c must be asked again
+        builder.delta.modified = {d}
+        builder.delta.unchanged = {a, b, c}
+
+        reusable = builder._reusable_cross_ka_results()
+
+        assert reusable == {a: [previous[0]]}
@@ -7,21 +7,32 @@ Tests cover:
 - Relevance score calculation
 - New concept creation defaults
 """
+import asyncio
+import csv
+import json
+import random
 import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID, uuid4
 
 import pytest
+from thefuzz import fuzz
 
 # Add script path to enable import
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from import_vendor_questions import (
+    DEFAULT_KA_MAPPINGS,
+    ConceptMapping,
     ConceptTagMatcher,
+    ImportCheckpoint,
+    ImportStatistics,
     QuestionData,
     VendorQuestionImporter,
+    file_sha256,
 )
 
 
@@ -255,6 +266,74 @@ class TestConceptTagMatcher:
         # With low threshold, partial word might match
         # (depends on fuzz.ratio behavior)
 
+    @pytest.mark.parametrize("threshold", [50, 70, 85, 95])
+    def test_matches_linear_thefuzz_scan(self, threshold):
+        """Indexed matching returns the same match, score and relevance as a full fuzz.ratio scan."""
+        rnd = random.Random(threshold)
+        words = ["stakeholder", "analysis", "requirements", "business", "data", "model",
+                 "elicitation", "solution", "planning", "risk", "value", "change"]
+        concepts = [
+            MockConcept(id=uuid4(), name=" ".join(rnd.sample(words, rnd.randint(1, 4))).title())
+            for _ in range(200)
+        ]
+
+        def typo(text: str) -> str:
+            chars = list(text)
+            for _ in range(rnd.randint(0, 4)):
+                pos = rnd.randrange(len(chars))
+                op = rnd.choice(["drop", "swap", "insert"])
+                if op == "drop" and len(chars) > 1:
+                    chars.pop(pos)
+                elif op == "swap":
+                    chars[pos] = rnd.choice("abcdefghijklmnopqrstuvwxyz ")
+                else:
+                    chars.insert(pos, rnd.choice("abcdefghijklmnopqrstuvwxyz"))
+            return "".join(chars)
+
+        tags = [typo(rnd.choice(concepts).name) for _ in range(300)] + ["", "zzz", "Risk"]
+
+        def linear_scan(tag):
+            normalized = tag.lower().strip()
+            by_name = {c.name.lower(): c for c in concepts}
+            if normalized in by_name:
+                return (by_name[normalized], 100.0, 1.0)
+            best_match, best_score = None, 0.0
+            for name, concept in by_name.items():
+                score = fuzz.ratio(normalized, name)
+                if score > best_score and score >= threshold:
+                    best_match, best_score = concept, score
+            if best_match:
+                return (best_match, best_score, 0.9 if best_score >= 95 else 0.8)
+            return None
+
+        expected = [linear_scan(tag) for tag in tags]
+
+        batched = [result for _, result in ConceptTagMatcher(concepts, threshold).match_tags(tags)]
+        single = [ConceptTagMatcher(concepts, threshold).match_tag(tag) for tag in tags]
+
+        assert any(result is not None and result[1] < 100 for result in expected)
+        assert batched == expected
+        assert single == expected
+
+    def test_memoizes_tag_matches(self, sample_concepts, monkeypatch):
+        """Each distinct tag is scored once per matcher."""
+        import import_vendor_questions
+
+        calls = []
+        cdist = import_vendor_questions.process.cdist
+
+        def counting_cdist(queries, *args, **kwargs):
+            calls.append(list(queries))
+            return cdist(queries, *args, **kwargs)
+
+        monkeypatch.setattr(import_vendor_questions.process, "cdist", counting_cdist)
+        matcher = ConceptTagMatcher(sample_concepts, threshold=85)
+
+        matcher.match_tags(["Stakeholder Analysi", "stakeholder analysi ", "Data Modelng"])
+        matcher.match_tag("Stakeholder Analysi")
+
+        assert sorted(tag for batch in calls for tag in batch) == ["data modelng", "stakeholder analysi"]
+
 
 # =====================================
 # Relevance Score Tests
@@ -669,5 +748,271 @@ class TestQuestionDataWithSecondaryTags:
         assert question.competencies == []
 
 
+
+# =====================================
+# Row-by-row Insert Tests
+# =====================================
+
+class TestInsertQuestionsAndMappings:
+    """Tests for the non-streaming insert path."""
+
+    @pytest.mark.asyncio
+    async def test_bumps_content_version_once(self):
+        """Rows are inserted without per-row version bumps; the course is bumped once."""
+        importer = VendorQuestionImporter(course_slug="cbap")
+        importer.course_id = uuid4()
+        questions = [
+            QuestionData(
+                question_text=f"Question {i}?",
+                options={"A": "a", "B": "b", "C": "c", "D": "d"},
+                correct_answer="A",
+                explanation="Because",
+                knowledge_area_name="Strategy",
+                row_number=i,
+            )
+            for i in range(3)
+        ]
+        mappings = {
+            q.row_number: [ConceptMapping(concept_id=uuid4(), concept_name="Concept", relevance=1.0, reasoning="")]
+            for q in questions
+        }
+
+        repo = MagicMock()
+        repo.create_question = AsyncMock(side_effect=lambda data: MagicMock(id=uuid4()))
+        repo.add_concept_mapping = AsyncMock()
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=MagicMock())
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("import_vendor_questions.AsyncSessionLocal", return_value=session), \
+                patch("import_vendor_questions.QuestionRepository", return_value=repo), \
+                patch("import_vendor_questions.bump_course_content_version", AsyncMock()) as bump:
+            inserted, mapped, _ = await importer.insert_questions_and_mappings(questions, mappings)
+
+        assert (inserted, mapped) == (3, 3)
+        bump.assert_awaited_once_with(importer.course_id)
+
+
+# =====================================
+# Streaming Import Tests
+# =====================================
+
+STREAM_KAS = ["Strategy", "Elicitation", "RADD"]
+STREAM_TAGS = ["stakeholder analysis", "business case", "interviews", "stakeholder analysys"]
+
+
+def write_vendor_csv(path: Path, rows: int) -> None:
+    """Write a vendor CSV with one invalid row (missing explanation) every 7 rows."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "question_text", "option_a", "option_b", "option_c", "option_d",
+            "correct_answer", "explanation", "knowledge_area", "concept_tags", "difficulty",
+        ])
+        for i in range(rows):
+            writer.writerow([
+                f"Streaming question {i}?", "a", "b", "c", "d",
+                "ABCD"[i % 4],
+                "" if i % 7 == 6 else f"Explanation {i}",
+                STREAM_KAS[i % len(STREAM_KAS)],
+                ",".join(STREAM_TAGS[i % 3:i % 3 + 2]),
+                ["Easy", "Medium", "Hard"][i % 3],
+            ])
+
+
+class TestImportStatistics:
+    """Tests for the incremental validation report."""
+
+    def test_batched_report_matches_single_pass(self, tmp_path):
+        """Accumulating batches gives the same report as the whole import at once."""
+        csv_path = tmp_path / "questions.csv"
+        write_vendor_csv(csv_path, rows=40)
+        concepts = [MockConcept(id=uuid4(), name=name) for name in ("Stakeholder Analysis", "Business Case")]
+
+        importer = VendorQuestionImporter(course_slug="cbap", use_csv_tags=True, batch_size=6)
+        importer.ka_name_to_id = dict(DEFAULT_KA_MAPPINGS)
+        importer.concepts = concepts
+        questions = importer.parse_csv(str(csv_path))
+
+        matcher = ConceptTagMatcher(concepts)
+        mappings = {}
+        for q in questions[::2]:
+            mappings[q.row_number] = [
+                ConceptMapping(concept_id=concept.id, concept_name=concept.name, relevance=1.0, reasoning="")
+                for concept, _, _ in filter(None, (matcher.match_tag(tag) for tag in q.concept_tags))
+            ]
+
+        stats = ImportStatistics()
+        for batch in importer.iter_batches(str(csv_path)):
+            stats.add(batch, {q.row_number: mappings[q.row_number] for q in batch if q.row_number in mappings})
+
+        assert stats.report(concepts) == importer.validate_import_results(questions, mappings)
+
+    def test_empty_report_uses_defaults(self):
+        """An import without questions reports the default IRT parameters."""
+        report = ImportStatistics().report([])
+
+        assert report["total_questions"] == 0
+        assert report["avg_mappings_per_question"] == 0
+        assert report["irt_parameters"]["guess_rate"] == {"min": 0.25, "max": 0.25, "avg": 0.25}
+
+
+class TestStreamingImport:
+    """Tests for run_streaming batching, checkpointing and resume."""
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        path = tmp_path / "vendor_drop.csv"
+        write_vendor_csv(path, rows=30)
+        return path
+
+    @pytest.fixture
+    def concepts(self):
+        return [
+            MockConcept(id=uuid4(), name="Stakeholder Analysis", knowledge_area_id="strategy"),
+            MockConcept(id=uuid4(), name="Business Case", knowledge_area_id="strategy"),
+        ]
+
+    def make_importer(self, concepts, inserted_rows, fail_on_batch=None, **kwargs):
+        """Importer with a fake course and an in-memory insert."""
+        importer = VendorQuestionImporter(course_slug="cbap", use_csv_tags=True, batch_size=4, **kwargs)
+        batches = 0
+
+        async def initialize():
+            importer.course_id = uuid4()
+            importer.ka_name_to_id = dict(DEFAULT_KA_MAPPINGS)
+            importer.concepts = list(concepts)
+            return True
+
+        async def insert_batch(questions, mappings):
+            nonlocal batches
+            batches += 1
+            if batches == fail_on_batch:
+                raise RuntimeError("database went away")
+            inserted_rows.extend(q.row_number for q in questions)
+            return len(questions), sum(len(m) for m in mappings.values())
+
+        importer.initialize = initialize
+        importer.insert_batch = insert_batch
+        return importer
+
+    @pytest.mark.asyncio
+    async def test_streaming_matches_full_import(self, csv_path, concepts, tmp_path):
+        """Streaming imports every valid row once with the same mappings as run()."""
+        inserted_rows: list[int] = []
+        importer = self.make_importer(concepts, inserted_rows)
+        result = await importer.run_streaming(
+            str(csv_path),
+            output_csv=str(tmp_path / "stream.csv"),
+            checkpoint_file=str(tmp_path / "checkpoint.json"),
+        )
+
+        reference = VendorQuestionImporter(course_slug="cbap", use_csv_tags=True)
+        reference.ka_name_to_id = dict(DEFAULT_KA_MAPPINGS)
+        reference.concepts = list(concepts)
+        questions = reference.parse_csv(str(csv_path))
+        mappings = await reference.map_questions_from_tags(questions)
+        reference.export_mappings_to_csv(questions, mappings, str(tmp_path / "full.csv"))
+
+        assert inserted_rows == [q.row_number for q in questions]
+        assert result.questions_inserted == len(questions)
+        assert result.mappings_created == sum(len(m) for m in mappings.values())
+        reference.validate_import_results(questions, mappings)
+        assert sorted(result.warnings) == sorted(reference.result.warnings)
+        assert (tmp_path / "stream.csv").read_text() == (tmp_path / "full.csv").read_text()
+        assert not (tmp_path / "checkpoint.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_failed_batch(self, csv_path, concepts, tmp_path):
+        """A rerun after a failure resumes after the last committed batch."""
+        checkpoint_file = tmp_path / "checkpoint.json"
+        output_csv = tmp_path / "mappings.csv"
+        inserted_rows: list[int] = []
+
+        failed = self.make_importer(concepts, inserted_rows, fail_on_batch=3)
+        result = await failed.run_streaming(
+            str(csv_path), output_csv=str(output_csv), checkpoint_file=str(checkpoint_file)
+        )
+
+        assert any("database went away" in error for error in result.errors)
+        checkpoint = json.loads(checkpoint_file.read_text())
+        assert checkpoint["batches_committed"] == 2
+        assert checkpoint["last_row"] == inserted_rows[-1]
+
+        resumed = self.make_importer(concepts, inserted_rows)
+        result = await resumed.run_streaming(
+            str(csv_path), output_csv=str(output_csv), checkpoint_file=str(checkpoint_file)
+        )
+
+        reference = VendorQuestionImporter(course_slug="cbap")
+        reference.ka_name_to_id = dict(DEFAULT_KA_MAPPINGS)
+        all_rows = [q.row_number for q in reference.parse_csv(str(csv_path))]
+
+        assert all(error.endswith("Missing explanation") for error in result.errors)
+        assert inserted_rows == all_rows
+        assert not checkpoint_file.exists()
+        with open(output_csv, newline="", encoding="utf-8") as f:
+            exported_rows = [int(row["row_number"]) for row in csv.DictReader(f)]
+        assert sorted(set(exported_rows)) == all_rows
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_ignored_when_input_changes(self, csv_path, concepts, tmp_path):
+        """A checkpoint of different file contents or --restart starts from the first row."""
+        checkpoint_file = tmp_path / "checkpoint.json"
+        ImportCheckpoint(
+            course_slug="cbap",
+            input_sha256="0" * 64,
+            mapping_mode="csv_tags",
+            last_row=20,
+        ).save(checkpoint_file)
+
+        inserted_rows: list[int] = []
+        importer = self.make_importer(concepts, inserted_rows)
+        await importer.run_streaming(str(csv_path), checkpoint_file=str(checkpoint_file))
+        assert inserted_rows[0] == 2
+
+        ImportCheckpoint(
+            course_slug="cbap",
+            input_sha256=file_sha256(str(csv_path)),
+            mapping_mode="csv_tags",
+            last_row=20,
+        ).save(checkpoint_file)
+
+        inserted_rows.clear()
+        importer = self.make_importer(concepts, inserted_rows)
+        await importer.run_streaming(str(csv_path), checkpoint_file=str(checkpoint_file), restart=True)
+        assert inserted_rows[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_queues_bound_pending_batches(self, csv_path, concepts):
+        """A slow insert stage holds back parsing (backpressure)."""
+        importer = self.make_importer(concepts, [], max_pending_batches=1)
+        parsed_batches = 0
+        committed = 0
+        max_in_flight = 0
+        iter_batches = importer.iter_batches
+
+        def counting_batches(*args):
+            nonlocal parsed_batches
+            for batch in iter_batches(*args):
+                parsed_batches += 1
+                yield batch
+
+        async def slow_insert(questions, mappings):
+            nonlocal max_in_flight, committed
+            max_in_flight = max(max_in_flight, parsed_batches - committed)
+            await asyncio.sleep(0.001)
+            committed += 1
+            return len(questions), 0
+
+        importer.iter_batches = counting_batches
+        importer.insert_batch = slow_insert
+        await importer.run_streaming(str(csv_path))
+
+        # At most one batch per queue, one per stage and one waiting to be queued
+        assert max_in_flight <= 3 + 3 + 1
+        assert committed == parsed_batches
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])